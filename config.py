@@ -10,7 +10,7 @@ from dataclasses import dataclass
 class SnapMode(Enum):
     """元素对齐模式"""
     GRID = 'grid'  # 对齐到网格
-    OBJECTS = 'objects'  # 对齐到对象
+    OBJECTS = 'objects'  # 对齐到对象（阈值内没有对象时对齐到网格）
     NONE = 'none'  # 不对齐
 
 
@@ -35,7 +35,14 @@ CONFIG = {
     # 默认标签参数
     'DEFAULT_WIDTH_MM': 28,
     'DEFAULT_HEIGHT_MM': 28,
-    'DEFAULT_DPI': 203,
+    'DEFAULT_DPI': 203,  # 画布设计比例（输出分辨率由打印机配置决定）
+    'PRINTER_PROFILE': 'zebra_203',  # 默认打印机配置 (core/printer_profiles.py)
+    'ZPL_OPTIMIZE': False,  # 导出前优化 ZPL（去掉空白和重复的状态命令，压缩 ^GFA）
+    # 文本图形/下载字体模式的默认 TrueType 字体（文件路径或系统字体文件名；需要包含西里尔字母和中文；
+    # 下载到打印机的字体必须是单个 .ttf，不能是 .ttc 集合）
+    'TTF_FONT': 'simhei.ttf',
+    # 下载字体 (~DY) 在打印机上的存储设备: E = 闪存（断电保留），R = 内存
+    'PRINTER_FONT_DEVICE': 'E',
 
     # 标签尺寸限制（Zebra 打印机）
     'MIN_LABEL_WIDTH_MM': 10.0,
@@ -50,6 +57,17 @@ CONFIG = {
 
     # 路径
     'TEMPLATES_DIR': 'templates/library',
+
+    # 导入图片时缩小到标签尺寸 × 打印机分辨率 × 此系数（留出放大元素的余量）
+    'IMAGE_IMPORT_OVERSAMPLE': 2.0,
+
+    # 撤销堆栈最大条目数（限制内存占用）
+    'UNDO_LIMIT': 200,
+
+    # 画布元素渲染缓存: device | item | none
+    'ITEM_CACHE_MODE': 'device',
+    # 在画布角落显示帧时间
+    'SHOW_FRAME_TIME': False,
 }
 
 # === 日志配置 ===
@@ -0,0 +1,617 @@
+# -*- coding: utf-8 -*-
+"""条码符号编码器 - Code 128（自动 A/B/C 切换）、EAN-13、QR（版本和模块矩阵）
+
+纯 Python 实现，结果按 (码制, 数据) 缓存。用于布局的准确模块数、
+画布上的真实条/空以及本地位图渲染。
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+
+from utils.logger import logger
+
+
+@dataclass(frozen=True)
+class LinearSymbol:
+    """一维条码符号（不含静区）"""
+    symbology: str
+    data: str  # 实际编码的数据（EAN-13 含校验位）
+    codewords: Tuple[int, ...]  # 码字（Code 128 含起始符和校验符；EAN-13 为数字）
+    modules: str  # '1' = 条，'0' = 空
+    bars: Tuple[Tuple[int, int], ...]  # (起始模块, 宽度) - 每个条一项
+
+    @property
+    def module_count(self):
+        return len(self.modules)
+
+    def to_bitmap(self, module_width, height):
+        """bool 位图 (height, 模块数 × module_width)，True = 黑色"""
+        row = np.repeat(np.frombuffer(self.modules.encode('ascii'), dtype=np.uint8) == ord('1'), module_width)
+        return np.tile(row, (height, 1))
+
+
+@dataclass(frozen=True)
+class MatrixSymbol:
+    """二维码符号（不含静区）"""
+    symbology: str
+    data: str
+    version: int
+    error_correction: str  # L / M / Q / H
+    mask: int
+    matrix: np.ndarray  # bool (size, size)，True = 黑色
+
+    @property
+    def size(self):
+        return self.matrix.shape[0]
+
+    def to_bitmap(self, magnification):
+        """bool 位图 (size × magnification)²，True = 黑色"""
+        return np.kron(self.matrix, np.ones((magnification, magnification), dtype=bool))
+
+
+def _bar_runs(modules):
+    """模块串 → 条的 (起始, 宽度) 列表"""
+    bars = []
+    start = None
+    for i, module in enumerate(modules + '0'):
+        if module == '1' and start is None:
+            start = i
+        elif module == '0' and start is not None:
+            bars.append((start, i - start))
+            start = None
+    return tuple(bars)
+
+
+# ==================== Code 128 ====================
+
+# 码字 0-106 的条/空宽度（条开始，交替）；106 = 停止符（含 2 模块终止条）
+_CODE128_PATTERNS = (
+    "212222", "222122", "222221", "121223", "121322", "131222", "122213", "122312", "132212", "221213",
+    "221312", "231212", "112232", "122132", "122231", "113222", "123122", "123221", "223211", "221132",
+    "221231", "213212", "223112", "312131", "311222", "321122", "321221", "312212", "322112", "322211",
+    "212123", "212321", "232121", "111323", "131123", "131321", "112313", "132113", "132311", "211313",
+    "231113", "231311", "112133", "112331", "132131", "113123", "113321", "133121", "313121", "211331",
+    "231131", "213113", "213311", "213131", "311123", "311321", "331121", "312113", "312311", "332111",
+    "314111", "221411", "431111", "111224", "111422", "121124", "121421", "141122", "141221", "112214",
+    "112412", "122114", "122411", "142112", "142211", "241211", "221114", "413111", "241112", "134111",
+    "111242", "121142", "121241", "114212", "124112", "124211", "411212", "421112", "421211", "212141",
+    "214121", "412121", "111143", "111341", "131141", "114113", "114311", "411113", "411311", "113141",
+    "114131", "311141", "411131", "211412", "211214", "211232", "2331112",
+)
+
+_CODE128_START = {'A': 103, 'B': 104, 'C': 105}
+_CODE128_SWITCH = {'A': 101, 'B': 100, 'C': 99}  # 切换到该字符集的码字
+_CODE128_SHIFT = 98  # A/B 之间只切换一个字符
+_CODE128_STOP = 106
+
+
+def _code128_value(char, code_set):
+    """字符在字符集 A/B 中的码字值；不能编码时返回 None"""
+    code = ord(char)
+    if code_set == 'A':
+        if 32 <= code <= 95:
+            return code - 32
+        if code < 32:
+            return code + 64
+    elif 32 <= code <= 127:
+        return code - 32
+    return None
+
+
+def _encode_code128(data):
+    """
+    Code 128 编码，码字数最少的 A/B/C 切换方案（动态规划）
+
+    字符集 C 每个码字编码两位数字；A 含控制字符，B 含小写字母。
+    """
+    if not data:
+        raise ValueError("Code 128 数据为空")
+    bad = [char for char in data if ord(char) > 127]
+    if bad:
+        raise ValueError(f"Code 128 不能编码字符 {bad[0]!r}")
+
+    n = len(data)
+    sets = ('B', 'A', 'C')  # 码字数相同时优先 B
+    # cost[i][s]: 编码前 i 个字符并处于字符集 s 的最少码字数；back: (前一状态, 本步码字)
+    cost = [dict.fromkeys(sets, None) for _ in range(n + 1)]
+    back = [dict() for _ in range(n + 1)]
+    for code_set in sets:
+        cost[0][code_set] = 1
+        back[0][code_set] = (None, (_CODE128_START[code_set],))
+
+    def relax(i, code_set, value, previous, codewords):
+        if cost[i][code_set] is None or value < cost[i][code_set]:
+            cost[i][code_set] = value
+            back[i][code_set] = (previous, codewords)
+
+    for i in range(n + 1):
+        # 在位置 i 切换字符集（起始状态之后）
+        if i > 0:
+            for code_set in sets:
+                for target in sets:
+                    if target != code_set and cost[i][code_set] is not None:
+                        relax(i, target, cost[i][code_set] + 1, (i, code_set), (_CODE128_SWITCH[target],))
+        if i == n:
+            break
+        char = data[i]
+        for code_set in sets:
+            current = cost[i][code_set]
+            if current is None:
+                continue
+            if code_set == 'C':
+                if i + 1 < n and data[i:i + 2].isdigit() and data[i:i + 2].isascii():
+                    relax(i + 2, 'C', current + 1, (i, 'C'), (int(data[i:i + 2]),))
+                continue
+            value = _code128_value(char, code_set)
+            if value is not None:
+                relax(i + 1, code_set, current + 1, (i, code_set), (value,))
+            else:
+                other = 'B' if code_set == 'A' else 'A'
+                value = _code128_value(char, other)
+                relax(i + 1, code_set, current + 2, (i, code_set), (_CODE128_SHIFT, value))
+
+    end_set = min((s for s in sets if cost[n][s] is not None), key=lambda s: cost[n][s])
+    steps = []
+    state = (n, end_set)
+    while state is not None:
+        previous, codewords = back[state[0]][state[1]]
+        steps.append(codewords)
+        state = previous
+    codewords = [value for step in reversed(steps) for value in step]
+
+    checksum = (codewords[0] + sum(i * value for i, value in enumerate(codewords[1:], 1))) % 103
+    codewords += [checksum, _CODE128_STOP]
+
+    modules = []
+    for value in codewords:
+        for i, width in enumerate(_CODE128_PATTERNS[value]):
+            modules.append(('1' if i % 2 == 0 else '0') * int(width))
+    modules = ''.join(modules)
+    return LinearSymbol('CODE128', data, tuple(codewords[:-1]), modules, _bar_runs(modules))
+
+
+# ==================== EAN-13 ====================
+
+_EAN_L = ("0001101", "0011001", "0010011", "0111101", "0100011",
+          "0110001", "0101111", "0111011", "0110111", "0001011")
+_EAN_R = tuple(''.join('1' if m == '0' else '0' for m in code) for code in _EAN_L)
+_EAN_G = tuple(code[::-1] for code in _EAN_R)
+# 第一位数字决定左半部分 6 位的奇偶（L/G）组合
+_EAN_PARITY = ("LLLLLL", "LLGLGG", "LLGGLG", "LLGGGL", "LGLLGG",
+               "LGGLLG", "LGGGLL", "LGLGLG", "LGLGGL", "LGGLGL")
+
+
+def ean13_check_digit(digits):
+    """12 位数字的 EAN-13 校验位"""
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digits))
+    return str((10 - total % 10) % 10)
+
+
+def _encode_ean13(data):
+    """
+    EAN-13 编码（与 ^BE 相同: 不足 12 位左侧补零，校验位总是重新计算）
+    """
+    if not data or not data.isascii() or not data.isdigit() or len(data) > 13:
+        raise ValueError(f"EAN-13 需要 12 或 13 位数字: {data!r}")
+    digits = data[:12].zfill(12)
+    digits += ean13_check_digit(digits)
+
+    parity = _EAN_PARITY[int(digits[0])]
+    left = ''.join((_EAN_L if p == 'L' else _EAN_G)[int(d)] for p, d in zip(parity, digits[1:7]))
+    right = ''.join(_EAN_R[int(d)] for d in digits[7:])
+    modules = "101" + left + "01010" + right + "101"
+    return LinearSymbol('EAN13', digits, tuple(int(d) for d in digits), modules, _bar_runs(modules))
+
+
+# ==================== QR ====================
+
+_QR_LEVELS = ('L', 'M', 'Q', 'H')
+_QR_FORMAT_BITS = {'L': 1, 'M': 0, 'Q': 3, 'H': 2}
+
+# 每块纠错码字数 [级别][版本]（索引 0 不用）
+_QR_ECC_PER_BLOCK = {
+    'L': (0, 7, 10, 15, 20, 26, 18, 20, 24, 30, 18, 20, 24, 26, 30, 22, 24, 28, 30, 28, 28,
+          28, 28, 30, 30, 26, 28, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30),
+    'M': (0, 10, 16, 26, 18, 24, 16, 18, 22, 22, 26, 30, 22, 22, 24, 24, 28, 28, 26, 26, 26,
+          26, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28),
+    'Q': (0, 13, 22, 18, 26, 18, 24, 18, 22, 20, 24, 28, 26, 24, 20, 30, 24, 28, 28, 26, 30,
+          28, 30, 30, 30, 30, 28, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30),
+    'H': (0, 17, 28, 22, 16, 22, 28, 26, 26, 24, 28, 24, 28, 22, 24, 24, 30, 28, 28, 26, 28,
+          30, 24, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30),
+}
+
+# 纠错块数 [级别][版本]
+_QR_BLOCKS = {
+    'L': (0, 1, 1, 1, 1, 1, 2, 2, 2, 2, 4, 4, 4, 4, 4, 6, 6, 6, 6, 7, 8,
+          8, 9, 9, 10, 12, 12, 12, 13, 14, 15, 16, 17, 18, 19, 19, 20, 21, 22, 24, 25),
+    'M': (0, 1, 1, 1, 2, 2, 4, 4, 4, 5, 5, 5, 8, 9, 9, 10, 10, 11, 13, 14, 16,
+          17, 17, 18, 20, 21, 23, 25, 26, 28, 29, 31, 33, 35, 37, 38, 40, 43, 45, 47, 49),
+    'Q': (0, 1, 1, 2, 2, 4, 4, 6, 6, 8, 8, 8, 10, 12, 16, 12, 17, 16, 18, 21, 20,
+          23, 23, 25, 27, 29, 34, 34, 35, 38, 40, 43, 45, 48, 51, 53, 56, 59, 62, 65, 68),
+    'H': (0, 1, 1, 2, 4, 4, 4, 5, 6, 8, 8, 11, 11, 16, 16, 18, 16, 19, 21, 25, 25,
+          25, 34, 30, 32, 35, 37, 40, 42, 45, 48, 51, 54, 57, 60, 63, 66, 70, 74, 77, 81),
+}
+
+_QR_ALPHANUMERIC = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:"
+
+# 模式: (模式指示符, 各版本段 1-9 / 10-26 / 27-40 的字符计数位数)
+_QR_MODES = {
+    'numeric': (0b0001, (10, 12, 14)),
+    'alphanumeric': (0b0010, (9, 11, 13)),
+    'byte': (0b0100, (8, 16, 16)),
+}
+
+# GF(256) 指数/对数表（本原多项式 x^8 + x^4 + x^3 + x^2 + 1）
+_GF_EXP = [0] * 512
+_GF_LOG = [0] * 256
+_value = 1
+for _i in range(255):
+    _GF_EXP[_i] = _value
+    _GF_LOG[_value] = _i
+    _value <<= 1
+    if _value & 0x100:
+        _value ^= 0x11D
+for _i in range(255, 512):
+    _GF_EXP[_i] = _GF_EXP[_i - 255]
+
+
+def _gf_multiply(a, b):
+    if a == 0 or b == 0:
+        return 0
+    return _GF_EXP[_GF_LOG[a] + _GF_LOG[b]]
+
+
+@lru_cache(maxsize=32)
+def _rs_generator(degree):
+    """Reed-Solomon 生成多项式系数（最高次项 1 省略）"""
+    result = [0] * (degree - 1) + [1]
+    root = 1
+    for _ in range(degree):
+        for j in range(degree):
+            result[j] = _gf_multiply(result[j], root)
+            if j + 1 < degree:
+                result[j] ^= result[j + 1]
+        root = _gf_multiply(root, 2)
+    return tuple(result)
+
+
+def _rs_remainder(data, degree):
+    """数据码字的 Reed-Solomon 纠错码字"""
+    generator = _rs_generator(degree)
+    result = [0] * degree
+    for byte in data:
+        factor = byte ^ result.pop(0)
+        result.append(0)
+        for j, coefficient in enumerate(generator):
+            result[j] ^= _gf_multiply(coefficient, factor)
+    return result
+
+
+def qr_raw_modules(version):
+    """版本的数据+纠错模块数（去掉功能图形）"""
+    result = (16 * version + 128) * version + 64
+    if version >= 2:
+        count = version // 7 + 2
+        result -= (25 * count - 10) * count - 55
+        if version >= 7:
+            result -= 36
+    return result
+
+
+def qr_data_codewords(version, error_correction):
+    """版本和纠错级别的数据码字容量"""
+    return (qr_raw_modules(version) // 8
+            - _QR_ECC_PER_BLOCK[error_correction][version] * _QR_BLOCKS[error_correction][version])
+
+
+def _qr_alignment_positions(version):
+    if version == 1:
+        return []
+    count = version // 7 + 2
+    size = version * 4 + 17
+    step = 26 if version == 32 else (version * 4 + count * 2 + 1) // (count * 2 - 2) * 2
+    return [6] + sorted(size - 7 - i * step for i in range(count - 1))
+
+
+def _qr_mode(data):
+    """单一模式中最紧凑的: 数字 / 字母数字 / 字节（UTF-8）"""
+    if data.isascii() and data.isdigit():
+        return 'numeric', data.encode('ascii')
+    if all(char in _QR_ALPHANUMERIC for char in data):
+        return 'alphanumeric', data.encode('ascii')
+    return 'byte', data.encode('utf-8')
+
+
+def _qr_segment_bits(mode, payload):
+    """模式数据位（不含模式指示符和字符计数）"""
+    bits = []
+
+    def put(value, length):
+        bits.extend((value >> i) & 1 for i in reversed(range(length)))
+
+    if mode == 'numeric':
+        for i in range(0, len(payload), 3):
+            chunk = payload[i:i + 3]
+            put(int(chunk), len(chunk) * 3 + 1)
+    elif mode == 'alphanumeric':
+        for i in range(0, len(payload), 2):
+            chunk = payload[i:i + 2].decode('ascii')
+            if len(chunk) == 2:
+                put(_QR_ALPHANUMERIC.index(chunk[0]) * 45 + _QR_ALPHANUMERIC.index(chunk[1]), 11)
+            else:
+                put(_QR_ALPHANUMERIC.index(chunk), 6)
+    else:
+        for byte in payload:
+            put(byte, 8)
+    return bits
+
+
+def _qr_count_bits(mode, version):
+    lengths = _QR_MODES[mode][1]
+    return lengths[0] if version <= 9 else lengths[1] if version <= 26 else lengths[2]
+
+
+def _qr_codewords(mode, payload, version, error_correction):
+    """数据码字（填充到容量）+ 分块纠错 + 交织"""
+    bits = []
+
+    def put(value, length):
+        bits.extend((value >> i) & 1 for i in reversed(range(length)))
+
+    put(_QR_MODES[mode][0], 4)
+    count = len(payload)
+    put(count, _qr_count_bits(mode, version))
+    bits.extend(_qr_segment_bits(mode, payload))
+
+    capacity = qr_data_codewords(version, error_correction) * 8
+    bits.extend([0] * min(4, capacity - len(bits)))  # 终止符
+    bits.extend([0] * (-len(bits) % 8))
+    data = [int(''.join(map(str, bits[i:i + 8])), 2) for i in range(0, len(bits), 8)]
+    for pad in range(capacity // 8 - len(data)):
+        data.append(0xEC if pad % 2 == 0 else 0x11)
+
+    blocks_count = _QR_BLOCKS[error_correction][version]
+    ecc_length = _QR_ECC_PER_BLOCK[error_correction][version]
+    raw_codewords = qr_raw_modules(version) // 8
+    short_blocks = blocks_count - raw_codewords % blocks_count
+    short_length = raw_codewords // blocks_count - ecc_length
+
+    blocks = []
+    position = 0
+    for i in range(blocks_count):
+        length = short_length + (0 if i < short_blocks else 1)
+        block = data[position:position + length]
+        position += length
+        blocks.append((block, _rs_remainder(block, ecc_length)))
+
+    result = []
+    for i in range(short_length + 1):
+        result.extend(block[i] for block, _ in blocks if i < len(block))
+    for i in range(ecc_length):
+        result.extend(ecc[i] for _, ecc in blocks)
+    return result
+
+
+def _qr_function_patterns(version):
+    """功能图形（寻像、定位、校正、版本信息）和功能区掩码"""
+    size = version * 4 + 17
+    modules = np.zeros((size, size), dtype=bool)
+    function = np.zeros((size, size), dtype=bool)
+
+    # 定位图形
+    modules[6, ::2] = True
+    modules[::2, 6] = True
+    function[6, :] = True
+    function[:, 6] = True
+
+    # 寻像图形 + 分隔符
+    for row, col in ((3, 3), (3, size - 4), (size - 4, 3)):
+        for dy in range(-4, 5):
+            for dx in range(-4, 5):
+                y, x = row + dy, col + dx
+                if 0 <= y < size and 0 <= x < size:
+                    distance = max(abs(dx), abs(dy))
+                    modules[y, x] = distance not in (2, 4)
+                    function[y, x] = True
+
+    # 校正图形
+    positions = _qr_alignment_positions(version)
+    last = len(positions) - 1
+    for i, row in enumerate(positions):
+        for j, col in enumerate(positions):
+            if (i, j) in ((0, 0), (0, last), (last, 0)):
+                continue
+            for dy in range(-2, 3):
+                for dx in range(-2, 3):
+                    modules[row + dy, col + dx] = max(abs(dx), abs(dy)) != 1
+                    function[row + dy, col + dx] = True
+
+    # 格式信息区（内容按掩码另写）和固定暗模块
+    function[8, :9] = function[:9, 8] = True
+    function[8, size - 8:] = function[size - 8:, 8] = True
+    modules[size - 8, 8] = True
+
+    # 版本信息（版本 7 起）
+    if version >= 7:
+        remainder = version
+        for _ in range(12):
+            remainder = (remainder << 1) ^ ((remainder >> 11) * 0x1F25)
+        bits = version << 12 | remainder
+        for i in range(18):
+            a, b = size - 11 + i % 3, i // 3
+            modules[b, a] = modules[a, b] = bool((bits >> i) & 1)
+            function[b, a] = function[a, b] = True
+    return modules, function
+
+
+def _qr_place_data(modules, function, codewords):
+    """按之字形顺序（右下角开始，两列一组）放置数据位"""
+    size = modules.shape[0]
+    total = len(codewords) * 8
+    index = 0
+    right = size - 1
+    while right >= 1:
+        if right == 6:
+            right = 5
+        upward = ((right + 1) & 2) == 0
+        for vertical in range(size):
+            y = size - 1 - vertical if upward else vertical
+            for x in (right, right - 1):
+                if not function[y, x] and index < total:
+                    modules[y, x] = bool((codewords[index >> 3] >> (7 - (index & 7))) & 1)
+                    index += 1
+        right -= 2
+
+
+def _qr_mask_pattern(mask, size):
+    y, x = np.indices((size, size))
+    return (
+        (x + y) % 2 == 0,
+        y % 2 == 0,
+        x % 3 == 0,
+        (x + y) % 3 == 0,
+        (x // 3 + y // 2) % 2 == 0,
+        x * y % 2 + x * y % 3 == 0,
+        (x * y % 2 + x * y % 3) % 2 == 0,
+        ((x + y) % 2 + x * y % 3) % 2 == 0,
+    )[mask]
+
+
+def _qr_draw_format(modules, error_correction, mask):
+    size = modules.shape[0]
+    data = _QR_FORMAT_BITS[error_correction] << 3 | mask
+    remainder = data
+    for _ in range(10):
+        remainder = (remainder << 1) ^ ((remainder >> 9) * 0x537)
+    bits = (data << 10 | remainder) ^ 0x5412
+
+    def bit(i):
+        return bool((bits >> i) & 1)
+
+    # 左上角
+    for i in range(6):
+        modules[i, 8] = bit(i)
+    modules[7, 8] = bit(6)
+    modules[8, 8] = bit(7)
+    modules[8, 7] = bit(8)
+    for i in range(9, 15):
+        modules[8, 14 - i] = bit(i)
+    # 右上角和左下角
+    for i in range(8):
+        modules[8, size - 1 - i] = bit(i)
+    for i in range(8, 15):
+        modules[size - 15 + i, 8] = bit(i)
+
+
+_FINDER_LIKE = ("10111010000", "00001011101")
+
+
+def _qr_penalty(modules):
+    """掩码评分（规则 1-4，分数越低越好）"""
+    size = modules.shape[0]
+    penalty = 0
+    lines = [''.join('1' if m else '0' for m in row) for row in modules]
+    lines += [''.join('1' if m else '0' for m in col) for col in modules.T]
+    for line in lines:
+        # 规则 1: 连续 5 个以上同色模块
+        run = 1
+        for i in range(1, size + 1):
+            if i < size and line[i] == line[i - 1]:
+                run += 1
+            else:
+                if run >= 5:
+                    penalty += run - 2
+                run = 1
+        # 规则 3: 类似寻像图形的 1:1:3:1:1 图案
+        for pattern in _FINDER_LIKE:
+            start = line.find(pattern)
+            while start != -1:
+                penalty += 40
+                start = line.find(pattern, start + 1)
+
+    # 规则 2: 2×2 同色块
+    same = (modules[:-1, :-1] == modules[1:, :-1]) & (modules[:-1, :-1] == modules[:-1, 1:]) \
+        & (modules[:-1, :-1] == modules[1:, 1:])
+    penalty += 3 * int(same.sum())
+
+    # 规则 4: 暗模块比例偏离 50%
+    dark = int(modules.sum())
+    total = size * size
+    penalty += 10 * (abs(dark * 20 - total * 10) // total)
+    return penalty
+
+
+def _encode_qr(data, error_correction='M', mask=None):
+    """
+    QR 编码: 选择最小版本、Reed-Solomon 纠错、评分最低的掩码
+
+    Args:
+        data: 数据（数字 / 字母数字 / 字节模式自动选择）
+        error_correction: 纠错级别 L / M / Q / H
+        mask: 固定掩码 0-7；None = 自动选择
+    """
+    if not data:
+        raise ValueError("QR 数据为空")
+    if error_correction not in _QR_LEVELS:
+        raise ValueError(f"无效的 QR 纠错级别: {error_correction}")
+    mode, payload = _qr_mode(data)
+    count = len(data) if mode != 'byte' else len(payload)
+    data_bits = len(_qr_segment_bits(mode, payload))
+
+    for version in range(1, 41):
+        count_bits = _qr_count_bits(mode, version)
+        if count < (1 << count_bits) and \
+                4 + count_bits + data_bits <= qr_data_codewords(version, error_correction) * 8:
+            break
+    else:
+        raise ValueError(f"QR 数据过长: {count} 字节（纠错级别 {error_correction}）")
+
+    base, function = _qr_function_patterns(version)
+    _qr_place_data(base, function, _qr_codewords(mode, payload, version, error_correction))
+
+    best = None
+    for candidate in (range(8) if mask is None else (mask,)):
+        modules = base ^ (_qr_mask_pattern(candidate, base.shape[0]) & ~function)
+        _qr_draw_format(modules, error_correction, candidate)
+        penalty = _qr_penalty(modules) if mask is None else 0
+        if best is None or penalty < best[0]:
+            best = (penalty, candidate, modules)
+
+    _, mask, modules = best
+    modules.setflags(write=False)
+    return MatrixSymbol('QRCODE', data, version, error_correction, mask, modules)
+
+
+_ENCODERS = {
+    'CODE128': _encode_code128,
+    'EAN13': _encode_ean13,
+    'QRCODE': _encode_qr,
+}
+
+
+@lru_cache(maxsize=4096)
+def encode(symbology, data):
+    """
+    编码条码（按 (码制, 数据) 缓存）
+
+    Args:
+        symbology: 'CODE128' / 'EAN13' / 'QRCODE'（与 BarcodeElement.barcode_type 相同）
+        data: 数据
+
+    Returns:
+        LinearSymbol 或 MatrixSymbol（QR 使用纠错级别 M）
+
+    Raises:
+        ValueError: 不支持的码制或数据无法编码
+    """
+    encoder = _ENCODERS.get(symbology)
+    if encoder is None:
+        raise ValueError(f"不支持的码制: {symbology}")
+    symbol = encoder(data)
+    logger.debug(f"[条码编码] {symbology} '{data}': "
+                 + (f"{symbol.module_count} 模块" if isinstance(symbol, LinearSymbol)
+                    else f"版本 {symbol.version}, {symbol.size}×{symbol.size} 模块"))
+    return symbol
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""单色抖动 - 灰度图 → 1 位（阈值、Bayer 有序抖动、Atkinson、Floyd-Steinberg）"""
+
+from enum import Enum
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+
+class DitherMode(Enum):
+    """图片元素的抖动模式"""
+    FLOYD_STEINBERG = ("floyd_steinberg", "Floyd-Steinberg（照片）")
+    ATKINSON = ("atkinson", "Atkinson（高对比度）")
+    BAYER_2 = ("bayer2", "Bayer 2x2")
+    BAYER_4 = ("bayer4", "Bayer 4x4（Logo）")
+    BAYER_8 = ("bayer8", "Bayer 8x8")
+    THRESHOLD = ("threshold", "阈值（线稿/条码）")
+
+    def __init__(self, code, display_name):
+        self.code = code
+        self.display_name = display_name
+
+    @classmethod
+    def from_code(cls, code):
+        """根据代码查找模式"""
+        for mode in cls:
+            if mode.code == code:
+                return mode
+        return cls.FLOYD_STEINBERG  # 默认
+
+
+DEFAULT_DITHER_MODE = DitherMode.FLOYD_STEINBERG
+
+_BAYER_SIZES = {
+    DitherMode.BAYER_2: 2,
+    DitherMode.BAYER_4: 4,
+    DitherMode.BAYER_8: 8,
+}
+
+
+@lru_cache(maxsize=None)
+def bayer_matrix(size):
+    """
+    Bayer 阈值矩阵 (size x size)，值为 0..255 的阈值
+
+    递归构造: M(2n) = [[4M, 4M+2], [4M+3, 4M+1]]
+    """
+    matrix = np.array([[0]])
+    while matrix.shape[0] < size:
+        matrix = np.block([[4 * matrix, 4 * matrix + 2],
+                           [4 * matrix + 3, 4 * matrix + 1]])
+    thresholds = (matrix + 0.5) * 255.0 / (size * size)
+    thresholds.setflags(write=False)
+    return thresholds
+
+
+def _as_gray_array(gray):
+    if isinstance(gray, Image.Image):
+        gray = np.asarray(gray.convert('L'))
+    return np.asarray(gray, dtype=np.uint8)
+
+
+def threshold(gray, level=128):
+    """阈值: 亮度 < level 为黑色（全向量化）"""
+    return _as_gray_array(gray) < level
+
+
+def ordered(gray, size=4):
+    """Bayer 有序抖动（全向量化: 阈值矩阵平铺到整幅图像）"""
+    gray = _as_gray_array(gray)
+    height, width = gray.shape
+    matrix = bayer_matrix(size)
+    thresholds = np.tile(matrix, (-(-height // size), -(-width // size)))[:height, :width]
+    return gray < thresholds
+
+
+def floyd_steinberg(gray):
+    """Floyd-Steinberg 误差扩散（PIL 的 C 实现，与之前的输出一致）"""
+    gray = _as_gray_array(gray)
+    image = Image.fromarray(gray).convert('1')
+    return ~np.asarray(image, dtype=bool)
+
+
+def atkinson(gray):
+    """
+    Atkinson 误差扩散（只扩散 6/8 的误差 - 对比度更高，适合热敏打印头）
+
+    误差扩散按像素顺序依赖，逐像素处理: 当前行和下两行的误差
+    保存在 Python 浮点列表中（比 numpy 标量索引快）。
+    """
+    gray = _as_gray_array(gray)
+    height, width = gray.shape
+    black = np.zeros((height, width), dtype=bool)
+
+    row = gray[0].astype(float).tolist() if height else []
+    below = [0.0] * (width + 2)  # 下一行误差，列 c 在索引 c+1
+    below2 = [0.0] * width  # 下两行误差
+
+    for y in range(height):
+        row_black = [False] * width
+        for x in range(width):
+            old = row[x]
+            if old < 128:
+                row_black[x] = True
+                error = old / 8.0
+            else:
+                error = (old - 255.0) / 8.0
+            if error == 0.0:
+                continue
+            if x + 1 < width:
+                row[x + 1] += error
+                if x + 2 < width:
+                    row[x + 2] += error
+            below[x] += error
+            below[x + 1] += error
+            below[x + 2] += error
+            below2[x] += error
+        black[y] = row_black
+
+        if y + 1 < height:
+            next_row = gray[y + 1].tolist()
+            row = [value + carried for value, carried in zip(next_row, below[1:width + 1])]
+            below = [0.0] + below2 + [0.0]
+            below2 = [0.0] * width
+    return black
+
+
+def dither(gray, mode=DEFAULT_DITHER_MODE):
+    """
+    灰度图 → 黑色像素掩码
+
+    Args:
+        gray: 'L' 模式的 PIL 图片或 uint8 数组 (高, 宽)
+        mode: DitherMode
+
+    Returns:
+        bool 数组 (高, 宽)，True = 黑色
+    """
+    if mode in _BAYER_SIZES:
+        return ordered(gray, _BAYER_SIZES[mode])
+    if mode == DitherMode.THRESHOLD:
+        return threshold(gray)
+    if mode == DitherMode.ATKINSON:
+        return atkinson(gray)
+    return floyd_steinberg(gray)
+
+
+def pack_bits(black):
+    """黑色掩码 → ZPL ^GF 位图（每行 (宽+7)//8 字节，1 = 黑色，行末补 0）"""
+    return np.packbits(black, axis=1).tobytes()
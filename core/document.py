@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""标签文档模型 - 按 ID 索引的元素集合（z 顺序 + 变更通知）"""
+
+from PySide6.QtCore import QObject, Signal
+
+from utils.logger import logger
+
+
+class DocumentEntry:
+    """文档中的一个元素: 稳定 ID、元素、图形项和 z 值"""
+
+    __slots__ = ('id', 'element', 'graphics_item', 'z')
+
+    def __init__(self, element_id, element, graphics_item, z):
+        self.id = element_id
+        self.element = element
+        self.graphics_item = graphics_item
+        self.z = z
+
+
+class LabelDocument(QObject):
+    """
+    标签文档
+
+    - 每个元素在加入文档时获得稳定的整数 ID（element.id），
+      删除后撤销重新加入时保持原 ID 和 z 值；ID 从不重复分配
+    - 按 ID 的字典索引: 查找/删除 O(1)，批量删除 O(n)
+    - z 顺序: 每个条目的 z 值（置顶/置底 O(1)），有序列表按需缓存
+    - 变更通知: 批量操作只发出一次信号（画布据此同步场景）
+    """
+
+    elements_added = Signal(list)  # [DocumentEntry]
+    elements_removed = Signal(list)  # [DocumentEntry]
+    order_changed = Signal(list)  # [DocumentEntry]（z 值已改变）
+    element_changed = Signal(object)  # DocumentEntry（属性已改变）
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries = {}  # id -> DocumentEntry
+        self._next_id = 1
+        self._top_z = 0.0
+        self._bottom_z = 0.0
+        self._ordered = None  # 按 z 排序的条目缓存
+
+    # ========== 查询 ==========
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        """按 z 顺序（从下到上）遍历元素"""
+        return iter([entry.element for entry in self.entries()])
+
+    def __contains__(self, element):
+        return self.entry_for(element) is not None
+
+    def entries(self):
+        """按 z 顺序（从下到上）的条目列表"""
+        if self._ordered is None:
+            self._ordered = sorted(self._entries.values(), key=lambda entry: entry.z)
+        return list(self._ordered)
+
+    @property
+    def elements(self):
+        """按 z 顺序的元素元组（只读，修改请调用 add()/remove()/clear()）"""
+        return tuple(entry.element for entry in self.entries())
+
+    @property
+    def graphics_items(self):
+        """按 z 顺序的图形项元组（只读）"""
+        return tuple(entry.graphics_item for entry in self.entries() if entry.graphics_item is not None)
+
+    def get(self, element_id):
+        """按 ID 获取元素（不存在时返回 None）"""
+        entry = self._entries.get(element_id)
+        return entry.element if entry is not None else None
+
+    def entry_for(self, element):
+        """元素对应的条目（元素不在文档中时返回 None）"""
+        entry = self._entries.get(getattr(element, 'id', None))
+        if entry is not None and entry.element is element:
+            return entry
+        return None
+
+    def item_for(self, element):
+        """元素对应的图形项"""
+        entry = self.entry_for(element)
+        return entry.graphics_item if entry is not None else None
+
+    # ========== 修改 ==========
+
+    def _assign_id(self, element):
+        """
+        分配新 ID
+
+        add() 加入的元素总是获得新 ID: 深拷贝的元素带有原元素的 ID，
+        而原元素可能已删除、等待撤销时 restore() 用原 ID 恢复。
+        """
+        element.id = self._next_id
+        self._next_id += 1
+        return element.id
+
+    def _insert(self, entry):
+        self._entries[entry.id] = entry
+        self._top_z = max(self._top_z, entry.z)
+        self._bottom_z = min(self._bottom_z, entry.z)
+
+        # 添加到最上层时直接追加到缓存，否则重新排序
+        if self._ordered is not None and (not self._ordered or entry.z >= self._ordered[-1].z):
+            self._ordered.append(entry)
+        else:
+            self._ordered = None
+
+    def add(self, element, graphics_item=None):
+        """添加元素到最上层"""
+        return self.add_many([(element, graphics_item)])[0]
+
+    def add_many(self, pairs):
+        """
+        批量添加元素（一次通知）
+
+        Args:
+            pairs: [(element, graphics_item), ...]，按 z 顺序从下到上
+
+        Returns:
+            新条目列表
+        """
+        added = []
+        for element, graphics_item in pairs:
+            if self.entry_for(element) is not None:
+                continue
+            element_id = self._assign_id(element)
+            entry = DocumentEntry(element_id, element, graphics_item, self._top_z + 1)
+            self._insert(entry)
+            added.append(entry)
+
+        if added:
+            logger.debug(f"[文档] 已添加 {len(added)} 个元素, 总数: {len(self._entries)}")
+            self.elements_added.emit(added)
+        return added
+
+    def restore(self, entries):
+        """
+        重新加入已删除的条目（保持原 ID 和 z 值，用于撤销删除）
+
+        已在文档中的元素跳过；ID 被其他元素占用时（不应发生）条目获得新 ID，
+        元素不会丢失。
+        """
+        restored = []
+        for entry in entries:
+            if self.entry_for(entry.element) is not None:
+                continue
+            if entry.id in self._entries:
+                old_id = entry.id
+                entry.id = self._assign_id(entry.element)
+                logger.warning(f"[文档] 恢复时 ID {old_id} 已被占用，新 ID: {entry.id}")
+            elif isinstance(entry.id, int) and entry.id >= self._next_id:
+                self._next_id = entry.id + 1
+            entry.element.id = entry.id
+            self._insert(entry)
+            restored.append(entry)
+
+        if restored:
+            logger.debug(f"[文档] 已恢复 {len(restored)} 个元素")
+            self.elements_added.emit(restored)
+        return restored
+
+    def remove(self, element):
+        """删除元素，返回条目（元素不在文档中时返回 None）"""
+        removed = self.remove_many([element])
+        return removed[0] if removed else None
+
+    def remove_many(self, elements):
+        """批量删除元素 - O(n)，一次通知"""
+        removed = []
+        for element in elements:
+            entry = self.entry_for(element)
+            if entry is None:
+                continue
+            del self._entries[entry.id]
+            removed.append(entry)
+
+        if removed:
+            self._ordered = None
+            logger.debug(f"[文档] 已删除 {len(removed)} 个元素, 剩余: {len(self._entries)}")
+            self.elements_removed.emit(removed)
+        return removed
+
+    def clear(self):
+        """删除所有元素"""
+        removed = self.entries()
+        self._entries = {}
+        self._ordered = None
+        self._top_z = 0.0
+        self._bottom_z = 0.0
+
+        if removed:
+            logger.debug(f"[文档] 已清空 ({len(removed)} 个元素)")
+            self.elements_removed.emit(removed)
+        return removed
+
+    # ========== z 顺序 ==========
+
+    def bring_to_front(self, elements):
+        """移到最上层（保持所选元素之间的相对顺序）"""
+        return self._reorder(elements, front=True)
+
+    def send_to_back(self, elements):
+        """移到最下层（保持所选元素之间的相对顺序）"""
+        return self._reorder(elements, front=False)
+
+    def _reorder(self, elements, front):
+        entries = [entry for entry in map(self.entry_for, elements) if entry is not None]
+        if not entries:
+            return []
+
+        entries.sort(key=lambda entry: entry.z, reverse=not front)
+        for entry in entries:
+            if front:
+                self._top_z += 1
+                entry.z = self._top_z
+            else:
+                self._bottom_z -= 1
+                entry.z = self._bottom_z
+
+        self._ordered = None
+        self.order_changed.emit(entries)
+        return entries
+
+    # ========== 通知 ==========
+
+    def notify_changed(self, element):
+        """元素属性已改变"""
+        entry = self.entry_for(element)
+        if entry is not None:
+            self.element_changed.emit(entry)
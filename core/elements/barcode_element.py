@@ -2,11 +2,16 @@
 """ZPL 标签设计器的条形码类"""
 
 from PySide6.QtWidgets import QGraphicsRectItem, QGraphicsItem
-from PySide6.QtCore import Qt, QPointF
-from PySide6.QtGui import QPen, QBrush, QColor
+from PySide6.QtCore import Qt, QPointF, QRectF
+from PySide6.QtGui import QPen, QBrush, QColor, QPainterPath
+
+import numpy as np
 
 from utils.logger import logger
+from core.snap_engine import get_snap_engine
+from core.barcode_encoder import encode, LinearSymbol
 from .base import BaseElement, ElementConfig
+from .serial import SerialField
 
 
 class BarcodeElement(BaseElement):
@@ -27,6 +32,7 @@ class BarcodeElement(BaseElement):
         self.height = height
         self.data_field = None
         self.show_text = True
+        self.serial = None  # SerialField: 打印机端递增的序列号 (^SN/^SF)
 
     def to_dict(self):
         return {
@@ -38,7 +44,8 @@ class BarcodeElement(BaseElement):
             'width': self.width,
             'height': self.height,
             'data_field': self.data_field,
-            'show_text': self.show_text
+            'show_text': self.show_text,
+            'serial': self.serial.to_dict() if self.serial else None
         }
 
     @classmethod
@@ -52,6 +59,7 @@ class BarcodeElement(BaseElement):
             height=data.get('height', 30)
         )
         element.data_field = data.get('data_field')
+        element.serial = SerialField.from_dict(data.get('serial'))
         element.show_text = data.get('show_text', True)
         return element
 
@@ -59,8 +67,36 @@ class BarcodeElement(BaseElement):
         raise NotImplementedError
 
     def _get_barcode_data(self):
+        if self.serial:
+            return self.serial.start_text
         return self.data_field if self.data_field else self.data
 
+    def _symbol_data(self):
+        """布局和画布使用的数据（序列号显示第一个编号）"""
+        return self.serial.start_text if self.serial else self.data
+
+    def encode(self, data=None):
+        """
+        编码的条码符号（按码制和数据缓存）
+
+        Args:
+            data: 要编码的数据；None = 元素数据
+
+        Returns:
+            LinearSymbol / MatrixSymbol；数据无法编码时返回 None
+        """
+        try:
+            return encode(self.barcode_type, self._symbol_data() if data is None else data)
+        except ValueError as e:
+            logger.debug(f"[条形码] 无法编码: {e}")
+            return None
+
+    def _field_data_zpl(self, barcode_data):
+        """字段数据: 序列号 (^SN/^SF) 或 ^FD"""
+        if self.serial:
+            return f"{self.serial.field_zpl()}^FS"
+        return f"^FD{barcode_data}^FS"
+
 
 class GraphicsBarcodeItem(QGraphicsRectItem):
     """条形码图形元素"""
@@ -88,6 +124,10 @@ class GraphicsBarcodeItem(QGraphicsRectItem):
         self.setFlag(QGraphicsRectItem.ItemIsSelectable)
         self.setFlag(QGraphicsRectItem.ItemSendsGeometryChanges)
 
+        # 渲染缓存模式由画布缓存策略决定
+        if canvas is not None and hasattr(canvas, 'item_cache_policy'):
+            canvas.item_cache_policy.apply(self)
+
         pen = QPen(QColor(0, 0, 255), 2, Qt.DashLine)
         brush = QBrush(QColor(200, 220, 255, 100))
         self.setPen(pen)
@@ -98,6 +138,10 @@ class GraphicsBarcodeItem(QGraphicsRectItem):
         self.grid_step_mm = 1.0
         self.snap_threshold_mm = 1.0  # grid_step / 2 用于正确对齐
 
+        # 条/模块路径缓存: (符号, 矩形) -> QPainterPath
+        self._symbol_path_key = None
+        self._symbol_path = None
+
         # 设置位置（触发 itemChange）
         x_px = self._mm_to_px(element.config.x)
         y_px = self._mm_to_px(element.config.y)
@@ -106,11 +150,57 @@ class GraphicsBarcodeItem(QGraphicsRectItem):
     def _mm_to_px(self, mm):
         return int(mm * self.dpi / 25.4)
 
+    def paint(self, painter, option, widget=None):
+        """绘制真实的条/空（QR 为模块矩阵）；数据无法编码时绘制占位矩形"""
+        symbol = self.element.encode()
+        if symbol is None:
+            super().paint(painter, option, widget)
+            return
+
+        rect = self.rect()
+        painter.save()
+        painter.fillRect(rect, Qt.white)
+        painter.fillPath(self._bars_path(symbol, rect), Qt.black)
+        if self.isSelected():
+            painter.setPen(QPen(QColor(0, 0, 255), 1, Qt.DashLine))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(rect)
+        painter.restore()
+
+    def _bars_path(self, symbol, rect):
+        """条（或 QR 每行连续的黑色模块）组成的路径"""
+        key = (rect.x(), rect.y(), rect.width(), rect.height())
+        if self._symbol_path_key is not None and self._symbol_path_key[0] is symbol \
+                and self._symbol_path_key[1] == key:
+            return self._symbol_path
+
+        path = QPainterPath()
+        if isinstance(symbol, LinearSymbol):
+            module = rect.width() / symbol.module_count
+            for start, width in symbol.bars:
+                path.addRect(QRectF(rect.x() + start * module, rect.y(), width * module, rect.height()))
+        else:
+            # QR 正方形，按较短边缩放
+            module = min(rect.width(), rect.height()) / symbol.size
+            for y, row in enumerate(symbol.matrix):
+                edges = np.flatnonzero(np.diff(np.concatenate(([0], row.astype(np.int8), [0]))))
+                for start, end in zip(edges[::2], edges[1::2]):
+                    path.addRect(QRectF(rect.x() + start * module, rect.y() + y * module,
+                                        (end - start) * module, module))
+
+        self._symbol_path_key = (symbol, key)
+        self._symbol_path = path
+        return path
+
     def _px_to_mm(self, px):
         return px * 25.4 / self.dpi
 
     def itemChange(self, change, value):
         """跟踪位置变化，带网格对齐功能"""
+        # 批量加载模板/群组移动时跳过吸附和通知（位置已由调用方确定）
+        if getattr(self.canvas, 'item_changes_suppressed', False):
+            return super().itemChange(change, value)
+
         # 网格对齐 - 移动时
         if change == QGraphicsItem.ItemPositionChange:
             new_pos = value
@@ -126,13 +216,11 @@ class GraphicsBarcodeItem(QGraphicsRectItem):
 
             # 拖拽时发送光标位置给标尺
             if self.canvas:
-                logger.debug(f"[项目拖拽] 发送光标位置: ({x_mm:.2f}, {y_mm:.2f})mm")
-                self.canvas.cursor_position_changed.emit(x_mm, y_mm)
+                self.canvas.report_cursor_position(x_mm, y_mm)
 
             if self.snap_enabled:
-                # 对齐到网格（分别处理 X 和 Y）
-                snapped_x = self._snap_to_grid(x_mm, 'x')
-                snapped_y = self._snap_to_grid(y_mm, 'y')
+                # 吸附（网格/对象，由 canvas 的吸附引擎决定）
+                snapped_x, snapped_y = get_snap_engine(self.canvas).snap_position(self, x_mm, y_mm)
 
                 if snapped_x != x_mm or snapped_y != y_mm:
                     logger.debug(
@@ -151,6 +239,9 @@ class GraphicsBarcodeItem(QGraphicsRectItem):
 
         # 更新元素 - 移动后
         if change == QGraphicsRectItem.ItemPositionHasChanged:
+            # 吸附候选值过期（拖拽源自身除外）
+            get_snap_engine(self.canvas).item_moved(self)
+
             # 考虑对齐更新元素
             x_mm = self._px_to_mm(self.pos().x())
             y_mm = self._px_to_mm(self.pos().y())
@@ -162,8 +253,7 @@ class GraphicsBarcodeItem(QGraphicsRectItem):
 
             # 如果启用对齐，应用对齐
             if self.snap_enabled:
-                x_mm = self._snap_to_grid(x_mm)
-                y_mm = self._snap_to_grid(y_mm)
+                x_mm, y_mm = get_snap_engine(self.canvas).snap_position(self, x_mm, y_mm)
 
             self.element.config.x = x_mm
             self.element.config.y = y_mm
@@ -181,43 +271,6 @@ class GraphicsBarcodeItem(QGraphicsRectItem):
 
         return super().itemChange(change, value)
 
-    def _snap_to_grid(self, value_mm, axis='x'):
-        """使用 GridConfig（大小、偏移量）对齐到网格"""
-        from config import SnapMode
-
-        # 回退用于没有 canvas 的旧元素
-        if not self.canvas:
-            logger.debug(f"[对齐回退] 使用默认值: 大小=1.0mm, 偏移=0.0mm")
-            size = 1.0
-            offset = 0.0
-            threshold = 1.0
-        else:
-            config = self.canvas.grid_config
-
-            # 检查对齐模式
-            if config.snap_mode != SnapMode.GRID:
-                logger.debug(f"[对齐] 模式={config.snap_mode.value}, 跳过网格对齐")
-                return value_mm
-
-            size = config.size_x_mm if axis == 'x' else config.size_y_mm
-            offset = config.offset_x_mm if axis == 'x' else config.offset_y_mm
-            threshold = size / 2
-
-            logger.debug(f"[对齐-{axis.upper()}] 值: {value_mm:.2f}mm, 偏移: {offset:.2f}mm, 大小: {size:.2f}mm")
-
-        # 对齐公式：nearest = offset + round((value - offset) / size) * size
-        relative = value_mm - offset
-        rounded = round(relative / size) * size + offset
-
-        logger.debug(f"[对齐-{axis.upper()}] 相对: {relative:.2f}mm, 四舍五入: {rounded:.2f}mm")
-
-        if abs(value_mm - rounded) <= threshold:
-            logger.debug(f"[对齐-{axis.upper()}] 结果: {value_mm:.2f}mm -> {rounded:.2f}mm")
-            return rounded
-
-        logger.debug(f"[对齐-{axis.upper()}] 未对齐（距离 > 阈值）")
-        return value_mm
-
     def update_size(self, width, height):
         self.element.width = width
         self.element.height = height
@@ -245,17 +298,15 @@ class EAN13BarcodeElement(BarcodeElement):
     def calculate_real_width(self, dpi=203):
         """基于模块宽度计算 EAN-13 的实际宽度
 
-        EAN-13 结构:
-        - 3 静区（左侧）
+        EAN-13 结构（打印机不打印静区）:
         - 3 起始保护符 (101)
         - 42 左半部分 (6 位数字 * 7 模块)
         - 5 中间保护符 (01010)
         - 42 右半部分 (6 位数字 * 7 模块)
         - 3 结束保护符 (101)
-        - 7 静区（右侧）
-        总计: 105 模块
+        总计: 95 模块
         """
-        total_modules = 105
+        total_modules = 95
         width_dots = total_modules * self.module_width
         width_mm = width_dots * 25.4 / dpi
         logger.debug(f"[条形码-EAN13] 实际宽度: {width_mm:.1f}mm ({total_modules} 模块 * {self.module_width} 点)")
@@ -280,7 +331,7 @@ class EAN13BarcodeElement(BarcodeElement):
         zpl_lines.append(f"^FO{x_dots},{y_dots}")
         zpl_lines.append(f"^BY{self.module_width}")
         zpl_lines.append(f"^BEN,{height_dots},Y,N")
-        zpl_lines.append(f"^FD{barcode_data}^FS")
+        zpl_lines.append(self._field_data_zpl(barcode_data))
 
         zpl = "\n".join(zpl_lines)
         logger.debug(f"[条形码-ZPL-EAN13] 已生成: {zpl.replace(chr(10), ' | ')}")
@@ -297,6 +348,7 @@ class EAN13BarcodeElement(BarcodeElement):
             height=data.get('height', 10)
         )
         element.data_field = data.get('data_field')
+        element.serial = SerialField.from_dict(data.get('serial'))
         element.show_text = data.get('show_text', True)
         return element
 
@@ -309,18 +361,28 @@ class Code128BarcodeElement(BarcodeElement):
         super().__init__(config, 'CODE128', data, width, height)
         self.module_width = 2  # 点（^BY 参数）
 
-    def calculate_real_width(self, dpi=203):
+    def calculate_real_width(self, dpi=203, data=None):
         """基于模块宽度计算 CODE128 的实际宽度
 
-        CODE128 结构:
-        - 10 静区（左侧）
+        CODE128 结构（按编码器的实际码字，打印机不打印静区）:
         - 11 起始字符
-        - data_length * 11（每个字符平均值）
+        - 每个码字 11（字符集 C 每个码字两位数字；切换字符集也占码字）
+        - 11 校验字符
         - 13 停止字符（包括 2 条停止模式）
-        - 10 静区（右侧）
+
+        Args:
+            dpi: 打印机分辨率
+            data: 要测量的数据（如批量记录）；None = 元素数据
         """
-        data_length = len(self.data)
-        total_modules = 10 + 11 + (data_length * 11) + 13 + 10
+        if data is None:
+            data = self._symbol_data()
+        data_length = len(data)
+        symbol = self.encode(data)
+        if symbol is not None:
+            total_modules = symbol.module_count
+        else:
+            # 无法编码（非 ASCII 字符）: 每个字符按一个码字估算
+            total_modules = 11 + (data_length * 11) + 11 + 13
         width_dots = total_modules * self.module_width
         width_mm = width_dots * 25.4 / dpi
         logger.debug(
@@ -346,8 +408,8 @@ class Code128BarcodeElement(BarcodeElement):
         zpl_lines = []
         zpl_lines.append(f"^FO{x_dots},{y_dots}")
         zpl_lines.append(f"^BY{self.module_width}")
-        zpl_lines.append(f"^BCN,{height_dots},Y,N,N")
-        zpl_lines.append(f"^FD{barcode_data}^FS")
+        zpl_lines.append(f"^BCN,{height_dots},Y,N,N,A")  # ^BCo,h,f,g,e,m: m = A 自动选择字符集，与编码器一致
+        zpl_lines.append(self._field_data_zpl(barcode_data))
 
         zpl = "\n".join(zpl_lines)
         logger.debug(f"[条形码-ZPL-CODE128] 已生成: {zpl.replace(chr(10), ' | ')}")
@@ -364,6 +426,7 @@ class Code128BarcodeElement(BarcodeElement):
             height=data.get('height', 10)
         )
         element.data_field = data.get('data_field')
+        element.serial = SerialField.from_dict(data.get('serial'))
         element.show_text = data.get('show_text', True)
         return element
 
@@ -371,11 +434,13 @@ class Code128BarcodeElement(BarcodeElement):
 class QRCodeElement(BarcodeElement):
     """QR 码"""
 
+    DEFAULT_MAGNIFICATION = 3
+
     def __init__(self, config: ElementConfig, data: str,
                  size: int = 15):
         super().__init__(config, 'QRCODE', data, width=size, height=size)
         self.size = size
-        self.magnification = 3
+        self.magnification = self.DEFAULT_MAGNIFICATION
 
     def to_zpl(self, dpi):
         x_dots = int(self.config.x * dpi / 25.4)
@@ -386,7 +451,7 @@ class QRCodeElement(BarcodeElement):
         zpl_lines = []
         zpl_lines.append(f"^FO{x_dots},{y_dots}")
         zpl_lines.append(f"^BQN,2,{self.magnification}")
-        zpl_lines.append(f"^FD{barcode_data}^FS")
+        zpl_lines.append(self._field_data_zpl(barcode_data))
 
         return "\n".join(zpl_lines)
 
@@ -405,5 +470,6 @@ class QRCodeElement(BarcodeElement):
             size=data.get('size', 15)
         )
         element.data_field = data.get('data_field')
+        element.serial = SerialField.from_dict(data.get('serial'))
         element.magnification = data.get('magnification', 3)
         return element
\ No newline at end of file
@@ -2,15 +2,18 @@
 """ZPL 标签设计器的图片元素"""
 
 from PySide6.QtWidgets import QGraphicsPixmapItem, QGraphicsItem
-from PySide6.QtCore import Qt, QPointF, Signal
-from PySide6.QtGui import QPixmap
+from PySide6.QtCore import Qt, QPointF
+from PySide6.QtGui import QPixmap, QPixmapCache
 from pathlib import Path
-import base64
 from PIL import Image
+import base64
 import io
 
 from core.elements.base import BaseElement, ElementConfig
+from core.image_store import image_store
+from core.dithering import DitherMode, DEFAULT_DITHER_MODE, dither, pack_bits
 from utils.logger import logger
+from core.snap_engine import get_snap_engine
 
 
 class ImageConfig(ElementConfig):
@@ -31,29 +34,56 @@ class ImageConfig(ElementConfig):
         self.image_path = image_path
         self.image_data = image_data
 
+    @property
+    def image_data(self):
+        """Base64 图片数据（共享负载中的字符串）"""
+        return self.image_payload.data if self.image_payload is not None else None
+
+    @image_data.setter
+    def image_data(self, value):
+        # 相同内容共享一个不可变负载；赋予新数据时替换引用（写时复制）
+        self.image_payload = image_store.intern(value)
+
 
 class ImageElement(BaseElement):
     """图片/Logo 元素"""
 
-    def __init__(self, config=None):
+    MAX_SAVED_BITMAPS = 8  # 随模板保存的位图数上限（最早保存的先丢弃）
+
+    def __init__(self, config=None, dither_mode=DEFAULT_DITHER_MODE):
         if config is None:
             config = ImageConfig()
         super().__init__(config)
+        self.dither_mode = dither_mode  # DitherMode（打印时的单色转换）
+
+        # 预抖动的 1 位位图（随模板保存，导出时复用）
+        # "宽x高:模式" → {'source': 源图内容哈希, 'dpi': 分辨率, 'data': 打包位图的 base64}
+        # 每个 (分辨率, 模式) 只保留当前尺寸的一个位图，总数不超过 MAX_SAVED_BITMAPS
+        self.bitmaps = {}
+
         logger.debug(
             f"[图片元素] 已创建: 位置=({config.x:.2f}, {config.y:.2f})mm, 尺寸=({config.width}x{config.height})mm")
 
     def to_dict(self):
         """序列化到 dict 用于 JSON"""
-        return {
+        data = {
             'type': 'image',
             'x': self.config.x,
             'y': self.config.y,
             'width': self.config.width,
             'height': self.config.height,
             'image_path': self.config.image_path,
-            'image_data': self.config.image_data
+            'image_data': self.config.image_data,
+            'dither_mode': self.dither_mode.code
         }
 
+        # 只保存与当前源图匹配的位图
+        source = self._bitmap_source()
+        bitmaps = {key: entry for key, entry in self.bitmaps.items() if entry['source'] == source}
+        if bitmaps:
+            data['bitmaps'] = bitmaps
+        return data
+
     @classmethod
     def from_dict(cls, data):
         """从 dict 反序列化"""
@@ -65,7 +95,9 @@ class ImageElement(BaseElement):
             image_path=data.get('image_path'),
             image_data=data.get('image_data')
         )
-        return cls(config)
+        element = cls(config, dither_mode=DitherMode.from_code(data.get('dither_mode')))
+        element.bitmaps = dict(data.get('bitmaps') or {})
+        return element
 
     def to_zpl(self, dpi=203):
         """
@@ -87,13 +119,15 @@ class ImageElement(BaseElement):
         logger.debug(f"[图片-ZPL] 位置: ({x_dots}, {y_dots}) 点")
         logger.debug(f"[图片-ZPL] 尺寸: ({width_dots}x{height_dots}) 点")
 
-        # 转换图片为 ZPL hex 格式
-        hex_data = self._convert_image_to_zpl_hex(width_dots, height_dots)
+        # 打包的 1 位位图（已保存时不再处理图片）
+        packed = self.get_packed_bitmap(width_dots, height_dots, dpi)
 
-        if not hex_data:
+        if packed is None:
             logger.error(f"[图片-ZPL] 转换图片失败")
             return ""
 
+        hex_data = packed.hex().upper()
+
         # 生成 ZPL ^GFA 命令
         # 格式: ^GFA,{总字节数},{总字节数},{每行字节数},{十六进制数据}
         bytes_per_row = (width_dots + 7) // 8
@@ -108,30 +142,70 @@ class ImageElement(BaseElement):
         logger.debug(f"[图片-ZPL] 已生成: 总字节数={total_bytes}, 每行字节数={bytes_per_row}")
         return "\n".join(zpl_commands)
 
-    def _convert_image_to_zpl_hex(self, width_dots, height_dots):
+    def _bitmap_source(self):
+        """位图对应的源图哈希（只有嵌入的图片数据才能保存位图）"""
+        payload = self.config.image_payload
+        return payload.key if payload is not None else None
+
+    @staticmethod
+    def bitmap_key(width_dots, height_dots, dither_mode=DEFAULT_DITHER_MODE):
+        return f"{width_dots}x{height_dots}:{dither_mode.code}"
+
+    def get_packed_bitmap(self, width_dots, height_dots, dpi=None):
+        """
+        打包的 1 位位图（每行 (宽+7)//8 字节，1 = 黑色）
+
+        匹配 (宽, 高, 抖动模式) 和源图时复用保存的位图，否则重新生成并保存。
+        保存时替换同一 (分辨率, 模式) 的旧尺寸位图（调整大小后旧位图不再需要）。
+
+        Returns:
+            bytes，失败时返回 None
         """
-        转换图片为 ZPL hex 格式
+        key = self.bitmap_key(width_dots, height_dots, self.dither_mode)
+        source = self._bitmap_source()
+
+        entry = self.bitmaps.get(key)
+        if source is not None and entry is not None and entry['source'] == source:
+            logger.debug(f"[图片-ZPL] 复用已保存的位图: {key}")
+            return base64.b64decode(entry['data'])
+
+        packed = self._render_packed_bitmap(width_dots, height_dots)
+        if packed is not None and source is not None:
+            # 源图已改变的旧位图、同一 (分辨率, 模式) 的旧尺寸位图一并丢弃
+            mode = key.rsplit(':', 1)[1]
+            self.bitmaps = {
+                k: e for k, e in self.bitmaps.items()
+                if e['source'] == source and not (e.get('dpi') == dpi and k.rsplit(':', 1)[1] == mode)
+            }
+            self.bitmaps[key] = {'source': source, 'dpi': dpi, 'data': base64.b64encode(packed).decode('ascii')}
+            while len(self.bitmaps) > self.MAX_SAVED_BITMAPS:
+                del self.bitmaps[next(iter(self.bitmaps))]
+            logger.debug(f"[图片-ZPL] 位图已保存: {key} ({len(packed)} 字节)")
+        return packed
+
+    def _render_packed_bitmap(self, width_dots, height_dots):
+        """
+        源图 → 打包的 1 位位图
 
         过程:
         1. 加载图片（从 base64 或路径）
         2. 调整到目标尺寸
         3. 转换为灰度
-        4. 应用 Floyd-Steinberg 抖动 → 1位单色
-        5. 转换像素为 hex 格式
+        4. 按元素的抖动模式 → 1 位单色
+        5. 按行打包像素（8 像素 → 1 字节）
 
         Args:
             width_dots: 宽度（点）
             height_dots: 高度（点）
 
         Returns:
-            str: ^GFA 命令的十六进制数据
+            bytes，失败时返回 None
         """
         try:
             # === 1. 加载图片 ===
-            if self.config.image_data:
+            if self.config.image_payload is not None:
                 # 从 base64
-                image_bytes = base64.b64decode(self.config.image_data)
-                img = Image.open(io.BytesIO(image_bytes))
+                img = Image.open(io.BytesIO(self.config.image_payload.decode()))
                 logger.debug(f"[图片转换] 从 base64 加载")
             elif self.config.image_path:
                 # 从文件
@@ -149,56 +223,79 @@ class ImageElement(BaseElement):
 
             # === 3. 灰度转换 ===
             img = img.convert('L')
-            logger.debug(f"[图片转换] 转换为灰度")
 
             # === 4. 抖动 → 单色 ===
-            # Floyd-Steinberg 抖动以获得更好质量
-            img = img.convert('1')
-            logger.debug(f"[图片转换] 应用抖动 + 转换为 1 位单色")
-
-            # === 5. 像素 → HEX 格式 ===
-            hex_lines = []
-            bytes_per_row = (width_dots + 7) // 8
-
-            for y in range(height_dots):
-                row_bytes = []
+            black = dither(img, self.dither_mode)
+            logger.debug(f"[图片转换] 抖动: {self.dither_mode.code}")
 
-                for x in range(0, width_dots, 8):
-                    byte_value = 0
+            # === 5. 打包 ===
+            packed = pack_bits(black)
+            logger.debug(f"[图片转换] 打包位图: {len(packed)} 字节")
 
-                    # 8 像素 → 1 字节
-                    for bit in range(8):
-                        if x + bit < width_dots:
-                            pixel = img.getpixel((x + bit, y))
-                            # PIL '1' 模式: 0 = 黑色, 255 = 白色
-                            # ZPL 格式: 1 = 黑色, 0 = 白色
-                            if pixel == 0:  # 黑色像素
-                                byte_value |= (1 << (7 - bit))
-
-                    row_bytes.append(f"{byte_value:02X}")
-
-                # 如果需要填充
-                while len(row_bytes) < bytes_per_row:
-                    row_bytes.append("00")
-
-                hex_lines.append("".join(row_bytes))
-
-            hex_data = "".join(hex_lines)
-            logger.debug(f"[图片转换] 十六进制数据长度: {len(hex_data)} 字符 ({len(hex_data) // 2} 字节)")
-
-            return hex_data
+            return packed
 
         except Exception as e:
             logger.error(f"[图片转换] 错误: {e}", exc_info=True)
             return None
 
 
+# === 图片缓存（QPixmapCache）===
+# 源图: "zpl-image-src:<哈希>" → 解码后的 QPixmap（引用同一 logo 的元素共享）
+# 缩放图: "zpl-image:<哈希>:<宽>x<高>" → 缩放后的 QPixmap
+
+def image_content_key(config):
+    """
+    图片内容的缓存键
+
+    Returns:
+        共享负载的 SHA1（已预先计算）/ 文件路径，没有图片时返回 None
+    """
+    if config.image_payload is not None:
+        return config.image_payload.key
+    if config.image_path:
+        return 'file:' + str(config.image_path)
+    return None
+
+
+def _decode_source_pixmap(config):
+    """解码原始图片（缓存未命中时）"""
+    if config.image_payload is not None:
+        pixmap = QPixmap()
+        pixmap.loadFromData(config.image_payload.decode())
+        return pixmap
+    return QPixmap(config.image_path)
+
+
+def get_source_pixmap(config, content_key):
+    """获取解码后的原始图片（共享）"""
+    cache_key = f"zpl-image-src:{content_key}"
+    pixmap = QPixmapCache.find(cache_key)
+    if pixmap is None:
+        pixmap = _decode_source_pixmap(config)
+        QPixmapCache.insert(cache_key, pixmap)
+        logger.debug(f"[图片缓存] 源图已解码: {pixmap.width()}x{pixmap.height()}px")
+    return pixmap
+
+
+def get_scaled_pixmap(config, content_key, width_px, height_px):
+    """获取缩放到目标尺寸的图片（按内容哈希 + 尺寸缓存）"""
+    cache_key = f"zpl-image:{content_key}:{width_px}x{height_px}"
+    pixmap = QPixmapCache.find(cache_key)
+    if pixmap is None:
+        pixmap = get_source_pixmap(config, content_key).scaled(
+            width_px,
+            height_px,
+            Qt.KeepAspectRatio,
+            Qt.SmoothTransformation
+        )
+        QPixmapCache.insert(cache_key, pixmap)
+        logger.debug(f"[图片缓存] 已缩放: {width_px}x{height_px}px")
+    return pixmap
+
+
 class GraphicsImageItem(QGraphicsPixmapItem):
     """画布上图片的图形项"""
 
-    # 用于更新属性面板的信号
-    position_changed = Signal(float, float)
-
     def __init__(self, element, dpi=203, canvas=None, parent=None):
         super().__init__(parent)
         self.element = element
@@ -225,37 +322,31 @@ class GraphicsImageItem(QGraphicsPixmapItem):
             QGraphicsItem.ItemSendsGeometryChanges
         )
 
+        # 渲染缓存模式由画布缓存策略决定
+        if canvas is not None and hasattr(canvas, 'item_cache_policy'):
+            canvas.item_cache_policy.apply(self)
+
         logger.debug(f"[图片项] 已创建于: ({element.config.x:.2f}, {element.config.y:.2f})mm")
 
+    def _content_key(self):
+        """内容哈希（负载创建时已计算，O(1)）"""
+        return image_content_key(self.element.config)
+
     def _load_image(self):
-        """加载并显示图片"""
+        """加载并显示图片（通过 QPixmapCache）"""
         try:
-            if self.element.config.image_data:
-                # 从 base64
-                image_bytes = base64.b64decode(self.element.config.image_data)
-                pixmap = QPixmap()
-                pixmap.loadFromData(image_bytes)
-                logger.debug(f"[图片项] 从 base64 加载")
-            elif self.element.config.image_path:
-                # 从文件
-                pixmap = QPixmap(self.element.config.image_path)
-                logger.debug(f"[图片项] 从文件加载")
-            else:
+            width_px = int(self._mm_to_px(self.element.config.width))
+            height_px = int(self._mm_to_px(self.element.config.height))
+
+            content_key = self._content_key()
+            if content_key is None:
                 # 占位符
                 pixmap = QPixmap(100, 100)
                 pixmap.fill(Qt.lightGray)
+                pixmap = pixmap.scaled(width_px, height_px, Qt.KeepAspectRatio, Qt.SmoothTransformation)
                 logger.debug(f"[图片项] 创建占位符")
-
-            # 调整到所需尺寸
-            width_px = int(self._mm_to_px(self.element.config.width))
-            height_px = int(self._mm_to_px(self.element.config.height))
-
-            pixmap = pixmap.scaled(
-                width_px,
-                height_px,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
+            else:
+                pixmap = get_scaled_pixmap(self.element.config, content_key, width_px, height_px)
 
             self.setPixmap(pixmap)
             logger.debug(f"[图片项] 已显示: 尺寸=({pixmap.width()}x{pixmap.height()})px")
@@ -269,6 +360,10 @@ class GraphicsImageItem(QGraphicsPixmapItem):
 
     def itemChange(self, change, value):
         """处理项目变化（网格对齐、位置更新）"""
+        # 批量加载模板/群组移动时跳过吸附和通知（位置已由调用方确定）
+        if getattr(self.canvas, 'item_changes_suppressed', False):
+            return super().itemChange(change, value)
+
         if change == QGraphicsItem.ItemPositionChange:
             new_pos = value
 
@@ -283,13 +378,11 @@ class GraphicsImageItem(QGraphicsPixmapItem):
 
             # 拖拽时发送光标位置给标尺
             if self.canvas:
-                logger.debug(f"[项目拖拽] 发送光标: ({x_mm:.2f}, {y_mm:.2f})mm")
-                self.canvas.cursor_position_changed.emit(x_mm, y_mm)
+                self.canvas.report_cursor_position(x_mm, y_mm)
 
             if self.snap_enabled:
-                # 对齐到网格
-                snapped_x = self._snap_to_grid(x_mm)
-                snapped_y = self._snap_to_grid(y_mm)
+                # 吸附（网格/对象，由 canvas 的吸附引擎决定）
+                snapped_x, snapped_y = get_snap_engine(self.canvas).snap_position(self, x_mm, y_mm)
 
                 logger.debug(f"[图片对齐] ({x_mm:.2f}, {y_mm:.2f})mm -> ({snapped_x:.2f}, {snapped_y:.2f})mm")
 
@@ -304,6 +397,9 @@ class GraphicsImageItem(QGraphicsPixmapItem):
             return new_pos
 
         elif change == QGraphicsItem.ItemPositionHasChanged:
+            # 吸附候选值过期（拖拽源自身除外）
+            get_snap_engine(self.canvas).item_moved(self)
+
             # 移动后更新配置
             x_mm = self._px_to_mm(self.pos().x())
             y_mm = self._px_to_mm(self.pos().y())
@@ -327,20 +423,8 @@ class GraphicsImageItem(QGraphicsPixmapItem):
                 )
                 self.canvas.bounds_update_callback(self)
 
-            # 属性面板的信号
-            self.position_changed.emit(x_mm, y_mm)
-
         return super().itemChange(change, value)
 
-    def _snap_to_grid(self, value_mm):
-        """将值对齐到网格"""
-        nearest = round(value_mm / self.grid_step_mm) * self.grid_step_mm
-
-        if abs(value_mm - nearest) <= self.snap_threshold_mm:
-            return nearest
-
-        return value_mm
-
     def _mm_to_px(self, mm):
         """转换毫米 → 像素"""
         return mm * self.dpi / 25.4
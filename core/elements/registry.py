@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""元素类型注册表 - type/barcode_type → 模型类和图形类（延迟导入）"""
+
+import importlib
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from utils.logger import logger
+
+
+@dataclass(frozen=True)
+class ElementSpec:
+    """一个元素类型的注册信息"""
+    elem_type: str  # to_dict() 中的 'type'
+    module: str  # 模型类和图形类所在模块
+    model_class: str  # 模型类名称
+    graphics_class: str  # 画布图形项类名称
+    barcode_type: Optional[str] = None  # 仅用于条形码
+
+
+# 内置元素类型（新类型只需在此注册，所有加载/创建路径自动生效）
+BUILTIN_SPECS = [
+    ElementSpec('text', 'core.elements.text_element', 'TextElement', 'GraphicsTextItem'),
+    ElementSpec('barcode', 'core.elements.barcode_element', 'EAN13BarcodeElement',
+                'GraphicsBarcodeItem', barcode_type='EAN13'),
+    ElementSpec('barcode', 'core.elements.barcode_element', 'Code128BarcodeElement',
+                'GraphicsBarcodeItem', barcode_type='CODE128'),
+    ElementSpec('barcode', 'core.elements.barcode_element', 'QRCodeElement',
+                'GraphicsBarcodeItem', barcode_type='QRCODE'),
+    ElementSpec('rectangle', 'core.elements.shape_element', 'RectangleElement', 'GraphicsRectangleItem'),
+    ElementSpec('circle', 'core.elements.shape_element', 'CircleElement', 'GraphicsCircleItem'),
+    ElementSpec('line', 'core.elements.shape_element', 'LineElement', 'GraphicsLineItem'),
+    ElementSpec('image', 'core.elements.image_element', 'ImageElement', 'GraphicsImageItem'),
+]
+
+# (type, barcode_type) → spec
+_SPECS_BY_KEY: Dict[Tuple[str, Optional[str]], ElementSpec] = {}
+
+# (模块, 模型类名) → spec，用于按元素实例查找而无需导入模块
+_SPECS_BY_CLASS: Dict[Tuple[str, str], ElementSpec] = {}
+
+# 已解析的类缓存: (模块, 类名) → class
+_CLASS_CACHE: Dict[Tuple[str, str], Any] = {}
+
+
+def register_element(spec: ElementSpec):
+    """注册（或覆盖）元素类型"""
+    _SPECS_BY_KEY[(spec.elem_type, spec.barcode_type)] = spec
+    _SPECS_BY_CLASS[(spec.module, spec.model_class)] = spec
+    logger.debug(f"[注册表] 已注册: type={spec.elem_type}, barcode_type={spec.barcode_type} -> {spec.model_class}")
+
+
+def _resolve(module: str, name: str):
+    """延迟导入模块并返回类（带缓存）"""
+    key = (module, name)
+    cls = _CLASS_CACHE.get(key)
+    if cls is None:
+        cls = getattr(importlib.import_module(module), name)
+        _CLASS_CACHE[key] = cls
+    return cls
+
+
+def get_spec(elem_type: str, barcode_type: Optional[str] = None) -> Optional[ElementSpec]:
+    """按 type/barcode_type 查找注册信息"""
+    if elem_type != 'barcode':
+        barcode_type = None
+    return _SPECS_BY_KEY.get((elem_type, barcode_type))
+
+
+def spec_for_element(element) -> Optional[ElementSpec]:
+    """按元素实例查找注册信息（支持子类）"""
+    for cls in type(element).__mro__:
+        spec = _SPECS_BY_CLASS.get((cls.__module__, cls.__name__))
+        if spec is not None:
+            return spec
+    return None
+
+
+def get_model_class(elem_type: str, barcode_type: Optional[str] = None):
+    """获取模型类，未知类型返回 None"""
+    spec = get_spec(elem_type, barcode_type)
+    if spec is None:
+        return None
+    return _resolve(spec.module, spec.model_class)
+
+
+def get_graphics_class(element):
+    """获取元素对应的图形项类，未知类型返回 None"""
+    spec = spec_for_element(element)
+    if spec is None:
+        return None
+    return _resolve(spec.module, spec.graphics_class)
+
+
+def element_from_dict(data: Dict[str, Any]):
+    """
+    转换 dict → BaseElement
+
+    Args:
+        data: 包含元素数据的字典（to_dict() 的结果）
+
+    Returns:
+        元素对象或 None（未知类型）
+    """
+    elem_type = data.get('type')
+    model_class = get_model_class(elem_type, data.get('barcode_type'))
+
+    if model_class is None:
+        logger.warning(f"[注册表] 未知元素类型: {elem_type}")
+        return None
+
+    return model_class.from_dict(data)
+
+
+def create_graphics_item(element, dpi=203, canvas=None):
+    """
+    为元素创建画布图形项
+
+    Args:
+        element: 元素对象
+        dpi: 画布 DPI
+        canvas: CanvasView（用于 GridConfig），可选
+
+    Returns:
+        图形项或 None（未知类型）
+    """
+    graphics_class = get_graphics_class(element)
+
+    if graphics_class is None:
+        logger.warning(f"[注册表] 没有图形项类: {element.__class__.__name__}")
+        return None
+
+    return graphics_class(element, dpi=dpi, canvas=canvas)
+
+
+for _spec in BUILTIN_SPECS:
+    register_element(_spec)
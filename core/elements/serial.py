@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""序列号字段 - 打印机端递增 (^SN / ^SF)"""
+
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class SerialField:
+    """
+    文本/条码的序列号（打印机每打印一张自动递增）
+
+    没有前缀时生成 ^SN{起始值},{增量},{补零}；有前缀时生成
+    ^FD{前缀}{起始值}^SF{掩码},{增量}（掩码从右对齐，只递增数字部分）。
+    ^SF 掩码宽度固定，超出时打印机回绕（999 → 000），因此有前缀时
+    必须补零 (padding >= 1)，value_at() 也按掩码宽度回绕。
+    打印数量由 ^PQ 给出，主机只发送一次标签格式。
+    """
+    start: int = 1  # 起始值
+    increment: int = 1  # 增量（可为负数）
+    padding: int = 6  # 数字位数（补零），0 = 不补零
+    prefix: str = ''  # 固定前缀（如 "BOX"）
+
+    def __post_init__(self):
+        self.validate()
+
+    def validate(self):
+        """有前缀时 ^SF 掩码需要固定位数"""
+        if self.prefix and self.padding < 1:
+            raise ValueError(f"带前缀的序列号需要补零位数 (^SF 掩码宽度): prefix={self.prefix!r}")
+
+    @property
+    def mask_width(self) -> int:
+        """^SF 掩码位数（至少容纳起始值）"""
+        return max(self.padding, len(str(self.start)))
+
+    def format_number(self, value: int) -> str:
+        """数字部分（补零到 padding 位；有前缀时按 ^SF 掩码宽度回绕）"""
+        if self.prefix:
+            return str(value % 10 ** self.mask_width).zfill(self.mask_width)
+        return str(value).zfill(self.padding) if self.padding else str(value)
+
+    def value_at(self, index: int) -> str:
+        """第 index 张标签（从 0 开始）打印的值"""
+        return self.prefix + self.format_number(self.start + index * self.increment)
+
+    @property
+    def start_text(self) -> str:
+        """第一张标签的值（画布显示）"""
+        return self.value_at(0)
+
+    def field_zpl(self) -> str:
+        """字段数据命令（替代 ^FD...，不包括 ^FS）"""
+        self.validate()
+        number = self.format_number(self.start)
+        if not self.prefix:
+            leading_zeros = 'Y' if self.padding else 'N'
+            return f"^SN{number},{self.increment},{leading_zeros}"
+        return f"^FD{self.prefix}{number}^SF{'d' * self.mask_width},{self.increment}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> Optional['SerialField']:
+        """dict → SerialField（没有序列号时返回 None）"""
+        if not data:
+            return None
+        return cls(
+            start=int(data.get('start', 1)),
+            increment=int(data.get('increment', 1)),
+            padding=int(data.get('padding', 6)),
+            prefix=data.get('prefix', '')
+        )
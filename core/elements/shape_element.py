@@ -5,7 +5,9 @@ from PySide6.QtWidgets import QGraphicsRectItem, QGraphicsEllipseItem, QGraphics
 from PySide6.QtCore import Qt, QPointF, QRectF, QLineF
 from PySide6.QtGui import QPen, QBrush, QColor
 
+from config import SnapMode
 from core.elements.base import BaseElement, ElementConfig
+from core.snap_engine import get_snap_engine
 from utils.logger import logger
 
 
@@ -411,6 +413,10 @@ class GraphicsRectangleItem(QGraphicsRectItem):
             QGraphicsItem.ItemSendsGeometryChanges
         )
 
+        # 渲染缓存模式由画布缓存策略决定
+        if canvas is not None and hasattr(canvas, 'item_cache_policy'):
+            canvas.item_cache_policy.apply(self)
+
         logger.debug(f"[形状项-矩形] 已创建于: ({element.config.x:.2f}, {element.config.y:.2f})mm")
 
     def _update_style(self):
@@ -434,6 +440,10 @@ class GraphicsRectangleItem(QGraphicsRectItem):
 
     def itemChange(self, change, value):
         """重写用于网格对齐"""
+        # 批量加载模板/群组移动时跳过吸附和通知（位置已由调用方确定）
+        if getattr(self.canvas, 'item_changes_suppressed', False):
+            return super().itemChange(change, value)
+
         if change == QGraphicsItem.ItemPositionChange:
             new_pos = value
 
@@ -448,13 +458,11 @@ class GraphicsRectangleItem(QGraphicsRectItem):
 
             # 拖拽时发送光标位置给标尺
             if self.canvas:
-                logger.debug(f"[项目拖拽] 发送光标: ({x_mm:.2f}, {y_mm:.2f})mm")
-                self.canvas.cursor_position_changed.emit(x_mm, y_mm)
+                self.canvas.report_cursor_position(x_mm, y_mm)
 
             if self.snap_enabled:
-                # 对齐到网格（分别处理 X 和 Y）
-                snapped_x = self._snap_to_grid(x_mm, 'x')
-                snapped_y = self._snap_to_grid(y_mm, 'y')
+                # 吸附（网格/对象，由 canvas 的吸附引擎决定）
+                snapped_x, snapped_y = get_snap_engine(self.canvas).snap_position(self, x_mm, y_mm)
 
                 # 转换回像素
                 snapped_pos = QPointF(
@@ -467,6 +475,9 @@ class GraphicsRectangleItem(QGraphicsRectItem):
             return new_pos
 
         elif change == QGraphicsItem.ItemPositionHasChanged:
+            # 吸附候选值过期（拖拽源自身除外）
+            get_snap_engine(self.canvas).item_moved(self)
+
             # 移动后更新配置
             x_mm = self._px_to_mm(self.pos().x())
             y_mm = self._px_to_mm(self.pos().y())
@@ -492,43 +503,6 @@ class GraphicsRectangleItem(QGraphicsRectItem):
 
         return super().itemChange(change, value)
 
-    def _snap_to_grid(self, value_mm, axis='x'):
-        """使用 GridConfig（大小、偏移量）对齐到网格"""
-        from config import SnapMode
-
-        # 回退用于没有 canvas 的旧元素
-        if not self.canvas:
-            logger.debug(f"[对齐回退] 使用默认值: 大小=1.0mm, 偏移=0.0mm")
-            size = 1.0
-            offset = 0.0
-            threshold = 1.0
-        else:
-            config = self.canvas.grid_config
-
-            # 检查对齐模式
-            if config.snap_mode != SnapMode.GRID:
-                logger.debug(f"[对齐] 模式={config.snap_mode.value}, 跳过网格对齐")
-                return value_mm
-
-            size = config.size_x_mm if axis == 'x' else config.size_y_mm
-            offset = config.offset_x_mm if axis == 'x' else config.offset_y_mm
-            threshold = size / 2
-
-            logger.debug(f"[对齐-{axis.upper()}] 值: {value_mm:.2f}mm, 偏移: {offset:.2f}mm, 大小: {size:.2f}mm")
-
-        # 对齐公式: nearest = offset + round((value - offset) / size) * size
-        relative = value_mm - offset
-        rounded = round(relative / size) * size + offset
-
-        logger.debug(f"[对齐-{axis.upper()}] 相对: {relative:.2f}mm, 四舍五入: {rounded:.2f}mm")
-
-        if abs(value_mm - rounded) <= threshold:
-            logger.debug(f"[对齐-{axis.upper()}] 结果: {value_mm:.2f}mm -> {rounded:.2f}mm")
-            return rounded
-
-        logger.debug(f"[对齐-{axis.upper()}] 未对齐（距离 > 阈值）")
-        return value_mm
-
     def _mm_to_px(self, mm):
         """转换毫米 -> 像素"""
         return mm * self.dpi / 25.4
@@ -586,6 +560,10 @@ class GraphicsCircleItem(QGraphicsEllipseItem):
             QGraphicsItem.ItemSendsGeometryChanges
         )
 
+        # 渲染缓存模式由画布缓存策略决定
+        if canvas is not None and hasattr(canvas, 'item_cache_policy'):
+            canvas.item_cache_policy.apply(self)
+
         logger.debug(f"[形状项-圆形] 已创建于: ({element.config.x:.2f}, {element.config.y:.2f})mm")
 
     def _update_style(self):
@@ -609,6 +587,10 @@ class GraphicsCircleItem(QGraphicsEllipseItem):
 
     def itemChange(self, change, value):
         """重写用于网格对齐 - 类似于矩形"""
+        # 批量加载模板/群组移动时跳过吸附和通知（位置已由调用方确定）
+        if getattr(self.canvas, 'item_changes_suppressed', False):
+            return super().itemChange(change, value)
+
         if change == QGraphicsItem.ItemPositionChange:
             new_pos = value
 
@@ -622,12 +604,11 @@ class GraphicsCircleItem(QGraphicsEllipseItem):
 
             # 拖拽时发送光标位置给标尺
             if self.canvas:
-                logger.debug(f"[项目拖拽] 发送光标: ({x_mm:.2f}, {y_mm:.2f})mm")
-                self.canvas.cursor_position_changed.emit(x_mm, y_mm)
+                self.canvas.report_cursor_position(x_mm, y_mm)
 
             if self.snap_enabled:
-                snapped_x = self._snap_to_grid(x_mm, 'x')
-                snapped_y = self._snap_to_grid(y_mm, 'y')
+                # 吸附（网格/对象，由 canvas 的吸附引擎决定）
+                snapped_x, snapped_y = get_snap_engine(self.canvas).snap_position(self, x_mm, y_mm)
 
                 snapped_pos = QPointF(
                     self._mm_to_px(snapped_x),
@@ -639,6 +620,9 @@ class GraphicsCircleItem(QGraphicsEllipseItem):
             return new_pos
 
         elif change == QGraphicsItem.ItemPositionHasChanged:
+            # 吸附候选值过期（拖拽源自身除外）
+            get_snap_engine(self.canvas).item_moved(self)
+
             x_mm = self._px_to_mm(self.pos().x())
             y_mm = self._px_to_mm(self.pos().y())
 
@@ -663,43 +647,6 @@ class GraphicsCircleItem(QGraphicsEllipseItem):
 
         return super().itemChange(change, value)
 
-    def _snap_to_grid(self, value_mm, axis='x'):
-        """使用 GridConfig（大小、偏移量）对齐到网格"""
-        from config import SnapMode
-
-        # 回退用于没有 canvas 的旧元素
-        if not self.canvas:
-            logger.debug(f"[对齐回退] 使用默认值: 大小=1.0mm, 偏移=0.0mm")
-            size = 1.0
-            offset = 0.0
-            threshold = 1.0
-        else:
-            config = self.canvas.grid_config
-
-            # 检查对齐模式
-            if config.snap_mode != SnapMode.GRID:
-                logger.debug(f"[对齐] 模式={config.snap_mode.value}, 跳过网格对齐")
-                return value_mm
-
-            size = config.size_x_mm if axis == 'x' else config.size_y_mm
-            offset = config.offset_x_mm if axis == 'x' else config.offset_y_mm
-            threshold = size / 2
-
-            logger.debug(f"[对齐-{axis.upper()}] 值: {value_mm:.2f}mm, 偏移: {offset:.2f}mm, 大小: {size:.2f}mm")
-
-        # 对齐公式: nearest = offset + round((value - offset) / size) * size
-        relative = value_mm - offset
-        rounded = round(relative / size) * size + offset
-
-        logger.debug(f"[对齐-{axis.upper()}] 相对: {relative:.2f}mm, 四舍五入: {rounded:.2f}mm")
-
-        if abs(value_mm - rounded) <= threshold:
-            logger.debug(f"[对齐-{axis.upper()}] 结果: {value_mm:.2f}mm -> {rounded:.2f}mm")
-            return rounded
-
-        logger.debug(f"[对齐-{axis.upper()}] 未对齐（距离 > 阈值）")
-        return value_mm
-
     def _mm_to_px(self, mm):
         """转换毫米 -> 像素"""
         return mm * self.dpi / 25.4
@@ -762,6 +709,10 @@ class GraphicsLineItem(QGraphicsLineItem):
             QGraphicsItem.ItemSendsGeometryChanges
         )
 
+        # 渲染缓存模式由画布缓存策略决定
+        if canvas is not None and hasattr(canvas, 'item_cache_policy'):
+            canvas.item_cache_policy.apply(self)
+
         logger.debug(
             f"[形状项-线条] 已创建: 从 ({element.config.x:.2f},{element.config.y:.2f}) 到 ({element.config.x2:.2f},{element.config.y2:.2f})mm")
 
@@ -780,6 +731,10 @@ class GraphicsLineItem(QGraphicsLineItem):
 
     def itemChange(self, change, value):
         """两个端点的网格对齐"""
+        # 批量加载模板/群组移动时跳过吸附和通知（位置已由调用方确定）
+        if getattr(self.canvas, 'item_changes_suppressed', False):
+            return super().itemChange(change, value)
+
         if change == QGraphicsItem.ItemPositionChange:
             new_pos = value
 
@@ -798,14 +753,22 @@ class GraphicsLineItem(QGraphicsLineItem):
 
             # 发送光标
             if self.canvas:
-                self.canvas.cursor_position_changed.emit(x1_mm, y1_mm)
+                self.canvas.report_cursor_position(x1_mm, y1_mm)
 
             if self.snap_enabled:
-                # 对齐两个端点！
-                snapped_x1 = self._snap_to_grid(x1_mm, 'x')
-                snapped_y1 = self._snap_to_grid(y1_mm, 'y')
-                snapped_x2 = self._snap_to_grid(x2_mm, 'x')
-                snapped_y2 = self._snap_to_grid(y2_mm, 'y')
+                engine = get_snap_engine(self.canvas)
+
+                if engine.mode == SnapMode.GRID:
+                    # 对齐两个端点！
+                    snapped_x1 = engine.snap_value(x1_mm, 'x')
+                    snapped_y1 = engine.snap_value(y1_mm, 'y')
+                    snapped_x2 = engine.snap_value(x2_mm, 'x')
+                    snapped_y2 = engine.snap_value(y2_mm, 'y')
+                else:
+                    # 对象吸附: 整条线平移，向量不变
+                    snapped_x1, snapped_y1 = engine.snap_position(self, x1_mm, y1_mm)
+                    snapped_x2 = x2_mm + (snapped_x1 - x1_mm)
+                    snapped_y2 = y2_mm + (snapped_y1 - y1_mm)
 
                 logger.debug(f"[线条对齐] 起点: ({x1_mm:.2f}, {y1_mm:.2f}) -> ({snapped_x1:.2f}, {snapped_y1:.2f})mm")
                 logger.debug(f"[线条对齐] 终点: ({x2_mm:.2f}, {y2_mm:.2f}) -> ({snapped_x2:.2f}, {snapped_y2:.2f})mm")
@@ -830,6 +793,9 @@ class GraphicsLineItem(QGraphicsLineItem):
             return new_pos
 
         elif change == QGraphicsItem.ItemPositionHasChanged:
+            # 吸附候选值过期（拖拽源自身除外）
+            get_snap_engine(self.canvas).item_moved(self)
+
             # 保存对齐后的坐标
             line_vector = self.line()
             x1_mm = self._px_to_mm(self.pos().x())
@@ -852,43 +818,6 @@ class GraphicsLineItem(QGraphicsLineItem):
 
         return super().itemChange(change, value)
 
-    def _snap_to_grid(self, value_mm, axis='x'):
-        """使用 GridConfig（大小、偏移量）对齐到网格"""
-        from config import SnapMode
-
-        # 回退用于没有 canvas 的旧元素
-        if not self.canvas:
-            logger.debug(f"[对齐回退] 使用默认值: 大小=1.0mm, 偏移=0.0mm")
-            size = 1.0
-            offset = 0.0
-            threshold = 1.0
-        else:
-            config = self.canvas.grid_config
-
-            # 检查对齐模式
-            if config.snap_mode != SnapMode.GRID:
-                logger.debug(f"[对齐] 模式={config.snap_mode.value}, 跳过网格对齐")
-                return value_mm
-
-            size = config.size_x_mm if axis == 'x' else config.size_y_mm
-            offset = config.offset_x_mm if axis == 'x' else config.offset_y_mm
-            threshold = size / 2
-
-            logger.debug(f"[对齐-{axis.upper()}] 值: {value_mm:.2f}mm, 偏移: {offset:.2f}mm, 大小: {size:.2f}mm")
-
-        # 对齐公式: nearest = offset + round((value - offset) / size) * size
-        relative = value_mm - offset
-        rounded = round(relative / size) * size + offset
-
-        logger.debug(f"[对齐-{axis.upper()}] 相对: {relative:.2f}mm, 四舍五入: {rounded:.2f}mm")
-
-        if abs(value_mm - rounded) <= threshold:
-            logger.debug(f"[对齐-{axis.upper()}] 结果: {value_mm:.2f}mm -> {rounded:.2f}mm")
-            return rounded
-
-        logger.debug(f"[对齐-{axis.upper()}] 未对齐（距离 > 阈值）")
-        return value_mm
-
     def _mm_to_px(self, mm):
         """转换毫米 -> 像素"""
         return mm * self.dpi / 25.4
@@ -6,7 +6,13 @@ from PySide6.QtCore import Qt, Signal, QPointF
 from PySide6.QtGui import QFont
 
 from utils.logger import logger
+from core.snap_engine import get_snap_engine
+from core.font_metrics import text_width, fit_font_size
+from core.text_raster import glyph_cache, DESIGN_DPI
+from core.printer_fonts import printer_font_name, is_font_collection
+from config import CONFIG
 from .base import BaseElement, ElementConfig
+from .serial import SerialField
 from enum import Enum
 
 
@@ -26,7 +32,7 @@ class ZplFont(Enum):
         self.zpl_code = zpl_code
         self.display_name = display_name
         self.scalable = scalable
-        self.base_width, self.base_height = base_size
+        self.base_height, self.base_width = base_size  # "9x5" = 高 x 宽
 
     @classmethod
     def from_zpl_code(cls, code):
@@ -37,6 +43,25 @@ class ZplFont(Enum):
         return cls.SCALABLE_0  # 默认
 
 
+class TextRenderMode(Enum):
+    """文本的打印方式"""
+    PRINTER_FONT = ("font", "打印机字体 (^A)")
+    GRAPHIC = ("graphic", "TrueType 图形 (^GFA)")
+    DOWNLOADED = ("downloaded", "下载到打印机的字体 (^A@)")
+
+    def __init__(self, code, display_name):
+        self.code = code
+        self.display_name = display_name
+
+    @classmethod
+    def from_code(cls, code):
+        """根据代码查找模式"""
+        for mode in cls:
+            if mode.code == code:
+                return mode
+        return cls.PRINTER_FONT  # 默认
+
+
 class TextElement(BaseElement):
     """文本元素"""
 
@@ -46,6 +71,10 @@ class TextElement(BaseElement):
         self.font_size = font_size
         self.font_family = font_family or ZplFont.SCALABLE_0  # 默认字体 0
         self.data_field = None  # 占位符 {{FIELD}}
+        self.serial = None  # SerialField: 打印机端递增的序列号 (^SN/^SF)
+        self.fit_width = None  # 自动缩小: 最大宽度 (mm)，None = 不缩小
+        self.render_mode = TextRenderMode.PRINTER_FONT
+        self.ttf_font = None  # 图形/下载字体模式的 TrueType 字体（None = CONFIG['TTF_FONT']）
         # 字体样式
         self.bold = False
         self.italic = False  # 没有字体上传时 ZPL 不支持斜体
@@ -62,7 +91,11 @@ class TextElement(BaseElement):
             'data_field': self.data_field,
             'bold': self.bold,
             'italic': self.italic,
-            'underline': self.underline
+            'underline': self.underline,
+            'serial': self.serial.to_dict() if self.serial else None,
+            'fit_width': self.fit_width,
+            'render_mode': self.render_mode.code,
+            'ttf_font': self.ttf_font
         }
 
     @classmethod
@@ -78,29 +111,124 @@ class TextElement(BaseElement):
         element.bold = data.get('bold', False)
         element.italic = data.get('italic', False)
         element.underline = data.get('underline', False)
+        element.serial = SerialField.from_dict(data.get('serial'))
+        element.fit_width = data.get('fit_width')
+        element.render_mode = TextRenderMode.from_code(data.get('render_mode'))
+        element.ttf_font = data.get('ttf_font')
         return element
 
-    def to_zpl(self, dpi):
-        """生成 ZPL 代码"""
+    @property
+    def width_ratio(self):
+        """字体宽度 / 高度（粗体：字体 0 宽度增加 50%；下载字体使用字体本身的粗体）"""
+        if self.downloaded_font:
+            return 1.0
+        return 1.5 if self.bold and self.font_family == ZplFont.SCALABLE_0 else 1.0
+
+    @property
+    def renders_graphic(self):
+        """以 ^GFA 图形打印（序列号由打印机递增，始终使用打印机字体）"""
+        return self.render_mode == TextRenderMode.GRAPHIC and not self.serial
+
+    @property
+    def graphic_font(self):
+        return self.ttf_font or CONFIG['TTF_FONT']
+
+    @property
+    def downloaded_font(self):
+        """
+        ^A@ 引用的打印机字体名，如 "E:ARIAL.TTF"
+
+        不是下载字体模式或字体是 TrueType 集合（.ttc，打印机不能使用）时为 None，
+        文本使用打印机字体。
+        """
+        if self.render_mode != TextRenderMode.DOWNLOADED or is_font_collection(self.graphic_font):
+            return None
+        return printer_font_name(self.graphic_font, CONFIG['PRINTER_FONT_DEVICE'])
+
+    def _ttf_measure_dpi(self, dpi):
+        """按 TrueType 字形测量宽度的分辨率（None = 使用 Zebra 字体宽度表）"""
+        if self.renders_graphic:
+            return dpi
+        if self.downloaded_font:
+            return DESIGN_DPI  # ^A@ 的高度是打印机点数，与设计分辨率的字形大小相同
+        return None
+
+    def display_content(self):
+        """字段内容: 序列号的第一个值、占位符或文本"""
+        if self.serial:
+            return self.serial.start_text
+        return self.data_field if self.data_field else self.text
+
+    def fitted_font_size(self, dpi, content=None):
+        """自动缩小后的字体大小（没有设置 fit_width 时为 font_size）"""
+        if not self.fit_width:
+            return self.font_size
+        content = self.display_content() if content is None else content
+        max_width = int(self.fit_width * dpi / 25.4)
+        measure_dpi = self._ttf_measure_dpi(dpi)
+        if measure_dpi is not None:
+            return self._fit_ttf_size(content, measure_dpi, max_width)
+        return fit_font_size(content, self.font_family, max_width, self.font_size,
+                             width_ratio=self.width_ratio)
+
+    def _fit_ttf_size(self, content, dpi, max_width):
+        """TrueType 字体的自动缩小（按缓存字形的前进量）"""
+        size = self.font_size
+        width = glyph_cache.text_width(content, self.graphic_font, size, dpi)
+        if width <= max_width:
+            return size
+        size = max(1, min(size - 1, int(size * max_width / width) + 1))
+        while size > 1 and glyph_cache.text_width(content, self.graphic_font, size, dpi) > max_width:
+            size -= 1
+        return size
+
+    def text_width_dots(self, dpi, content=None):
+        """打印宽度（点，按字体宽度表或字形缓存计算，包括自动缩小）"""
+        content = self.display_content() if content is None else content
+        font_height = self.fitted_font_size(dpi, content)
+        measure_dpi = self._ttf_measure_dpi(dpi)
+        if measure_dpi is not None:
+            return glyph_cache.text_width(content, self.graphic_font, font_height, measure_dpi)
+        return text_width(content, self.font_family, font_height, int(font_height * self.width_ratio))
+
+    def to_zpl(self, dpi, record_text=None):
+        """
+        生成 ZPL 代码
+
+        Args:
+            dpi: 打印机分辨率
+            record_text: 替换占位符后的字段值（批量打印时）；自动缩小、下划线
+                和图形模式按此文本计算
+        """
 
         # 转换毫米 → dots
         x_dots = int(self.config.x * dpi / 25.4)
         y_dots = int(self.config.y * dpi / 25.4)
 
-        # 使用占位符或文本
-        content = self.data_field if self.data_field else self.text
+        # 使用序列号、占位符或文本
+        content = self.display_content()
+        measured = content if record_text is None else record_text
+
+        if self.renders_graphic:
+            return self._graphic_zpl(measured, dpi, x_dots, y_dots)
 
-        # 字体高度和宽度
-        font_height = self.font_size
+        # 字体高度和宽度（自动缩小时按字体宽度表计算）
+        font_height = self.fitted_font_size(dpi, measured)
+        if font_height != self.font_size:
+            logger.debug(f"[ZPL-自动缩小] '{measured}': {self.font_size} -> {font_height} "
+                         f"(最大宽度 {self.fit_width}mm)")
 
         # 粗体：字体宽度增加 50%（仅适用于字体 0）
-        if self.bold and self.font_family == ZplFont.SCALABLE_0:
-            font_width = int(font_height * 1.5)
-        else:
-            font_width = font_height  # 等比例
+        font_width = int(font_height * self.width_ratio)
 
         # ZPL 字体命令: ^A{字体代码}N,{高度},{宽度}
         font_cmd = f"^A{self.font_family.zpl_code}N,{font_height},{font_width}"
+        if self.downloaded_font:
+            # 下载字体: ^A@{方向},{高度},{宽度},{设备}:{文件名}（字体由 ~DY 上传）
+            font_cmd = f"^A@N,{font_height},{font_width},{self.downloaded_font}"
+        elif self.render_mode == TextRenderMode.DOWNLOADED:
+            logger.error(f"[ZPL-字体] {self.graphic_font} 是 TrueType 集合 (.ttc)，不能下载到打印机，"
+                         f"使用打印机字体；请选择单个 .ttf 字体")
 
         logger.debug(
             f"[ZPL-字体] 字体={self.font_family.zpl_code} "
@@ -112,26 +240,42 @@ class TextElement(BaseElement):
         lines = []
         lines.append(f"^FO{x_dots},{y_dots}")
         lines.append(font_cmd)
-        lines.append(f"^FD{content}^FS")
+        if self.serial:
+            lines.append(f"{self.serial.field_zpl()}^FS")
+        else:
+            lines.append(f"^FD{content}^FS")
 
         # 下划线：在文本下方绘制线条
         if self.underline:
             # 线条位置: y + font_height + 2px 偏移
             underline_y = y_dots + font_height + 2
 
-            # 文本长度（点，近似值）
-            char_count = len(content)
-            avg_char_width = font_height * 0.6  # 大约高度的 60%
-            text_width = int(char_count * avg_char_width)
+            # 文本宽度（点，字体宽度表）
+            underline_width = max(1, self.text_width_dots(dpi, measured))
 
-            underline_cmd = f"^FO{x_dots},{underline_y}^GB{text_width},1,1^FS"
+            underline_cmd = f"^FO{x_dots},{underline_y}^GB{underline_width},1,1^FS"
             lines.append(underline_cmd)
-            logger.debug(f"[ZPL-下划线] y={underline_y}, 宽度={text_width}px")
+            logger.debug(f"[ZPL-下划线] y={underline_y}, 宽度={underline_width}px")
 
         logger.debug(f"[ZPL-字体样式] 粗体={self.bold}, 斜体={self.italic}, 下划线={self.underline}")
 
         return '\n'.join(lines)
 
+    def _graphic_zpl(self, content, dpi, x_dots, y_dots):
+        """TrueType 字体栅格化为 ^GFA（打印机不需要对应的字体）"""
+        font_size = self.fitted_font_size(dpi, content)
+        bitmap = glyph_cache.render(content, self.graphic_font, font_size, dpi)
+        if bitmap is None:
+            return ""
+
+        lines = [bitmap.to_zpl(x_dots, y_dots)]
+        if self.underline:
+            underline_y = y_dots + bitmap.height + 2
+            lines.append(f"^FO{x_dots},{underline_y}^GB{bitmap.width},1,1^FS")
+        logger.debug(f"[ZPL-文本图形] '{content}': 字体={self.graphic_font}, 大小={font_size}, "
+                     f"{bitmap.width}x{bitmap.height} 点")
+        return '\n'.join(lines)
+
 
 class GraphicsTextItem(QGraphicsTextItem):
     """带有拖放功能的图形文本元素"""
@@ -149,6 +293,10 @@ class GraphicsTextItem(QGraphicsTextItem):
         self.setFlag(QGraphicsTextItem.ItemIsSelectable)
         self.setFlag(QGraphicsTextItem.ItemSendsGeometryChanges)
 
+        # 渲染缓存模式由画布缓存策略决定
+        if canvas is not None and hasattr(canvas, 'item_cache_policy'):
+            canvas.item_cache_policy.apply(self)
+
         # 为 ZEBRA 字体设置正确的 Qt 字体
         font = self._get_qt_font_for_zebra_font(element.font_size)
         self.setFont(font)
@@ -174,6 +322,10 @@ class GraphicsTextItem(QGraphicsTextItem):
 
     def itemChange(self, change, value):
         """跟踪位置变化，带网格对齐功能"""
+        # 批量加载模板/群组移动时跳过吸附和通知（位置已由调用方确定）
+        if getattr(self.canvas, 'item_changes_suppressed', False):
+            return super().itemChange(change, value)
+
         # 网格对齐 - 移动时
         if change == QGraphicsItem.ItemPositionChange:
             new_pos = value
@@ -189,13 +341,11 @@ class GraphicsTextItem(QGraphicsTextItem):
 
             # 拖拽时发送光标位置给标尺
             if self.canvas:
-                logger.debug(f"[项目拖拽] 发送光标: ({x_mm:.2f}, {y_mm:.2f})mm")
-                self.canvas.cursor_position_changed.emit(x_mm, y_mm)
+                self.canvas.report_cursor_position(x_mm, y_mm)
 
             if self.snap_enabled:
-                # 对齐到网格（分别处理 X 和 Y）
-                snapped_x = self._snap_to_grid(x_mm, 'x')
-                snapped_y = self._snap_to_grid(y_mm, 'y')
+                # 吸附（网格/对象，由 canvas 的吸附引擎决定）
+                snapped_x, snapped_y = get_snap_engine(self.canvas).snap_position(self, x_mm, y_mm)
 
                 if snapped_x != x_mm or snapped_y != y_mm:
                     logger.debug(
@@ -214,6 +364,9 @@ class GraphicsTextItem(QGraphicsTextItem):
 
         # 更新元素 - 移动后
         if change == QGraphicsTextItem.ItemPositionHasChanged:
+            # 吸附候选值过期（拖拽源自身除外）
+            get_snap_engine(self.canvas).item_moved(self)
+
             # 考虑对齐更新元素
             x_mm = self._px_to_mm(self.pos().x())
             y_mm = self._px_to_mm(self.pos().y())
@@ -225,8 +378,7 @@ class GraphicsTextItem(QGraphicsTextItem):
 
             # 如果启用对齐，应用对齐
             if self.snap_enabled:
-                x_mm = self._snap_to_grid(x_mm)
-                y_mm = self._snap_to_grid(y_mm)
+                x_mm, y_mm = get_snap_engine(self.canvas).snap_position(self, x_mm, y_mm)
 
             self.element.config.x = x_mm
             self.element.config.y = y_mm
@@ -250,43 +402,6 @@ class GraphicsTextItem(QGraphicsTextItem):
 
         return super().itemChange(change, value)
 
-    def _snap_to_grid(self, value_mm, axis='x'):
-        """使用 GridConfig（大小、偏移量）对齐到网格"""
-        from config import SnapMode
-
-        # 回退用于没有 canvas 的旧元素
-        if not self.canvas:
-            logger.debug(f"[对齐回退] 使用默认值: 大小=1.0mm, 偏移=0.0mm")
-            size = 1.0
-            offset = 0.0
-            threshold = 1.0
-        else:
-            config = self.canvas.grid_config
-
-            # 检查对齐模式
-            if config.snap_mode != SnapMode.GRID:
-                logger.debug(f"[对齐] 模式={config.snap_mode.value}, 跳过网格对齐")
-                return value_mm
-
-            size = config.size_x_mm if axis == 'x' else config.size_y_mm
-            offset = config.offset_x_mm if axis == 'x' else config.offset_y_mm
-            threshold = size / 2
-
-            logger.debug(f"[对齐-{axis.upper()}] 值: {value_mm:.2f}mm, 偏移: {offset:.2f}mm, 大小: {size:.2f}mm")
-
-        # 对齐公式: nearest = offset + round((value - offset) / size) * size
-        relative = value_mm - offset
-        rounded = round(relative / size) * size + offset
-
-        logger.debug(f"[对齐-{axis.upper()}] 相对: {relative:.2f}mm, 四舍五入: {rounded:.2f}mm")
-
-        if abs(value_mm - rounded) <= threshold:
-            logger.debug(f"[对齐-{axis.upper()}] 结果: {value_mm:.2f}mm -> {rounded:.2f}mm")
-            return rounded
-
-        logger.debug(f"[对齐-{axis.upper()}] 未对齐（距离 > 阈值）")
-        return value_mm
-
     def update_text(self, text):
         """更新文本"""
         self.element.text = text
@@ -341,6 +456,8 @@ class GraphicsTextItem(QGraphicsTextItem):
         # 为 ZEBRA 字体使用正确的字体
         font = self._get_qt_font_for_zebra_font(font_size)
         self.setFont(font)
+        if self.element.fit_width:
+            self.update_display_text()
 
     def update_font_family(self):
         """更新字体族（从属性面板调用）"""
@@ -352,10 +469,15 @@ class GraphicsTextItem(QGraphicsTextItem):
 
     def update_display_text(self):
         """更新显示的文本（占位符或文本）"""
-        # 如果有占位符则显示占位符，否则显示文本
-        display = self.element.data_field if self.element.data_field else self.element.text
+        # 序列号显示第一个值；如果有占位符则显示占位符，否则显示文本
+        display = self.element.display_content()
         self.setPlainText(display)
 
+        # 自动缩小: 显示缩小后的字体大小
+        if self.element.fit_width:
+            font = self._get_qt_font_for_zebra_font(self.element.fitted_font_size(self.dpi, display))
+            self.setFont(font)
+
     def update_display(self):
         """更新视觉显示，考虑样式"""
 
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""Zebra 字体宽度计算 - 点阵字体 A-H 的字符宽度表、字体 0 的近似宽度表、自动缩小"""
+
+import math
+import unicodedata
+from functools import lru_cache
+
+# 点阵字体: 代码 → (基本高度, 基本宽度, 字符间距)，单位为点。
+# 点阵字体是等宽字体: 每个字符占 (宽度 + 间距) × 宽度倍数。
+BITMAP_FONTS = {
+    'A': (9, 5, 1),
+    'B': (11, 7, 2),
+    'C': (18, 10, 2),
+    'D': (18, 10, 2),
+    'E': (28, 15, 5),
+    'F': (26, 13, 3),
+    'G': (60, 40, 8),
+    'H': (34, 22, 6),
+}
+
+# 点阵字体放大倍数范围 (^A 的高度/宽度是基本尺寸的整数倍)
+MAX_MAGNIFICATION = 10
+
+# 字体 0 (CG Triumvirate Bold Condensed) 的近似字符宽度: 千分之一字体宽度。
+# 按 Helvetica Bold 的字宽乘以压缩系数；没有列出的字符使用 DEFAULT_FONT0_UNITS。
+_FONT0_GROUPS = (
+    ("'", 238), ("|", 280),
+    (" !,./:;I\\[]`fijlt", 278),
+    ("()-r", 333),
+    ("*{}", 389),
+    ('"', 474), ("z", 500),
+    ("#$0123456789_acekosvxy", 556),
+    ("+<=>^~", 584),
+    ("?FLTZbdghnpqu", 611),
+    ("EPSVXY", 667),
+    ("&ABCDHKNRU", 722),
+    ("GOQw", 778),
+    ("M", 833),
+    ("%m", 889),
+    ("W", 944), ("@", 975),
+)
+FONT0_WIDTHS = {char: units for chars, units in _FONT0_GROUPS for char in chars}
+
+# 西里尔字母（按相近拉丁字母的宽度）
+_FONT0_GROUPS_CYRILLIC = (
+    ("ЖШЩЮЫжшщюым", 889),
+    ("ГЁЕЗЛПСЭЯТ", 667),
+    ("АБВДИЙКНОРУФХЦЧЪЬ", 722),
+    ("гзлпэяткй", 556),
+)
+FONT0_WIDTHS.update({char: units for chars, units in _FONT0_GROUPS_CYRILLIC for char in chars})
+
+DEFAULT_FONT0_UNITS = 611  # 其他字母（平均宽度）
+WIDE_FONT0_UNITS = 1000  # 全角字符（中文、日文等）
+FONT0_CONDENSED = 0.85  # 压缩字体相对 Helvetica Bold 的宽度系数
+
+
+@lru_cache(maxsize=4096)
+def font0_char_units(char):
+    """字体 0 一个字符的宽度（千分之一字体宽度）"""
+    units = FONT0_WIDTHS.get(char)
+    if units is not None:
+        return units
+    if unicodedata.combining(char):
+        return 0
+    if unicodedata.east_asian_width(char) in ('W', 'F'):
+        return WIDE_FONT0_UNITS
+    if char.isupper():
+        return 722
+    if char.islower():
+        return 556
+    return DEFAULT_FONT0_UNITS
+
+
+def _font_code(font):
+    """ZplFont 或 ZPL 字体代码 → 代码"""
+    return getattr(font, 'zpl_code', font)
+
+
+def magnification(value, base):
+    """点阵字体的放大倍数（^A 尺寸 / 基本尺寸，四舍五入，1..10）"""
+    return max(1, min(MAX_MAGNIFICATION, int(value / base + 0.5)))
+
+
+def _unit_width(text, code):
+    """宽度单位数: 字体 0 为字体宽度的倍数，点阵字体为 1 倍大小的点数"""
+    if code in BITMAP_FONTS:
+        _, base_width, gap = BITMAP_FONTS[code]
+        count = len(text)
+        return count * (base_width + gap) - gap if count else 0
+    return sum(font0_char_units(char) for char in text) * FONT0_CONDENSED / 1000.0
+
+
+def _scale(code, height, width):
+    """单位宽度 → 点 的系数"""
+    if code in BITMAP_FONTS:
+        return magnification(width, BITMAP_FONTS[code][1])
+    return width
+
+
+def text_width(text, font, height, width=None):
+    """
+    ^A{字体}N,{高度},{宽度} 打印 text 的宽度（点）
+
+    不渲染字体，只查表: O(len(text))。点阵字体 A-H 是精确值，
+    字体 0 是近似值（误差通常在几个百分点以内）。
+
+    Args:
+        text: 字段文本
+        font: ZplFont 或字体代码 ('0', 'A'...'H')
+        height: 字体高度（点）
+        width: 字体宽度（点），默认等于高度
+    """
+    code = _font_code(font)
+    width = width or height
+    return int(math.ceil(_unit_width(text, code) * _scale(code, height, width) - 1e-9))
+
+
+def fit_font_size(text, font, max_width, font_size, min_size=1, width_ratio=1.0):
+    """
+    不超过 max_width 的最大字体大小（不大于 font_size）
+
+    Args:
+        text: 字段文本
+        font: ZplFont 或字体代码
+        max_width: 最大宽度（点）
+        font_size: 设计的字体大小（^A 高度）
+        min_size: 最小字体大小（文本仍然太宽时返回此值）
+        width_ratio: 字体宽度 / 高度（粗体字体 0 为 1.5）
+
+    Returns:
+        int，字体大小（^A 高度）
+    """
+    code = _font_code(font)
+    units = _unit_width(text, code)
+
+    def fits(size):
+        width = int(size * width_ratio)
+        return math.ceil(units * _scale(code, size, width) - 1e-9) <= max_width
+
+    if units <= 0 or fits(font_size):
+        return font_size
+
+    # 宽度与大小近似成正比: 从估计值开始向下查找
+    size = int(font_size * max_width / max(1, text_width(text, code, font_size, int(font_size * width_ratio)))) + 1
+    size = max(min_size, min(font_size, size))
+    while size > min_size and not fits(size):
+        size -= 1
+    return size
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""图片导入 - 解码、EXIF 方向、缩小到标签分辨率、编码（可在后台线程中运行）"""
+
+import base64
+import io
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from PIL import Image, ImageOps
+
+from utils.logger import logger
+
+
+# 导入步骤（进度条显示）
+IMPORT_STAGES = ('读取文件', '解码', 'EXIF 方向', '缩小', '编码')
+
+EXIF_ORIENTATION = 0x0112
+
+# 原样保存的格式（无需缩小和旋转时不重新编码）
+_KEEP_FORMATS = ('PNG', 'JPEG')
+
+
+@dataclass
+class ImportedImage:
+    """导入结果"""
+    image_data: str  # 保存到模板的 base64
+    size: Tuple[int, int]  # 保存的图片尺寸（像素）
+    source_size: Tuple[int, int]  # 原始尺寸（像素）
+    source_bytes: int  # 原始文件大小
+    stored_bytes: int  # 保存的图片大小（编码后，base64 之前）
+
+    @property
+    def downscaled(self):
+        return self.size != self.source_size
+
+
+class ImportProgress:
+    """导入进度（工作线程写入，GUI 线程读取）"""
+
+    def __init__(self):
+        self.stage = 0
+        self.text = IMPORT_STAGES[0]
+
+    def advance(self, stage):
+        self.stage = stage
+        self.text = IMPORT_STAGES[stage]
+
+
+def max_useful_size(width_mm, height_mm, dpi, oversample=1.0):
+    """
+    图片的最大有用尺寸（像素）: 标签尺寸按打印机分辨率换算
+
+    Args:
+        width_mm, height_mm: 标签尺寸
+        dpi: 打印机分辨率
+        oversample: 余量系数（画布缩放/之后放大元素）
+    """
+    scale = dpi / 25.4 * oversample
+    return max(1, int(round(width_mm * scale))), max(1, int(round(height_mm * scale)))
+
+
+def import_image(file_path, max_size, progress: Optional[ImportProgress] = None) -> ImportedImage:
+    """
+    导入图片文件
+
+    Args:
+        file_path: 图片文件路径
+        max_size: (宽, 高) 最大像素尺寸，超出时按比例缩小
+        progress: 进度对象（可选）
+
+    Returns:
+        ImportedImage
+    """
+    progress = progress or ImportProgress()
+
+    progress.advance(0)
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+
+    progress.advance(1)
+    img = Image.open(io.BytesIO(raw))
+    source_format = img.format
+    source_size = img.size
+    max_width, max_height = max_size
+    if source_format == 'JPEG':
+        # JPEG 在解码时直接按 1/2/4/8 缩小（方向未知，按较大边请求）
+        limit = max(max_width, max_height)
+        img.draft(img.mode, (limit, limit))
+    img.load()
+    logger.debug(f"[图片导入] {file_path}: {source_format} {source_size}, {len(raw)} 字节")
+
+    progress.advance(2)
+    rotated = img.getexif().get(EXIF_ORIENTATION, 1) != 1
+    if rotated:
+        img = ImageOps.exif_transpose(img)
+
+    progress.advance(3)
+    if img.width > max_width or img.height > max_height:
+        img.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+        logger.debug(f"[图片导入] 已缩小: {source_size} -> {img.size}")
+
+    progress.advance(4)
+    resized = img.size != source_size  # 包括 JPEG draft 缩小
+    if not resized and not rotated and source_format in _KEEP_FORMATS:
+        encoded = raw
+    else:
+        encoded = _encode(img, source_format)
+
+    logger.info(f"[图片导入] 完成: {source_size} -> {img.size}, {len(raw)} -> {len(encoded)} 字节")
+
+    return ImportedImage(
+        image_data=base64.b64encode(encoded).decode('ascii'),
+        size=img.size,
+        source_size=source_size,
+        source_bytes=len(raw),
+        stored_bytes=len(encoded),
+    )
+
+
+def _encode(img, source_format):
+    """编码缩小后的图片: 照片保持 JPEG，其他（透明、线稿、BMP）用 PNG"""
+    buffer = io.BytesIO()
+    if source_format == 'JPEG' and img.mode in ('RGB', 'L', 'CMYK'):
+        if img.mode == 'CMYK':
+            img = img.convert('RGB')
+        img.save(buffer, format='JPEG', quality=92)
+    else:
+        if img.mode not in ('1', 'L', 'LA', 'RGB', 'RGBA', 'P'):
+            img = img.convert('RGBA')
+        img.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+class ImageImporter:
+    """在后台线程中导入图片"""
+
+    def __init__(self):
+        self._executor = None
+
+    def submit(self, file_path, max_size) -> Tuple[Future, ImportProgress]:
+        """
+        提交导入任务
+
+        Returns:
+            (Future[ImportedImage], ImportProgress)
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-import')
+        progress = ImportProgress()
+        return self._executor.submit(import_image, file_path, max_size, progress), progress
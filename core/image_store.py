@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""共享图片数据存储 - 按内容哈希的不可变图片负载（写时复制）"""
+
+import base64
+import hashlib
+import threading
+import weakref
+
+from utils.logger import logger
+
+
+class ImagePayload:
+    """
+    不可变的图片数据（base64）
+
+    复制/深拷贝返回同一对象: 克隆的元素共享数据，
+    直到其中一个被赋予新图片（新负载），其他克隆不受影响。
+    """
+
+    __slots__ = ('key', 'data', '__weakref__')
+
+    def __init__(self, key, data):
+        object.__setattr__(self, 'key', key)
+        object.__setattr__(self, 'data', data)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ImagePayload 不可修改")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return f"ImagePayload({self.key[:12]}, {len(self.data)} 字符)"
+
+    def decode(self):
+        """原始图片字节"""
+        return base64.b64decode(self.data)
+
+
+class ImageStore:
+    """
+    图片负载存储
+
+    相同内容只保存一份（按 SHA1）；没有元素引用的负载自动释放（弱引用）。
+    """
+
+    def __init__(self):
+        self._payloads = weakref.WeakValueDictionary()  # 哈希 -> ImagePayload
+        self._lock = threading.Lock()  # 后台线程加载模板时也会调用
+
+    def intern(self, data):
+        """
+        获取图片数据的共享负载
+
+        Args:
+            data: base64 字符串/字节、ImagePayload 或 None
+
+        Returns:
+            ImagePayload 或 None
+        """
+        if data is None or isinstance(data, ImagePayload):
+            return data
+        if isinstance(data, bytes):
+            data = data.decode('ascii')
+
+        key = hashlib.sha1(data.encode('ascii')).hexdigest()
+        with self._lock:
+            payload = self._payloads.get(key)
+            if payload is None:
+                payload = ImagePayload(key, data)
+                self._payloads[key] = payload
+                logger.debug(f"[图片存储] 新负载: {key[:12]} ({len(data)} 字符)")
+        return payload
+
+    def get(self, key):
+        """按内容哈希获取负载（已释放时返回 None）"""
+        return self._payloads.get(key)
+
+    def __len__(self):
+        return len(self._payloads)
+
+    def total_size(self):
+        """所有负载的 base64 字符总数"""
+        return sum(len(payload) for payload in list(self._payloads.values()))
+
+
+# 全局实例
+image_store = ImageStore()
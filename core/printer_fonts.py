@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""打印机下载字体 - ~DY 上传 TrueType 字体、^A@ 引用、每台打印机已安装字体记录
+
+字体只有在打印机确实收到作业后（发送方调用 FontInventory.confirm）才记录为已安装；
+生成 ZPL（预览、导出、发送失败）不改变记录。
+"""
+
+import os
+import re
+import json
+import glob
+import hashlib
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from utils.logger import logger
+
+# 打印机存储设备: E = 闪存（断电保留），R = 内存（断电丢失）
+FONT_DEVICES = ('E', 'R')
+
+# 打印机文件名: 最多 16 个字符（不含扩展名）
+_MAX_NAME_LENGTH = 16
+_INVALID_NAME_CHARS = re.compile(r'[^A-Z0-9_]')
+
+# TrueType 集合（.ttc/.otc）: 打印机不能作为 TrueType 字体使用
+_COLLECTION_EXTENSIONS = ('.ttc', '.otc')
+_COLLECTION_TAG = b'ttcf'
+
+# 没有路径的字体文件名在这些目录中查找
+_FONT_DIRS = (
+    os.path.join(os.environ.get('WINDIR', r'C:\Windows'), 'Fonts'),
+    os.path.expanduser('~/.fonts'),
+    os.path.expanduser('~/.local/share/fonts'),
+    '/usr/share/fonts',
+    '/Library/Fonts',
+)
+
+
+def resolve_font_file(font) -> Optional[str]:
+    """字体文件路径或系统字体文件名 → 文件路径（找不到时返回 None）"""
+    if not font:
+        return None
+    if os.path.isfile(font):
+        return font
+    return _find_system_font(os.path.basename(font))
+
+
+@lru_cache(maxsize=64)
+def _find_system_font(name):
+    for directory in _FONT_DIRS:
+        candidate = os.path.join(directory, name)
+        if os.path.isfile(candidate):
+            return candidate
+        matches = glob.glob(os.path.join(directory, '**', name), recursive=True)
+        if matches:
+            return matches[0]
+    return None
+
+
+@lru_cache(maxsize=64)
+def is_font_collection(font) -> bool:
+    """字体是 TrueType 集合（.ttc，按扩展名或文件头判断）"""
+    if not font:
+        return False
+    if os.path.splitext(font)[1].lower() in _COLLECTION_EXTENSIONS:
+        return True
+    path = resolve_font_file(font)
+    if path is None:
+        return False
+    try:
+        with open(path, 'rb') as f:
+            return f.read(4) == _COLLECTION_TAG
+    except OSError:
+        return False
+
+
+def printer_font_name(font, device='E') -> str:
+    """
+    打印机上的字体文件名，如 "E:MSYH.TTF"
+
+    由字体文件名得到: 大写，只保留字母、数字和下划线，最多 16 个字符。
+    """
+    if device not in FONT_DEVICES:
+        raise ValueError(f"无效的字体存储设备: {device}")
+    stem = os.path.splitext(os.path.basename(font))[0].upper()
+    stem = _INVALID_NAME_CHARS.sub('_', stem)[:_MAX_NAME_LENGTH] or 'FONT'
+    return f"{device}:{stem}.TTF"
+
+
+@lru_cache(maxsize=16)
+def _read_font(path, mtime, size):
+    """字体文件内容和 SHA1（按路径、修改时间、大小缓存）"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return data, hashlib.sha1(data).hexdigest()
+
+
+def load_font_file(font):
+    """
+    读取字体文件
+
+    Returns:
+        (bytes, sha1)；找不到文件时返回 None
+    """
+    path = resolve_font_file(font)
+    if path is None:
+        return None
+    stat = os.stat(path)
+    return _read_font(path, stat.st_mtime, stat.st_size)
+
+
+def download_font_zpl(font_data: bytes, name: str) -> str:
+    """
+    ~DY{设备}:{名称},A,T,{字节数},,{十六进制数据} - 上传 TrueType 字体
+
+    Raises:
+        ValueError: 字体数据是 TrueType 集合（.ttc）
+    """
+    if font_data[:4] == _COLLECTION_TAG:
+        raise ValueError(f"{name}: TrueType 集合 (.ttc) 不能下载到打印机，请使用单个 .ttf 字体")
+    stem = os.path.splitext(name)[0]
+    return f"~DY{stem},A,T,{len(font_data)},,{font_data.hex().upper()}"
+
+
+class FontInventory:
+    """
+    每台打印机已安装的下载字体
+
+    记录 {打印机标识: {打印机字体名: 字体 SHA1}}。字体文件改变（SHA1 不同）时
+    重新上传。设置 path 时从 JSON 文件加载并在每次更改后保存。
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._fonts: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._fonts = {printer: dict(fonts) for printer, fonts in json.load(f).items()}
+            except (OSError, ValueError) as e:
+                logger.error(f"[打印机字体] 无法读取字体记录 {path}: {e}")
+
+    def is_installed(self, printer_id, name, digest) -> bool:
+        with self._lock:
+            return self._fonts.get(printer_id, {}).get(name) == digest
+
+    def installed(self, printer_id) -> Dict[str, str]:
+        """打印机上已安装的字体 {名称: SHA1}"""
+        with self._lock:
+            return dict(self._fonts.get(printer_id, {}))
+
+    def mark_installed(self, printer_id, name, digest):
+        with self._lock:
+            self._fonts.setdefault(printer_id, {})[name] = digest
+        self._save()
+
+    def confirm(self, uploads: Iterable['FontUpload']):
+        """打印机已收到包含这些上传的作业: 记录为已安装"""
+        uploads = list(uploads)
+        if not uploads:
+            return
+        with self._lock:
+            for upload in uploads:
+                self._fonts.setdefault(upload.printer_id, {})[upload.name] = upload.digest
+        self._save()
+        logger.info(f"[打印机字体] 已确认安装: {', '.join(upload.name for upload in uploads)}")
+
+    def forget(self, printer_id, device=None):
+        """
+        清除打印机的字体记录（打印机被重置或内存字体断电丢失时）
+
+        Args:
+            printer_id: 打印机标识
+            device: 只清除此设备上的字体（如 'R'）；None = 全部
+        """
+        with self._lock:
+            fonts = self._fonts.get(printer_id, {})
+            for name in [n for n in fonts if device is None or n.startswith(f"{device}:")]:
+                del fonts[name]
+        self._save()
+        logger.info(f"[打印机字体] 已清除 {printer_id} 的字体记录 (设备: {device or '全部'})")
+
+    def to_dict(self):
+        with self._lock:
+            return {printer: dict(fonts) for printer, fonts in self._fonts.items()}
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.error(f"[打印机字体] 无法保存字体记录 {self.path}: {e}")
+
+
+@dataclass(frozen=True)
+class FontUpload:
+    """作业中的一个 ~DY 字体上传（发送成功后用 FontInventory.confirm 记录）"""
+    printer_id: Optional[str]
+    name: str  # 打印机字体名，如 "E:ARIAL.TTF"
+    digest: str  # 字体文件 SHA1
+    command: str  # ~DY 命令
+
+
+def font_downloads(fonts: Iterable[tuple], inventory: Optional[FontInventory] = None,
+                   printer_id=None) -> List[FontUpload]:
+    """
+    ~DY 上传（每个打印机字体名一次）
+
+    没有 inventory 时上传所有字体（导出的文件可以在任何打印机上打印）；
+    有 inventory 时只上传打印机上没有的字体。不修改 inventory: 打印机收到作业后
+    由发送方调用 inventory.confirm(uploads)。
+
+    Args:
+        fonts: (字体文件, 打印机字体名) 序列
+        inventory: 已安装字体记录
+        printer_id: 打印机标识
+
+    Returns:
+        FontUpload 列表
+    """
+    uploads = []
+    seen = set()
+    for font, name in fonts:
+        if name in seen:
+            continue
+        seen.add(name)
+        loaded = load_font_file(font)
+        if loaded is None:
+            logger.error(f"[打印机字体] 找不到字体文件 {font!r}，打印机将使用默认字体")
+            continue
+        data, digest = loaded
+        if inventory is not None and inventory.is_installed(printer_id, name, digest):
+            logger.debug(f"[打印机字体] {printer_id}: {name} 已安装")
+            continue
+        try:
+            command = download_font_zpl(data, name)
+        except ValueError as e:
+            logger.error(f"[打印机字体] {e}")
+            continue
+        uploads.append(FontUpload(printer_id, name, digest, command))
+        logger.info(f"[打印机字体] {printer_id or '导出'}: 上传 {name} ({len(data)} 字节)")
+    return uploads
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""打印机配置 - 分辨率、最大打印宽度、打印浓度"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class PrinterProfile:
+    """打印机配置（dots_per_mm 在创建时计算一次）"""
+    key: str  # 唯一标识（保存到设置）
+    name: str  # 显示名称
+    dpi: int  # 分辨率（点/英寸）
+    max_print_width_mm: float = 104.0  # 最大打印宽度
+    darkness: Optional[int] = None  # 打印浓度 ~SD (0-30)；None = 不发送（~SD 会保存到打印机，不覆盖调好的设置）
+    dots_per_mm: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'dots_per_mm', self.dpi / 25.4)
+
+    @property
+    def dpmm(self):
+        """Zebra 标称 dpmm（203 → 8, 300 → 12, 600 → 24）"""
+        return round(self.dots_per_mm)
+
+    @property
+    def max_print_width_dots(self):
+        return self.mm_to_dots(self.max_print_width_mm)
+
+    def mm_to_dots(self, mm):
+        """毫米 → 点（与元素的 to_zpl 相同的公式和取整，结果逐点一致）"""
+        return int(mm * self.dpi / 25.4)
+
+    def dots_to_mm(self, dots):
+        return dots / self.dots_per_mm
+
+
+PRINTER_PROFILES: Dict[str, PrinterProfile] = {
+    profile.key: profile for profile in (
+        PrinterProfile('zebra_203', "Zebra 203 dpi (8 dpmm)", 203),
+        PrinterProfile('zebra_300', "Zebra 300 dpi (12 dpmm)", 300),
+        PrinterProfile('zebra_600', "Zebra 600 dpi (24 dpmm)", 600),
+    )
+}
+
+DEFAULT_PRINTER_PROFILE = 'zebra_203'
+
+
+def get_printer_profile(key=None):
+    """按标识获取配置（未知标识返回默认配置）"""
+    return PRINTER_PROFILES.get(key) or PRINTER_PROFILES[DEFAULT_PRINTER_PROFILE]
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""画布吸附引擎 - 网格吸附 + 对象边缘/中心吸附（所有图形项共用）"""
+
+import numpy as np
+
+from config import GridConfig, SnapMode
+from utils.logger import logger
+
+
+class SnapEngine:
+    """
+    计算元素的吸附位置
+
+    GRID 模式: 最近的网格点（网格是无限的，按公式计算）
+    OBJECTS 模式: 最近的对象边缘/中心（其他元素 + 标签边框），阈值内没有对象时
+    每个轴吸附到最近的网格线；对象候选值在拖拽开始时预先计算为排序数组，
+    每次移动只做一次 searchsorted 查询
+    NONE 模式: 不吸附
+    """
+
+    OBJECT_SNAP_THRESHOLD_MM = 2.0  # 与智能参考线阈值相同
+
+    def __init__(self, canvas=None):
+        self.canvas = canvas
+        self._default_config = GridConfig()
+
+        # 对象候选值（毫米，已排序）
+        self._x_candidates = np.empty(0)
+        self._y_candidates = np.empty(0)
+        self._source_ids = frozenset()  # 构建候选值时排除的元素（拖拽源/移动的群组）
+        self._candidates_valid = False
+
+    @property
+    def grid_config(self):
+        """当前网格配置（没有 canvas 时使用默认值）"""
+        if self.canvas is not None:
+            return self.canvas.grid_config
+        return self._default_config
+
+    @property
+    def mode(self):
+        return self.grid_config.snap_mode
+
+    # ========== 网格 ==========
+
+    def snap_value(self, value_mm, axis='x'):
+        """将单个坐标吸附到网格（非 GRID 模式时原样返回）"""
+        if self.grid_config.snap_mode != SnapMode.GRID:
+            return value_mm
+        return self._grid_value(value_mm, axis)
+
+    def _grid_value(self, value_mm, axis):
+        """最近的网格线（不检查模式）"""
+        config = self.grid_config
+        size = config.size_x_mm if axis == 'x' else config.size_y_mm
+        offset = config.offset_x_mm if axis == 'x' else config.offset_y_mm
+
+        # 对齐公式: nearest = offset + round((value - offset) / size) * size
+        return round((value_mm - offset) / size) * size + offset
+
+    # ========== 对象 ==========
+
+    def invalidate(self):
+        """标记对象候选值过期（元素被添加/删除/移动时）"""
+        self._candidates_valid = False
+
+    def item_moved(self, item):
+        """元素位置已改变: 非拖拽源的元素移动时候选值过期"""
+        if id(item) not in self._source_ids:
+            self._candidates_valid = False
+
+    def _scene_items(self):
+        if self.canvas is None:
+            return []
+        return [item for item in self.canvas.scene.items() if hasattr(item, 'element')]
+
+    def _rebuild_candidates(self, source_items):
+        """构建除 source_items 外所有对象的边缘/中心候选数组"""
+        source_ids = frozenset(id(item) for item in source_items)
+        xs = []
+        ys = []
+
+        # 标签边框和中心
+        if self.canvas is not None:
+            width_mm = self.canvas.width_mm
+            height_mm = self.canvas.height_mm
+            xs.extend((0.0, width_mm / 2, width_mm))
+            ys.extend((0.0, height_mm / 2, height_mm))
+
+        for item in self._scene_items():
+            if id(item) in source_ids:
+                continue
+            rect = item.sceneBoundingRect()
+            scale = 25.4 / item.dpi
+            xs.extend((rect.left() * scale, rect.center().x() * scale, rect.right() * scale))
+            ys.extend((rect.top() * scale, rect.center().y() * scale, rect.bottom() * scale))
+
+        self._x_candidates = np.sort(np.asarray(xs, dtype=float))
+        self._y_candidates = np.sort(np.asarray(ys, dtype=float))
+        self._source_ids = source_ids
+        self._candidates_valid = True
+
+        logger.debug(f"[吸附引擎] 对象候选值已构建: {len(self._x_candidates)} 个")
+
+    @staticmethod
+    def _nearest_shift(candidates, anchors, threshold):
+        """
+        对所有锚点（起始/中心/结束）一次性查找最近候选值
+
+        Returns:
+            需要的位移（毫米），没有候选值在阈值内时返回 None
+        """
+        if candidates.size == 0:
+            return None
+
+        idx = np.searchsorted(candidates, anchors)
+        lower = candidates[np.clip(idx - 1, 0, candidates.size - 1)]
+        upper = candidates[np.clip(idx, 0, candidates.size - 1)]
+
+        nearest = np.where(np.abs(anchors - lower) <= np.abs(upper - anchors), lower, upper)
+        shifts = nearest - anchors
+
+        best = np.argmin(np.abs(shifts))
+        if abs(shifts[best]) > threshold:
+            return None
+        return float(shifts[best])
+
+    def _snap_to_objects(self, item, x_mm, y_mm, group):
+        """对象边缘/中心优先，阈值内没有对象的轴吸附到网格"""
+        # 尚未添加到场景的元素（创建/加载模板时）不吸附到对象
+        if item.scene() is None:
+            return self._grid_value(x_mm, 'x'), self._grid_value(y_mm, 'y')
+
+        source_ids = frozenset(id(member) for member in group)
+        if not self._candidates_valid or self._source_ids != source_ids:
+            self._rebuild_candidates(group)
+
+        # 元素自身边缘相对于位置的偏移（起始/中心/结束）
+        rect = item.boundingRect()
+        scale = 25.4 / item.dpi
+        x_offsets = np.array((rect.left(), rect.center().x(), rect.right())) * scale
+        y_offsets = np.array((rect.top(), rect.center().y(), rect.bottom())) * scale
+
+        threshold = self.OBJECT_SNAP_THRESHOLD_MM
+        shift_x = self._nearest_shift(self._x_candidates, x_mm + x_offsets, threshold)
+        shift_y = self._nearest_shift(self._y_candidates, y_mm + y_offsets, threshold)
+        snapped_x = x_mm + shift_x if shift_x is not None else self._grid_value(x_mm, 'x')
+        snapped_y = y_mm + shift_y if shift_y is not None else self._grid_value(y_mm, 'y')
+        return snapped_x, snapped_y
+
+    # ========== 统一入口 ==========
+
+    def snap_position(self, item, x_mm, y_mm, group=None):
+        """
+        计算元素位置的吸附结果
+
+        Args:
+            item: 正在移动的图形项（群组移动时为锚点）
+            x_mm, y_mm: 建议位置（毫米）
+            group: 一起移动的图形项（不作为对象吸附候选值），默认只有 item
+
+        Returns:
+            (x_mm, y_mm) 吸附后的位置
+        """
+        mode = self.mode
+
+        if mode == SnapMode.GRID:
+            return self.snap_value(x_mm, 'x'), self.snap_value(y_mm, 'y')
+
+        if mode == SnapMode.OBJECTS:
+            return self._snap_to_objects(item, x_mm, y_mm, group or (item,))
+
+        return x_mm, y_mm
+
+
+# 没有 canvas 的元素使用的引擎（默认网格 1mm）
+_DEFAULT_ENGINE = SnapEngine()
+
+
+def get_snap_engine(canvas):
+    """获取 canvas 的吸附引擎"""
+    engine = getattr(canvas, 'snap_engine', None)
+    if isinstance(engine, SnapEngine):
+        return engine
+    return _DEFAULT_ENGINE
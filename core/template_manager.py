@@ -3,12 +3,13 @@
 
 import json
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 from .elements.base import BaseElement
-from .elements.text_element import TextElement
+from .elements.registry import element_from_dict
 from utils.unit_converter import MeasurementUnit
 
 
@@ -25,6 +26,9 @@ class TemplateManager:
         self.templates_dir = Path(templates_dir)
         self.templates_dir.mkdir(parents=True, exist_ok=True)
 
+        # 后台加载线程（首次使用时创建）
+        self._executor = None
+
     def save_template(self,
                       name: str,
                       elements: List[BaseElement],
@@ -101,6 +105,10 @@ class TemplateManager:
 
         label_config = template_data.get('label_config', {})
 
+        # 1C 格式: 只有 "zpl" 字符串和 "variables" → 从 ZPL 重建元素
+        if not elements and template_data.get('zpl'):
+            elements, label_config = self._import_zpl(template_data['zpl'], label_config)
+
         # 加载 display_unit (默认: MM)
         unit_str = label_config.get('display_unit', 'mm')
         try:
@@ -120,9 +128,23 @@ class TemplateManager:
             "label_config": label_config,
             "display_unit": display_unit,  # ← 返回 enum
             "elements": elements,
-            "metadata": template_data.get('metadata', {})
+            "metadata": template_data.get('metadata', {}),
+            "variables": template_data.get('variables', {})
         }
 
+    def load_template_async(self, filepath: str) -> Future:
+        """
+        在后台线程中加载模板（JSON 解析 + 元素对象构建）
+
+        图形项必须在 GUI 线程中创建，这里只构建元素模型。
+
+        Returns:
+            Future，结果与 load_template() 相同
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='template-loader')
+        return self._executor.submit(self.load_template, filepath)
+
     def list_templates(self) -> List[Dict[str, str]]:
         """
         获取所有模板列表
@@ -165,6 +187,25 @@ class TemplateManager:
             print(f"[ERROR] 删除模板失败 {filepath}: {e}")
             return False
 
+    def _import_zpl(self, zpl: str, label_config: Dict[str, Any]):
+        """
+        ZPL → 元素和标签配置（^PW/^LL 给出标签尺寸）
+
+        Returns:
+            (元素列表, label_config)
+        """
+        from zpl.importer import import_zpl
+
+        label = import_zpl(zpl, dpi=label_config.get('dpi', 203))
+        label_config = dict(label_config)
+        if label.width_mm:
+            label_config.setdefault('width_mm', label.width_mm)
+        if label.height_mm:
+            label_config.setdefault('height_mm', label.height_mm)
+
+        print(f"[INFO] 从 ZPL 导入: {len(label.elements)} 个元素, 未支持的命令: {label.skipped}")
+        return label.elements, label_config
+
     def _element_from_dict(self, data: Dict[str, Any]) -> Optional[BaseElement]:
         """
         转换 dict → BaseElement
@@ -175,45 +216,7 @@ class TemplateManager:
         Returns:
             元素对象或 None
         """
-        elem_type = data.get('type')
-
-        if elem_type == 'text':
-            return TextElement.from_dict(data)
-
-        elif elem_type == 'barcode':
-            from .elements.barcode_element import (
-                EAN13BarcodeElement,
-                Code128BarcodeElement,
-                QRCodeElement
-            )
-
-            barcode_type = data.get('barcode_type')
-
-            if barcode_type == 'EAN13':
-                return EAN13BarcodeElement.from_dict(data)
-            elif barcode_type == 'CODE128':
-                return Code128BarcodeElement.from_dict(data)
-            elif barcode_type == 'QRCODE':
-                return QRCodeElement.from_dict(data)
-
-        elif elem_type == 'rectangle':
-            from .elements.shape_element import RectangleElement
-            return RectangleElement.from_dict(data)
-
-        elif elem_type == 'circle':
-            from .elements.shape_element import CircleElement
-            return CircleElement.from_dict(data)
-
-        elif elem_type == 'line':
-            from .elements.shape_element import LineElement
-            return LineElement.from_dict(data)
-
-        elif elem_type == 'image':
-            from .elements.image_element import ImageElement
-            return ImageElement.from_dict(data)
-
-        print(f"[WARNING] 未知元素类型: {elem_type}")
-        return None
+        return element_from_dict(data)
 
     def _sanitize_filename(self, name: str) -> str:
         """
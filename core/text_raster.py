@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""TrueType 文本 → ^GFA 位图 - 字形位图缓存（按字体、大小、字符、分辨率）"""
+
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from utils.logger import logger
+from core.dithering import pack_bits
+from zpl.graphic_field import encode_graphic_field
+
+# font_size 是设计分辨率下的点数；其他分辨率按比例缩放（打印尺寸不变）
+DESIGN_DPI = 203
+
+# 灰度 → 黑色的阈值（抗锯齿边缘）
+_BLACK_THRESHOLD = 128
+
+
+@dataclass(frozen=True)
+class Glyph:
+    """一个字符的位图（高度 = 字体行高，基线对齐）"""
+    offset_x: int  # 位图左边相对笔位置的偏移（点）
+    bitmap: np.ndarray  # bool (行高, 宽)，True = 黑色
+    advance: float  # 笔位置前进量（点）
+
+
+@dataclass(frozen=True)
+class TextBitmap:
+    """一个字符串的 1 位位图和 ^GFA 数据"""
+    width: int  # 点
+    height: int  # 点
+    bytes_per_row: int
+    packed: bytes  # 打包的位图（每行 bytes_per_row 字节）
+    field_data: str  # ASCII 压缩的 ^GFA 数据
+
+    @property
+    def total_bytes(self):
+        return len(self.packed)
+
+    def to_zpl(self, x_dots, y_dots):
+        """^FO + ^GFA + ^FS"""
+        return "\n".join([
+            f"^FO{x_dots},{y_dots}",
+            f"^GFA,{self.total_bytes},{self.total_bytes},{self.bytes_per_row},{self.field_data}",
+            "^FS",
+        ])
+
+
+def pixel_size(size, dpi):
+    """字体大小（设计分辨率的点） → 目标分辨率的像素大小"""
+    return max(1, int(round(size * dpi / DESIGN_DPI)))
+
+
+@lru_cache(maxsize=64)
+def load_font(font, size_px):
+    """
+    加载 TrueType 字体（文件路径或系统字体文件名，如 "arial.ttf"）
+
+    找不到字体时使用 Pillow 内置字体并记录警告。
+    """
+    if font:
+        try:
+            return ImageFont.truetype(font, size_px)
+        except OSError as e:
+            logger.warning(f"[文本图形] 无法加载字体 {font!r}: {e}，使用内置字体")
+    return ImageFont.load_default(size_px)
+
+
+class GlyphCache:
+    """
+    字形位图缓存
+
+    每个 (字体, 大小, 字符, 分辨率) 只栅格化一次；字符串由缓存的字形拼接，
+    拼接结果（包括压缩的 ^GFA 数据）按字符串再缓存一次。两级缓存都有
+    容量上限（最近最少使用的条目先丢弃）。可以从后台线程调用。
+    """
+
+    def __init__(self, max_glyphs=8192, max_strings=1024):
+        self.max_glyphs = max_glyphs
+        self.max_strings = max_strings
+        self._glyphs = OrderedDict()
+        self._strings = OrderedDict()
+        self._lock = threading.Lock()
+        self.rasterized = 0  # 已栅格化的字形数（统计）
+
+    def glyph(self, font, size, char, dpi):
+        """一个字符的字形（缓存）"""
+        key = (font, size, char, dpi)
+        with self._lock:
+            glyph = self._glyphs.get(key)
+            if glyph is not None:
+                self._glyphs.move_to_end(key)
+                return glyph
+
+        glyph = self._rasterize(load_font(font, pixel_size(size, dpi)), char)
+        with self._lock:
+            self._glyphs[key] = glyph
+            self.rasterized += 1
+            while len(self._glyphs) > self.max_glyphs:
+                self._glyphs.popitem(last=False)
+        return glyph
+
+    def text_width(self, text, font, size, dpi):
+        """字符串宽度（点，按字形前进量，不渲染整个字符串）"""
+        return int(math.ceil(sum(self.glyph(font, size, char, dpi).advance for char in text)))
+
+    def render(self, text, font, size, dpi):
+        """
+        字符串 → TextBitmap（缓存）
+
+        Args:
+            text: 字符串
+            font: TrueType 字体文件或名称
+            size: 字体大小（设计分辨率的点）
+            dpi: 打印机分辨率
+
+        Returns:
+            TextBitmap；空字符串时返回 None
+        """
+        if not text:
+            return None
+        key = (font, size, text, dpi)
+        with self._lock:
+            bitmap = self._strings.get(key)
+            if bitmap is not None:
+                self._strings.move_to_end(key)
+                return bitmap
+
+        bitmap = self._compose([self.glyph(font, size, char, dpi) for char in text])
+        with self._lock:
+            self._strings[key] = bitmap
+            while len(self._strings) > self.max_strings:
+                self._strings.popitem(last=False)
+        logger.debug(f"[文本图形] '{text}': {bitmap.width}x{bitmap.height} 点, "
+                     f"^GFA {len(bitmap.field_data)} 字符")
+        return bitmap
+
+    def clear(self):
+        with self._lock:
+            self._glyphs.clear()
+            self._strings.clear()
+
+    @staticmethod
+    def _rasterize(font, char):
+        ascent, descent = font.getmetrics()
+        height = max(1, ascent + descent)
+        left, _, right, _ = font.getbbox(char)
+        offset_x = min(0, int(math.floor(left)))
+        width = max(0, int(math.ceil(right)) - offset_x)
+
+        image = Image.new('L', (max(1, width), height), 0)
+        ImageDraw.Draw(image).text((-offset_x, 0), char, font=font, fill=255)
+        bitmap = np.asarray(image)[:, :width] >= _BLACK_THRESHOLD
+        bitmap.setflags(write=False)
+        return Glyph(offset_x, bitmap, font.getlength(char))
+
+    @staticmethod
+    def _compose(glyphs):
+        """按前进量拼接字形（不计字距调整）"""
+        pen = 0.0
+        placed = []
+        for glyph in glyphs:
+            placed.append((int(round(pen)) + glyph.offset_x, glyph.bitmap))
+            pen += glyph.advance
+
+        shift = -min(0, min(x for x, _ in placed))
+        width = max(int(math.ceil(pen)) + shift,
+                    max(x + shift + bitmap.shape[1] for x, bitmap in placed), 1)
+        height = max(bitmap.shape[0] for _, bitmap in placed)
+
+        black = np.zeros((height, width), dtype=bool)
+        for x, bitmap in placed:
+            rows, cols = bitmap.shape
+            black[:rows, x + shift:x + shift + cols] |= bitmap
+
+        bytes_per_row = (width + 7) // 8
+        packed = pack_bits(black)
+        return TextBitmap(width, height, bytes_per_row, packed, encode_graphic_field(packed, bytes_per_row))
+
+
+# 全局实例
+glyph_cache = GlyphCache()
@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
 """用于 QUndoStack 的撤销/重做命令"""
 
+import numpy as np
 from PySide6.QtGui import QUndoCommand
 from utils.logger import logger
 
+# QUndoCommand.id() - 相同 id 的连续命令会被 QUndoStack 合并
+MOVE_ELEMENTS_COMMAND_ID = 1001
+
 
 class AddElementCommand(QUndoCommand):
     """添加元素命令"""
@@ -13,22 +17,23 @@ class AddElementCommand(QUndoCommand):
         self.main_window = main_window
         self.element = element
         self.graphics_item = graphics_item
+        self.entry = None  # 撤销后保存的文档条目（重做时保持 ID 和 z 值）
         logger.debug(f"[撤销命令] AddElementCommand 已创建")
 
     def redo(self):
         """执行（添加元素）"""
         logger.debug(f"[撤销] 重做 添加元素")
-        self.main_window.canvas.scene.addItem(self.graphics_item)
-        self.main_window.elements.append(self.element)
-        self.main_window.graphics_items.append(self.graphics_item)
+        document = self.main_window.document
+        if self.entry is None:
+            document.add(self.element, self.graphics_item)
+        else:
+            document.restore([self.entry])
         logger.info(f"[撤销] 元素已添加")
 
     def undo(self):
         """撤销（删除元素）"""
         logger.debug(f"[撤销] 撤销 添加元素")
-        self.main_window.canvas.scene.removeItem(self.graphics_item)
-        self.main_window.elements.remove(self.element)
-        self.main_window.graphics_items.remove(self.graphics_item)
+        self.entry = self.main_window.document.remove(self.element)
         logger.info(f"[撤销] 元素已移除")
 
 
@@ -40,25 +45,44 @@ class DeleteElementCommand(QUndoCommand):
         self.main_window = main_window
         self.element = element
         self.graphics_item = graphics_item
+        self.entry = None
         logger.debug(f"[撤销命令] DeleteElementCommand 已创建")
 
     def redo(self):
         """执行（删除元素）"""
         logger.debug(f"[撤销] 重做 删除元素")
-        self.main_window.canvas.scene.removeItem(self.graphics_item)
-        self.main_window.elements.remove(self.element)
-        self.main_window.graphics_items.remove(self.graphics_item)
+        self.entry = self.main_window.document.remove(self.element)
         logger.info(f"[撤销] 元素已删除")
 
     def undo(self):
-        """撤销（重新添加元素）"""
+        """撤销（重新添加元素到原来的 z 位置）"""
         logger.debug(f"[撤销] 撤销 删除元素")
-        self.main_window.canvas.scene.addItem(self.graphics_item)
-        self.main_window.elements.append(self.element)
-        self.main_window.graphics_items.append(self.graphics_item)
+        if self.entry is not None:
+            self.main_window.document.restore([self.entry])
         logger.info(f"[撤销] 元素已恢复")
 
 
+class DeleteElementsCommand(QUndoCommand):
+    """删除多个元素命令（一次文档操作，O(n)）"""
+
+    def __init__(self, main_window, elements):
+        super().__init__(f"删除 {len(elements)} 个元素")
+        self.main_window = main_window
+        self.elements = list(elements)
+        self.entries = []
+        logger.debug(f"[撤销命令] DeleteElementsCommand: {len(self.elements)} 个元素")
+
+    def redo(self):
+        """执行（删除所有元素）"""
+        self.entries = self.main_window.document.remove_many(self.elements)
+        logger.debug(f"[撤销] 重做 删除: {len(self.entries)} 个元素")
+
+    def undo(self):
+        """撤销（恢复所有元素，保持 ID 和 z 值）"""
+        self.main_window.document.restore(self.entries)
+        logger.debug(f"[撤销] 撤销 删除: {len(self.entries)} 个元素")
+
+
 class MoveElementCommand(QUndoCommand):
     """移动元素命令"""
 
@@ -78,7 +102,7 @@ class MoveElementCommand(QUndoCommand):
         self.element.config.x = self.new_x
         self.element.config.y = self.new_y
 
-        dpi = 203
+        dpi = self.graphics_item.dpi
         x_px = self.new_x * dpi / 25.4
         y_px = self.new_y * dpi / 25.4
         self.graphics_item.setPos(x_px, y_px)
@@ -90,13 +114,87 @@ class MoveElementCommand(QUndoCommand):
         self.element.config.x = self.old_x
         self.element.config.y = self.old_y
 
-        dpi = 203
+        dpi = self.graphics_item.dpi
         x_px = self.old_x * dpi / 25.4
         y_px = self.old_y * dpi / 25.4
         self.graphics_item.setPos(x_px, y_px)
         logger.info(f"[撤销] 元素已移回到 ({self.old_x}, {self.old_y})")
 
 
+class MoveElementsCommand(QUndoCommand):
+    """
+    群组移动命令（一个命令移动任意数量的元素）
+
+    起始位置和位移以 (n, 2) 数组保存（毫米）。
+    可合并的命令（键盘微调）连续推入时，如果元素集合相同，
+    会合并为一个撤销条目，只累加位移。
+    """
+
+    def __init__(self, graphics_items, old_positions, deltas, mergeable=False):
+        """
+        Args:
+            graphics_items: 图形项列表
+            old_positions: 起始位置 (n, 2)，毫米
+            deltas: 位移 (n, 2) 或 (2,)（所有元素相同），毫米
+            mergeable: 是否与下一个相同元素集合的移动命令合并
+        """
+        super().__init__(f"移动 {len(graphics_items)} 个元素")
+        self.graphics_items = list(graphics_items)
+        self.old_positions = np.asarray(old_positions, dtype=float).reshape(-1, 2)
+        self.deltas = np.broadcast_to(np.asarray(deltas, dtype=float), self.old_positions.shape).copy()
+        self.mergeable = mergeable
+        self._item_keys = tuple(id(item) for item in self.graphics_items)
+        logger.debug(f"[撤销命令] MoveElementsCommand: {len(self.graphics_items)} 个元素, 可合并={mergeable}")
+
+    @classmethod
+    def from_items(cls, graphics_items, dx_mm, dy_mm, mergeable=False):
+        """从当前位置创建统一位移的移动命令"""
+        old_positions = [(item.element.config.x, item.element.config.y) for item in graphics_items]
+        return cls(graphics_items, old_positions, (dx_mm, dy_mm), mergeable=mergeable)
+
+    def id(self):
+        return MOVE_ELEMENTS_COMMAND_ID if self.mergeable else -1
+
+    def mergeWith(self, other):
+        """合并连续的微调（相同元素集合）"""
+        if not isinstance(other, MoveElementsCommand) or not other.mergeable:
+            return False
+        if other._item_keys != self._item_keys:
+            return False
+
+        self.deltas += other.deltas
+
+        # 来回移动后位移为 0（浮点累加误差以内）- 命令从堆栈中移除
+        if np.allclose(self.deltas, 0):
+            self.setObsolete(True)
+
+        return True
+
+    def _apply(self, positions):
+        """一次性设置所有元素的位置 - O(n)"""
+        canvas = getattr(self.graphics_items[0], 'canvas', None) if self.graphics_items else None
+        if canvas is not None and hasattr(canvas, 'set_item_positions'):
+            # 群组路径: 不逐个吸附/通知，只发出一次 items_moved
+            canvas.set_item_positions(self.graphics_items, positions.tolist())
+            return
+
+        for item, (x_mm, y_mm) in zip(self.graphics_items, positions.tolist()):
+            item.element.config.x = x_mm
+            item.element.config.y = y_mm
+            scale = item.dpi / 25.4
+            item.setPos(x_mm * scale, y_mm * scale)
+
+    def redo(self):
+        """执行（移动到新位置）"""
+        self._apply(self.old_positions + self.deltas)
+        logger.debug(f"[撤销] 重做 群组移动: {len(self.graphics_items)} 个元素")
+
+    def undo(self):
+        """撤销（返回到旧位置）"""
+        self._apply(self.old_positions)
+        logger.debug(f"[撤销] 撤销 群组移动: {len(self.graphics_items)} 个元素")
+
+
 class ChangePropertyCommand(QUndoCommand):
     """更改元素属性命令"""
 
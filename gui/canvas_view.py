@@ -1,11 +1,17 @@
 # -*- coding: utf-8 -*-
 """用于标签视觉编辑的画布"""
 
+import math
+from contextlib import contextmanager
+
 from PySide6.QtWidgets import QGraphicsView, QGraphicsScene, QMenu
-from PySide6.QtCore import Qt, Signal, QPoint
+from PySide6.QtCore import Qt, Signal, QPoint, QLineF
 from PySide6.QtGui import QPen, QColor, QPainter
 
-from config import GridConfig
+from config import GridConfig, CONFIG
+from core.snap_engine import SnapEngine
+from gui.render_cache import ItemCachePolicy, FrameTimeCounter
+from gui.cursor_coalescer import CursorCoalescer
 from utils.logger import logger
 from utils.settings_manager import settings_manager
 
@@ -13,9 +19,14 @@ from utils.settings_manager import settings_manager
 class CanvasView(QGraphicsView):
     """带网格的标签设计画布"""
 
+    # 屏幕上网格线的最小间距（像素），低于此值时自动降低网格密度
+    GRID_MIN_SPACING_PX = 4
+
     # 光标追踪信号
     cursor_position_changed = Signal(float, float)  # x_mm, y_mm
     context_menu_requested = Signal(object, QPoint)  # (item, global_pos)
+    # 群组移动完成（每次移动只发出一次，替代每个图形项的位置通知）
+    items_moved = Signal(list)  # [graphics_item, ...]
 
     def __init__(self, width_mm=28, height_mm=28, dpi=203):
         super().__init__()
@@ -61,7 +72,28 @@ class CanvasView(QGraphicsView):
             "[网格] 默认尺寸已初始化: "
             f"{self.grid_config.size_x_mm}mm x {self.grid_config.size_y_mm}mm"
         )
-        self.grid_items = []
+        # 吸附引擎（所有图形项共用）
+        self.snap_engine = SnapEngine(self)
+
+        # 批量加载模式: 图形项跳过吸附和位置变化通知
+        self.bulk_loading = False
+        # 群组移动: 位置由 set_item_positions() 统一设置
+        self.group_moving = False
+        self._group_drag = None  # 多选拖拽状态
+        self.document = None  # 标签文档（attach_document()）
+
+        # 图形项渲染缓存（缩放期间关闭）和帧时间计数器
+        self.item_cache_policy = ItemCachePolicy(self.scene, CONFIG['ITEM_CACHE_MODE'])
+        self.frame_counter = FrameTimeCounter()
+        self.frame_time_visible = CONFIG['SHOW_FRAME_TIME']
+
+        # 光标位置每帧最多发出一次 cursor_position_changed
+        self.cursor_coalescer = CursorCoalescer(
+            self.cursor_position_changed.emit, self._frame_interval_ms()
+        )
+
+        self.grid_items = []  # 仅包含标签边框，网格线在 drawBackground() 中绘制
+        self.grid_pen = QPen(QColor(200, 200, 200), 1, Qt.SolidLine)
 
         # 绘制网格
         self._draw_grid()
@@ -87,19 +119,121 @@ class CanvasView(QGraphicsView):
         # 为视口安装事件过滤器以拦截滚轮事件
         self.viewport().installEventFilter(self)
 
+    def _frame_interval_ms(self):
+        """屏幕一帧的时长（毫秒）"""
+        screen = self.screen()
+        refresh_rate = screen.refreshRate() if screen is not None else 0
+        if refresh_rate <= 0:
+            refresh_rate = 60.0
+        return 1000.0 / refresh_rate
+
+    def attach_document(self, document):
+        """连接标签文档: 场景中的图形项跟随文档的添加/删除/z 顺序"""
+        self.document = document
+        document.elements_added.connect(self._on_document_elements_added)
+        document.elements_removed.connect(self._on_document_elements_removed)
+        document.order_changed.connect(self._on_document_order_changed)
+
+    def _on_document_elements_added(self, entries):
+        for entry in entries:
+            item = entry.graphics_item
+            if item is None:
+                continue
+            item.setZValue(entry.z)
+            if item.scene() is not self.scene:
+                self.scene.addItem(item)
+        self.snap_engine.invalidate()
+
+    def _on_document_elements_removed(self, entries):
+        # 删除选中项时每次 removeItem 都会发出 selectionChanged - 只在最后发出一次
+        was_blocked = self.scene.blockSignals(True)
+        try:
+            for entry in entries:
+                item = entry.graphics_item
+                if item is not None and item.scene() is self.scene:
+                    self.scene.removeItem(item)
+        finally:
+            self.scene.blockSignals(was_blocked)
+
+        if not was_blocked:
+            self.scene.selectionChanged.emit()
+        self.snap_engine.invalidate()
+
+    def _on_document_order_changed(self, entries):
+        for entry in entries:
+            if entry.graphics_item is not None:
+                entry.graphics_item.setZValue(entry.z)
+
+    @property
+    def item_changes_suppressed(self):
+        """图形项的 itemChange 是否跳过吸附和通知"""
+        return self.bulk_loading or self.group_moving
+
+    def set_item_positions(self, items, positions_mm):
+        """
+        群组移动: 一次设置多个元素的位置（毫米）
+
+        期间图形项跳过吸附和通知，结束后吸附候选值过期一次、
+        发出一次 items_moved。线条的终点随起点平移。
+        """
+        self.group_moving = True
+        try:
+            for item, (x_mm, y_mm) in zip(items, positions_mm):
+                config = item.element.config
+                if hasattr(config, 'x2'):
+                    config.x2 += x_mm - config.x
+                    config.y2 += y_mm - config.y
+                config.x = x_mm
+                config.y = y_mm
+
+                scale = item.dpi / 25.4
+                item.setPos(x_mm * scale, y_mm * scale)
+        finally:
+            self.group_moving = False
+
+        self.snap_engine.invalidate()
+        self.items_moved.emit(list(items))
+
+    def snap_group_delta(self, anchor, start_mm, dx_mm, dy_mm, group):
+        """
+        群组移动的位移只按锚点吸附一次
+
+        Args:
+            anchor: 锚点图形项
+            start_mm: 锚点起始位置 (x, y)，毫米
+            dx_mm, dy_mm: 建议位移（毫米）
+            group: 一起移动的图形项
+
+        Returns:
+            (dx_mm, dy_mm) 吸附后的位移
+        """
+        x_mm = start_mm[0] + dx_mm
+        y_mm = start_mm[1] + dy_mm
+
+        if getattr(anchor, 'snap_enabled', True):
+            x_mm, y_mm = self.snap_engine.snap_position(anchor, x_mm, y_mm, group=group)
+
+        return x_mm - start_mm[0], y_mm - start_mm[1]
+
+    def report_cursor_position(self, x_mm, y_mm):
+        """报告光标位置（合并后每帧发出一次信号）"""
+        self.cursor_coalescer.push(x_mm, y_mm)
+
     def _mm_to_px(self, mm):
         """毫米 -> 像素转换"""
         return mm * self.dpi / 25.4  # 浮点数以提高精度
 
     def _draw_grid(self):
-        """使用 GridConfig 绘制网格（尺寸 X/Y，偏移 X/Y）"""
+        """绘制标签边框并刷新背景网格
+
+        网格线不再作为 QGraphicsLineItem 添加到场景中，
+        而是在 drawBackground() 中只绘制可见部分。
+        """
         config = self.grid_config
         logger.debug(f"[网格绘制] 配置: 尺寸 X={config.size_x_mm}mm, Y={config.size_y_mm}mm")
         logger.debug(f"[网格绘制] 配置: 偏移 X={config.offset_x_mm}mm, Y={config.offset_y_mm}mm")
 
-        pen = QPen(QColor(200, 200, 200), 1, Qt.SolidLine)
-
-        # 移除之前的网格
+        # 移除之前的边框
         for item in self.grid_items:
             try:
                 self.scene.removeItem(item)
@@ -107,37 +241,117 @@ class CanvasView(QGraphicsView):
                 pass
         self.grid_items = []
 
-        # 垂直线 - 从 offset_x 开始，步长为 size_x
-        mm = config.offset_x_mm
-        while mm <= self.width_mm:
-            x_px = round(self._mm_to_px(mm))
-            logger.debug(f"[网格绘制] 垂直线: mm={mm:.2f}, px={x_px}")
-            line = self.scene.addLine(x_px, 0, x_px, self.height_px, pen)
-            line.setVisible(config.visible)
-            self.grid_items.append(line)
-            mm += config.size_x_mm
-
-        # 水平线 - 从 offset_y 开始，步长为 size_y
-        mm = config.offset_y_mm
-        while mm <= self.height_mm:
-            y_px = round(self._mm_to_px(mm))
-            logger.debug(f"[网格绘制] 水平线: mm={mm:.2f}, px={y_px}")
-            line = self.scene.addLine(0, y_px, self.width_px, y_px, pen)
-            line.setVisible(config.visible)
-            self.grid_items.append(line)
-            mm += config.size_y_mm
-
         # 边框
         border_pen = QPen(QColor(0, 0, 0), 2, Qt.SolidLine)
         border = self.scene.addRect(0, 0, self.width_px, self.height_px, border_pen)
+        border.setVisible(config.visible)
         self.grid_items.append(border)
 
-        # 在创建所有项目后设置可见性
-        for item in self.grid_items:
-            item.setVisible(self.grid_config.visible)
+        # 网格在背景层绘制 - 只需重绘
+        self._invalidate_grid()
 
         logger.debug(f"[网格绘制] 创建了 {len(self.grid_items)} 个项目，可见性: {self.grid_config.visible}")
 
+    def _invalidate_grid(self):
+        """请求重绘背景网格"""
+        self.resetCachedContent()
+        self.viewport().update()
+
+    def _grid_axis_positions(self, start_px, end_px, size_mm, offset_mm, limit_mm, view_scale):
+        """计算一个轴上可见网格线的像素位置
+
+        Args:
+            start_px, end_px: 暴露区域的范围（场景像素）
+            size_mm: 网格步长
+            offset_mm: 网格偏移
+            limit_mm: 标签尺寸（网格线不超出标签）
+            view_scale: 当前视图缩放比例
+
+        Returns:
+            list: 网格线的场景像素位置（已四舍五入）
+        """
+        if size_mm <= 0:
+            return []
+
+        # 低缩放时降低密度: 步长 ×1, ×2, ×5, ×10, ...
+        step_mm = size_mm
+        factors = (2, 2.5, 2)
+        i = 0
+        while self._mm_to_px(step_mm) * view_scale < self.GRID_MIN_SPACING_PX:
+            step_mm *= factors[i % len(factors)]
+            i += 1
+
+        # 网格线: mm = offset + k * step，k >= 0，mm <= limit
+        first_mm = max(self._px_to_mm(start_px), offset_mm)
+        last_mm = min(self._px_to_mm(end_px), limit_mm)
+        if last_mm < first_mm:
+            return []
+
+        k_first = math.ceil((first_mm - offset_mm) / step_mm - 1e-9)
+        k_last = math.floor((last_mm - offset_mm) / step_mm + 1e-9)
+
+        return [round(self._mm_to_px(offset_mm + k * step_mm)) for k in range(k_first, k_last + 1)]
+
+    def drawBackground(self, painter, rect):
+        """绘制背景和网格（仅暴露区域的可见线条）"""
+        super().drawBackground(painter, rect)
+
+        config = self.grid_config
+        if not config.visible:
+            return
+
+        view_scale = self.transform().m11() or 1.0
+
+        top = max(rect.top(), 0)
+        bottom = min(rect.bottom(), self.height_px)
+        left = max(rect.left(), 0)
+        right = min(rect.right(), self.width_px)
+
+        xs = self._grid_axis_positions(
+            rect.left() - 1, rect.right() + 1,
+            config.size_x_mm, config.offset_x_mm, self.width_mm, view_scale
+        )
+        ys = self._grid_axis_positions(
+            rect.top() - 1, rect.bottom() + 1,
+            config.size_y_mm, config.offset_y_mm, self.height_mm, view_scale
+        )
+
+        lines = [QLineF(x, top, x, bottom) for x in xs] if bottom > top else []
+        if right > left:
+            lines.extend(QLineF(left, y, right, y) for y in ys)
+
+        if lines:
+            painter.save()
+            painter.setPen(self.grid_pen)
+            painter.drawLines(lines)
+            painter.restore()
+
+    def paintEvent(self, event):
+        """绘制视口并记录帧时间"""
+        self.frame_counter.begin()
+        super().paintEvent(event)
+        self.frame_counter.end()
+
+    def drawForeground(self, painter, rect):
+        """帧时间叠加层（视口左上角）"""
+        super().drawForeground(painter, rect)
+
+        if not self.frame_time_visible:
+            return
+
+        painter.save()
+        painter.resetTransform()
+        painter.setPen(QColor(200, 0, 0))
+        painter.drawText(6, 14, self.frame_counter.text())
+        painter.restore()
+
+    def set_frame_time_visible(self, visible: bool):
+        """显示/隐藏帧时间叠加层"""
+        self.frame_time_visible = visible
+        self.frame_counter.reset()
+        self.viewport().update()
+        logger.debug(f"[帧时间] 叠加层可见: {visible}")
+
     def set_grid_config(self, grid_config):
         """设置网格配置"""
         logger.debug(f"[网格配置] 设置: 尺寸 X={grid_config.size_x_mm}mm, Y={grid_config.size_y_mm}mm")
@@ -168,35 +382,14 @@ class CanvasView(QGraphicsView):
         self.grid_config.visible = visible
         logger.debug(f"[网格可见性] 设置为: {visible}")
 
-        # 检查 grid_items 是否有效
-        if not self.grid_items:
-            logger.debug(f"[网格可见性] grid_items 为空，重新绘制")
+        # 检查边框是否仍在场景中
+        if not self.grid_items or any(item is None or item.scene() is None for item in self.grid_items):
+            logger.debug(f"[网格可见性] grid_items 无效，重新绘制")
             self._draw_grid()
-            return
-
-        # 检查项目是否仍在场景中
-        items_valid = True
-        for item in self.grid_items:
-            if item is None or item.scene() is None:
-                items_valid = False
-                logger.debug(f"[网格可见性] grid_items 无效，重新绘制")
-                break
-
-        if not items_valid:
-            self.grid_items = []
-            self._draw_grid()
-            return
-
-        # 项目有效 → 只需更改可见性
-        logger.debug(f"[网格可见性] 在 {len(self.grid_items)} 个项目上设置可见性")
-        for item in self.grid_items:
-            try:
-                item.setVisible(visible)  # ← 已修复：使用参数 visible
-            except RuntimeError:
-                logger.debug(f"[网格可见性] RuntimeError，重新绘制")
-                self.grid_items = []
-                self._draw_grid()
-                return
+        else:
+            for item in self.grid_items:
+                item.setVisible(visible)
+            self._invalidate_grid()
 
         logger.debug(f"[网格可见性] 成功将可见性设置为 {visible}")
         settings_manager.save_grid_settings(
@@ -239,22 +432,76 @@ class CanvasView(QGraphicsView):
             # 画布上下文菜单（如果有剪贴板内容可以是粘贴）
             self.context_menu_requested.emit(None, event.globalPos())
 
+    def mousePressEvent(self, event):
+        """按下选中的元素时，多选拖拽走群组移动路径"""
+        super().mousePressEvent(event)
+
+        self._group_drag = None
+        if event.button() != Qt.LeftButton:
+            return
+
+        anchor = self.itemAt(event.position().toPoint())
+        if anchor is None or not hasattr(anchor, 'element') or not anchor.isSelected():
+            return
+
+        items = [item for item in self.scene.selectedItems() if hasattr(item, 'element')]
+        if len(items) < 2:
+            return
+
+        self._group_drag = {
+            'anchor': anchor,
+            'items': items,
+            'start_scene': self.mapToScene(event.position().toPoint()),
+            'start_positions': [(item.element.config.x, item.element.config.y) for item in items],
+            'anchor_start': (anchor.element.config.x, anchor.element.config.y),
+        }
+        logger.debug(f"[群组拖拽] 开始: {len(items)} 个元素")
+
+    def _move_group_drag(self, scene_pos):
+        """多选拖拽的一步: 锚点吸附一次，所有元素应用相同位移"""
+        drag = self._group_drag
+        delta = scene_pos - drag['start_scene']
+
+        dx_mm, dy_mm = self.snap_group_delta(
+            drag['anchor'], drag['anchor_start'],
+            self._px_to_mm(delta.x()), self._px_to_mm(delta.y()),
+            drag['items']
+        )
+
+        positions = [(x + dx_mm, y + dy_mm) for x, y in drag['start_positions']]
+        self.set_item_positions(drag['items'], positions)
+
+        # 拖拽时发送锚点位置给标尺
+        anchor_x, anchor_y = drag['anchor_start']
+        self.report_cursor_position(anchor_x + dx_mm, anchor_y + dy_mm)
+
     def mouseMoveEvent(self, event):
         """追踪光标位置"""
+        # 多选拖拽: 自己移动群组（不逐个调用图形项的拖拽逻辑）
+        if self._group_drag is not None and event.buttons() & Qt.LeftButton:
+            self._move_group_drag(self.mapToScene(event.position().toPoint()))
+            event.accept()
+            return
+
         # 将位置转换为毫米
         scene_pos = self.mapToScene(event.pos())
         x_mm = self._px_to_mm(scene_pos.x())
         y_mm = self._px_to_mm(scene_pos.y())
 
-        # 调试：光标追踪
-        logger.debug(f"[光标] 信号发出: {x_mm:.2f}mm, {y_mm:.2f}mm")
-
-        # 发出信号
-        self.cursor_position_changed.emit(x_mm, y_mm)
+        # 合并后发出信号（每帧最多一次）
+        self.report_cursor_position(x_mm, y_mm)
 
         # 调用父类方法
         super().mouseMoveEvent(event)
 
+    def mouseReleaseEvent(self, event):
+        """结束多选拖拽"""
+        if self._group_drag is not None:
+            logger.debug(f"[群组拖拽] 结束: {len(self._group_drag['items'])} 个元素")
+            self._group_drag = None
+
+        super().mouseReleaseEvent(event)
+
     def _px_to_mm(self, px):
         """像素 -> 毫米转换"""
         return px * 25.4 / self.dpi
@@ -272,6 +519,7 @@ class CanvasView(QGraphicsView):
     def wheelEvent(self, event):
         """缩放到光标下的点"""
         logger.debug(f"[缩放] wheelEvent 触发, angleDelta={event.angleDelta().y()}")
+        self.item_cache_policy.begin_zoom()
 
         # 获取场景坐标中的光标位置
         old_pos = self.mapToScene(event.position().toPoint())
@@ -336,12 +584,14 @@ class CanvasView(QGraphicsView):
 
     def reset_zoom(self):
         """重置缩放到 100%"""
+        self.item_cache_policy.begin_zoom()
         self.resetTransform()
         self.current_scale = 1.0
         self._update_rulers_scale()
 
     def _zoom_at_point(self, point, factor):
         """缩放到特定点"""
+        self.item_cache_policy.begin_zoom()
         old_pos = self.mapToScene(point)
 
         new_scale = self.current_scale * factor
@@ -357,6 +607,32 @@ class CanvasView(QGraphicsView):
 
         self._update_rulers_scale()
 
+    @contextmanager
+    def bulk_update(self):
+        """
+        批量添加元素（加载模板）
+
+        期间关闭场景 BSP 索引、图形项的 itemChange 吸附/通知和视口重绘，
+        结束后重建索引并只重绘一次。
+        """
+        index_method = self.scene.itemIndexMethod()
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+        self.viewport().setUpdatesEnabled(False)
+        self.bulk_loading = True
+
+        try:
+            yield
+        finally:
+            self.bulk_loading = False
+
+            # 恢复索引方法时场景重建 BSP 树
+            self.scene.setItemIndexMethod(index_method)
+            self.snap_engine.invalidate()
+
+            self.viewport().setUpdatesEnabled(True)
+            self.viewport().update()
+            logger.debug(f"[批量加载] 完成: 场景中 {len(self.scene.items())} 个项目")
+
     def clear_and_redraw_grid(self):
         """清除场景并重新绘制网格"""
         grid_visible_state = self.grid_config.visible
@@ -384,6 +660,9 @@ class CanvasView(QGraphicsView):
         self.width_px = round(self._mm_to_px(width_mm))
         self.height_px = round(self._mm_to_px(height_mm))
 
+        # 标签边框是对象吸附的候选值
+        self.snap_engine.invalidate()
+
         # 如果标尺附加到画布，则更新标尺
         if self.h_ruler:
             self.h_ruler.set_length(width_mm)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""光标位置合并器（每帧最多传递一次）"""
+
+import time
+
+from PySide6.QtCore import QTimer
+
+
+class CursorCoalescer:
+    """
+    按帧率限制光标位置的传递
+
+    高回报率鼠标每秒产生数百次移动事件，拖拽时图形项还会再报告一次位置。
+    push() 只保存最新位置: 距上次传递已超过一帧时立即传递，
+    否则在当前帧结束时传递最后一个位置（中间位置被丢弃）。
+    """
+
+    def __init__(self, deliver, interval_ms=16):
+        self.deliver = deliver  # 回调 (x_mm, y_mm)
+        self.interval_ms = interval_ms
+        self.pending = None
+        self._last_delivery = None
+
+        # 统计（用于调试/测试）
+        self.pushed = 0
+        self.delivered = 0
+
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    def push(self, x_mm, y_mm):
+        """记录最新位置"""
+        self.pending = (x_mm, y_mm)
+        self.pushed += 1
+
+        if self._timer.isActive():
+            return
+
+        if self._last_delivery is None:
+            self.flush()
+            return
+
+        elapsed_ms = (time.perf_counter() - self._last_delivery) * 1000.0
+        if elapsed_ms >= self.interval_ms:
+            self.flush()
+        else:
+            self._timer.start(max(1, round(self.interval_ms - elapsed_ms)))
+
+    def flush(self):
+        """立即传递等待中的位置"""
+        self._timer.stop()
+        if self.pending is None:
+            return
+
+        x_mm, y_mm = self.pending
+        self.pending = None
+        self._last_delivery = time.perf_counter()
+        self.delivered += 1
+        self.deliver(x_mm, y_mm)
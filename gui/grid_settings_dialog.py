@@ -82,7 +82,7 @@ class GridSettingsDialog(QDialog):
 
         self.snap_combo = QComboBox()
         self.snap_combo.addItem("对齐到网格", SnapMode.GRID)
-        self.snap_combo.addItem("对齐到对象", SnapMode.OBJECTS)
+        self.snap_combo.addItem("对齐到对象 + 网格", SnapMode.OBJECTS)
         self.snap_combo.addItem("不对齐", SnapMode.NONE)
         snap_layout.addWidget(self.snap_combo)
 
@@ -3,7 +3,7 @@
 
 from PySide6.QtWidgets import (QMainWindow, QDockWidget, QWidget, QGridLayout, QMenu)
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QAction, QKeySequence, QUndoStack
+from PySide6.QtGui import QAction, QActionGroup, QKeySequence, QUndoStack
 from .canvas_view import CanvasView
 from .toolbar import EditorToolbar
 from .sidebar import Sidebar
@@ -19,13 +19,16 @@ from .mixins import (
     LabelConfigMixin,
     UIHelpersMixin
 )
+from core.document import LabelDocument
 from core.template_manager import TemplateManager
+from core.image_import import ImageImporter
+from core.printer_profiles import PRINTER_PROFILES, get_printer_profile
 from zpl.generator import ZPLGenerator
 from integration.labelary_client import LabelaryClient
 from utils.logger import logger
 from utils.unit_converter import MeasurementUnit, UnitConverter
 from utils.settings_manager import settings_manager
-from config import DEFAULT_UNIT
+from config import CONFIG, DEFAULT_UNIT
 
 
 class MainWindow(QMainWindow,
@@ -47,21 +50,22 @@ class MainWindow(QMainWindow,
         # 保存模板文件路径用于 UI 初始化后加载
         self._template_file_to_load = template_file
 
-        # 元素和图形项列表
-        self.elements = []
-        self.graphics_items = []
+        # 元素和图形项由 LabelDocument 管理（画布创建后初始化）
+        self.document = None
         self.selected_item = None
 
         # 剪贴板用于复制/粘贴
         self.clipboard_element = None
 
         # 拖拽状态
-        self.drag_start_pos = None
+        self.drag_start_positions = None  # 拖拽开始时的元素位置 {item: (x, y)}
 
         # ZPL 生成器
-        self.zpl_generator = ZPLGenerator(dpi=203)
-        self.labelary_client = LabelaryClient(dpi=203)
+        self.printer_profile = get_printer_profile(settings_manager.load_printer_profile())
+        self.zpl_generator = ZPLGenerator(profile=self.printer_profile, optimize=CONFIG['ZPL_OPTIMIZE'])
+        self.labelary_client = LabelaryClient(dpi=self.printer_profile.dpi)
         self.template_manager = TemplateManager()
+        self.image_importer = ImageImporter()
         logger.info("ZPL 生成器、Labelary 客户端和模板管理器已创建")
 
         toolbar_settings = settings_manager.load_toolbar_settings()
@@ -69,10 +73,14 @@ class MainWindow(QMainWindow,
         label_height_mm = toolbar_settings['label_height']
 
         # 画布
-        self.canvas = CanvasView(width_mm=label_width_mm, height_mm=label_height_mm, dpi=203)
-        logger.info(f"画布已创建 ({label_width_mm}x{label_height_mm}mm, DPI 203)")
+        self.canvas = CanvasView(width_mm=label_width_mm, height_mm=label_height_mm, dpi=CONFIG['DEFAULT_DPI'])
+        logger.info(f"画布已创建 ({label_width_mm}x{label_height_mm}mm, DPI {CONFIG['DEFAULT_DPI']})")
         self.canvas.bounds_update_callback = self._highlight_element_bounds
 
+        # 标签文档（画布同步场景）
+        self.document = LabelDocument(self)
+        self.canvas.attach_document(self.document)
+
         # 侧边栏
         self.sidebar = Sidebar()
         logger.info("侧边栏已创建")
@@ -85,11 +93,12 @@ class MainWindow(QMainWindow,
 
         # 撤销/重做堆栈
         self.undo_stack = QUndoStack(self)
-        logger.debug(f"[撤销堆栈] 已初始化")
+        self.undo_stack.setUndoLimit(CONFIG['UNDO_LIMIT'])
+        logger.debug(f"[撤销堆栈] 已初始化, 限制={CONFIG['UNDO_LIMIT']}")
 
         # 标尺
-        self.h_ruler = HorizontalRuler(length_mm=28, dpi=203, scale=2.5)
-        self.v_ruler = VerticalRuler(length_mm=28, dpi=203, scale=2.5)
+        self.h_ruler = HorizontalRuler(length_mm=28, dpi=self.canvas.dpi, scale=2.5)
+        self.v_ruler = VerticalRuler(length_mm=28, dpi=self.canvas.dpi, scale=2.5)
         logger.info("标尺已创建")
 
         # 将标尺链接到画布
@@ -160,11 +169,22 @@ class MainWindow(QMainWindow,
         if self._template_file_to_load:
             self._load_template_from_file(self._template_file_to_load)
 
+    @property
+    def elements(self):
+        """按 z 顺序的元素元组（只读，修改请通过 self.document）"""
+        return self.document.elements if self.document is not None else ()
+
+    @property
+    def graphics_items(self):
+        """按 z 顺序的图形项元组（只读，修改请通过 self.document）"""
+        return self.document.graphics_items if self.document is not None else ()
+
     def _connect_signals(self):
         """连接所有信号"""
         # 画布信号
         self.canvas.scene.selectionChanged.connect(self._on_selection_changed)
         self.canvas.cursor_position_changed.connect(self._update_ruler_cursor)
+        self.canvas.items_moved.connect(self._on_items_moved)
         self.canvas.context_menu_requested.connect(self._show_context_menu)
 
         # 事件过滤器
@@ -189,6 +209,7 @@ class MainWindow(QMainWindow,
         self.actions['open_json'].triggered.connect(self._open_json)
         self.actions['preview'].triggered.connect(self._show_preview)
         self.actions['grid_settings'].triggered.connect(self._show_grid_settings)
+        self.actions['frame_time'].toggled.connect(self.canvas.set_frame_time_visible)
 
         logger.info("所有信号已连接")
 
@@ -238,6 +259,13 @@ class MainWindow(QMainWindow,
         grid_settings_action.setToolTip("网格设置")
         self.actions['grid_settings'] = grid_settings_action
 
+        # 帧时间叠加层
+        frame_time_action = QAction("显示帧时间", self)
+        frame_time_action.setToolTip("在画布角落显示绘制耗时")
+        frame_time_action.setCheckable(True)
+        frame_time_action.setChecked(CONFIG['SHOW_FRAME_TIME'])
+        self.actions['frame_time'] = frame_time_action
+
         # 条码组
         barcode_menu = QMenu("添加条码", self)
         add_ean13_action = QAction("EAN-13", self)
@@ -308,6 +336,32 @@ class MainWindow(QMainWindow,
 
         view_menu = menubar.addMenu("视图")
         view_menu.addAction(self.actions['grid_settings'])
+        view_menu.addAction(self.actions['frame_time'])
+
+        printer_menu = menubar.addMenu("打印机")
+        self.printer_profile_group = QActionGroup(self)
+        self.printer_profile_group.setExclusive(True)
+        for profile in PRINTER_PROFILES.values():
+            action = QAction(profile.name, self)
+            action.setCheckable(True)
+            action.setChecked(profile.key == self.printer_profile.key)
+            action.triggered.connect(lambda checked=False, key=profile.key: self._set_printer_profile(key))
+            self.printer_profile_group.addAction(action)
+            printer_menu.addAction(action)
+            self.actions[f'printer_{profile.key}'] = action
+
+    def _set_printer_profile(self, profile_key):
+        """切换打印机配置: 导出和预览使用新的分辨率，画布保持设计比例"""
+        profile = get_printer_profile(profile_key)
+        self.printer_profile = profile
+        self.zpl_generator.set_profile(profile)
+        self.labelary_client.dpi = profile.dpi
+        settings_manager.save_printer_profile(profile.key)
+
+        action = self.actions.get(f'printer_{profile.key}')
+        if action is not None and not action.isChecked():
+            action.setChecked(True)
+        logger.info(f"[打印机] 配置已切换: {profile.key} ({profile.dpi} DPI)")
 
     def _apply_persisted_toolbar_settings(self, toolbar_settings):
         """应用在会话间保存的工具栏设置"""
@@ -427,6 +481,19 @@ class MainWindow(QMainWindow,
             }
         )
 
+    # QMainWindow 在 MRO 中位于混入类之前，混入类的事件处理方法需要显式转发
+
+    def eventFilter(self, obj, event):
+        """画布/场景事件（SelectionMixin）"""
+        if SelectionMixin.eventFilter(self, obj, event):
+            return True
+        return super().eventFilter(obj, event)
+
+    def keyPressEvent(self, event):
+        """键盘快捷键（ShortcutsMixin）"""
+        ShortcutsMixin.keyPressEvent(self, event)
+        super().keyPressEvent(event)
+
     def _on_sidebar_element_selected(self, element_type: str):
         """
         从侧边栏选择元素的处理程序。
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """剪贴板操作混入类"""
 
+from core.undo_commands import MoveElementsCommand
 from utils.logger import logger
 import copy
 
@@ -10,62 +11,34 @@ class ClipboardMixin:
 
     def _move_selected(self, dx_mm, dy_mm):
         """移动选中的元素（支持多选）"""
-        selected = self.canvas.scene.selectedItems()
-
-        if len(selected) > 1:
-            # 群组移动
-            logger.debug(f"[群组移动] 正在移动 {len(selected)} 个项目，偏移量 ({dx_mm:.2f}, {dy_mm:.2f})mm")
-
-            for item in selected:
-                if hasattr(item, 'element'):
-                    element = item.element
-                    old_x, old_y = element.config.x, element.config.y
-
-                    element.config.x += dx_mm
-                    element.config.y += dy_mm
-
-                    # 更新图形项位置
-                    dpi = 203
-                    new_x = element.config.x * dpi / 25.4
-                    new_y = element.config.y * dpi / 25.4
-                    item.setPos(new_x, new_y)
-
-                    # 为撤销创建移动命令
-                    command = MoveElementCommand(element, item, old_x, old_y, element.config.x, element.config.y)
-                    self.undo_stack.push(command)
-
-            logger.info(f"已移动 {len(selected)} 个元素，偏移量 ({dx_mm}, {dy_mm})mm")
-
-        elif self.selected_item and hasattr(self.selected_item, 'element'):
-            # 单个移动
-            element = self.selected_item.element
-            old_x, old_y = element.config.x, element.config.y
-
-            element.config.x += dx_mm
-            element.config.y += dy_mm
-
-            logger.debug(f"[移动] 之前: ({old_x:.2f}, {old_y:.2f})mm")
-            logger.debug(f"[移动] 增量: ({dx_mm:.2f}, {dy_mm:.2f})mm")
-            logger.debug(f"[移动] 之后: ({element.config.x:.2f}, {element.config.y:.2f})mm")
+        # 按文档顺序（selectedItems() 的顺序不确定，锚点必须稳定）
+        items = [item for item in self.graphics_items if item.isSelected()]
+        if not items and self.selected_item and hasattr(self.selected_item, 'element'):
+            items = [self.selected_item]
+        if not items:
+            return
 
-            # 更新图形项位置
-            dpi = 203
-            new_x = element.config.x * dpi / 25.4
-            new_y = element.config.y * dpi / 25.4
-            self.selected_item.setPos(new_x, new_y)
+        # 只按锚点（第一个元素）吸附一次，所有元素使用相同位移
+        anchor = items[0]
+        dx_mm, dy_mm = self.canvas.snap_group_delta(
+            anchor, (anchor.element.config.x, anchor.element.config.y), dx_mm, dy_mm, items
+        )
+        if dx_mm == 0 and dy_mm == 0:
+            logger.debug("[微调] 吸附后位移为 0")
+            return
 
-            # 更新属性面板和边界
-            if self.property_panel.current_element:
-                self.property_panel.update_position(element.config.x, element.config.y)
-            self._highlight_element_bounds(self.selected_item)
+        # 一个命令移动所有元素；连续微调合并为一个撤销条目
+        command = MoveElementsCommand.from_items(items, dx_mm, dy_mm, mergeable=True)
+        self.undo_stack.push(command)
 
-            logger.info(f"元素已移动: dx={dx_mm}mm, dy={dy_mm}mm -> ({element.config.x}, {element.config.y})")
+        logger.info(f"已移动 {len(items)} 个元素，偏移量 ({dx_mm:.2f}, {dy_mm:.2f})mm")
 
     def _copy_selected(self):
         """复制选中元素到剪贴板"""
         if self.selected_item and hasattr(self.selected_item, 'element'):
             import copy
             self.clipboard_element = copy.deepcopy(self.selected_item.element)
+            self.clipboard_element.id = None  # 剪贴板中的副本不属于文档
             logger.debug(f"[剪贴板] 已复制: {self.clipboard_element.__class__.__name__}")
             logger.info(f"元素已复制到剪贴板")
 
@@ -76,6 +49,7 @@ class ClipboardMixin:
             return
 
         import copy
+        # 图片数据是共享的不可变负载（ImagePayload）- 深拷贝不复制字节
         new_element = copy.deepcopy(self.clipboard_element)
 
         # 偏移量用于视觉区分
@@ -86,9 +60,13 @@ class ClipboardMixin:
 
         # 添加到画布
         graphics_item = self._create_graphics_item(new_element)
-        self.canvas.scene.addItem(graphics_item)
-        self.elements.append(new_element)
-        self.graphics_items.append(graphics_item)
+        if graphics_item is None:
+            logger.warning(f"[剪贴板] 无法为 {new_element.__class__.__name__} 创建图形项")
+            return
+
+        # 每次粘贴都是新元素 - 文档分配新 ID
+        new_element.id = None
+        self.document.add(new_element, graphics_item)
 
         # 选中新项
         self.canvas.scene.clearSelection()
@@ -96,20 +74,6 @@ class ClipboardMixin:
 
         logger.info(f"已从剪贴板粘贴元素")
 
-    def _create_graphics_item(self, element):
-        """为元素创建图形项"""
-        if isinstance(element, TextElement):
-            graphics_item = GraphicsTextItem(element, dpi=self.canvas.dpi)
-        else:
-            from core.elements.barcode_element import BarcodeElement, GraphicsBarcodeItem
-            if isinstance(element, BarcodeElement):
-                graphics_item = GraphicsBarcodeItem(element, dpi=self.canvas.dpi)
-            else:
-                return None
-
-        graphics_item.snap_enabled = self.snap_enabled
-        return graphics_item
-
     def _duplicate_selected(self):
         """复制选中的元素（复制 + 粘贴）"""
         if self.selected_item:
@@ -1,13 +1,17 @@
 # -*- coding: utf-8 -*-
 """在画布上创建元素的混入类"""
 
-from PySide6.QtWidgets import QFileDialog, QMessageBox
+from PySide6.QtWidgets import QFileDialog, QMessageBox, QProgressDialog, QApplication
+from PySide6.QtCore import Qt, QEventLoop
+from concurrent.futures import wait
 from core.elements.text_element import TextElement, GraphicsTextItem
 from core.elements.image_element import ImageElement, GraphicsImageItem, ImageConfig
 from core.elements.base import ElementConfig
+from core.elements.registry import create_graphics_item
+from core.image_import import IMPORT_STAGES, max_useful_size
 from core.undo_commands import AddElementCommand
 from utils.logger import logger
-import base64
+from config import CONFIG
 
 
 class ElementCreationMixin:
@@ -35,10 +39,7 @@ class ElementCreationMixin:
 
         graphics_item = GraphicsBarcodeItem(element, dpi=self.canvas.dpi, canvas=self.canvas)
         graphics_item.snap_enabled = self.snap_enabled
-        self.canvas.scene.addItem(graphics_item)
-
-        self.elements.append(element)
-        self.graphics_items.append(graphics_item)
+        self.document.add(element, graphics_item)
 
         logger.info(f"EAN-13 条形码已添加在 ({element.config.x}, {element.config.y})")
 
@@ -51,10 +52,7 @@ class ElementCreationMixin:
 
         graphics_item = GraphicsBarcodeItem(element, dpi=self.canvas.dpi, canvas=self.canvas)
         graphics_item.snap_enabled = self.snap_enabled
-        self.canvas.scene.addItem(graphics_item)
-
-        self.elements.append(element)
-        self.graphics_items.append(graphics_item)
+        self.document.add(element, graphics_item)
 
         logger.info(f"Code 128 条形码已添加在 ({element.config.x}, {element.config.y})")
 
@@ -67,10 +65,7 @@ class ElementCreationMixin:
 
         graphics_item = GraphicsBarcodeItem(element, dpi=self.canvas.dpi, canvas=self.canvas)
         graphics_item.snap_enabled = self.snap_enabled
-        self.canvas.scene.addItem(graphics_item)
-
-        self.elements.append(element)
-        self.graphics_items.append(graphics_item)
+        self.document.add(element, graphics_item)
 
         logger.info(f"QR 码已添加在 ({element.config.x}, {element.config.y})")
 
@@ -83,10 +78,7 @@ class ElementCreationMixin:
 
         graphics_item = GraphicsRectangleItem(element, dpi=self.canvas.dpi, canvas=self.canvas)
         graphics_item.snap_enabled = self.snap_enabled
-        self.canvas.scene.addItem(graphics_item)
-
-        self.elements.append(element)
-        self.graphics_items.append(graphics_item)
+        self.document.add(element, graphics_item)
 
         logger.info(
             f"矩形已添加在 ({element.config.x}, {element.config.y})mm, 尺寸=({element.config.width}x{element.config.height})mm")
@@ -100,10 +92,7 @@ class ElementCreationMixin:
 
         graphics_item = GraphicsCircleItem(element, dpi=self.canvas.dpi, canvas=self.canvas)
         graphics_item.snap_enabled = self.snap_enabled
-        self.canvas.scene.addItem(graphics_item)
-
-        self.elements.append(element)
-        self.graphics_items.append(graphics_item)
+        self.document.add(element, graphics_item)
 
         logger.info(
             f"圆形已添加在 ({element.config.x}, {element.config.y})mm, 尺寸=({element.config.width}x{element.config.height})mm")
@@ -117,10 +106,7 @@ class ElementCreationMixin:
 
         graphics_item = GraphicsLineItem(element, dpi=self.canvas.dpi, canvas=self.canvas)
         graphics_item.snap_enabled = self.snap_enabled
-        self.canvas.scene.addItem(graphics_item)
-
-        self.elements.append(element)
-        self.graphics_items.append(graphics_item)
+        self.document.add(element, graphics_item)
 
         logger.info(
             f"线条已添加从 ({element.config.x}, {element.config.y})mm 到 ({element.config.x2}, {element.config.y2})mm")
@@ -143,19 +129,18 @@ class ElementCreationMixin:
         logger.debug(f"[添加图片] 选择的文件: {file_path}")
 
         try:
-            with open(file_path, 'rb') as f:
-                image_bytes = f.read()
-                image_data = base64.b64encode(image_bytes).decode('utf-8')
-
-            logger.debug(f"[添加图片] 图片数据长度: {len(image_data)} 字符")
+            # 在后台线程中解码并缩小到标签分辨率（只保存缩小后的图片）
+            imported = self._import_image_file(file_path)
 
+            # 宽度 30mm，高度按图片比例
+            width_px, height_px = imported.size
             config = ImageConfig(
                 x=10.0,
                 y=10.0,
                 width=30.0,
-                height=30.0,
+                height=round(30.0 * height_px / width_px, 2),
                 image_path=file_path,
-                image_data=image_data
+                image_data=imported.image_data
             )
             image_element = ImageElement(config)
 
@@ -171,27 +156,43 @@ class ElementCreationMixin:
             logger.error(f"[添加图片] 加载图片失败: {e}", exc_info=True)
             QMessageBox.critical(self, "添加图片", f"加载图片失败:\n{e}")
 
+    def _import_image_file(self, file_path):
+        """
+        导入图片文件（后台线程: 解码、EXIF 方向、缩小、编码），等待期间显示进度
+
+        Returns:
+            ImportedImage（失败时抛出异常）
+        """
+        max_size = max_useful_size(
+            self.canvas.width_mm, self.canvas.height_mm, self.canvas.dpi, CONFIG['IMAGE_IMPORT_OVERSAMPLE']
+        )
+        future, progress = self.image_importer.submit(file_path, max_size)
+
+        dialog = QProgressDialog("正在导入图片...", None, 0, len(IMPORT_STAGES), self)
+        dialog.setWindowTitle("导入图片")
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(300)
+        try:
+            while not future.done():
+                wait([future], timeout=0.02)
+                dialog.setValue(progress.stage)
+                dialog.setLabelText(f"正在导入图片: {progress.text}...")
+                QApplication.processEvents(QEventLoop.ExcludeUserInputEvents)
+        finally:
+            dialog.setValue(len(IMPORT_STAGES))
+            dialog.close()
+
+        imported = future.result()
+        logger.debug(
+            f"[添加图片] 原始 {imported.source_size} ({imported.source_bytes} 字节) -> "
+            f"{imported.size} ({imported.stored_bytes} 字节)")
+        return imported
+
     def _create_graphics_item(self, element):
-        """为元素创建图形项（在加载模板时使用）"""
-        if isinstance(element, TextElement):
-            graphics_item = GraphicsTextItem(element, dpi=self.canvas.dpi, canvas=self.canvas)
-        elif isinstance(element, ImageElement):
-            graphics_item = GraphicsImageItem(element, dpi=self.canvas.dpi, canvas=self.canvas)
-        else:
-            from core.elements.barcode_element import BarcodeElement, GraphicsBarcodeItem
-            from core.elements.shape_element import ShapeElement, GraphicsRectangleItem, GraphicsCircleItem, \
-                GraphicsLineItem, RectangleElement, CircleElement, LineElement
-
-            if isinstance(element, BarcodeElement):
-                graphics_item = GraphicsBarcodeItem(element, dpi=self.canvas.dpi, canvas=self.canvas)
-            elif isinstance(element, RectangleElement):
-                graphics_item = GraphicsRectangleItem(element, dpi=self.canvas.dpi, canvas=self.canvas)
-            elif isinstance(element, CircleElement):
-                graphics_item = GraphicsCircleItem(element, dpi=self.canvas.dpi, canvas=self.canvas)
-            elif isinstance(element, LineElement):
-                graphics_item = GraphicsLineItem(element, dpi=self.canvas.dpi, canvas=self.canvas)
-            else:
-                return None
+        """为元素创建图形项（在加载模板和粘贴时使用）"""
+        graphics_item = create_graphics_item(element, dpi=self.canvas.dpi, canvas=self.canvas)
+        if graphics_item is None:
+            return None
 
         graphics_item.snap_enabled = self.snap_enabled
-        return graphics_item
\ No newline at end of file
+        return graphics_item
@@ -2,8 +2,9 @@
 """选择与事件处理混入类"""
 
 from PySide6.QtWidgets import QToolTip
-from PySide6.QtCore import QEvent
+from PySide6.QtCore import Qt, QEvent
 from PySide6.QtGui import QCursor
+from core.undo_commands import MoveElementsCommand, DeleteElementsCommand
 from utils.logger import logger
 
 
@@ -54,7 +55,7 @@ class SelectionMixin:
             width_px = bounds.width()
             height_px = bounds.height()
 
-            dpi = 203
+            dpi = self.canvas.dpi
             width_mm = width_px * 25.4 / dpi
             height_mm = height_px * 25.4 / dpi
 
@@ -65,6 +66,17 @@ class SelectionMixin:
             self.v_ruler.highlight_bounds(y, height_mm)
             logger.info(f"已高亮边界: X={x}mm 宽度={width_mm:.1f}mm, Y={y}mm 高度={height_mm:.1f}mm")
 
+    def _on_items_moved(self, items):
+        """群组移动完成（每次移动一次通知）"""
+        if len(items) == 1:
+            # 单个元素: 更新属性面板和边界
+            element = items[0].element
+            if self.property_panel.current_element is element:
+                self.property_panel.update_position(element.config.x, element.config.y)
+            self._highlight_element_bounds(items[0])
+        else:
+            logger.debug(f"[群组移动] {len(items)} 个元素已移动")
+
     def _update_ruler_cursor(self, x_mm, y_mm):
         """更新标尺上的光标标记"""
         self.h_ruler.update_cursor_position(x_mm)
@@ -87,33 +99,20 @@ class SelectionMixin:
 
         logger.debug(f"[删除] 正在删除 {len(selected)} 个项目")
 
-        # 关键：在 removeItem 之前保存列表！
-        # removeItem() 会触发 selectionChanged 从而改变 selected
-        items_to_delete = []
-        for item in selected:
-            if hasattr(item, 'element'):
-                items_to_delete.append((item, item.element))
-                logger.debug(
-                    f"[删除] 标记: {item.__class__.__name__} 位于 ({item.element.config.x:.2f}, {item.element.config.y:.2f})mm")
-
-        # 删除所有项目
-        for item, element in items_to_delete:
-            # removeItem 会触发 selectionChanged
-            self.canvas.scene.removeItem(item)
-
-            # 使用保存的变量！
-            if element in self.elements:
-                self.elements.remove(element)
-                logger.debug(f"[删除] 已从列表中移除元素")
-
-            if item in self.graphics_items:
-                self.graphics_items.remove(item)
-                logger.debug(f"[删除] 已从列表中移除图形项目")
-
-        # 清除属性面板
+        elements = [item.element for item in selected if hasattr(item, 'element')]
+        if not elements:
+            return
+
+        # 一个命令删除所有元素（文档批量删除 O(n)，撤销时恢复 ID 和 z 顺序）
+        self.undo_stack.push(DeleteElementsCommand(self, elements))
+
+        # 清除 UI
+        self.selected_item = None
+        self.h_ruler.clear_highlight()
+        self.v_ruler.clear_highlight()
         self.property_panel.set_element(None, None)
 
-        logger.info(f"已删除 {len(items_to_delete)} 个元素。剩余: {len(self.elements)} 个")
+        logger.info(f"已删除 {len(elements)} 个元素。剩余: {len(self.document)} 个")
 
     def eventFilter(self, obj, event):
         """处理画布和场景事件"""
@@ -130,12 +129,27 @@ class SelectionMixin:
                 item = items[0] if items else None
 
                 if item and hasattr(item, 'element'):
-                    self.drag_start_pos = (item.element.config.x, item.element.config.y)
-                    logger.debug(f"[拖拽开始] 位置: ({self.drag_start_pos[0]:.2f}, {self.drag_start_pos[1]:.2f})")
+                    # 记录所有可能被拖动的元素（选中的 + 点击的）的起始位置
+                    drag_items = [i for i in self.canvas.scene.selectedItems() if hasattr(i, 'element')]
+                    if item not in drag_items:
+                        drag_items.append(item)
+                    self.drag_start_positions = {
+                        i: (i.element.config.x, i.element.config.y) for i in drag_items
+                    }
+                    logger.debug(f"[拖拽开始] {len(drag_items)} 个元素, 位置: "
+                                 f"({item.element.config.x:.2f}, {item.element.config.y:.2f})")
+
+                    # 拖拽开始时重新收集对象吸附候选值
+                    self.canvas.snap_engine.invalidate()
+
+                    # 拖拽开始时构建一次边缘索引（不含所有被拖动的元素）
+                    if self.guides_enabled:
+                        self.smart_guides.rebuild_index(self.graphics_items, dpi=self.canvas.dpi,
+                                                        moving_items=drag_items)
                 else:
-                    self.drag_start_pos = None
+                    self.drag_start_positions = None
 
-            elif event.type() == QEvent.GraphicsSceneMouseMove:
+            elif event.type() == QEvent.GraphicsSceneMouseMove and event.buttons() & Qt.LeftButton:
                 items = self.canvas.scene.items(event.scenePos())
                 dragged_item = items[0] if items else None
 
@@ -143,29 +157,31 @@ class SelectionMixin:
                     snap_pos = self.smart_guides.check_alignment(
                         dragged_item,
                         self.graphics_items,
-                        dpi=203
+                        dpi=self.canvas.dpi
                     )
                     if snap_pos:
-                        logger.debug(f"[智能参考线] 对齐到: ({snap_pos[0]:.2f}, {snap_pos[1]:.2f})")
+                        logger.debug(f"[智能参考线] 对齐到: ({snap_pos[0]}, {snap_pos[1]})")
 
             elif event.type() == QEvent.GraphicsSceneMouseRelease:
                 self.smart_guides.clear()
 
-                if self.drag_start_pos and self.selected_item:
-                    from core.undo_commands import MoveElementCommand
-                    element = self.selected_item.element
-                    end_pos = (element.config.x, element.config.y)
-
-                    if self.drag_start_pos != end_pos:
-                        command = MoveElementCommand(
-                            element,
-                            self.drag_start_pos,
-                            end_pos,
-                            self.selected_item
+                if self.drag_start_positions:
+                    moved = [
+                        (i, old_pos) for i, old_pos in self.drag_start_positions.items()
+                        if (i.element.config.x, i.element.config.y) != old_pos
+                    ]
+
+                    if moved:
+                        # 一个群组命令记录整个拖拽
+                        command = MoveElementsCommand(
+                            [i for i, _ in moved],
+                            [old_pos for _, old_pos in moved],
+                            [(i.element.config.x - old_pos[0], i.element.config.y - old_pos[1])
+                             for i, old_pos in moved]
                         )
                         self.undo_stack.push(command)
-                        logger.debug(f"[移动命令] 已添加到撤销栈")
+                        logger.debug(f"[移动命令] 已添加到撤销栈: {len(moved)} 个元素")
 
-                    self.drag_start_pos = None
+                    self.drag_start_positions = None
 
-        return super().eventFilter(obj, event)
\ No newline at end of file
+        return False
\ No newline at end of file
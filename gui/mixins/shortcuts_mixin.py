@@ -254,6 +254,4 @@ class ShortcutsMixin:
                 self._move_selected(0, -1)
             elif key == Qt.Key_Down:
                 logger.debug("[SHORTCUT] 下 - 向下移动 +1mm")
-                self._move_selected(0, 1)
-
-        super().keyPressEvent(event)
\ No newline at end of file
+                self._move_selected(0, 1)
\ No newline at end of file
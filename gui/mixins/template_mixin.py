@@ -1,30 +1,48 @@
 # -*- coding: utf-8 -*-
 """模板操作的混入类"""
 
-from PySide6.QtWidgets import QMessageBox, QDialog, QVBoxLayout, QTextEdit, QFileDialog, QLabel
+from PySide6.QtWidgets import QMessageBox, QDialog, QVBoxLayout, QTextEdit, QFileDialog, QLabel, QApplication
 from PySide6.QtGui import QPixmap, QFont
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QEventLoop
+from concurrent.futures import wait
 from io import BytesIO
 from datetime import datetime
 import json
 from pathlib import Path
 from utils.logger import logger
 from utils.unit_converter import MeasurementUnit
-from core.elements.text_element import TextElement, GraphicsTextItem
-from core.elements.image_element import ImageElement, GraphicsImageItem
-from core.elements.barcode_element import BarcodeElement, GraphicsBarcodeItem
 
 
 class TemplateMixin:
     """模板保存/加载和 ZPL 导出操作"""
 
+    def _read_template(self, filepath):
+        """在后台线程中解析模板，等待期间保持界面响应"""
+        future = self.template_manager.load_template_async(filepath)
+        while not future.done():
+            wait([future], timeout=0.02)
+            QApplication.processEvents(QEventLoop.ExcludeUserInputEvents)
+        return future.result()
+
+    def _add_elements_bulk(self, elements):
+        """创建图形项并批量添加到场景（一次重建索引和重绘）"""
+        with self.canvas.bulk_update():
+            pairs = []
+            for element in elements:
+                graphics_item = self._create_graphics_item(element)
+                if graphics_item is None:
+                    continue
+                pairs.append((element, graphics_item))
+
+            self.document.add_many(pairs)
+
     def _load_template_from_file(self, filepath):
         """从文件加载模板（用于 1C 集成）- 加载到画布"""
         try:
             logger.info(f"[1C-导入] 从文件加载模板: {filepath}")
 
             # 使用 TemplateManager 进行解析（类似于 _load_template）
-            template_data = self.template_manager.load_template(filepath)
+            template_data = self._read_template(filepath)
             logger.info(f"[1C-导入] 模板已加载: {template_data.get('name', '未命名')}")
 
             # 应用网格配置（向后兼容）
@@ -47,10 +65,9 @@ class TemplateMixin:
                 from config import GridConfig
                 self.canvas.set_grid_config(GridConfig())
 
-            # 清除画布
+            # 清除画布（先清空文档，图形项从场景移除后再清除场景）
+            self.document.clear()
             self.canvas.clear_and_redraw_grid()
-            self.elements.clear()
-            self.graphics_items.clear()
             logger.info("[1C-导入] 画布已清除")
 
             # 设置单位
@@ -75,19 +92,7 @@ class TemplateMixin:
                 logger.info(f"[1C-导入] 标签尺寸已设置: {width_mm}x{height_mm}mm")
 
             # 加载元素
-            for element in template_data['elements']:
-                if isinstance(element, TextElement):
-                    graphics_item = GraphicsTextItem(element, dpi=self.canvas.dpi)
-                elif isinstance(element, BarcodeElement):
-                    graphics_item = GraphicsBarcodeItem(element, dpi=self.canvas.dpi)
-                elif isinstance(element, ImageElement):
-                    graphics_item = GraphicsImageItem(element, dpi=self.canvas.dpi)
-                else:
-                    continue
-
-                self.canvas.scene.addItem(graphics_item)
-                self.elements.append(element)
-                self.graphics_items.append(graphics_item)
+            self._add_elements_bulk(template_data['elements'])
 
             logger.info(f"[1C-导入] 模板加载成功: {len(self.elements)} 个元素")
 
@@ -109,7 +114,7 @@ class TemplateMixin:
             'dpi': self.canvas.dpi
         }
 
-        zpl_code = self.zpl_generator.generate(self.elements, label_config)
+        zpl_code = self.zpl_generator.generate(self.document, label_config)
         logger.info("已生成 ZPL 代码用于导出")
 
         # 在对话框中显示
@@ -288,7 +293,7 @@ class TemplateMixin:
             return
 
         try:
-            template_data = self.template_manager.load_template(filepath)
+            template_data = self._read_template(filepath)
 
             # 应用网格配置（向后兼容）
             label_config = template_data['label_config']
@@ -312,9 +317,8 @@ class TemplateMixin:
                 from config import GridConfig
                 self.canvas.set_grid_config(GridConfig())
 
+            self.document.clear()
             self.canvas.clear_and_redraw_grid()
-            self.elements.clear()
-            self.graphics_items.clear()
 
             display_unit = template_data.get('display_unit', MeasurementUnit.MM)
 
@@ -343,19 +347,7 @@ class TemplateMixin:
 
                 logger.debug(f"[加载模板] 微调框已更新: 宽={width_mm}, 高={height_mm}")
 
-            for element in template_data['elements']:
-                if isinstance(element, TextElement):
-                    graphics_item = GraphicsTextItem(element, dpi=self.canvas.dpi)
-                elif isinstance(element, BarcodeElement):
-                    graphics_item = GraphicsBarcodeItem(element, dpi=self.canvas.dpi)
-                elif isinstance(element, ImageElement):
-                    graphics_item = GraphicsImageItem(element, dpi=self.canvas.dpi)
-                else:
-                    continue
-
-                self.canvas.scene.addItem(graphics_item)
-                self.elements.append(element)
-                self.graphics_items.append(graphics_item)
+            self._add_elements_bulk(template_data['elements'])
 
             logger.info(f"模板已加载: {filepath} ({len(self.elements)} 个元素)")
             QMessageBox.information(
@@ -418,7 +410,7 @@ class TemplateMixin:
             logger.info("没有占位符，使用实际文本值")
 
         logger.info("正在生成 ZPL 代码...")
-        zpl_code = self.zpl_generator.generate(self.elements, label_config, test_data)
+        zpl_code = self.zpl_generator.generate(self.document, label_config, test_data)
 
         # 在 DEBUG 模式下显示 ZPL
         logger.debug("=" * 60)
@@ -3,7 +3,6 @@
 
 from PySide6.QtWidgets import QMenu
 from utils.logger import logger
-from core.undo_commands import DeleteElementCommand
 
 
 class UIHelpersMixin:
@@ -27,20 +26,27 @@ class UIHelpersMixin:
 
     def _bring_to_front(self):
         """移到最前面（z 顺序）"""
-        if self.selected_item:
-            max_z = max([item.zValue() for item in self.graphics_items], default=0)
-            self.selected_item.setZValue(max_z + 1)
-            logger.debug(f"[Z顺序] 移到最前面: z={max_z + 1}")
+        elements = self._selected_elements()
+        if elements:
+            entries = self.document.bring_to_front(elements)
+            logger.debug(f"[Z顺序] 移到最前面: z={entries[-1].z if entries else None}")
             logger.info(f"元素已移到最前面")
 
     def _send_to_back(self):
         """移到最后面（z 顺序）"""
-        if self.selected_item:
-            min_z = min([item.zValue() for item in self.graphics_items], default=0)
-            self.selected_item.setZValue(min_z - 1)
-            logger.debug(f"[Z顺序] 移到最后面: z={min_z - 1}")
+        elements = self._selected_elements()
+        if elements:
+            entries = self.document.send_to_back(elements)
+            logger.debug(f"[Z顺序] 移到最后面: z={entries[-1].z if entries else None}")
             logger.info(f"元素已移到最后面")
 
+    def _selected_elements(self):
+        """选中的元素（没有多选时使用当前项）"""
+        elements = [item.element for item in self.canvas.scene.selectedItems() if hasattr(item, 'element')]
+        if not elements and self.selected_item is not None and hasattr(self.selected_item, 'element'):
+            elements = [self.selected_item.element]
+        return elements
+
     def _show_context_menu(self, item, global_pos):
         """显示上下文菜单"""
         from PySide6.QtWidgets import QMenu
@@ -77,42 +83,3 @@ class UIHelpersMixin:
 
         logger.debug(f"[上下文菜单] 显示位置: {global_pos}")
         menu.exec(global_pos)
-
-    def _delete_selected(self):
-        """删除选中的元素（支持多选）"""
-        selected = self.canvas.scene.selectedItems()
-
-        if len(selected) > 1:
-            # 组删除
-            logger.debug(f"[组删除] 删除 {len(selected)} 个项目")
-
-            for item in selected:
-                if hasattr(item, 'element'):
-                    element = item.element
-                    command = DeleteElementCommand(self, element, item)
-                    self.undo_stack.push(command)
-
-            # 清除 UI
-            self.selected_item = None
-            self.h_ruler.clear_highlight()
-            self.v_ruler.clear_highlight()
-            self.property_panel.set_element(None, None)
-            logger.info(f"删除了 {len(selected)} 个元素")
-
-        elif self.selected_item:
-            # 单元素删除
-            # 在 removeItem 之前保存（竞态条件！）
-            item_to_delete = self.selected_item
-            element_to_delete = item_to_delete.element if hasattr(item_to_delete, 'element') else None
-
-            if element_to_delete:
-                logger.debug(f"[删除] 创建删除命令")
-                command = DeleteElementCommand(self, element_to_delete, item_to_delete)
-                self.undo_stack.push(command)
-
-                # 清除 UI
-                self.selected_item = None
-                self.h_ruler.clear_highlight()
-                self.v_ruler.clear_highlight()
-                self.property_panel.set_element(None, None)
-                logger.debug(f"[删除] UI 已清除")
\ No newline at end of file
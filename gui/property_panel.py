@@ -3,11 +3,13 @@
 
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QLineEdit,
                                QSpinBox, QDoubleSpinBox, QGroupBox, QFormLayout, QComboBox)
-from PySide6.QtCore import Signal
+from PySide6.QtCore import Signal, QTimer
 from utils.logger import logger
 from utils.unit_converter import UnitConverter
-from config import UNIT_DECIMALS, UNIT_STEPS
-from core.elements.text_element import ZplFont
+from config import CONFIG, UNIT_DECIMALS, UNIT_STEPS
+from core.elements.text_element import ZplFont, TextRenderMode
+from core.dithering import DitherMode
+from core.elements.serial import SerialField
 
 
 class PropertyPanel(QWidget):
@@ -15,10 +17,20 @@ class PropertyPanel(QWidget):
 
     property_changed = Signal(str, object)  # (属性名称, 新值)
 
+    IMAGE_RESIZE_DEBOUNCE_MS = 150  # 图片尺寸微调框的防抖间隔
+
     def __init__(self):
         super().__init__()
         self.current_element = None
         self.current_graphics_item = None
+
+        # 图片尺寸调整防抖: 停止调整后才重新缩放图片
+        self._image_resize_timer = QTimer(self)
+        self._image_resize_timer.setSingleShot(True)
+        self._image_resize_timer.setInterval(self.IMAGE_RESIZE_DEBOUNCE_MS)
+        self._image_resize_timer.timeout.connect(self._apply_image_resize)
+        self._image_resize_item = None
+
         self._setup_ui()
         logger.info("属性面板已初始化")
 
@@ -84,6 +96,35 @@ class PropertyPanel(QWidget):
         )
         text_form.addRow("占位符:", self.placeholder_input)
 
+        # 自动缩小（按 Zebra 字体宽度表，超过最大宽度时减小字体）
+        self.fit_width_input = QDoubleSpinBox()
+        self.fit_width_input.setRange(0, 500)
+        self.fit_width_input.setDecimals(1)
+        self.fit_width_input.setSuffix(" mm")
+        self.fit_width_input.setSpecialValueText("关闭")
+        self.fit_width_input.setToolTip("文本超过此宽度时自动减小字体大小（0 = 关闭）")
+        self.fit_width_input.valueChanged.connect(
+            lambda v: self._on_property_change('fit_width', v if v > 0 else None)
+        )
+        text_form.addRow("自动缩小:", self.fit_width_input)
+
+        # 打印方式: 打印机字体或 TrueType 图形（打印机没有对应字体时）
+        self.render_mode_combo = QComboBox()
+        for mode in TextRenderMode:
+            self.render_mode_combo.addItem(mode.display_name, mode)
+        self.render_mode_combo.currentIndexChanged.connect(
+            lambda: self._on_property_change('render_mode', self.render_mode_combo.currentData())
+        )
+        text_form.addRow("打印方式:", self.render_mode_combo)
+
+        self.ttf_font_input = QLineEdit()
+        self.ttf_font_input.setPlaceholderText(CONFIG['TTF_FONT'])
+        self.ttf_font_input.setToolTip("TrueType 字体文件或系统字体文件名（图形模式、下载字体模式）")
+        self.ttf_font_input.editingFinished.connect(
+            lambda: self._on_property_change('ttf_font', self.ttf_font_input.text().strip() or None)
+        )
+        text_form.addRow("TTF 字体:", self.ttf_font_input)
+
         # 字体样式
         from PySide6.QtWidgets import QCheckBox
 
@@ -156,6 +197,52 @@ class PropertyPanel(QWidget):
         barcode_group.setVisible(False)
         self.barcode_group = barcode_group
 
+        # === 序列号分组（文本和条码，打印机端递增 ^SN/^SF）===
+        serial_group = QGroupBox("序列号")
+        serial_form = QFormLayout()
+
+        from PySide6.QtWidgets import QCheckBox
+        self.serial_checkbox = QCheckBox("打印机递增 (^SN)")
+        self.serial_checkbox.setToolTip("打印数量由 ^PQ 给出，打印机自动递增编号")
+        self.serial_checkbox.stateChanged.connect(
+            lambda state: self._on_property_change('serial_enabled', state == 2)  # 2 = Qt.Checked
+        )
+        serial_form.addRow("", self.serial_checkbox)
+
+        self.serial_prefix_input = QLineEdit()
+        self.serial_prefix_input.setPlaceholderText("BOX")
+        self.serial_prefix_input.textChanged.connect(
+            lambda v: self._on_property_change('serial_prefix', v)
+        )
+        serial_form.addRow("前缀:", self.serial_prefix_input)
+
+        self.serial_start_input = QSpinBox()
+        self.serial_start_input.setRange(0, 999999999)
+        self.serial_start_input.valueChanged.connect(
+            lambda v: self._on_property_change('serial_start', v)
+        )
+        serial_form.addRow("起始值:", self.serial_start_input)
+
+        self.serial_increment_input = QSpinBox()
+        self.serial_increment_input.setRange(-9999, 9999)
+        self.serial_increment_input.valueChanged.connect(
+            lambda v: self._on_property_change('serial_increment', v)
+        )
+        serial_form.addRow("增量:", self.serial_increment_input)
+
+        self.serial_padding_input = QSpinBox()
+        self.serial_padding_input.setRange(0, 12)
+        self.serial_padding_input.setSuffix(" 位")
+        self.serial_padding_input.setToolTip("补零位数，0 = 不补零")
+        self.serial_padding_input.valueChanged.connect(
+            lambda v: self._on_property_change('serial_padding', v)
+        )
+        serial_form.addRow("补零:", self.serial_padding_input)
+
+        serial_group.setLayout(serial_form)
+        serial_group.setVisible(False)
+        self.serial_group = serial_group
+
         # === 形状属性分组 ===
         shape_group = QGroupBox("形状属性")
         shape_form = QFormLayout()
@@ -265,6 +352,15 @@ class PropertyPanel(QWidget):
         self.image_height_input.valueChanged.connect(self._on_image_height_changed)
         image_layout.addRow("高度:", self.image_height_input)
 
+        # 抖动模式（打印时的单色转换）
+        self.image_dither_combo = QComboBox()
+        for mode in DitherMode:
+            self.image_dither_combo.addItem(mode.display_name, mode)
+        self.image_dither_combo.currentIndexChanged.connect(
+            lambda: self._on_property_change('image_dither_mode', self.image_dither_combo.currentData())
+        )
+        image_layout.addRow("抖动:", self.image_dither_combo)
+
         # 更改图片按钮
         from PySide6.QtWidgets import QPushButton
         self.change_image_btn = QPushButton("更改图片...")
@@ -279,6 +375,7 @@ class PropertyPanel(QWidget):
         layout.addWidget(pos_group)
         layout.addWidget(text_group)
         layout.addWidget(barcode_group)
+        layout.addWidget(serial_group)
         layout.addWidget(shape_group)
         layout.addWidget(image_group)
         layout.addStretch()
@@ -342,6 +439,12 @@ class PropertyPanel(QWidget):
             from core.elements.barcode_element import BarcodeElement
             from core.elements.shape_element import RectangleElement, CircleElement, LineElement
 
+            # 序列号只用于文本和条码
+            has_serial = isinstance(element, (TextElement, BarcodeElement))
+            self.serial_group.setVisible(has_serial)
+            if has_serial:
+                self._load_serial(element.serial)
+
             if isinstance(element, TextElement):
                 # 仅显示文本属性
                 self.text_group.setVisible(True)
@@ -363,6 +466,18 @@ class PropertyPanel(QWidget):
                 self.placeholder_input.setText(
                     element.data_field if element.data_field else ""
                 )
+                self.fit_width_input.blockSignals(True)
+                self.fit_width_input.setValue(element.fit_width or 0)
+                self.fit_width_input.blockSignals(False)
+
+                for i in range(self.render_mode_combo.count()):
+                    if self.render_mode_combo.itemData(i) == element.render_mode:
+                        self.render_mode_combo.blockSignals(True)
+                        self.render_mode_combo.setCurrentIndex(i)
+                        self.render_mode_combo.blockSignals(False)
+                        break
+                self.ttf_font_input.setText(element.ttf_font or "")
+                self.ttf_font_input.setEnabled(element.render_mode != TextRenderMode.PRINTER_FONT)
 
                 # 加载字体样式
                 self.bold_checkbox.setChecked(element.bold)
@@ -380,7 +495,7 @@ class PropertyPanel(QWidget):
 
                 # 关键：使用实际宽度！
                 if hasattr(element, 'calculate_real_width'):
-                    real_width = element.calculate_real_width(dpi=203)
+                    real_width = element.calculate_real_width(dpi=self._printer_dpi())
                     self.barcode_width_input.setValue(int(real_width))
                     logger.debug(f"[属性-条码] 宽度（实际）: {real_width:.1f}mm")
                 else:
@@ -418,6 +533,14 @@ class PropertyPanel(QWidget):
                 self.image_width_input.blockSignals(False)
                 self.image_height_input.blockSignals(False)
 
+                # 抖动模式下拉菜单
+                for i in range(self.image_dither_combo.count()):
+                    if self.image_dither_combo.itemData(i) == element.dither_mode:
+                        self.image_dither_combo.blockSignals(True)
+                        self.image_dither_combo.setCurrentIndex(i)
+                        self.image_dither_combo.blockSignals(False)
+                        break
+
                 logger.debug(f"[属性-图片] 设置属性: {element.config.width}x{element.config.height}mm")
 
             elif isinstance(element, RectangleElement):
@@ -595,12 +718,25 @@ class PropertyPanel(QWidget):
             if self.current_graphics_item:
                 self.current_graphics_item.update_display_text()
 
+        elif prop_name == 'render_mode':
+            self.current_element.render_mode = value
+            self.ttf_font_input.setEnabled(value != TextRenderMode.PRINTER_FONT)
+
+        elif prop_name == 'ttf_font':
+            self.current_element.ttf_font = value
+
+        elif prop_name == 'fit_width':
+            self.current_element.fit_width = value
+            if self.current_graphics_item:
+                # 关闭时恢复设计的字体大小
+                self.current_graphics_item.update_font_size(self.current_element.font_size)
+
         elif prop_name == 'barcode_data':
             self.current_element.data = value
 
             # 关键：更改 CODE128 数据时重新计算宽度！
             if hasattr(self.current_element, 'calculate_real_width'):
-                real_width = self.current_element.calculate_real_width(dpi=203)
+                real_width = self.current_element.calculate_real_width(dpi=self._printer_dpi())
                 self.barcode_width_input.blockSignals(True)
                 self.barcode_width_input.setValue(int(real_width))
                 self.barcode_width_input.blockSignals(False)
@@ -610,13 +746,17 @@ class PropertyPanel(QWidget):
 
                 logger.debug(f"[属性-条码] 数据更改，新宽度: {real_width:.1f}mm")
 
+            # 画布绘制新数据的条/模块（宽度不变时 update_size 不会重绘）
+            if self.current_graphics_item:
+                self.current_graphics_item.update()
+
         elif prop_name == 'barcode_module_width':
             # 关键：更改模块宽度会影响实际宽度！
             if hasattr(self.current_element, 'module_width'):
                 self.current_element.module_width = value
 
                 # 重新计算实际宽度
-                real_width = self.current_element.calculate_real_width(dpi=203)
+                real_width = self.current_element.calculate_real_width(dpi=self._printer_dpi())
 
                 # 无信号更新属性面板宽度
                 self.barcode_width_input.blockSignals(True)
@@ -637,6 +777,9 @@ class PropertyPanel(QWidget):
         elif prop_name == 'barcode_data_field':
             self.current_element.data_field = value
 
+        elif prop_name.startswith('serial_'):
+            self._apply_serial_change(prop_name, value)
+
         elif prop_name == 'circle_diameter':
             # 圆形直径更改
             from core.elements.shape_element import CircleElement
@@ -720,6 +863,11 @@ class PropertyPanel(QWidget):
             if self.current_graphics_item and hasattr(self.current_graphics_item, 'update_from_element'):
                 self.current_graphics_item.update_from_element()
 
+        elif prop_name == 'image_dither_mode':
+            # 位图缓存键包含抖动模式 - 下次导出时重新生成
+            self.current_element.dither_mode = value
+            logger.debug(f"[属性-图片] 抖动模式: {value.code}")
+
         elif prop_name == 'line_end_x':
             # 线条结束 X - 从当前单位转换为毫米
             end_x_mm = UnitConverter.unit_to_mm(value, current_unit)
@@ -740,11 +888,80 @@ class PropertyPanel(QWidget):
             if self.current_graphics_item and hasattr(self.current_graphics_item, 'update_from_element'):
                 self.current_graphics_item.update_from_element()
 
+        # 元素属性已改变: 丢弃图形项的渲染缓存
+        self._invalidate_item_cache(self.current_graphics_item)
+
+        # 通知文档（监听者按元素 ID 更新）
+        document = getattr(main_window, 'document', None)
+        if document is not None:
+            document.notify_changed(self.current_element)
+
         # 属性更改信号
         self.property_changed.emit(prop_name, value)
 
         logger.info(f"属性 '{prop_name}' 更改为 '{value}'")
 
+    def _load_serial(self, serial):
+        """显示序列号设置（没有序列号时显示默认值）"""
+        enabled = serial is not None
+        serial = serial or SerialField()
+        widgets = (self.serial_checkbox, self.serial_prefix_input, self.serial_start_input,
+                   self.serial_increment_input, self.serial_padding_input)
+        for widget in widgets:
+            widget.blockSignals(True)
+        self.serial_checkbox.setChecked(enabled)
+        self.serial_prefix_input.setText(serial.prefix)
+        self.serial_padding_input.setMinimum(1 if serial.prefix else 0)
+        self.serial_start_input.setValue(serial.start)
+        self.serial_increment_input.setValue(serial.increment)
+        self.serial_padding_input.setValue(serial.padding)
+        for widget in widgets:
+            widget.blockSignals(False)
+            if widget is not self.serial_checkbox:
+                widget.setEnabled(enabled)
+
+    def _apply_serial_change(self, prop_name, value):
+        """序列号设置更改 → 元素的 SerialField"""
+        element = self.current_element
+        if prop_name == 'serial_enabled':
+            element.serial = SerialField(
+                start=self.serial_start_input.value(),
+                increment=self.serial_increment_input.value(),
+                padding=self.serial_padding_input.value(),
+                prefix=self.serial_prefix_input.text()
+            ) if value else None
+            for widget in (self.serial_prefix_input, self.serial_start_input,
+                           self.serial_increment_input, self.serial_padding_input):
+                widget.setEnabled(bool(value))
+        elif element.serial is None:
+            return
+        elif prop_name == 'serial_prefix':
+            # ^SF 掩码需要固定位数: 有前缀时补零至少 1 位（setMinimum 会触发 serial_padding 更改）
+            if value and element.serial.padding < 1:
+                element.serial.padding = 1
+            element.serial.prefix = value
+            self.serial_padding_input.setMinimum(1 if value else 0)
+        elif prop_name == 'serial_start':
+            element.serial.start = value
+        elif prop_name == 'serial_increment':
+            element.serial.increment = value
+        elif prop_name == 'serial_padding':
+            element.serial.padding = value
+
+        # 画布显示第一个编号
+        item = self.current_graphics_item
+        if item is not None and hasattr(item, 'update_display_text'):
+            item.update_display_text()
+        elif item is not None and hasattr(element, 'calculate_real_width'):
+            item.update_size(element.calculate_real_width(dpi=self._printer_dpi()), element.height)
+        logger.debug(f"[属性-序列号] {prop_name} = {value}: {element.serial}")
+
+    def _invalidate_item_cache(self, item):
+        """使图形项的渲染缓存失效（画布缓存策略）"""
+        canvas = getattr(item, 'canvas', None)
+        if canvas is not None and hasattr(canvas, 'item_cache_policy'):
+            canvas.item_cache_policy.invalidate(item)
+
     def update_position(self, x_mm, y_mm):
         """更新 UI 中的位置（从 position_changed 信号调用）"""
         # 阻塞信号以避免触发 _on_property_change
@@ -805,16 +1022,28 @@ class PropertyPanel(QWidget):
         if self.current_element and hasattr(self.current_element.config, 'width'):
             logger.debug(f"[属性-图片] 宽度更改: {value}mm")
             self.current_element.config.width = value
-            if self.current_graphics_item:
-                self.current_graphics_item.update_from_element()
+            self._schedule_image_resize()
 
     def _on_image_height_changed(self, value):
         """更新图片高度"""
         if self.current_element and hasattr(self.current_element.config, 'height'):
             logger.debug(f"[属性-图片] 高度更改: {value}mm")
             self.current_element.config.height = value
-            if self.current_graphics_item:
-                self.current_graphics_item.update_from_element()
+            self._schedule_image_resize()
+
+    def _schedule_image_resize(self):
+        """重新启动防抖定时器（连续调整只缩放一次）"""
+        if self.current_graphics_item:
+            self._image_resize_item = self.current_graphics_item
+            self._image_resize_timer.start()
+
+    def _apply_image_resize(self):
+        """防抖结束: 重新缩放图片"""
+        item = self._image_resize_item
+        self._image_resize_item = None
+        if item is not None:
+            item.update_from_element()
+            self._invalidate_item_cache(item)
 
     def _on_change_image(self):
         """更改图片"""
@@ -839,10 +1068,13 @@ class PropertyPanel(QWidget):
         logger.debug(f"[属性-图片] 选择新图片: {file_path}")
 
         try:
-            # 转换为 base64
-            with open(file_path, 'rb') as f:
-                image_bytes = f.read()
-                image_data = base64.b64encode(image_bytes).decode('utf-8')
+            # 后台导入（缩小到标签分辨率）；没有主窗口时直接读取原图
+            main_window = self._get_main_window()
+            if main_window is not None and hasattr(main_window, '_import_image_file'):
+                image_data = main_window._import_image_file(file_path).image_data
+            else:
+                with open(file_path, 'rb') as f:
+                    image_data = base64.b64encode(f.read()).decode('utf-8')
 
             # 更新元素
             self.current_element.config.image_path = file_path
@@ -851,12 +1083,19 @@ class PropertyPanel(QWidget):
             # 更新图形项
             if self.current_graphics_item:
                 self.current_graphics_item.update_from_element()
+                self._invalidate_item_cache(self.current_graphics_item)
 
             logger.info(f"图片已更改: {file_path}")
 
         except Exception as e:
             logger.error(f"[属性-图片] 更改图片失败: {e}")
 
+    def _printer_dpi(self):
+        """当前打印机配置的分辨率（条码实际宽度取决于打印点）"""
+        main_window = self._get_main_window()
+        profile = getattr(main_window, 'printer_profile', None)
+        return profile.dpi if profile is not None else CONFIG['DEFAULT_DPI']
+
     def _get_main_window(self):
         """获取主窗口"""
         widget = self.parent()
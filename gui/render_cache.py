@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""画布渲染缓存策略和帧时间计数器"""
+
+import time
+from collections import deque
+
+from PySide6.QtWidgets import QGraphicsItem
+from PySide6.QtCore import QTimer
+
+from utils.logger import logger
+
+
+class ItemCachePolicy:
+    """
+    画布元素的 QGraphicsItem.CacheMode 策略
+
+    - 空闲时: 配置的缓存模式（默认 DeviceCoordinateCache）
+    - 元素属性改变时: 使缓存失效（下次绘制时重新渲染）
+    - 缩放进行中: 关闭缓存（避免每一步都重新渲染缓存），
+      停止缩放 ZOOM_IDLE_MS 毫秒后恢复
+    """
+
+    MODES = {
+        'device': QGraphicsItem.CacheMode.DeviceCoordinateCache,
+        'item': QGraphicsItem.CacheMode.ItemCoordinateCache,
+        'none': QGraphicsItem.CacheMode.NoCache,
+    }
+
+    ZOOM_IDLE_MS = 250
+
+    def __init__(self, scene, mode='device'):
+        self.scene = scene
+        self.idle_mode = self.MODES[mode]
+        self.zooming = False
+
+        self._zoom_timer = QTimer()
+        self._zoom_timer.setSingleShot(True)
+        self._zoom_timer.setInterval(self.ZOOM_IDLE_MS)
+        self._zoom_timer.timeout.connect(self.end_zoom)
+
+        logger.debug(f"[渲染缓存] 策略已初始化: 模式={mode}")
+
+    def _element_items(self):
+        return [item for item in self.scene.items() if hasattr(item, 'element')]
+
+    def current_mode(self):
+        """当前应使用的缓存模式"""
+        if self.zooming:
+            return QGraphicsItem.CacheMode.NoCache
+        return self.idle_mode
+
+    def set_mode(self, mode):
+        """更改空闲时的缓存模式并应用到所有元素"""
+        self.idle_mode = self.MODES[mode]
+        self.apply_all()
+        logger.debug(f"[渲染缓存] 模式已更改: {mode}")
+
+    def apply(self, item):
+        """为新元素设置缓存模式"""
+        item.setCacheMode(self.current_mode())
+
+    def apply_all(self):
+        """为场景中的所有元素设置缓存模式"""
+        mode = self.current_mode()
+        for item in self._element_items():
+            item.setCacheMode(mode)
+
+    def invalidate(self, item):
+        """元素属性已改变: 丢弃缓存的渲染结果"""
+        if item.cacheMode() != QGraphicsItem.CacheMode.NoCache:
+            item.update()
+
+    def begin_zoom(self):
+        """缩放开始/继续: 关闭缓存，重新启动空闲定时器"""
+        if not self.zooming:
+            self.zooming = True
+            self.apply_all()
+            logger.debug("[渲染缓存] 缩放中 - 缓存已关闭")
+        self._zoom_timer.start()
+
+    def end_zoom(self):
+        """缩放停止: 恢复缓存"""
+        if self.zooming:
+            self.zooming = False
+            self.apply_all()
+            logger.debug("[渲染缓存] 缩放结束 - 缓存已恢复")
+
+
+class FrameTimeCounter:
+    """视口绘制耗时计数器（最近 N 帧）"""
+
+    def __init__(self, window=60):
+        self.frame_times = deque(maxlen=window)  # 毫秒
+        self._started = None
+
+    def begin(self):
+        self._started = time.perf_counter()
+
+    def end(self):
+        if self._started is not None:
+            self.frame_times.append((time.perf_counter() - self._started) * 1000.0)
+            self._started = None
+
+    def reset(self):
+        self.frame_times.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: frames, avg_ms, max_ms, last_ms
+        """
+        if not self.frame_times:
+            return {'frames': 0, 'avg_ms': 0.0, 'max_ms': 0.0, 'last_ms': 0.0}
+
+        return {
+            'frames': len(self.frame_times),
+            'avg_ms': sum(self.frame_times) / len(self.frame_times),
+            'max_ms': max(self.frame_times),
+            'last_ms': self.frame_times[-1],
+        }
+
+    def text(self):
+        """用于叠加显示的文本"""
+        stats = self.stats()
+        return f"帧: {stats['last_ms']:.1f}ms  平均: {stats['avg_ms']:.1f}ms  最大: {stats['max_ms']:.1f}ms"
@@ -2,14 +2,23 @@
 """标尺 - 用于元素精确定位"""
 
 from PySide6.QtWidgets import QWidget
+import math
+
 from PySide6.QtCore import Qt, QRect
-from PySide6.QtGui import QPainter, QColor, QPen, QFont
+from PySide6.QtGui import QPainter, QColor, QPen, QFont, QPixmap
 from utils.logger import logger
 from utils.unit_converter import MeasurementUnit, UnitConverter
 
 
 class RulerWidget(QWidget):
-    """带有毫米刻度的标尺"""
+    """带有毫米刻度的标尺
+
+    刻度条渲染到缓存的 QPixmap 中（键: 尺寸、长度、缩放、单位、DPI），
+    光标标记和边界高亮只重绘其周围的小脏矩形。
+    """
+
+    # 光标标记脏矩形的半宽（像素）
+    CURSOR_DIRTY_MARGIN = 3
 
     def __init__(self, orientation, length_mm, dpi, scale=2.5, unit=MeasurementUnit.MM):
         """
@@ -60,6 +69,10 @@ class RulerWidget(QWidget):
         # 元素边界高亮
         self.highlighted_bounds = None  # (start_mm, width_mm)
 
+        # 刻度条缓存
+        self._tick_pixmap = None
+        self._tick_cache_key = None
+
     def _mm_to_px(self, mm):
         """毫米 -> 像素转换（不考虑缩放）"""
         return mm * self.dpi / 25.4  # 保持浮点数精度
@@ -70,18 +83,17 @@ class RulerWidget(QWidget):
             f"[RULER-{'H' if self.orientation == Qt.Horizontal else 'V'}] 设置单位: {self.unit.value} -> {unit.value}")
 
         self.unit = unit
-        self.update()
+        self.invalidate_cache()
 
     def paintEvent(self, event):
-        """绘制标尺"""
+        """绘制标尺（刻度来自缓存，仅重绘脏区域）"""
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
 
-        # 背景
-        painter.fillRect(self.rect(), self.bg_color)
+        # 背景 + 刻度
+        dirty = event.rect()
+        painter.drawPixmap(dirty, self._get_tick_pixmap(), self._pixmap_rect(dirty))
 
-        # 刻度
-        self._draw_ticks(painter)
+        painter.setRenderHint(QPainter.Antialiasing)
 
         # 绘制高亮边界
         if self.highlighted_bounds:
@@ -93,69 +105,96 @@ class RulerWidget(QWidget):
 
         painter.end()
 
+    def _pixmap_rect(self, rect):
+        """将 widget 坐标矩形转换为缓存 pixmap 的物理像素矩形"""
+        ratio = self._tick_pixmap.devicePixelRatio()
+        return QRect(
+            round(rect.x() * ratio), round(rect.y() * ratio),
+            round(rect.width() * ratio), round(rect.height() * ratio)
+        )
+
+    def _get_tick_pixmap(self):
+        """返回缓存的刻度条，参数变化时重新渲染"""
+        ratio = self.devicePixelRatioF()
+        key = (self.width(), self.height(), self.length_mm, self.scale_factor, self.unit, self.dpi, ratio)
+
+        if self._tick_pixmap is None or self._tick_cache_key != key:
+            orientation_name = "H" if self.orientation == Qt.Horizontal else "V"
+            logger.debug(f"[RULER-{orientation_name}] 渲染刻度缓存: {self.width()}x{self.height()}px")
+
+            pixmap = QPixmap(max(1, round(self.width() * ratio)), max(1, round(self.height() * ratio)))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(self.bg_color)
+
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            self._draw_ticks(painter)
+            painter.end()
+
+            self._tick_pixmap = pixmap
+            self._tick_cache_key = key
+
+        return self._tick_pixmap
+
+    def invalidate_cache(self):
+        """丢弃刻度缓存并完整重绘"""
+        self._tick_pixmap = None
+        self._tick_cache_key = None
+        self.update()
+
+    def _tick_steps(self):
+        """根据单位返回 (主刻度步长 mm, 次刻度步长 mm, 标签小数位)"""
+        if self.unit == MeasurementUnit.CM:
+            return 10.0, 5.0, 1  # 主刻度每 1cm，次刻度每 0.5cm
+        if self.unit == MeasurementUnit.INCH:
+            return 25.4, 25.4 / 8, 2  # 主刻度每 1 inch，次刻度每 1/8 inch
+        return 5.0, 2.0, 0  # MM: 主刻度每 5mm（带标签），次刻度每 2mm（与 canvas 网格一致）
+
+    def _tick_positions(self):
+        """
+        计算刻度位置
+
+        Returns:
+            list: (pos_mm, is_major) 按位置排序
+        """
+        major_step_mm, minor_step_mm, _ = self._tick_steps()
+
+        ticks = {}
+        for k in range(int(math.floor(self.length_mm / minor_step_mm + 1e-9)) + 1):
+            pos_mm = k * minor_step_mm
+            ticks[round(pos_mm, 6)] = (pos_mm, False)
+
+        # 主刻度覆盖同一位置的次刻度
+        for k in range(int(math.floor(self.length_mm / major_step_mm + 1e-9)) + 1):
+            pos_mm = k * major_step_mm
+            ticks[round(pos_mm, 6)] = (pos_mm, True)
+
+        return [ticks[key] for key in sorted(ticks)]
+
     def _draw_ticks(self, painter):
         """绘制刻度和标签"""
-        # === 根据单位设置网格参数 ===
-        if self.unit == MeasurementUnit.MM:
-            major_step_mm = 5.0  # 主刻度（带标签）每 5mm → 0, 5, 10, 15, 20, 25
-            minor_step_mm = 2.0  # 次刻度每 2mm（与 canvas 网格一致）
-            decimals = 0  # 标签无小数
-
-        elif self.unit == MeasurementUnit.CM:
-            major_step_mm = 10.0  # 主刻度每 1cm
-            minor_step_mm = 5.0  # 次刻度每 0.5cm
-            decimals = 1  # 标签带 1 位小数
-
-        elif self.unit == MeasurementUnit.INCH:
-            major_step_mm = 25.4  # 主刻度每 1 inch
-            minor_step_mm = 25.4 / 8  # 次刻度每 1/8 inch
-            decimals = 2  # 标签带 2 位小数
-
-        # === 绘制刻度 ===
-        # 收集所有刻度位置（主刻度 + 次刻度）
-        tick_positions = set()
-
-        # 添加主刻度位置（每 5mm）
-        mm = 0.0
-        while mm <= self.length_mm:
-            tick_positions.add(mm)
-            mm += major_step_mm
-
-        # 添加次刻度位置（每 2mm）
-        mm = 0.0
-        while mm <= self.length_mm:
-            tick_positions.add(mm)
-            mm += minor_step_mm
-
-        # 绘制所有刻度
-        for pos_mm in sorted(tick_positions):
-            # 确定是否为主刻度（带标签）
-            is_major = (abs(pos_mm % major_step_mm) < 0.01)
+        _, _, decimals = self._tick_steps()
 
+        for pos_mm, is_major in self._tick_positions():
             # 刻度在像素中的位置
             pos_px = round(self._mm_to_px(pos_mm) * self.scale_factor)
 
             if is_major:
-                # 带标签的主刻度
-                tick_length = self.major_tick_length
-
                 # 以选定单位显示标签
-                label_mm = pos_mm
-                label_value = UnitConverter.mm_to_unit(label_mm, self.unit)
+                label_value = UnitConverter.mm_to_unit(pos_mm, self.unit)
 
                 if decimals == 0:
-                    label_text = f"{int(label_value)}"
+                    label_text = f"{int(round(label_value))}"
                 else:
                     label_text = f"{label_value:.{decimals}f}"
 
-                # 绘制刻度
-                self._draw_tick_at_px(painter, pos_px, tick_length, self.major_tick_color, width=2)
+                # 带标签的主刻度
+                self._draw_tick_at_px(painter, pos_px, self.major_tick_length, self.major_tick_color, width=2)
                 self._draw_label_at_px(painter, pos_px, label_text)
 
             else:
                 # 不带标签的次刻度
-                tick_length = self.minor_tick_length
-                self._draw_tick_at_px(painter, pos_px, tick_length, self.minor_tick_color, width=1)
+                self._draw_tick_at_px(painter, pos_px, self.minor_tick_length, self.minor_tick_color, width=1)
 
     def _draw_tick_at_px(self, painter, pos_px, tick_length, color, width=1):
         """在像素位置绘制一个刻度"""
@@ -201,17 +240,51 @@ class RulerWidget(QWidget):
             painter.drawText(rect, Qt.AlignRight | Qt.AlignVCenter, text)
 
     def update_cursor_position(self, mm):
-        """更新标尺上的光标位置"""
+        """更新标尺上的光标位置（仅重绘旧/新标记区域）"""
         orientation_name = "H" if self.orientation == Qt.Horizontal else "V"
         logger.debug(f"[RULER-{orientation_name}] 更新位置: {mm:.2f}mm")
+
+        old_rect = self._cursor_rect()
         self.cursor_pos_mm = mm
         self.show_cursor = True
-        self.update()  # 重新绘制
+        new_rect = self._cursor_rect()
+
+        if old_rect is not None and old_rect != new_rect:
+            self.update(old_rect)
+        self.update(new_rect)
 
     def hide_cursor(self):
         """隐藏光标"""
+        old_rect = self._cursor_rect()
         self.show_cursor = False
-        self.update()
+        if old_rect is not None:
+            self.update(old_rect)
+
+    def _strip_rect(self, start_px, length_px):
+        """沿标尺方向的矩形（横跨整个标尺厚度）"""
+        if self.orientation == Qt.Horizontal:
+            return QRect(start_px, 0, length_px, self.ruler_thickness)
+        return QRect(0, start_px, self.ruler_thickness, length_px)
+
+    def _cursor_rect(self):
+        """当前光标标记的脏矩形，未显示时返回 None"""
+        if not self.show_cursor or self.cursor_pos_mm is None:
+            return None
+
+        pos_px = round(self._mm_to_px(self.cursor_pos_mm) * self.scale_factor)
+        margin = self.CURSOR_DIRTY_MARGIN
+        return self._strip_rect(pos_px - margin, 2 * margin + 1)
+
+    def _bounds_rect(self):
+        """当前边界高亮的脏矩形，无高亮时返回 None"""
+        if not self.highlighted_bounds:
+            return None
+
+        start_mm, width_mm = self.highlighted_bounds
+        start_px = round(self._mm_to_px(start_mm) * self.scale_factor)
+        width_px = round(self._mm_to_px(width_mm) * self.scale_factor)
+        # 边框笔宽 1px 向外扩展
+        return self._strip_rect(start_px - 1, width_px + 3)
 
     def _draw_cursor_marker(self, painter):
         """在光标位置绘制红线"""
@@ -238,15 +311,20 @@ class RulerWidget(QWidget):
             f"[RULER-{orientation_name}] 边界已更新: 起始={start_mm:.2f}mm, "
             f"结束={end_mm:.2f}mm, 宽度={width_mm:.2f}mm"
         )
+        old_rect = self._bounds_rect()
         self.highlighted_bounds = (start_mm, width_mm)
-        self.update()
+        new_rect = self._bounds_rect()
+
+        self.update(new_rect if old_rect is None else old_rect.united(new_rect))
 
     def clear_highlight(self):
         """清除高亮"""
         orientation_name = "H" if self.orientation == Qt.Horizontal else "V"
         logger.debug(f"[BOUNDS-{orientation_name}] 清除高亮")
+        old_rect = self._bounds_rect()
         self.highlighted_bounds = None
-        self.update()
+        if old_rect is not None:
+            self.update(old_rect)
 
     def _draw_bounds_highlight(self, painter):
         """绘制边界高亮"""
@@ -1,12 +1,90 @@
 # -*- coding: utf-8 -*-
 """智能参考线 - 画布对齐辅助工具"""
 
+from bisect import bisect_left, insort
+
 from PySide6.QtWidgets import QGraphicsLineItem, QGraphicsItem
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QPen, QColor
 from utils.logger import logger
 
 
+class EdgeIndex:
+    """一个轴上按边缘类型（起始/中心/结束）分组的有序边缘索引
+
+    每组是按值排序的 (value_mm, item_key) 列表，
+    最近边缘查找为 bisect 查询，单个元素的更新为增量操作。
+    """
+
+    KINDS = ('start', 'center', 'end')
+
+    def __init__(self):
+        self.edges = {kind: [] for kind in self.KINDS}
+        self.item_values = {}  # item_key → (start, center, end)
+
+    def clear(self):
+        """清空索引"""
+        for kind in self.KINDS:
+            self.edges[kind].clear()
+        self.item_values.clear()
+
+    def set_item(self, key, values):
+        """插入或更新元素的边缘"""
+        old_values = self.item_values.get(key)
+        if old_values == values:
+            return
+
+        if old_values is not None:
+            self.remove_item(key)
+
+        for kind, value in zip(self.KINDS, values):
+            insort(self.edges[kind], (value, key))
+        self.item_values[key] = values
+
+    def remove_item(self, key):
+        """从索引中移除元素"""
+        old_values = self.item_values.pop(key, None)
+        if old_values is None:
+            return
+
+        for kind, value in zip(self.KINDS, old_values):
+            edges = self.edges[kind]
+            i = bisect_left(edges, (value, key))
+            if i < len(edges) and edges[i] == (value, key):
+                del edges[i]
+
+    def nearest(self, kind, value, threshold, exclude_key=None):
+        """
+        查找最近的边缘
+
+        Returns:
+            最近边缘的值（毫米），距离 >= threshold 时返回 None
+        """
+        edges = self.edges[kind]
+        i = bisect_left(edges, (value,))
+
+        best = None
+        best_distance = threshold
+
+        # 向左
+        j = i - 1
+        while j >= 0 and value - edges[j][0] < best_distance:
+            if edges[j][1] != exclude_key:
+                best, best_distance = edges[j][0], value - edges[j][0]
+                break
+            j -= 1
+
+        # 向右
+        j = i
+        while j < len(edges) and edges[j][0] - value < best_distance:
+            if edges[j][1] != exclude_key:
+                best, best_distance = edges[j][0], edges[j][0] - value
+                break
+            j += 1
+
+        return best
+
+
 class SmartGuides:
     """管理智能参考线（对齐辅助工具）"""
 
@@ -14,15 +92,87 @@ class SmartGuides:
 
     def __init__(self, scene):
         self.scene = scene
-        self.guides = []  # QGraphicsLineItem 列表
+        self.guides = []  # 可见的 QGraphicsLineItem 列表
         self.enabled = True
+
+        # 边缘索引（在拖拽开始时构建；拖拽中的元素不在索引中）
+        self.x_index = EdgeIndex()
+        self.y_index = EdgeIndex()
+        self._index_valid = False
+        self._moving_keys = set()  # 拖拽中元素的 id
+
+        # 固定的参考线池: 'v' → 垂直, 'h' → 水平
+        self._guide_pool = {}
+
         logger.debug("[GUIDES] 智能参考线已初始化")
 
+    # ========== 边缘索引 ==========
+
+    @staticmethod
+    def _item_extents(item, dpi):
+        """元素的 (x, y, 宽度, 高度)，单位毫米"""
+        element = item.element
+        bounds = item.boundingRect()
+        return (
+            element.config.x,
+            element.config.y,
+            bounds.width() * 25.4 / dpi,
+            bounds.height() * 25.4 / dpi
+        )
+
+    def rebuild_index(self, all_items, dpi=203, moving_items=()):
+        """
+        从所有元素重新构建边缘索引
+
+        Args:
+            all_items: 所有图形项
+            dpi: 分辨率
+            moving_items: 一起拖拽的元素（多选）- 不加入索引，
+                          否则参考线会吸附到它们拖拽前的位置
+        """
+        self.x_index.clear()
+        self.y_index.clear()
+        self._moving_keys = {id(item) for item in moving_items}
+
+        for item in all_items:
+            if hasattr(item, 'element') and id(item) not in self._moving_keys:
+                self.update_item(item, dpi)
+
+        self._index_valid = True
+        logger.debug(f"[GUIDES] 边缘索引已构建: {len(self.x_index.item_values)} 个元素")
+
+    def update_item(self, item, dpi=203):
+        """增量更新单个元素的边缘（元素移动后调用）"""
+        x, y, width_mm, height_mm = self._item_extents(item, dpi)
+        key = id(item)
+        self.x_index.set_item(key, (x, x + width_mm / 2, x + width_mm))
+        self.y_index.set_item(key, (y, y + height_mm / 2, y + height_mm))
+
+    def remove_item(self, item):
+        """从边缘索引中移除元素"""
+        self.x_index.remove_item(id(item))
+        self.y_index.remove_item(id(item))
+
+    def invalidate_index(self):
+        """标记索引过期（下次检查时重新构建）"""
+        self._index_valid = False
+
+    # ========== 参考线 ==========
+
     def clear_guides(self):
-        """清除所有参考线"""
+        """隐藏所有参考线"""
         for guide in self.guides:
-            self.scene.removeItem(guide)
+            try:
+                guide.setVisible(False)
+            except RuntimeError:
+                # 场景被清除时已删除
+                pass
         self.guides.clear()
+
+    def clear(self):
+        """拖拽结束: 隐藏参考线，索引在下次拖拽时重建"""
+        self.clear_guides()
+        self.invalidate_index()
         logger.debug("[GUIDES] 已清除所有参考线")
 
     def check_alignment(self, dragged_item, all_items, dpi=203):
@@ -35,80 +185,23 @@ class SmartGuides:
         if not hasattr(dragged_item, 'element'):
             return None
 
-        dragged_element = dragged_item.element
-        dragged_x = dragged_element.config.x
-        dragged_y = dragged_element.config.y
+        if not self._index_valid:
+            self.rebuild_index(all_items, dpi, moving_items=[dragged_item])
+        elif id(dragged_item) not in self._moving_keys:
+            # 拖拽开始时未登记为移动的元素: 从索引中移除
+            self._moving_keys.add(id(dragged_item))
+            self.remove_item(dragged_item)
 
-        # 拖拽元素的边界
-        dragged_bounds = dragged_item.boundingRect()
-        dragged_width_mm = dragged_bounds.width() * 25.4 / dpi
-        dragged_height_mm = dragged_bounds.height() * 25.4 / dpi
+        dragged_x, dragged_y, dragged_width_mm, dragged_height_mm = self._item_extents(dragged_item, dpi)
+        key = id(dragged_item)
 
-        dragged_center_x = dragged_x + dragged_width_mm / 2
-        dragged_center_y = dragged_y + dragged_height_mm / 2
-        dragged_right = dragged_x + dragged_width_mm
-        dragged_bottom = dragged_y + dragged_height_mm
+        snap_x, guide_x = self._snap_axis(self.x_index, dragged_x, dragged_width_mm, key)
+        snap_y, guide_y = self._snap_axis(self.y_index, dragged_y, dragged_height_mm, key)
 
-        logger.debug(f"[GUIDES] 检查对齐: x={dragged_x:.2f}, y={dragged_y:.2f}, "
-                     f"中心=({dragged_center_x:.2f}, {dragged_center_y:.2f})")
-
-        snap_x = None
-        snap_y = None
-
-        for item in all_items:
-            if item == dragged_item or not hasattr(item, 'element'):
-                continue
-
-            element = item.element
-            x = element.config.x
-            y = element.config.y
-
-            bounds = item.boundingRect()
-            width_mm = bounds.width() * 25.4 / dpi
-            height_mm = bounds.height() * 25.4 / dpi
-
-            center_x = x + width_mm / 2
-            center_y = y + height_mm / 2
-            right = x + width_mm
-            bottom = y + height_mm
-
-            # 检查 X 轴对齐
-            # 左边缘
-            if abs(dragged_x - x) < self.SNAP_THRESHOLD:
-                snap_x = x
-                self._draw_vertical_guide(x, dpi)
-                logger.debug(f"[GUIDES] 垂直参考线在 x={x:.2f}mm (左边缘)")
-
-            # X 中心
-            elif abs(dragged_center_x - center_x) < self.SNAP_THRESHOLD:
-                snap_x = center_x - dragged_width_mm / 2
-                self._draw_vertical_guide(center_x, dpi)
-                logger.debug(f"[GUIDES] 垂直参考线在 x={center_x:.2f}mm (中心)")
-
-            # 右边缘
-            elif abs(dragged_right - right) < self.SNAP_THRESHOLD:
-                snap_x = right - dragged_width_mm
-                self._draw_vertical_guide(right, dpi)
-                logger.debug(f"[GUIDES] 垂直参考线在 x={right:.2f}mm (右边缘)")
-
-            # 检查 Y 轴对齐
-            # 上边缘
-            if abs(dragged_y - y) < self.SNAP_THRESHOLD:
-                snap_y = y
-                self._draw_horizontal_guide(y, dpi)
-                logger.debug(f"[GUIDES] 水平参考线在 y={y:.2f}mm (上边缘)")
-
-            # Y 中心
-            elif abs(dragged_center_y - center_y) < self.SNAP_THRESHOLD:
-                snap_y = center_y - dragged_height_mm / 2
-                self._draw_horizontal_guide(center_y, dpi)
-                logger.debug(f"[GUIDES] 水平参考线在 y={center_y:.2f}mm (中心)")
-
-            # 下边缘
-            elif abs(dragged_bottom - bottom) < self.SNAP_THRESHOLD:
-                snap_y = bottom - dragged_height_mm
-                self._draw_horizontal_guide(bottom, dpi)
-                logger.debug(f"[GUIDES] 水平参考线在 y={bottom:.2f}mm (下边缘)")
+        if guide_x is not None:
+            self._draw_vertical_guide(guide_x, dpi)
+        if guide_y is not None:
+            self._draw_horizontal_guide(guide_y, dpi)
 
         if snap_x is not None or snap_y is not None:
             logger.debug(f"[GUIDES] 检测到吸附: x={snap_x}, y={snap_y}")
@@ -116,49 +209,77 @@ class SmartGuides:
 
         return None
 
-    def _draw_vertical_guide(self, x_mm, dpi):
-        """绘制垂直参考线"""
-        x_px = x_mm * dpi / 25.4
+    def _snap_axis(self, index, start, length, key):
+        """
+        在一个轴上按 起始边缘 → 中心 → 结束边缘 的优先级查找对齐
 
-        # 创建从画布顶部到底部的线条
-        line = QGraphicsLineItem(x_px, 0, x_px, 1000)
+        Returns:
+            (吸附后的起始位置, 参考线位置)，没有对齐时为 (None, None)
+        """
+        candidates = (
+            ('start', start, 0.0),
+            ('center', start + length / 2, length / 2),
+            ('end', start + length, length),
+        )
 
-        # 红色虚线
-        pen = QPen(QColor(255, 0, 0), 1, Qt.DashLine)
-        line.setPen(pen)
+        for kind, value, shift in candidates:
+            edge = index.nearest(kind, value, self.SNAP_THRESHOLD, exclude_key=key)
+            if edge is not None:
+                return edge - shift, edge
 
-        # 不可选择，在元素上方
-        line.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, False)
-        line.setZValue(1000)
+        return None, None
 
-        self.scene.addItem(line)
-        self.guides.append(line)
+    def _get_guide(self, name):
+        """从池中获取参考线（场景被清除后重新创建）"""
+        line = self._guide_pool.get(name)
 
-        logger.debug(f"[GUIDES] 绘制垂直参考线在 {x_px:.1f}px")
+        try:
+            valid = line is not None and line.scene() is self.scene
+        except RuntimeError:
+            valid = False
 
-    def _draw_horizontal_guide(self, y_mm, dpi):
-        """绘制水平参考线"""
-        y_px = y_mm * dpi / 25.4
+        if not valid:
+            line = QGraphicsLineItem()
+
+            # 红色虚线
+            line.setPen(QPen(QColor(255, 0, 0), 1, Qt.DashLine))
+
+            # 不可选择，在元素上方
+            line.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, False)
+            line.setZValue(1000)
+
+            self.scene.addItem(line)
+            self._guide_pool[name] = line
+
+        return line
 
-        # 创建从画布左侧到右侧的线条
-        line = QGraphicsLineItem(0, y_px, 1000, y_px)
+    def _draw_vertical_guide(self, x_mm, dpi):
+        """显示垂直参考线"""
+        x_px = x_mm * dpi / 25.4
+        height_px = max(self.scene.sceneRect().bottom(), 1000)
+
+        line = self._get_guide('v')
+        line.setLine(x_px, 0, x_px, height_px)
+        line.setVisible(True)
+        self.guides.append(line)
 
-        # 红色虚线
-        pen = QPen(QColor(255, 0, 0), 1, Qt.DashLine)
-        line.setPen(pen)
+        logger.debug(f"[GUIDES] 垂直参考线在 x={x_mm:.2f}mm ({x_px:.1f}px)")
 
-        # 不可选择，在元素上方
-        line.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, False)
-        line.setZValue(1000)
+    def _draw_horizontal_guide(self, y_mm, dpi):
+        """显示水平参考线"""
+        y_px = y_mm * dpi / 25.4
+        width_px = max(self.scene.sceneRect().right(), 1000)
 
-        self.scene.addItem(line)
+        line = self._get_guide('h')
+        line.setLine(0, y_px, width_px, y_px)
+        line.setVisible(True)
         self.guides.append(line)
 
-        logger.debug(f"[GUIDES] 绘制水平参考线在 {y_px:.1f}px")
+        logger.debug(f"[GUIDES] 水平参考线在 y={y_mm:.2f}mm ({y_px:.1f}px)")
 
     def set_enabled(self, enabled):
         """启用/禁用智能参考线"""
         self.enabled = enabled
         if not enabled:
             self.clear_guides()
-        logger.debug(f"[GUIDES] 启用状态: {enabled}")
\ No newline at end of file
+        logger.debug(f"[GUIDES] 启用状态: {enabled}")
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""Тест кодувальника штрихкодів: Code 128 (A/B/C), EAN-13, QR"""
+
+import os
+import sys
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtWidgets import QApplication, QStyleOptionGraphicsItem
+from PySide6.QtGui import QImage, QPainter, QColor
+
+from core.barcode_encoder import encode, ean13_check_digit, qr_data_codewords, _encode_qr
+from core.elements.base import ElementConfig
+from core.elements.barcode_element import (
+    EAN13BarcodeElement,
+    Code128BarcodeElement,
+    QRCodeElement,
+    GraphicsBarcodeItem
+)
+
+
+def test_code128():
+    """Code 128: набір C для цифр, перемикання наборів, контрольний символ"""
+    print("=" * 60)
+    print("[TEST] Barcode encoder")
+    print("=" * 60)
+
+    digits = encode('CODE128', "12345678")
+    assert digits.codewords == (105, 12, 34, 56, 78, 47)  # Start C + 4 пари + контроль
+    assert digits.module_count == 6 * 11 + 13
+    assert encode('CODE128', "ABC123").codewords == (104, 33, 34, 35, 17, 18, 19, 67)
+    print(f"[OK] '12345678' -> {digits.module_count} modules (set C)")
+
+    mixed = encode('CODE128', "AB1234567890")
+    assert 99 in mixed.codewords  # перемикання на набір C
+    assert mixed.module_count < encode('CODE128', "AB12345678XY").module_count
+    assert 101 in encode('CODE128', "ab\tcd").codewords or 98 in encode('CODE128', "ab\tcd").codewords
+    print("[OK] Auto A/B/C switching")
+
+    modules = digits.modules
+    assert modules.startswith("11010011100") and modules.endswith("1100011101011")
+    assert sum(width for _, width in digits.bars) == modules.count('1')
+    bitmap = digits.to_bitmap(2, 5)
+    assert bitmap.shape == (5, digits.module_count * 2) and bitmap[0, 0] and not bitmap[0, 4]
+    print("[OK] Bar pattern and bitmap")
+
+    for bad in ("", "Штрих"):
+        try:
+            encode('CODE128', bad)
+            assert False, "Має бути помилка"
+        except ValueError:
+            pass
+    assert encode('CODE128', "ABC") is encode('CODE128', "ABC")
+    print("[OK] Errors and memoization")
+
+
+def test_ean13():
+    """EAN-13: 95 модулів, контрольна цифра перераховується як у ^BE"""
+    assert ean13_check_digit("400638133393") == "1"
+    symbol = encode('EAN13', "4006381333931")
+    assert symbol.module_count == 95 and symbol.data == "4006381333931"
+    assert symbol.modules.startswith("101") and symbol.modules[45:50] == "01010"
+    assert encode('EAN13', "1234567890123").data == "1234567890128"
+    assert encode('EAN13', "123").data == "0000000001236"
+    try:
+        encode('EAN13', "{{BARCODE}}")
+        assert False, "Має бути помилка"
+    except ValueError:
+        pass
+    print("[OK] EAN-13")
+
+
+def test_qr():
+    """QR: вибір версії, маска, матриця модулів"""
+    small = encode('QRCODE', "HELLO WORLD")
+    assert small.version == 1 and small.size == 21 and small.error_correction == 'M'
+    assert small.matrix[0, :7].all() and not small.matrix[7, :8].any()  # шукач + роздільник
+    assert small.matrix[6, 8:13].tolist() == [True, False, True, False, True]  # синхронізація
+
+    assert encode('QRCODE', "1" * 34).version == 1  # цифровий режим: 34 цифри у версії 1-M
+    assert encode('QRCODE', "1" * 35).version == 2
+    assert qr_data_codewords(1, 'M') == 16 and qr_data_codewords(40, 'L') == 2956
+
+    url = encode('QRCODE', "https://example.com/товар/12345")
+    assert url.version == 3 and url.size == 29
+    assert _encode_qr("https://example.com/товар/12345", 'M', url.mask).matrix.tolist() == url.matrix.tolist()
+    assert encode('QRCODE', "x" * 200).version == 10
+    assert encode('QRCODE', "x" * 200).to_bitmap(3).shape == (57 * 3, 57 * 3)
+    print(f"[OK] QR versions, '{url.data}' -> v{url.version} mask {url.mask}")
+
+    try:
+        encode('QRCODE', "x" * 3000)
+        assert False, "Має бути помилка"
+    except ValueError:
+        pass
+    print("[OK] QR capacity")
+
+
+def test_element_widths():
+    """Ширина Code 128 рахується за справжніми кодовими словами"""
+    config = ElementConfig(x=0, y=0)
+    digits = Code128BarcodeElement(config, data="1234567890")
+    letters = Code128BarcodeElement(config, data="ABCDEFGHIJ")
+    assert digits.calculate_real_width(203) < letters.calculate_real_width(203)
+    assert abs(letters.calculate_real_width(203) - (11 + 10 * 11 + 11 + 13) * 2 * 25.4 / 203) < 1e-9
+    assert digits.calculate_real_width(203, data="ABCDEFGHIJ") == letters.calculate_real_width(203)
+    assert "^BCN,79,Y,N,N,A\n" in digits.to_zpl(203)  # e = N (без UCC), m = A (автоматичний режим)
+
+    ean13 = EAN13BarcodeElement(config, data="1234567890123")
+    assert abs(ean13.calculate_real_width(203) - 95 * 2 * 25.4 / 203) < 1e-9
+    assert Code128BarcodeElement(config, data="Штрих").calculate_real_width(203) > 0
+    print("[OK] Exact widths")
+
+
+def test_canvas_draws_bars():
+    """Полотно малює справжні смуги замість прямокутника-заповнювача"""
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    def render(item):
+        rect = item.rect()
+        image = QImage(int(rect.width()), int(rect.height()), QImage.Format_RGB32)
+        image.fill(QColor(128, 128, 128))
+        painter = QPainter(image)
+        item.paint(painter, QStyleOptionGraphicsItem())
+        painter.end()
+        return image
+
+    element = Code128BarcodeElement(ElementConfig(x=0, y=0), data="ABC123")
+    item = GraphicsBarcodeItem(element, dpi=203)
+    image = render(item)
+    symbol = element.encode()
+    module = item.rect().width() / symbol.module_count
+    row = [image.pixelColor(int((i + 0.5) * module), 5).black() > 128 for i in range(symbol.module_count)]
+    assert row == [m == '1' for m in symbol.modules]
+    print("[OK] Code 128 bars match modules")
+
+    qr = QRCodeElement(ElementConfig(x=0, y=0), data="HELLO WORLD", size=15)
+    item = GraphicsBarcodeItem(qr, dpi=203)
+    image = render(item)
+    matrix = qr.encode().matrix
+    module = item.rect().width() / matrix.shape[0]
+    assert image.pixelColor(int(module / 2), int(module / 2)).black() > 128
+    assert image.pixelColor(int(7.5 * module), int(7.5 * module)).black() < 128
+    print("[OK] QR matrix drawn")
+
+    ean13 = EAN13BarcodeElement(ElementConfig(x=0, y=0), data="{{BARCODE}}")
+    render(GraphicsBarcodeItem(ean13, dpi=203))  # не кодується - заповнювач
+    print("[OK] Placeholder fallback")
+
+
+if __name__ == '__main__':
+    test_code128()
+    test_ean13()
+    test_qr()
+    test_element_widths()
+    test_canvas_draws_bars()
+    print("\n[SUCCESS] All barcode encoder tests passed!")
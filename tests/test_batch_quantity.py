@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Тест пакетної генерації: ^PQ та об'єднання однакових послідовних записів"""
+
+import sys
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.elements.base import ElementConfig
+from core.elements.text_element import TextElement
+from core.elements.barcode_element import Code128BarcodeElement
+from core.elements.serial import SerialField
+from zpl.generator import ZPLGenerator
+
+LABEL = {'width': 50, 'height': 30}
+
+
+def _template():
+    name = TextElement(ElementConfig(x=2, y=2), text="Назва", font_size=25)
+    name.data_field = "{{NAME}}"
+    sku = Code128BarcodeElement(ElementConfig(x=2, y=10), data="SKU")
+    sku.data_field = "{{SKU}}"
+    return [name, sku]
+
+
+def test_quantity_in_render_api():
+    """quantity → ^PQ перед ^XZ; без quantity ^PQ не виводиться"""
+    print("=" * 60)
+    print("[TEST] Batch quantity")
+    print("=" * 60)
+
+    generator = ZPLGenerator(dpi=203)
+    zpl = generator.generate(_template(), LABEL, {'NAME': 'A', 'SKU': '1'}, quantity=12)
+    assert zpl.endswith("^PQ12\n^XZ")
+    assert "^PQ" not in generator.generate(_template(), LABEL, {'NAME': 'A', 'SKU': '1'})
+    print("[OK] ^PQ12 emitted")
+
+
+def test_batch_collapses_identical_runs():
+    """12 однакових записів → одна етикетка з ^PQ12, той самий код, що й generate()"""
+    generator = ZPLGenerator(dpi=203)
+    case = {'NAME': 'Молоко', 'SKU': '4820001', 'ROW': 0}
+    records = ([dict(case, ROW=i) for i in range(12)]  # ROW не використовується в шаблоні
+               + [{'NAME': 'Хліб', 'SKU': '4820002'}]
+               + [dict(case) for _ in range(3)])
+
+    zpl = generator.generate_batch(_template(), LABEL, records)
+    labels = [label + "^XZ" for label in zpl.split("^XZ") if label.strip()]
+    assert len(labels) == 3
+    assert labels[0] == generator.generate(_template(), LABEL, case, quantity=12)
+    assert labels[1].strip() == generator.generate(_template(), LABEL, records[12])
+    assert labels[2].strip() == generator.generate(_template(), LABEL, case, quantity=3)
+    print(f"[OK] {len(records)} records -> {len(labels)} labels")
+
+    # Кількість у записі
+    zpl = generator.generate_batch(_template(), LABEL,
+                                   [dict(case, QTY=5), dict(case, QTY=7), dict(case, QTY=0)],
+                                   quantity_field='QTY')
+    assert zpl.count("^XA") == 1 and "^PQ12" in zpl
+    print("[OK] quantity_field sums per-record quantities")
+
+    # Порожня кількість (CSV/1C) = 1, нечислова - запис пропускається
+    zpl = generator.generate_batch(_template(), LABEL,
+                                   [dict(case, QTY=''), dict(case, QTY=None), dict(case, QTY=' 2 '),
+                                    dict(case, QTY='abc'), dict(case)],
+                                   quantity_field='QTY')
+    assert zpl.count("^XA") == 1 and "^PQ5" in zpl
+    print("[OK] Empty quantity counts as 1, invalid quantity skipped")
+
+
+def test_batch_keeps_serial_labels_separate():
+    """З серійним полем записи не об'єднуються"""
+    template = _template()
+    template[1].serial = SerialField(start=1, padding=4)
+    zpl = ZPLGenerator(dpi=203).generate_batch(template, LABEL, [{'NAME': 'A'}] * 3)
+    assert zpl.count("^XA") == 3 and "^PQ" not in zpl
+    assert ZPLGenerator(dpi=203).generate_batch(template, LABEL, []) == ""
+    print("[OK] Serial template not collapsed")
+
+
+if __name__ == '__main__':
+    test_quantity_in_render_api()
+    test_batch_collapses_identical_runs()
+    test_batch_keeps_serial_labels_separate()
+    print("\n[SUCCESS] All batch quantity tests passed!")
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""Тест пакетного завантаження шаблону: фоновий парсинг, без BSP-індексу та itemChange під час вставки"""
+
+import sys
+import json
+import time
+import tempfile
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtWidgets import QApplication, QGraphicsScene
+
+
+def _write_template(path, count):
+    elements = []
+    for i in range(count):
+        x = 1.0 + (i % 20) * 5.03
+        y = 1.0 + (i // 20) * 3.07
+        if i % 3 == 0:
+            elements.append({'type': 'text', 'x': x, 'y': y, 'text': f'T{i}', 'font_size': 10})
+        elif i % 3 == 1:
+            elements.append({'type': 'rectangle', 'x': x, 'y': y, 'width': 4, 'height': 2})
+        else:
+            elements.append({'type': 'line', 'x': x, 'y': y, 'x2': x + 4, 'y2': y})
+
+    template = {
+        'name': 'bulk',
+        'label_config': {'width_mm': 110, 'height_mm': 100, 'dpi': 203, 'display_unit': 'mm'},
+        'elements': elements,
+    }
+    path.write_text(json.dumps(template), encoding='utf-8')
+
+
+def test_bulk_load_500_elements():
+    """500 елементів: всі додані, позиції точно як у шаблоні, індекс відновлено"""
+    print("=" * 60)
+    print("[TEST] Bulk template load")
+    print("=" * 60)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    from gui.main_window import MainWindow
+
+    window = MainWindow()
+    canvas = window.canvas
+
+    cursor_events = []
+    canvas.cursor_position_changed.connect(lambda x, y: cursor_events.append((x, y)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'bulk.json'
+        _write_template(path, 500)
+
+        start = time.perf_counter()
+        window._load_template_from_file(str(path))
+        elapsed = time.perf_counter() - start
+
+    print(f"[INFO] Loaded {len(window.elements)} elements in {elapsed * 1000:.0f} ms")
+
+    assert len(window.elements) == 500
+    assert len(window.graphics_items) == 500
+    assert canvas.scene.itemIndexMethod() == QGraphicsScene.BspTreeIndex
+    assert not canvas.bulk_loading
+    assert not cursor_events, "No cursor signals during load"
+    print("[OK] All items added, BSP index restored, no per-item notifications")
+
+    # Позиції не прив'язуються до сітки під час завантаження
+    element = window.elements[3]
+    assert abs(element.config.x - (1.0 + 3 * 5.03)) < 1e-9, element.config.x
+
+    # Після завантаження прив'язка знову працює
+    item = window.graphics_items[1]
+    item.setPos(canvas._mm_to_px(10.3), canvas._mm_to_px(10.3))
+    assert abs(item.element.config.x - 10.0) < 0.01
+    print("[OK] Snapping active again after bulk load")
+
+    window.close()
+
+
+def test_async_parse_returns_future():
+    """TemplateManager.load_template_async() виконується у фоновому потоці"""
+    from core.template_manager import TemplateManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'bulk.json'
+        _write_template(path, 30)
+
+        manager = TemplateManager(templates_dir=tmp)
+        future = manager.load_template_async(str(path))
+        data = future.result(timeout=10)
+
+    assert len(data['elements']) == 30
+    assert data['elements'][1].__class__.__name__ == 'RectangleElement'
+    print("[OK] Async parse")
+
+
+if __name__ == '__main__':
+    test_bulk_load_500_elements()
+    test_async_parse_returns_future()
+    print("\n[SUCCESS] All bulk load tests passed!")
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Тест: сітка малюється в drawBackground(), а не QGraphicsLineItem у сцені"""
+
+import sys
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtWidgets import QApplication, QGraphicsLineItem
+
+from config import GridConfig
+from gui.canvas_view import CanvasView
+
+
+def _make_canvas(width_mm, height_mm, size_mm):
+    canvas = CanvasView(width_mm=width_mm, height_mm=height_mm, dpi=203)
+    canvas.grid_config = GridConfig(size_x_mm=size_mm, size_y_mm=size_mm, visible=True)
+    canvas._draw_grid()
+    return canvas
+
+
+def test_grid_not_in_scene():
+    """110x300mm з сіткою 0.5mm: жодної лінії сітки в сцені"""
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    print("=" * 60)
+    print("[TEST] Background grid - scene items")
+    print("=" * 60)
+
+    canvas = _make_canvas(110, 300, 0.5)
+    line_items = [item for item in canvas.scene.items() if isinstance(item, QGraphicsLineItem)]
+
+    print(f"Scene items: {len(canvas.scene.items())}, line items: {len(line_items)}")
+    assert not line_items, "Grid lines must not be scene items"
+    assert len(canvas.grid_items) == 1, "Only the label border stays in the scene"
+
+    # Розмір/сітка змінюються - кількість елементів сцени не росте
+    canvas.set_label_size(100, 200)
+    canvas._redraw_grid()
+    assert len(canvas.scene.items()) == 1
+    print("[OK] Grid removed from scene graph")
+
+
+def test_visible_lines_only():
+    """Малюються тільки лінії у відкритій області"""
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    canvas = _make_canvas(110, 300, 1.0)
+
+    # Вся мітка при масштабі 2.5: 111 вертикальних ліній (0..110mm)
+    all_xs = canvas._grid_axis_positions(0, canvas.width_px + 1, 1.0, 0.0, 110, 2.5)
+    assert len(all_xs) == 111, len(all_xs)
+
+    # Тільки 0..10mm відкрито
+    exposed_xs = canvas._grid_axis_positions(0, canvas._mm_to_px(10), 1.0, 0.0, 110, 2.5)
+    assert len(exposed_xs) == 11, len(exposed_xs)
+    print(f"[OK] Exposed rect: {len(exposed_xs)} of {len(all_xs)} lines")
+
+    # Зміщення: лінії починаються з offset
+    offset_xs = canvas._grid_axis_positions(0, canvas.width_px, 1.0, 0.5, 110, 2.5)
+    assert offset_xs[0] == round(canvas._mm_to_px(0.5))
+    print("[OK] Offset respected")
+
+
+def test_density_reduced_at_low_zoom():
+    """При малому масштабі щільність сітки зменшується"""
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    canvas = _make_canvas(110, 300, 0.5)
+
+    dense = canvas._grid_axis_positions(0, canvas.width_px, 0.5, 0.0, 110, 2.5)
+    sparse = canvas._grid_axis_positions(0, canvas.width_px, 0.5, 0.0, 110, 0.5)
+
+    print(f"Lines at 2.5x: {len(dense)}, at 0.5x: {len(sparse)}")
+    assert len(sparse) < len(dense)
+
+    # Відстань на екрані не менша за мінімум
+    spacing = (sparse[1] - sparse[0]) * 0.5
+    assert spacing >= canvas.GRID_MIN_SPACING_PX - 1, spacing
+    print("[OK] Density reduced at low zoom")
+
+
+def test_render_with_grid():
+    """drawBackground() виконується без помилок для прихованої та видимої сітки"""
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    canvas = _make_canvas(28, 28, 1.0)
+    canvas.resize(300, 300)
+    canvas.show()
+    app.processEvents()
+    image = canvas.grab()
+    assert not image.isNull()
+
+    canvas.set_grid_visible(False)
+    assert not canvas.grid_items[0].isVisible()
+    app.processEvents()
+    assert not canvas.grab().isNull()
+
+    canvas.set_grid_visible(True)
+    print("[OK] Render works")
+
+
+if __name__ == '__main__':
+    test_grid_not_in_scene()
+    test_visible_lines_only()
+    test_density_reduced_at_low_zoom()
+    test_render_with_grid()
+    print("\n[SUCCESS] All background grid tests passed!")
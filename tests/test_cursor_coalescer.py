@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Тест об'єднання позицій курсора: не частіше одного разу за кадр, завжди остання позиція"""
+
+import sys
+import time
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import Qt, QEvent, QPointF
+from PySide6.QtGui import QMouseEvent
+
+from gui.cursor_coalescer import CursorCoalescer
+
+
+def _wait(app, seconds):
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.002)
+
+
+def test_burst_delivers_first_and_latest():
+    """1000 подій за один кадр -> перша одразу, остання в кінці кадру"""
+    print("=" * 60)
+    print("[TEST] Cursor coalescer")
+    print("=" * 60)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    delivered = []
+    coalescer = CursorCoalescer(lambda x, y: delivered.append((x, y)), interval_ms=50)
+
+    for i in range(1000):
+        coalescer.push(float(i), float(-i))
+
+    assert delivered == [(0.0, 0.0)], delivered
+    assert coalescer.pending == (999.0, -999.0)
+
+    _wait(app, 0.2)
+    assert delivered == [(0.0, 0.0), (999.0, -999.0)], delivered
+    assert coalescer.pushed == 1000 and coalescer.delivered == 2
+    print(f"[OK] {coalescer.pushed} pushes -> {coalescer.delivered} deliveries")
+
+    # Після паузи довше за кадр - знову одразу
+    coalescer.push(1.0, 2.0)
+    assert delivered[-1] == (1.0, 2.0)
+
+    # flush() без очікуваної позиції нічого не робить
+    coalescer.flush()
+    assert len(delivered) == 3
+    print("[OK] Idle push delivered immediately")
+
+
+def test_canvas_rulers_update_once_per_frame():
+    """MainWindow: сплеск mouseMove -> лінійки/підказка оновлюються раз за кадр"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    from gui.main_window import MainWindow
+
+    window = MainWindow()
+    canvas = window.canvas
+    canvas.cursor_coalescer.interval_ms = 50
+
+    ruler_updates = []
+    original = window.h_ruler.update_cursor_position
+    window.h_ruler.update_cursor_position = lambda mm: (ruler_updates.append(mm), original(mm))
+
+    _wait(app, 0.1)
+    for i in range(200):
+        event = QMouseEvent(QEvent.MouseMove, QPointF(10 + i, 40), QPointF(10 + i, 40), Qt.NoButton, Qt.NoButton, Qt.NoModifier)
+        canvas.mouseMoveEvent(event)
+
+    assert len(ruler_updates) == 1, len(ruler_updates)
+    _wait(app, 0.2)
+    assert len(ruler_updates) == 2, len(ruler_updates)
+
+    expected_x = canvas._px_to_mm(canvas.mapToScene(QPointF(209, 40).toPoint()).x())
+    assert abs(ruler_updates[-1] - expected_x) < 1e-6
+    print(f"[OK] 200 mouse moves -> {len(ruler_updates)} ruler updates (last position kept)")
+
+    window.close()
+
+
+if __name__ == '__main__':
+    test_burst_delivers_first_and_latest()
+    test_canvas_rulers_update_once_per_frame()
+    print("\n[SUCCESS] All cursor coalescer tests passed!")
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""Тест модуля дизерингу: поріг, Bayer, Atkinson, Floyd-Steinberg; режим елемента; бенчмарк"""
+
+import sys
+import io
+import time
+import base64
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from PIL import Image
+from PySide6.QtWidgets import QApplication
+
+from core.dithering import DitherMode, bayer_matrix, dither, pack_bits, threshold, ordered
+from core.elements.image_element import ImageConfig, ImageElement
+
+
+def _gradient(width, height):
+    """Горизонтальний градієнт 0..255"""
+    row = np.linspace(0, 255, width)
+    return np.tile(row, (height, 1)).astype(np.uint8)
+
+
+def test_bayer_matrix():
+    """Матриці Bayer: перестановка 0..n²-1, пороги в 0..255"""
+    print("=" * 60)
+    print("[TEST] Dithering")
+    print("=" * 60)
+
+    for size in (2, 4, 8):
+        matrix = bayer_matrix(size)
+        ranks = np.round(matrix * size * size / 255.0 - 0.5).astype(int)
+        assert sorted(ranks.ravel().tolist()) == list(range(size * size))
+        assert 0 < matrix.min() and matrix.max() < 255
+    assert np.array_equal(np.round(bayer_matrix(2) * 4 / 255 - 0.5), [[0, 2], [3, 1]])
+    print("[OK] Bayer 2/4/8 matrices")
+
+
+def test_modes_preserve_tone():
+    """Середня частка чорного ≈ темрява градієнта; краї - чисті"""
+    gray = _gradient(256, 64)
+    for mode in DitherMode:
+        black = dither(gray, mode)
+        assert black.shape == gray.shape and black.dtype == bool
+        assert abs(black.mean() - 0.5) < 0.03, (mode, black.mean())
+        assert black[:, 0].all(), mode  # чорний край
+        assert not black[:, -1].any(), mode  # білий край
+    print("[OK] All modes keep mean tone and pure black/white")
+
+    # Поріг і Bayer на однорідному сірому
+    flat = np.full((8, 8), 100, dtype=np.uint8)
+    assert threshold(flat).all()
+    assert abs(ordered(flat, 8).mean() - (1 - 100 / 255)) < 1 / 64 + 1e-9
+    print("[OK] Threshold and ordered dithering on flat gray")
+
+
+def test_pack_bits():
+    """Пакування: 1 = чорний, рядки доповнені до байта"""
+    black = np.zeros((2, 10), dtype=bool)
+    black[0, 0] = black[0, 9] = black[1, 7] = True
+    assert pack_bits(black) == bytes([0x80, 0x40, 0x01, 0x00])
+    print("[OK] Row padding and bit order")
+
+
+def test_element_dither_mode():
+    """Режим на рівні елемента: зберігається в шаблоні і змінює бітмап"""
+    buffer = io.BytesIO()
+    Image.fromarray(_gradient(200, 100)).save(buffer, format='PNG')
+    data = base64.b64encode(buffer.getvalue()).decode('ascii')
+
+    element = ImageElement(ImageConfig(width=20, height=10, image_data=data))
+    assert element.dither_mode == DitherMode.FLOYD_STEINBERG
+    fs_zpl = element.to_zpl(203)
+
+    element.dither_mode = DitherMode.BAYER_4
+    bayer_zpl = element.to_zpl(203)
+    assert bayer_zpl != fs_zpl
+    assert len(element.bitmaps) == 2
+
+    restored = ImageElement.from_dict(element.to_dict())
+    assert restored.dither_mode == DitherMode.BAYER_4
+    assert restored.to_zpl(203) == bayer_zpl
+
+    legacy = element.to_dict()
+    del legacy['dither_mode']
+    assert ImageElement.from_dict(legacy).dither_mode == DitherMode.FLOYD_STEINBERG
+    print("[OK] Per-element mode persisted; old templates default to Floyd-Steinberg")
+
+
+def test_property_panel_mode():
+    """Випадаючий список дизерингу в PropertyPanel"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    from gui.property_panel import PropertyPanel
+    from utils.unit_converter import MeasurementUnit
+
+    panel = PropertyPanel()
+    panel._get_main_window = lambda: type('Window', (), {'current_unit': MeasurementUnit.MM})()
+    element = ImageElement(ImageConfig(width=20, height=10), dither_mode=DitherMode.ATKINSON)
+    panel.set_element(element, None)
+    assert panel.image_dither_combo.currentData() == DitherMode.ATKINSON
+
+    index = next(i for i in range(panel.image_dither_combo.count())
+                 if panel.image_dither_combo.itemData(i) == DitherMode.THRESHOLD)
+    panel.image_dither_combo.setCurrentIndex(index)
+    assert element.dither_mode == DitherMode.THRESHOLD
+    print("[OK] Property panel switches the element mode")
+
+
+def run_benchmark(sizes=((200, 200), (600, 400), (1200, 800))):
+    """Час кожного режиму для кількох розмірів (мс)"""
+    print(f"{'mode':<16}" + "".join(f"{w}x{h:<10}" for w, h in sizes))
+    results = {}
+    for mode in DitherMode:
+        timings = []
+        for width, height in sizes:
+            gray = _gradient(width, height)
+            begin = time.perf_counter()
+            dither(gray, mode)
+            timings.append((time.perf_counter() - begin) * 1000)
+        results[mode] = timings
+        print(f"{mode.code:<16}" + "".join(f"{t:<14.1f}" for t in timings))
+    return results
+
+
+def test_benchmark_vectorized_modes():
+    """Bayer і поріг - повністю векторизовані (мілісекунди для 1200x800)"""
+    results = run_benchmark(sizes=((200, 200), (1200, 800)))
+    for mode in (DitherMode.THRESHOLD, DitherMode.BAYER_2, DitherMode.BAYER_4, DitherMode.BAYER_8):
+        assert results[mode][-1] < 100, (mode, results[mode])
+    assert results[DitherMode.BAYER_4][-1] < results[DitherMode.ATKINSON][-1]
+    print("[OK] Vectorized modes benchmarked")
+
+
+if __name__ == '__main__':
+    test_bayer_matrix()
+    test_modes_preserve_tone()
+    test_pack_bits()
+    test_element_dither_mode()
+    test_property_panel_mode()
+    run_benchmark()
+    print("\n[SUCCESS] All dithering tests passed!")
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Тест реєстру типів елементів (core/elements/registry.py)"""
+
+import sys
+import subprocess
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtWidgets import QApplication
+
+from core.elements import registry
+from core.elements.base import ElementConfig
+
+
+SAMPLE_DICTS = [
+    {'type': 'text', 'x': 1.0, 'y': 2.0, 'text': 'ABC', 'font_size': 20},
+    {'type': 'barcode', 'barcode_type': 'EAN13', 'x': 1.0, 'y': 2.0, 'data': '1234567890123'},
+    {'type': 'barcode', 'barcode_type': 'CODE128', 'x': 1.0, 'y': 2.0, 'data': 'SAMPLE'},
+    {'type': 'barcode', 'barcode_type': 'QRCODE', 'x': 1.0, 'y': 2.0, 'data': 'https://example.com'},
+    {'type': 'rectangle', 'x': 1.0, 'y': 2.0, 'width': 10, 'height': 5},
+    {'type': 'circle', 'x': 1.0, 'y': 2.0, 'width': 10, 'height': 10},
+    {'type': 'line', 'x': 1.0, 'y': 2.0, 'x2': 10, 'y2': 2.0},
+    {'type': 'image', 'x': 1.0, 'y': 2.0, 'width': 10, 'height': 10},
+]
+
+
+def test_element_from_dict_roundtrip():
+    """Кожен зареєстрований тип відновлюється з dict"""
+    print("=" * 60)
+    print("[TEST] Registry element_from_dict")
+    print("=" * 60)
+
+    for data in SAMPLE_DICTS:
+        element = registry.element_from_dict(data)
+        assert element is not None, f"Element not created: {data['type']}"
+
+        restored = element.to_dict()
+        assert restored['type'] == data['type'], "Wrong type"
+        if data['type'] == 'barcode':
+            assert restored['barcode_type'] == data['barcode_type'], "Wrong barcode_type"
+
+        print(f"[OK] {data['type']}/{data.get('barcode_type')} -> {element.__class__.__name__}")
+
+    assert registry.element_from_dict({'type': 'unknown', 'x': 0, 'y': 0}) is None
+    assert registry.element_from_dict({'type': 'barcode', 'barcode_type': 'PDF417', 'x': 0, 'y': 0, 'data': ''}) is None
+    print("[OK] Unknown types -> None")
+
+
+def test_create_graphics_item_for_all_types():
+    """Для кожного типу створюється правильний graphics item"""
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    expected = {
+        'text': 'GraphicsTextItem',
+        'barcode': 'GraphicsBarcodeItem',
+        'rectangle': 'GraphicsRectangleItem',
+        'circle': 'GraphicsCircleItem',
+        'line': 'GraphicsLineItem',
+        'image': 'GraphicsImageItem',
+    }
+
+    for data in SAMPLE_DICTS:
+        element = registry.element_from_dict(data)
+        item = registry.create_graphics_item(element, dpi=203)
+        assert item is not None, f"Graphics item not created: {data['type']}"
+        assert item.__class__.__name__ == expected[data['type']], item.__class__.__name__
+        assert item.element is element
+        print(f"[OK] {element.__class__.__name__} -> {item.__class__.__name__}")
+
+    class CustomElement:
+        config = ElementConfig(x=0, y=0)
+
+    assert registry.create_graphics_item(CustomElement()) is None
+    print("[OK] Unregistered element -> None")
+
+
+def test_lazy_module_loading():
+    """Завантаження текстового шаблону не імпортує модулі штрихкодів/фігур/зображень"""
+    code = (
+        "import sys\n"
+        "from core.elements import registry\n"
+        "registry.element_from_dict({'type': 'text', 'x': 0, 'y': 0, 'text': 'A', 'font_size': 10})\n"
+        "for name in ('barcode_element', 'shape_element', 'image_element'):\n"
+        "    print(name, 'core.elements.' + name in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=str(project_root),
+        capture_output=True,
+        text=True,
+        encoding='utf-8'
+    )
+    print(result.stdout)
+    assert result.returncode == 0, result.stderr
+
+    loaded = dict(line.split() for line in result.stdout.strip().splitlines()[-3:])
+    assert loaded == {'barcode_element': 'False', 'shape_element': 'False', 'image_element': 'False'}, loaded
+    print("[OK] Only text_element module loaded")
+
+
+if __name__ == '__main__':
+    test_element_from_dict_roundtrip()
+    test_create_graphics_item_for_all_types()
+    test_lazy_module_loading()
+    print("\n[SUCCESS] All registry tests passed!")
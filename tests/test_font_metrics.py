@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Тест таблиць ширини шрифтів Zebra та автоматичного зменшення шрифту"""
+
+import sys
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.font_metrics import text_width, fit_font_size, magnification
+from core.elements.base import ElementConfig
+from core.elements.text_element import TextElement, ZplFont
+from zpl.generator import ZPLGenerator
+
+
+def test_bitmap_font_widths():
+    """Растрові шрифти: (ширина + проміжок) × збільшення, без останнього проміжку"""
+    print("=" * 60)
+    print("[TEST] Font metrics")
+    print("=" * 60)
+
+    assert text_width("ABC", 'A', 9, 5) == 3 * 6 - 1
+    assert text_width("ABC", ZplFont.FONT_A, 18, 10) == 2 * (3 * 6 - 1)
+    assert text_width("12345", 'D', 18) == 2 * (5 * 12 - 2)  # ширина = висота → ×2
+    assert text_width("", 'G', 60) == 0
+    assert magnification(20, 5) == 4 and magnification(2, 5) == 1 and magnification(500, 5) == 10
+    print("[OK] Fonts A-H exact")
+
+
+def test_font0_widths():
+    """Шрифт 0: пропорційна ширина, лінійна за шириною шрифту"""
+    narrow, wide = text_width("iiii", '0', 30), text_width("WWWW", '0', 30)
+    assert 0 < narrow < wide
+    assert text_width("Рядок", '0', 60) >= 2 * text_width("Рядок", '0', 30) - 1
+    assert text_width("条码", '0', 30) > text_width("ab", '0', 30)
+    assert text_width("1234567890", '0', 30, 45) > text_width("1234567890", '0', 30)
+    print(f"[OK] Font 0: 'iiii'={narrow} 'WWWW'={wide} dots")
+
+
+def test_fit_font_size():
+    """Автозменшення: найбільший розмір, що вміщується в ширину"""
+    text = "Дуже довга назва товару для етикетки"
+    size = fit_font_size(text, '0', 300, 40)
+    assert size < 40
+    assert text_width(text, '0', size) <= 300 < text_width(text, '0', size + 1)
+    assert fit_font_size("OK", '0', 300, 40) == 40
+    assert fit_font_size(text, 'A', 10, 40, min_size=9) == 9
+    size = fit_font_size("ABCDEFGHIJ", 'A', 150, 50)
+    assert text_width("ABCDEFGHIJ", 'A', size, size) <= 150
+    print("[OK] fit_font_size")
+
+
+def test_text_element_auto_fit():
+    """TextElement.fit_width: ZPL з меншим ^A; підкреслення за таблицею ширин"""
+    element = TextElement(ElementConfig(x=0, y=0), text="Дуже довга назва товару", font_size=40)
+    element.underline = True
+    assert "^A0N,40,40" in element.to_zpl(203)
+    underline = element.to_zpl(203).split("^GB")[1].split(",")[0]
+    assert int(underline) == text_width(element.text, '0', 40)
+
+    element.fit_width = 30.0
+    zpl = element.to_zpl(203)
+    size = element.fitted_font_size(203)
+    assert size < 40 and f"^A0N,{size},{size}" in zpl
+    assert element.text_width_dots(203) <= int(30.0 * 203 / 25.4)
+    assert TextElement.from_dict(element.to_dict()).fit_width == 30.0
+    print(f"[OK] Auto-fit 40 -> {size}")
+
+    # Пакетна генерація: розмір для кожного запису
+    element.underline = False
+    element.data_field = "{{NAME}}"
+    zpl = ZPLGenerator(dpi=203).generate_batch(
+        [element], {'width': 50, 'height': 20},
+        [{'NAME': 'Сир'}, {'NAME': 'Сир твердий голландський витриманий'}])
+    labels = zpl.split("^XZ")
+    assert "^A0N,40,40^FDСир" in labels[0].replace("\n", "")
+    assert "^A0N,40,40" not in labels[1]
+    print("[OK] Batch resizes per record")
+
+
+if __name__ == '__main__':
+    test_bitmap_font_widths()
+    test_font0_widths()
+    test_fit_font_size()
+    test_text_element_auto_fit()
+    print("\n[SUCCESS] All font metrics tests passed!")
@@ -179,11 +179,9 @@ def test_font_styles_smart():
     element.underline = True
     
     # Добавить элемент
-    window.elements.append(element)
     from core.elements.text_element import GraphicsTextItem
     item = GraphicsTextItem(element)
-    window.canvas.scene.addItem(item)
-    window.graphics_items.append(item)
+    window.document.add(element, item)
     app.processEvents()
     
     # Генерировать ZPL
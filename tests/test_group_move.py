@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""Тест групового переміщення: прив'язка лише якоря, одне сповіщення, перетягування кількох елементів"""
+
+import sys
+import time
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import Qt, QEvent, QPointF
+from PySide6.QtGui import QMouseEvent, QKeyEvent
+
+from config import GridConfig, SnapMode
+
+
+def _make_window():
+    app = QApplication.instance() or QApplication(sys.argv)
+    from gui.main_window import MainWindow
+
+    window = MainWindow()
+    window.canvas.grid_config = GridConfig(size_x_mm=1.0, size_y_mm=1.0, snap_mode=SnapMode.GRID)
+    return app, window
+
+
+def _count_calls(obj, name):
+    calls = []
+    original = getattr(obj, name)
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    setattr(obj, name, counting)
+    return calls
+
+
+def test_nudge_300_items_snaps_once():
+    """300 виділених елементів: одна прив'язка, одне сповіщення на крок"""
+    print("=" * 60)
+    print("[TEST] Group move")
+    print("=" * 60)
+
+    app, window = _make_window()
+    canvas = window.canvas
+
+    for _ in range(300):
+        window._add_rectangle()
+    for item in window.graphics_items:
+        item.setSelected(True)
+
+    start = [(item.element.config.x, item.element.config.y) for item in window.graphics_items]
+    snap_calls = _count_calls(canvas.snap_engine, 'snap_position')
+    moved = []
+    canvas.items_moved.connect(lambda items: moved.append(len(items)))
+
+    begin = time.perf_counter()
+    window._move_selected(1, 0)
+    elapsed_many = time.perf_counter() - begin
+
+    assert len(snap_calls) == 1, len(snap_calls)
+    assert moved == [300], moved
+    for item, (x, y) in zip(window.graphics_items, start):
+        assert abs(item.element.config.x - (x + 1)) < 1e-9 and item.element.config.y == y
+        assert abs(item.pos().x() - (x + 1) * 203 / 25.4) < 0.01
+    print(f"[OK] 300 items nudged with 1 snap and 1 notification ({elapsed_many * 1000:.1f} ms)")
+
+    window.undo_stack.undo()
+    assert [(item.element.config.x, item.element.config.y) for item in window.graphics_items] == start
+    assert len(snap_calls) == 1, "Undo must not re-snap"
+    print("[OK] Undo restores positions without snapping")
+
+    window.close()
+
+
+def test_group_offsets_preserved_and_lines_follow():
+    """Усі елементи зсуваються на ту саму (прив'язану) дельту; кінець лінії рухається разом"""
+    app, window = _make_window()
+
+    window._add_rectangle()
+    window._add_line()
+    rect, line = window.graphics_items
+    canvas = window.canvas
+
+    canvas.set_item_positions([rect, line], [(10.3, 5.0), (20.0, 7.0)])
+    x2_before = line.element.config.x2 - line.element.config.x
+
+    for item in (rect, line):
+        item.setSelected(True)
+
+    # Якір (прямокутник) 10.3 + 1 -> 11.0: дельта 0.7 для всіх
+    window._move_selected(1, 0)
+    assert abs(rect.element.config.x - 11.0) < 1e-9
+    assert abs(line.element.config.x - 20.7) < 1e-9, line.element.config.x
+    assert abs((line.element.config.x2 - line.element.config.x) - x2_before) < 1e-9
+    print("[OK] Anchor snapped once, relative layout kept")
+
+    # Стрілка на клавіатурі доходить до ShortcutsMixin.keyPressEvent
+    window.keyPressEvent(QKeyEvent(QEvent.KeyPress, Qt.Key_Right, Qt.NoModifier))
+    assert abs(rect.element.config.x - 12.0) < 1e-9, rect.element.config.x
+    print("[OK] Arrow key nudges the selection")
+
+    window.close()
+
+
+def test_multi_selection_drag():
+    """Перетягування кількох виділених елементів мишею - груповий шлях"""
+    app, window = _make_window()
+    canvas = window.canvas
+    canvas.resize(800, 600)
+
+    window._add_rectangle()
+    window._add_rectangle()
+    first, second = window.graphics_items
+    canvas.set_item_positions([first, second], [(5.0, 5.0), (15.0, 12.0)])
+    first.setSelected(True)
+    second.setSelected(True)
+    base_count = window.undo_stack.count()
+
+    item_snaps = _count_calls(canvas.snap_engine, 'snap_position')
+    moved = []
+    canvas.items_moved.connect(lambda items: moved.append(len(items)))
+
+    press_scene = first.sceneBoundingRect().center()
+    press_view = canvas.mapFromScene(press_scene)
+
+    def send(kind, view_pos, button, buttons):
+        pos = QPointF(view_pos)
+        event = QMouseEvent(kind, pos, QPointF(canvas.viewport().mapToGlobal(view_pos)), button, buttons, Qt.NoModifier)
+        QApplication.sendEvent(canvas.viewport(), event)
+
+    send(QEvent.MouseButtonPress, press_view, Qt.LeftButton, Qt.LeftButton)
+    assert canvas._group_drag is not None
+
+    # 3.2mm праворуч, 2.1mm вниз -> прив'язка якоря до (8, 7)
+    target_scene = press_scene + QPointF(canvas._mm_to_px(3.2), canvas._mm_to_px(2.1))
+    for step in (0.25, 0.5, 1.0):
+        point = press_scene + (target_scene - press_scene) * step
+        send(QEvent.MouseMove, canvas.mapFromScene(point), Qt.NoButton, Qt.LeftButton)
+
+    assert len(item_snaps) == len(moved) == 3, (len(item_snaps), moved)
+    assert moved == [2, 2, 2]
+
+    send(QEvent.MouseButtonRelease, canvas.mapFromScene(target_scene), Qt.LeftButton, Qt.NoButton)
+
+    assert canvas._group_drag is None
+    assert first.isSelected() and second.isSelected()
+    dx = first.element.config.x - 5.0
+    dy = first.element.config.y - 5.0
+    assert abs(first.element.config.x - round(first.element.config.x)) < 1e-9
+    assert abs(second.element.config.x - (15.0 + dx)) < 1e-9
+    assert abs(second.element.config.y - (12.0 + dy)) < 1e-9
+    assert dx > 0 and dy > 0
+    assert window.undo_stack.count() == base_count + 1
+    print(f"[OK] Drag moved group by ({dx:.1f}, {dy:.1f})mm, 1 snap per step, 1 undo entry")
+
+    window.close()
+
+
+def test_objects_mode_ignores_group_members():
+    """OBJECTS: елементи групи не є кандидатами для прив'язки якоря"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    from core.elements.shape_element import ShapeConfig, RectangleElement, GraphicsRectangleItem
+    from gui.canvas_view import CanvasView
+
+    canvas = CanvasView(width_mm=100, height_mm=100, dpi=203)
+    canvas.grid_config = GridConfig(snap_mode=SnapMode.OBJECTS)
+
+    items = []
+    for x, y in ((20, 20), (32, 70)):
+        item = GraphicsRectangleItem(RectangleElement(ShapeConfig(x=x, y=y, width=10, height=10)),
+                                     dpi=203, canvas=canvas)
+        canvas.scene.addItem(item)
+        items.append(item)
+
+    # Якір 20 -> 21: правий край 31 близько до 32 (член групи) - не кандидат
+    dx, dy = canvas.snap_group_delta(items[0], (20, 20), 1.0, 0.0, items)
+    assert (dx, dy) == (1.0, 0.0), (dx, dy)
+
+    # Без групи другий елемент притягує: правий край якоря -> лівий край другого
+    dx, _ = canvas.snap_group_delta(items[0], (20, 20), 1.0, 0.0, [items[0]])
+    right_mm = 20 + dx + items[0].boundingRect().right() * 25.4 / 203
+    assert dx != 1.0
+    assert abs(right_mm - items[1].sceneBoundingRect().left() * 25.4 / 203) < 1e-6, right_mm
+    print("[OK] Group members excluded from object candidates")
+
+
+if __name__ == '__main__':
+    test_nudge_300_items_snaps_once()
+    test_group_offsets_preserved_and_lines_follow()
+    test_multi_selection_drag()
+    test_objects_mode_ignores_group_members()
+    print("\n[SUCCESS] All group move tests passed!")
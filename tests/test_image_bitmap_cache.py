@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""Тест збережених 1-бітних бітмапів ImageElement: повторне використання, інвалідація, збереження в шаблоні"""
+
+import sys
+import io
+import json
+import base64
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PIL import Image
+
+from core.elements import image_element
+from core.elements.image_element import ImageConfig, ImageElement
+
+
+def _logo_base64(size=(120, 80)):
+    buffer = io.BytesIO()
+    Image.radial_gradient('L').resize(size).save(buffer, format='PNG')
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def _reference_hex(image_data, width_dots, height_dots):
+    """Попередній алгоритм: піксель за пікселем через getpixel"""
+    img = Image.open(io.BytesIO(base64.b64decode(image_data)))
+    img = img.resize((width_dots, height_dots), Image.Resampling.LANCZOS).convert('L').convert('1')
+    rows = []
+    for y in range(height_dots):
+        row = []
+        for x in range(0, width_dots, 8):
+            byte_value = 0
+            for bit in range(8):
+                if x + bit < width_dots and img.getpixel((x + bit, y)) == 0:
+                    byte_value |= (1 << (7 - bit))
+            row.append(f"{byte_value:02X}")
+        rows.append("".join(row))
+    return "".join(rows)
+
+
+def _count_renders(element):
+    calls = []
+    original = element._render_packed_bitmap
+
+    def counting(*args):
+        calls.append(args)
+        return original(*args)
+
+    element._render_packed_bitmap = counting
+    return calls
+
+
+def test_packed_bitmap_matches_previous_output():
+    """Упакований бітмап збігається з попереднім hex-кодуванням"""
+    print("=" * 60)
+    print("[TEST] Image bitmap cache")
+    print("=" * 60)
+
+    data = _logo_base64()
+    element = ImageElement(ImageConfig(x=2, y=3, width=13.3, height=9.9, image_data=data))
+    zpl = element.to_zpl(203)
+
+    width_dots, height_dots = int(13.3 * 203 / 25.4), int(9.9 * 203 / 25.4)
+    hex_data = zpl.split('^GFA,')[1].split(',', 3)[3].split('\n')[0]
+    assert width_dots % 8 != 0
+    assert hex_data == _reference_hex(data, width_dots, height_dots)
+    print(f"[OK] {width_dots}x{height_dots} dots identical to per-pixel encoder")
+
+
+def test_reuse_and_invalidate():
+    """Повторний експорт без обробки зображення; нове зображення - нова генерація"""
+    element = ImageElement(ImageConfig(width=20, height=10, image_data=_logo_base64()))
+    renders = _count_renders(element)
+
+    first = element.to_zpl(203)
+    assert element.to_zpl(203) == first
+    assert len(renders) == 1
+    print("[OK] Second export reuses the stored bitmap")
+
+    element.to_zpl(300)
+    assert len(renders) == 2 and len(element.bitmaps) == 2
+    print("[OK] Each DPI gets its own bitmap")
+
+    element.config.image_data = _logo_base64((60, 60))
+    element.to_zpl(203)
+    assert len(renders) == 3
+    assert len(element.bitmaps) == 1, element.bitmaps.keys()
+    print("[OK] New source image regenerates and drops stale bitmaps")
+
+
+def test_resize_keeps_one_bitmap_per_dpi():
+    """Зміна розміру замінює бітмап; шаблон не росте"""
+    element = ImageElement(ImageConfig(width=20, height=10, image_data=_logo_base64()))
+    for step in range(30):
+        element.config.width = 20 + step * 0.5
+        element.to_zpl(203)
+    assert len(element.bitmaps) == 1, element.bitmaps.keys()
+
+    element.to_zpl(300)
+    key = ImageElement.bitmap_key(int(element.config.width * 203 / 25.4), int(10 * 203 / 25.4))
+    assert len(element.bitmaps) == 2 and key in element.bitmaps
+
+    for step in range(20):
+        element.get_packed_bitmap(50 + step, 40 + step, dpi=100 + step)  # багато профілів
+    assert len(element.bitmaps) == ImageElement.MAX_SAVED_BITMAPS
+    print("[OK] Resizing replaces the stored bitmap, count is capped")
+
+
+def test_template_round_trip_without_image_processing():
+    """Шаблон зберігає бітмап; завантажений елемент експортується без PIL"""
+    element = ImageElement(ImageConfig(width=20, height=10, image_data=_logo_base64()))
+    expected = element.to_zpl(203)
+
+    saved = json.loads(json.dumps(element.to_dict()))
+    key = ImageElement.bitmap_key(int(20 * 203 / 25.4), int(10 * 203 / 25.4))
+    assert key in saved['bitmaps']
+
+    loaded = ImageElement.from_dict(saved)
+    original_open = image_element.Image.open
+
+    def forbidden(*args, **kwargs):
+        raise AssertionError("image must not be decoded")
+
+    image_element.Image.open = forbidden
+    try:
+        assert loaded.to_zpl(203) == expected
+    finally:
+        image_element.Image.open = original_open
+    print("[OK] Loaded template exports with zero image processing")
+
+    # Застарілі бітмапи (інше джерело) не зберігаються
+    loaded.config.image_data = _logo_base64((30, 30))
+    assert 'bitmaps' not in loaded.to_dict()
+    print("[OK] Stale bitmaps are not saved")
+
+
+if __name__ == '__main__':
+    test_packed_bitmap_matches_previous_output()
+    test_reuse_and_invalidate()
+    test_resize_keeps_one_bitmap_per_dpi()
+    test_template_round_trip_without_image_processing()
+    print("\n[SUCCESS] All image bitmap cache tests passed!")
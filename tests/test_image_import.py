@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""Тест імпорту зображень: фоновий потік, EXIF-орієнтація, зменшення до роздільності етикетки"""
+
+import sys
+import io
+import base64
+import tempfile
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PIL import Image
+from PySide6.QtWidgets import QApplication
+
+from core.image_import import ImageImporter, import_image, max_useful_size, IMPORT_STAGES, EXIF_ORIENTATION
+
+
+def _write_photo(path, size=(4000, 3000), orientation=None):
+    """Велике «фото» JPEG з EXIF-орієнтацією"""
+    img = Image.radial_gradient('L').resize(size).convert('RGB')
+    exif = Image.Exif()
+    if orientation:
+        exif[EXIF_ORIENTATION] = orientation
+    img.save(path, format='JPEG', quality=90, exif=exif.tobytes())
+
+
+def _decoded_size(image_data):
+    return Image.open(io.BytesIO(base64.b64decode(image_data))).size
+
+
+def test_downscale_and_orientation():
+    """24 МП фото для етикетки 28x28 мм - зберігається лише зменшене зображення"""
+    print("=" * 60)
+    print("[TEST] Image import")
+    print("=" * 60)
+
+    max_size = max_useful_size(28, 28, 203, oversample=2.0)
+    assert max_size == (448, 448)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'photo.jpg'
+        _write_photo(path, orientation=6)  # повернуто на 90°
+
+        imported = import_image(str(path), max_size)
+
+    assert imported.source_size == (4000, 3000)
+    assert imported.size == (336, 448), imported.size  # портрет після EXIF
+    assert imported.downscaled
+    assert _decoded_size(imported.image_data) == imported.size
+    assert imported.stored_bytes * 5 < imported.source_bytes
+    print(f"[OK] {imported.source_size} -> {imported.size}, "
+          f"{imported.source_bytes // 1024} KB -> {imported.stored_bytes // 1024} KB")
+
+
+def test_small_images():
+    """Мале PNG зберігається без змін; BMP перекодовується в PNG"""
+    with tempfile.TemporaryDirectory() as tmp:
+        png_path = Path(tmp) / 'logo.png'
+        Image.new('RGBA', (64, 32), (0, 0, 0, 255)).save(png_path)
+        imported = import_image(str(png_path), (448, 448))
+        assert base64.b64decode(imported.image_data) == png_path.read_bytes()
+        assert not imported.downscaled
+
+        bmp_path = Path(tmp) / 'logo.bmp'
+        Image.new('RGB', (1000, 200), 'white').save(bmp_path)
+        imported = import_image(str(bmp_path), (448, 448))
+        assert imported.size == (448, 90)
+        assert base64.b64decode(imported.image_data)[:4] == b'\x89PNG'
+    print("[OK] Small PNG kept as is, BMP downscaled and stored as PNG")
+
+
+def test_worker_progress():
+    """Імпорт у фоновому потоці з прогресом"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'photo.jpg'
+        _write_photo(path, size=(2000, 1500))
+
+        future, progress = ImageImporter().submit(str(path), (200, 200))
+        imported = future.result(timeout=30)
+
+    assert progress.stage == len(IMPORT_STAGES) - 1
+    assert imported.size == (200, 150)
+    print("[OK] Worker import reports every stage")
+
+
+def test_add_image_in_window():
+    """MainWindow._add_image: елемент із зменшеними даними та пропорційною висотою"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    from PySide6.QtWidgets import QFileDialog
+    from gui.main_window import MainWindow
+
+    window = MainWindow()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'photo.jpg'
+        _write_photo(path)
+
+        original = QFileDialog.getOpenFileName
+        QFileDialog.getOpenFileName = staticmethod(lambda *args, **kwargs: (str(path), ''))
+        try:
+            window._add_image()
+        finally:
+            QFileDialog.getOpenFileName = original
+
+    element = window.elements[-1]
+    max_size = max_useful_size(window.canvas.width_mm, window.canvas.height_mm, window.canvas.dpi, 2.0)
+    width, height = _decoded_size(element.config.image_data)
+    assert width <= max_size[0] and height <= max_size[1]
+    assert abs(element.config.height - 30.0 * 3 / 4) < 0.01
+    assert window.undo_stack.count() == 1
+    print(f"[OK] Added image stored at {width}x{height}px")
+
+    window.close()
+
+
+if __name__ == '__main__':
+    test_downscale_and_orientation()
+    test_small_images()
+    test_worker_progress()
+    test_add_image_in_window()
+    print("\n[SUCCESS] All image import tests passed!")
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""Тест кешу зображень (QPixmapCache) та debounce зміни розміру в PropertyPanel"""
+
+import sys
+import io
+import time
+import base64
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PIL import Image
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QPixmapCache
+
+from core.elements import image_element
+from core.elements.image_element import ImageConfig, ImageElement, GraphicsImageItem
+
+
+def _logo_base64(color='black'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 32), color).save(buffer, format='PNG')
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def _make_item(image_data, width=20, height=10):
+    element = ImageElement(ImageConfig(x=0, y=0, width=width, height=height, image_data=image_data))
+    return GraphicsImageItem(element, dpi=203)
+
+
+def _count_decodes():
+    calls = []
+    original = image_element._decode_source_pixmap
+
+    def counting(config):
+        calls.append(config)
+        return original(config)
+
+    image_element._decode_source_pixmap = counting
+    return calls, original
+
+
+def test_source_shared_and_scaled_cached():
+    """Один логотип декодується один раз для всіх елементів; масштаб кешується за розміром"""
+    print("=" * 60)
+    print("[TEST] Image pixmap cache")
+    print("=" * 60)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    QPixmapCache.clear()
+    calls, original = _count_decodes()
+
+    try:
+        logo = _logo_base64()
+        items = [_make_item(logo) for _ in range(10)]
+        assert len(calls) == 1, len(calls)
+        assert len({item.pixmap().cacheKey() for item in items}) == 1
+        print("[OK] 10 items -> 1 decode, shared pixmap")
+
+        # Оновлення без зміни розміру - без повторного масштабування
+        items[0].update_from_element()
+        assert len(calls) == 1
+
+        # Новий розмір -> новий масштаб, але джерело не декодується знову
+        items[0].element.config.width = 30
+        items[0].element.config.height = 15
+        items[0].update_from_element()
+        assert len(calls) == 1
+        assert items[0].pixmap().width() > items[1].pixmap().width()
+        print("[OK] Resize reuses decoded source")
+
+        # Інший вміст -> інший ключ
+        other = _make_item(_logo_base64('white'))
+        assert len(calls) == 2
+        assert other._content_key() != items[0]._content_key()
+    finally:
+        image_element._decode_source_pixmap = original
+
+
+def test_property_panel_resize_debounced():
+    """Кілька змін ширини поспіль -> одне масштабування після паузи"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    from gui.property_panel import PropertyPanel
+
+    panel = PropertyPanel()
+    item = _make_item(_logo_base64())
+    panel.set_element(item.element, item)
+
+    updates = []
+    original_update = item.update_from_element
+    item.update_from_element = lambda: (updates.append(1), original_update())
+
+    for value in (21, 22, 23, 24, 25):
+        panel.image_width_input.setValue(value)
+
+    assert not updates, "Rescale must wait for debounce"
+    assert item.element.config.width == 25
+
+    deadline = time.time() + 2
+    while not updates and time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+
+    assert len(updates) == 1, len(updates)
+    print("[OK] 5 spinbox ticks -> 1 rescale")
+
+
+if __name__ == '__main__':
+    test_source_shared_and_scaled_cached()
+    test_property_panel_resize_debounced()
+    print("\n[SUCCESS] All image cache tests passed!")
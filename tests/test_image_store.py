@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Тест спільного сховища зображень: копії елементів ділять дані до зміни (copy-on-write)"""
+
+import sys
+import os
+import gc
+import copy
+import base64
+import tracemalloc
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtWidgets import QApplication
+
+from core.image_store import image_store, ImagePayload
+from core.elements.image_element import ImageConfig, ImageElement, GraphicsImageItem
+from core.undo_commands import ChangePropertyCommand
+
+
+def _big_payload(size=2 * 1024 * 1024):
+    """~2.7 МБ base64 (випадкові байти не стискаються)"""
+    return base64.b64encode(os.urandom(size)).decode('ascii')
+
+
+def test_clones_share_payload():
+    """Дублювання 20 разів коштує кілобайти, а не 20 копій даних"""
+    print("=" * 60)
+    print("[TEST] Image store")
+    print("=" * 60)
+
+    data = _big_payload()
+    logo = ImageElement(ImageConfig(width=20, height=20, image_data=data))
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    clones = [copy.deepcopy(logo) for _ in range(20)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert all(clone.config.image_payload is logo.config.image_payload for clone in clones)
+    assert after - before < 256 * 1024, after - before
+    print(f"[OK] 20 duplicates allocated {(after - before) / 1024:.1f} KB")
+
+    # Окремі рядки з JSON з однаковим вмістом - один спільний об'єкт
+    loaded = [ImageElement.from_dict(dict(logo.to_dict(), image_data=data[:10] + data[10:]))
+              for _ in range(3)]
+    assert all(element.config.image_data is data for element in loaded)
+    print("[OK] Equal payloads from JSON are interned")
+
+
+def test_edit_is_copy_on_write():
+    """Нове зображення в одній копії не змінює інші"""
+    original = ImageElement(ImageConfig(image_data=_big_payload(1024)))
+    clone = copy.deepcopy(original)
+    shared = original.config.image_payload
+
+    clone.config.image_data = _big_payload(1024)
+    assert original.config.image_payload is shared
+    assert clone.config.image_payload is not shared
+    assert clone.config.image_payload.key != shared.key
+
+    try:
+        shared.data = "x"
+        raise AssertionError("payload must be immutable")
+    except AttributeError:
+        pass
+    print("[OK] Editing a clone replaces its handle only")
+
+
+def test_undo_and_release():
+    """Undo повертає той самий об'єкт; невикористані дані звільняються"""
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    element = ImageElement(ImageConfig(image_data=_big_payload(4096)))
+    item = GraphicsImageItem(element, dpi=203)
+    old_data = element.config.image_data
+    new_data = _big_payload(4096)
+    new_key = image_store.intern(new_data).key
+
+    command = ChangePropertyCommand(element, item, 'image_data', old_data, new_data)
+    command.redo()
+    assert element.config.image_payload.key == new_key
+    command.undo()
+    assert element.config.image_data is old_data
+    print("[OK] Undo restores the shared payload")
+
+    del command, new_data
+    gc.collect()
+    assert image_store.get(new_key) is None
+    assert isinstance(image_store.get(element.config.image_payload.key), ImagePayload)
+    print("[OK] Unreferenced payloads are released")
+
+
+def test_duplicate_in_window():
+    """Ctrl+D для зображення в MainWindow - усі копії ділять дані"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    from gui.main_window import MainWindow
+
+    window = MainWindow()
+    element = ImageElement(ImageConfig(x=5, y=5, width=10, height=10, image_data=_big_payload(64 * 1024)))
+    item = window._create_graphics_item(element)
+    window.document.add(element, item)
+    window.selected_item = item
+
+    for _ in range(20):
+        window._duplicate_selected()
+
+    payloads = {id(e.config.image_payload) for e in window.elements}
+    assert len(window.document) == 21 and len(payloads) == 1
+    print("[OK] 21 images on canvas share one payload")
+
+    window.close()
+
+
+if __name__ == '__main__':
+    test_clones_share_payload()
+    test_edit_is_copy_on_write()
+    test_undo_and_release()
+    test_duplicate_in_window()
+    print("\n[SUCCESS] All image store tests passed!")
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""Тест політики кешування елементів полотна (CacheMode) та лічильника часу кадру"""
+
+import sys
+import time
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtWidgets import QApplication, QGraphicsItem
+from PySide6.QtCore import Qt, QPoint, QPointF
+from PySide6.QtGui import QWheelEvent
+
+from core.elements.base import ElementConfig
+from core.elements.text_element import TextElement, GraphicsTextItem
+from core.elements.shape_element import ShapeConfig, RectangleElement, GraphicsRectangleItem
+from gui.canvas_view import CanvasView
+from gui.render_cache import FrameTimeCounter
+
+DEVICE = QGraphicsItem.CacheMode.DeviceCoordinateCache
+NO_CACHE = QGraphicsItem.CacheMode.NoCache
+
+
+def _make_canvas():
+    app = QApplication.instance() or QApplication(sys.argv)
+    canvas = CanvasView(width_mm=100, height_mm=100, dpi=203)
+    canvas.item_cache_policy._zoom_timer.setInterval(50)
+    return app, canvas
+
+
+def _add_items(canvas, count):
+    items = []
+    for i in range(count):
+        element = TextElement(ElementConfig(x=(i % 10) * 9.0, y=(i // 10) * 4.0), f'L{i}')
+        item = GraphicsTextItem(element, dpi=canvas.dpi, canvas=canvas)
+        canvas.scene.addItem(item)
+        items.append(item)
+    return items
+
+
+def _wheel(canvas, delta):
+    pos = QPointF(50, 50)
+    event = QWheelEvent(pos, canvas.mapToGlobal(QPoint(50, 50)), QPoint(0, 0), QPoint(0, delta),
+                        Qt.NoButton, Qt.NoModifier, Qt.NoScrollPhase, False)
+    canvas.wheelEvent(event)
+
+
+def test_idle_items_use_device_cache():
+    """Нові елементи отримують DeviceCoordinateCache; без canvas - NoCache"""
+    print("=" * 60)
+    print("[TEST] Item cache policy")
+    print("=" * 60)
+
+    app, canvas = _make_canvas()
+    items = _add_items(canvas, 5)
+    assert all(item.cacheMode() == DEVICE for item in items)
+
+    loose = GraphicsRectangleItem(RectangleElement(ShapeConfig(x=0, y=0, width=5, height=5)), dpi=203)
+    assert loose.cacheMode() == NO_CACHE
+    print("[OK] DeviceCoordinateCache while idle")
+
+    canvas.item_cache_policy.set_mode('none')
+    assert all(item.cacheMode() == NO_CACHE for item in items)
+    canvas.item_cache_policy.set_mode('device')
+    assert all(item.cacheMode() == DEVICE for item in items)
+    print("[OK] Mode is configurable")
+
+
+def test_cache_off_during_zoom():
+    """Під час зуму кеш вимкнено, після паузи - відновлено"""
+    app, canvas = _make_canvas()
+    items = _add_items(canvas, 5)
+    policy = canvas.item_cache_policy
+
+    _wheel(canvas, 120)
+    assert policy.zooming
+    assert all(item.cacheMode() == NO_CACHE for item in items)
+
+    # Новий елемент під час зуму теж без кешу
+    extra = _add_items(canvas, 1)[0]
+    assert extra.cacheMode() == NO_CACHE
+
+    canvas.zoom_in()
+    assert policy.zooming
+    print("[OK] Cache disabled while zooming")
+
+    deadline = time.time() + 2
+    while policy.zooming and time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+
+    assert not policy.zooming
+    assert all(item.cacheMode() == DEVICE for item in items + [extra])
+    print("[OK] Cache restored after zoom idle")
+
+
+def test_property_change_invalidates():
+    """Зміна властивості в PropertyPanel -> update() елемента"""
+    app, canvas = _make_canvas()
+    from gui.property_panel import PropertyPanel
+
+    item = _add_items(canvas, 1)[0]
+    invalidated = []
+    canvas.item_cache_policy.invalidate = lambda it: invalidated.append(it)
+
+    panel = PropertyPanel()
+    panel._invalidate_item_cache(item)
+    assert invalidated == [item]
+    print("[OK] Property change invalidates cached rendering")
+
+
+def test_frame_time_counter():
+    """Лічильник кадрів: середній/максимальний час"""
+    counter = FrameTimeCounter(window=3)
+    assert counter.stats()['frames'] == 0
+
+    for _ in range(5):
+        counter.begin()
+        time.sleep(0.002)
+        counter.end()
+
+    stats = counter.stats()
+    assert stats['frames'] == 3
+    assert stats['avg_ms'] >= 1.0
+    assert stats['max_ms'] >= stats['avg_ms']
+    assert 'ms' in counter.text()
+
+    app, canvas = _make_canvas()
+    _add_items(canvas, 50)
+    canvas.resize(400, 300)
+    canvas.set_frame_time_visible(True)
+    canvas.show()
+    canvas.viewport().repaint()
+    app.processEvents()
+    assert canvas.frame_counter.stats()['frames'] >= 1
+    print(f"[OK] Frame time: {canvas.frame_counter.text()}")
+    canvas.close()
+
+
+if __name__ == '__main__':
+    test_idle_items_use_device_cache()
+    test_cache_off_during_zoom()
+    test_property_change_invalidates()
+    test_frame_time_counter()
+    print("\n[SUCCESS] All item cache policy tests passed!")
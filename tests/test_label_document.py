@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""Тест LabelDocument: стабільні ID, пакетне видалення, z-порядок, синхронізація зі сценою"""
+
+import sys
+import copy
+import time
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtWidgets import QApplication
+
+from core.document import LabelDocument
+from core.elements.base import ElementConfig
+from core.elements.text_element import TextElement
+from core.elements.shape_element import RectangleElement, ShapeConfig
+
+
+def _rect(x=0.0):
+    return RectangleElement(ShapeConfig(x=x, y=0, width=5, height=5))
+
+
+def test_stable_ids():
+    """ID призначаються один раз; копія елемента отримує новий ID"""
+    print("=" * 60)
+    print("[TEST] LabelDocument")
+    print("=" * 60)
+
+    document = LabelDocument()
+    first, second = _rect(), _rect()
+    document.add(first)
+    document.add(second)
+    assert (first.id, second.id) == (1, 2)
+    assert document.get(2) is second
+
+    duplicate = copy.deepcopy(first)
+    assert duplicate.id == first.id
+    document.add(duplicate)
+    assert duplicate.id == 3 and document.get(1) is first
+    assert duplicate in document and len(document) == 3
+
+    entry = document.remove(second)
+    assert document.get(2) is None
+    document.restore([entry])
+    assert document.get(2) is second
+    assert document.elements == (first, second, duplicate)
+    print("[OK] Stable ids, deepcopy gets a fresh id, restore keeps id")
+
+
+def test_paste_after_delete_then_undo():
+    """Копія видаленого елемента не займає його ID: undo видалення повертає оригінал"""
+    document = LabelDocument()
+    original = _rect()
+    document.add(original)
+
+    clipboard = copy.deepcopy(original)
+    entry = document.remove(original)
+    pasted = copy.deepcopy(clipboard)
+    document.add(pasted)
+    assert pasted.id != original.id
+
+    assert document.restore([entry]) == [entry]
+    assert original in document and pasted in document and len(document) == 2
+
+    # Навіть якщо ID зайнятий - запис отримує новий ID, а не губиться
+    other = _rect()
+    document.add(other)
+    entry = document.remove(other)
+    intruder = _rect()
+    document.add(intruder)
+    document._entries[entry.id] = document._entries.pop(intruder.id)  # штучна колізія ID
+    document._entries[entry.id].id = intruder.id = entry.id
+    assert document.restore([entry]) == [entry]
+    assert other in document and intruder in document and other.id != intruder.id
+    print("[OK] Copy, delete, paste, undo delete keeps the original")
+
+
+def test_bulk_remove_is_linear():
+    """Видалення 2000 елементів однією операцією, одне сповіщення"""
+    document = LabelDocument()
+    elements = [_rect(i) for i in range(2000)]
+    document.add_many([(element, None) for element in elements])
+
+    notifications = []
+    document.elements_removed.connect(lambda entries: notifications.append(len(entries)))
+
+    begin = time.perf_counter()
+    removed = document.remove_many(elements[::2])
+    elapsed = time.perf_counter() - begin
+
+    assert len(removed) == 1000 and len(document) == 1000
+    assert notifications == [1000]
+    assert document.elements == tuple(elements[1::2])
+    assert elapsed < 0.5, elapsed
+    print(f"[OK] Removed 1000 of 2000 elements in {elapsed * 1000:.1f} ms, 1 notification")
+
+
+def test_z_order():
+    """На передній/задній план - порядок ітерації і ZPL"""
+    from zpl.generator import ZPLGenerator
+
+    document = LabelDocument()
+    texts = [TextElement(ElementConfig(x=i, y=0), f"T{i}") for i in range(3)]
+    for element in texts:
+        document.add(element)
+
+    document.bring_to_front([texts[0]])
+    assert list(document) == [texts[1], texts[2], texts[0]]
+    document.send_to_back([texts[2]])
+    assert list(document) == [texts[2], texts[1], texts[0]]
+
+    zpl = ZPLGenerator(dpi=203).generate(document, {'width': 50, 'height': 20, 'dpi': 203})
+    assert zpl.index("T2") < zpl.index("T1") < zpl.index("T0")
+    print("[OK] z-order reflected in iteration and ZPL")
+
+
+def test_main_window_delete_undo_paste():
+    """MainWindow: групове видалення одним undo, вставка отримує новий ID"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    from gui.main_window import MainWindow
+
+    window = MainWindow()
+    for _ in range(5):
+        window._add_rectangle()
+    items = window.graphics_items
+    ids = [item.element.id for item in items]
+    assert len(set(ids)) == 5
+    assert all(item.scene() is window.canvas.scene for item in items)
+
+    for item in items[1:4]:
+        item.setSelected(True)
+    base_count = window.undo_stack.count()
+    window._delete_selected()
+
+    assert window.undo_stack.count() == base_count + 1
+    assert len(window.document) == 2
+    assert all(item.scene() is None for item in items[1:4])
+    print("[OK] Multi-delete: one undo entry, items removed from scene")
+
+    window.undo_stack.undo()
+    assert [element.id for element in window.elements] == ids
+    assert all(item.scene() is window.canvas.scene for item in items)
+    assert [item.zValue() for item in window.graphics_items] == sorted(item.zValue() for item in items)
+    window.undo_stack.redo()
+    assert len(window.document) == 2
+    print("[OK] Undo restores ids and z-order, redo deletes again")
+
+    window.canvas.scene.clearSelection()
+    window.selected_item = items[0]
+    items[0].setSelected(True)
+    window._copy_selected()
+    window._paste_from_clipboard()
+    pasted = window.graphics_items[-1]
+    assert pasted.element.id not in ids
+    assert pasted.scene() is window.canvas.scene and len(window.document) == 3
+
+    # Копіювати, видалити, вставити, скасувати видалення - оригінал повертається
+    original = items[4]
+    window.canvas.scene.clearSelection()
+    window.selected_item = original
+    original.setSelected(True)
+    window._copy_selected()
+    window._delete_selected()
+    window._paste_from_clipboard()
+    window.undo_stack.undo()
+    assert original.element in window.document and len(window.document) == 4
+    assert original.scene() is window.canvas.scene
+    print("[OK] Copy/delete/paste/undo keeps the original element")
+
+    window.canvas.scene.clearSelection()
+    pasted.setSelected(True)
+    window._bring_to_front()
+    assert window.graphics_items[-1] is pasted
+    window.canvas.scene.clearSelection()
+    items[0].setSelected(True)
+    window._bring_to_front()
+    assert window.graphics_items[-1] is items[0]
+    assert items[0].zValue() > pasted.zValue()
+    print("[OK] Paste gets a new id, bring to front updates z values")
+
+    window.close()
+
+
+if __name__ == '__main__':
+    test_stable_ids()
+    test_paste_after_delete_then_undo()
+    test_bulk_remove_is_linear()
+    test_z_order()
+    test_main_window_delete_undo_paste()
+    print("\n[SUCCESS] All label document tests passed!")
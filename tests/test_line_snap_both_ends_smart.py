@@ -167,9 +167,7 @@ def test_line_snap_both_ends():
     
     # Добавить в canvas
     graphics_line = GraphicsLineItem(line, dpi=203, canvas=window.canvas)
-    window.canvas.scene.addItem(graphics_line)
-    window.elements.append(line)
-    window.graphics_items.append(graphics_line)
+    window.document.add(line, graphics_line)
     
     app.processEvents()
     
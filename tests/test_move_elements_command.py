@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""Тест групової команди переміщення: масиви зміщень, mergeWith(), ліміт стеку"""
+
+import sys
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QUndoStack
+
+from config import CONFIG
+from core.elements.shape_element import ShapeConfig, RectangleElement, GraphicsRectangleItem
+from core.undo_commands import MoveElementsCommand, MoveElementCommand
+
+
+def _make_items(count):
+    items = []
+    for i in range(count):
+        element = RectangleElement(ShapeConfig(x=float(i), y=2.0 * i, width=5, height=5))
+        items.append(GraphicsRectangleItem(element, dpi=203))
+    return items
+
+
+def test_nudges_merge_into_one_entry():
+    """30 натискань стрілки на 50 елементах -> один запис у стеку"""
+    print("=" * 60)
+    print("[TEST] MoveElementsCommand merge")
+    print("=" * 60)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    stack = QUndoStack()
+    items = _make_items(50)
+    start = [(item.element.config.x, item.element.config.y) for item in items]
+
+    for _ in range(30):
+        stack.push(MoveElementsCommand.from_items(items, 1.0, 0.0, mergeable=True))
+
+    assert stack.count() == 1, stack.count()
+    assert items[0].element.config.x == 30.0
+    assert items[49].element.config.x == 79.0
+    print(f"[OK] 30 nudges -> {stack.count()} undo entry")
+
+    stack.undo()
+    assert [(item.element.config.x, item.element.config.y) for item in items] == start
+    assert abs(items[10].pos().x() - 10.0 * 203 / 25.4) < 0.01
+    print("[OK] Undo restores all positions in one step")
+
+    stack.redo()
+    assert items[10].element.config.x == 40.0
+    print("[OK] Redo")
+
+
+def test_merge_rules():
+    """Різні набори елементів / drag-команди не зливаються; нульовий зсув видаляє запис"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    stack = QUndoStack()
+    items = _make_items(3)
+
+    stack.push(MoveElementsCommand.from_items(items, 1.0, 0.0, mergeable=True))
+    stack.push(MoveElementsCommand.from_items(items[:2], 1.0, 0.0, mergeable=True))
+    assert stack.count() == 2
+
+    stack.push(MoveElementsCommand.from_items(items[:2], 0.0, 2.0))
+    assert stack.count() == 3
+    print("[OK] Different selections / drag moves stay separate")
+
+    stack.clear()
+    stack.push(MoveElementsCommand.from_items(items, 1.0, 0.0, mergeable=True))
+    stack.push(MoveElementsCommand.from_items(items, -1.0, 0.0, mergeable=True))
+    assert stack.count() == 0, stack.count()
+
+    # 0.1 мм кроки: сума 3×0.1 - 3×0.1 не дорівнює рівно нулю
+    for delta in (0.1, 0.1, 0.1, -0.1, -0.1, -0.1):
+        stack.push(MoveElementsCommand.from_items(items, delta, delta, mergeable=True))
+    assert stack.count() == 0, stack.count()
+    print("[OK] Back-and-forth nudges cancel out")
+
+    # Зміщення для кожного елемента окремо
+    command = MoveElementsCommand(items, [(0, 0), (1, 1), (2, 2)], [(1, 0), (0, 1), (3, 3)])
+    command.redo()
+    assert (items[2].element.config.x, items[2].element.config.y) == (5.0, 5.0)
+
+
+def test_dpi_from_item():
+    """MoveElementCommand бере DPI з graphics item, а не 203"""
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    element = RectangleElement(ShapeConfig(x=0, y=0, width=5, height=5))
+    item = GraphicsRectangleItem(element, dpi=300)
+    command = MoveElementCommand(element, item, 0, 0, 10.0, 20.0)
+    command.redo()
+    assert abs(item.pos().x() - 10.0 * 300 / 25.4) < 0.01, item.pos()
+    print("[OK] DPI taken from item")
+
+
+def test_main_window_undo_limit_and_nudge():
+    """MainWindow: ліміт стеку, стрілки на виділенні -> одна команда"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    from gui.main_window import MainWindow
+
+    window = MainWindow()
+    assert window.undo_stack.undoLimit() == CONFIG['UNDO_LIMIT']
+
+    window._add_rectangle()
+    window._add_rectangle()
+    base_count = window.undo_stack.count()
+
+    for item in window.graphics_items:
+        item.setSelected(True)
+
+    for _ in range(5):
+        window._move_selected(1, 0)
+
+    assert window.undo_stack.count() == base_count + 1, window.undo_stack.count()
+    print("[OK] Keyboard nudges merged in MainWindow")
+
+    window.undo_stack.undo()
+    assert window.undo_stack.count() == base_count + 1
+    window.close()
+
+
+if __name__ == '__main__':
+    test_nudges_merge_into_one_entry()
+    test_merge_rules()
+    test_dpi_from_item()
+    test_main_window_undo_limit_and_nudge()
+    print("\n[SUCCESS] All move command tests passed!")
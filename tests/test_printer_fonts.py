@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""Тест завантажених шрифтів: ~DY один раз на принтер, ^A@ у текстових полях"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.elements.base import ElementConfig
+from core.elements.text_element import TextElement, TextRenderMode
+from core.printer_fonts import FontInventory, printer_font_name, download_font_zpl
+from zpl.generator import ZPLGenerator
+from zpl.importer import import_zpl
+
+LABEL = {'width': 50, 'height': 20}
+
+
+def _font_file(directory, content=b"\x00\x01\x00\x00TTF-DATA"):
+    path = Path(directory) / "TestFont.ttf"
+    path.write_bytes(content)
+    return str(path)
+
+
+def _downloaded_text(font_path, text="Сорт 1"):
+    element = TextElement(ElementConfig(x=2, y=2), text=text, font_size=30)
+    element.render_mode = TextRenderMode.DOWNLOADED
+    element.ttf_font = font_path
+    return element
+
+
+def test_printer_font_names():
+    """Ім'я шрифту на принтері: пристрій, великі літери, до 16 символів"""
+    print("=" * 60)
+    print("[TEST] Printer fonts")
+    print("=" * 60)
+
+    assert printer_font_name("C:/Windows/Fonts/simhei.ttf") == "E:SIMHEI.TTF"
+    assert printer_font_name("arial-bold.ttf", 'R') == "R:ARIAL_BOLD.TTF"
+    assert printer_font_name("VeryLongFontFileName2024.ttf") == "E:VERYLONGFONTFILE.TTF"
+    try:
+        printer_font_name("arial.ttf", 'B')
+        assert False, "Невідомий пристрій має бути помилкою"
+    except ValueError:
+        pass
+    print("[OK] Printer file names")
+
+
+def test_downloaded_font_zpl():
+    """^A@ у полі; ~DY перед ^XA, коли немає обліку шрифтів"""
+    with tempfile.TemporaryDirectory() as directory:
+        element = _downloaded_text(_font_file(directory))
+        zpl = element.to_zpl(203)
+        assert "^A@N,30,30,E:TESTFONT.TTF" in zpl and "^FDСорт 1^FS" in zpl
+
+        generator = ZPLGenerator(dpi=203)
+        for _ in range(2):  # без обліку - шрифт у кожному завданні
+            job = generator.generate([element], LABEL)
+            assert job.startswith("~DYE:TESTFONT,A,T,12,,000100005454462D44415441\n^XA")
+
+        assert not import_zpl(job).skipped
+        restored = TextElement.from_dict(element.to_dict())
+        assert restored.render_mode == TextRenderMode.DOWNLOADED and restored.to_zpl(203) == zpl
+        print("[OK] ~DY + ^A@")
+
+
+def test_font_inventory_per_printer():
+    """Облік: шрифт надсилається лише тоді, коли його немає на принтері"""
+    with tempfile.TemporaryDirectory() as directory:
+        font_path = _font_file(directory)
+        inventory_path = str(Path(directory) / "fonts.json")
+        element = _downloaded_text(font_path)
+
+        generator = ZPLGenerator(dpi=203)
+        generator.set_font_inventory(FontInventory(inventory_path), printer_id="zebra-1")
+        assert generator.generate([element], LABEL).startswith("~DY")
+        assert [upload.name for upload in generator.pending_font_uploads] == ["E:TESTFONT.TTF"]
+        # Попередній перегляд / невдала відправка: шрифт не вважається встановленим
+        assert generator.generate([element], LABEL).startswith("~DY")
+        assert not FontInventory(inventory_path).installed("zebra-1")
+        print("[OK] Unconfirmed jobs keep the font upload")
+
+        generator.confirm_font_uploads()
+        assert generator.generate([element], LABEL).startswith("^XA")
+        assert generator.pending_font_uploads == []
+        print("[OK] Job after confirmed send has no font upload")
+
+        # Облік зберігається у файлі
+        reloaded = FontInventory(inventory_path)
+        assert list(reloaded.installed("zebra-1")) == ["E:TESTFONT.TTF"]
+        generator.set_font_inventory(reloaded, printer_id="zebra-2")
+        assert generator.generate([element], LABEL).startswith("~DY")  # інший принтер
+        generator.confirm_font_uploads()
+        print("[OK] Inventory persisted and kept per printer")
+
+        # Змінений файл шрифту або скидання принтера - надіслати знову
+        _font_file(directory, b"NEW-FONT-DATA")
+        generator.set_font_inventory(reloaded, printer_id="zebra-1")
+        assert generator.generate([element], LABEL).startswith("~DY")
+        generator.confirm_font_uploads()
+        assert generator.generate([element], LABEL).startswith("^XA")
+        reloaded.forget("zebra-1", device='R')
+        assert generator.generate([element], LABEL).startswith("^XA")
+        reloaded.forget("zebra-1")
+        assert generator.generate([element], LABEL).startswith("~DY")
+        print("[OK] Changed font / printer reset resend the font")
+
+        # Пакет: один ~DY для всіх етикеток
+        reloaded.forget("zebra-1")
+        batch = generator.generate_batch([element], LABEL, [{}] * 3)
+        assert batch.count("~DY") == 1 and batch.index("~DY") < batch.index("^XA")
+        print("[OK] One upload per batch")
+
+
+def test_font_collection_rejected():
+    """TrueType-колекція (.ttc) не завантажується: текст друкується шрифтом принтера"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "Collection.ttc"
+        path.write_bytes(b"ttcf\x00\x01\x00\x00DATA")
+        element = _downloaded_text(str(path))
+        assert element.downloaded_font is None
+        zpl = ZPLGenerator(dpi=203).generate([element], LABEL)
+        assert "~DY" not in zpl and "^A@" not in zpl and "^A0N,30,30" in zpl
+
+        # Колекція з розширенням .ttf визначається за заголовком
+        disguised = Path(directory) / "Collection.ttf"
+        disguised.write_bytes(path.read_bytes())
+        assert _downloaded_text(str(disguised)).downloaded_font is None
+        try:
+            download_font_zpl(path.read_bytes(), "E:COLLECTION.TTF")
+            assert False, "Колекція має бути помилкою"
+        except ValueError:
+            pass
+        print("[OK] .ttc fonts are not downloaded")
+
+
+if __name__ == '__main__':
+    test_printer_font_names()
+    test_downloaded_font_zpl()
+    test_font_inventory_per_printer()
+    test_font_collection_rejected()
+    print("\n[SUCCESS] All printer font tests passed!")
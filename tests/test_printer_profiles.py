@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Тест профілів принтера: 203/300/600 dpi, ZPL для кількох профілів за один прохід"""
+
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtWidgets import QApplication
+
+from core.printer_profiles import PRINTER_PROFILES, get_printer_profile, DEFAULT_PRINTER_PROFILE
+from core.elements.base import ElementConfig
+from core.elements.text_element import TextElement
+from core.elements.barcode_element import Code128BarcodeElement
+from core.elements.shape_element import RectangleElement, ShapeConfig
+from zpl.generator import ZPLGenerator
+
+
+def _elements():
+    return [
+        TextElement(ElementConfig(x=2.5, y=3.3), text="Товар {{NAME}}", font_size=25),
+        Code128BarcodeElement(ElementConfig(x=4.1, y=10.7), data='{{SKU}}', height=10),
+        RectangleElement(ShapeConfig(x=1, y=1, width=26.3, height=26.3, border_thickness=0.5)),
+    ]
+
+
+def test_profile_conversions():
+    """dpmm і перетворення мм -> точки збігаються з формулою елементів"""
+    print("=" * 60)
+    print("[TEST] Printer profiles")
+    print("=" * 60)
+
+    assert [p.dpmm for p in PRINTER_PROFILES.values()] == [8, 12, 24]
+    for profile in PRINTER_PROFILES.values():
+        for mm in (0.1, 2.5, 28, 104):
+            assert profile.mm_to_dots(mm) == int(mm * profile.dpi / 25.4)
+        assert abs(profile.dots_to_mm(profile.dpi) - 25.4) < 1e-9
+    assert get_printer_profile('unknown').key == DEFAULT_PRINTER_PROFILE
+    print("[OK] 8/12/24 dpmm, dot-exact conversions")
+
+
+def test_generate_for_profiles_matches_single_runs():
+    """Один прохід дає той самий ZPL, що й окремі генерації"""
+    label_config = {'width': 28, 'height': 28}
+    data = {'NAME': 'Молоко', 'SKU': '4820000000000'}
+    profiles = list(PRINTER_PROFILES.values())
+
+    results = ZPLGenerator().generate_for_profiles(_elements(), label_config, profiles, data)
+    assert set(results) == set(PRINTER_PROFILES)
+
+    for profile in profiles:
+        expected = ZPLGenerator(profile=profile).generate(_elements(), label_config, data)
+        assert results[profile.key] == expected, profile.key
+        assert f"^PW{profile.mm_to_dots(28)}" in expected
+        assert "~SD" not in expected  # щільність не задана - налаштування принтера не змінюється
+    assert results['zebra_203'] != results['zebra_300']
+    print("[OK] Multi-profile output identical to per-profile runs")
+
+    # Без профілю - заголовок без змін
+    plain = ZPLGenerator(dpi=203).generate(_elements(), label_config)
+    assert plain.split("\n")[:4] == ["^XA", "^CI28", "^PW223", "^LL223"]
+    print("[OK] Generator without profile keeps the previous header")
+
+    # Явно задана щільність
+    dark = replace(get_printer_profile('zebra_203'), darkness=8)
+    assert ZPLGenerator(profile=dark).generate(_elements(), label_config).split("\n")[2] == "~SD08"
+    print("[OK] ~SD only when darkness is set explicitly")
+
+
+def test_print_width_clamped():
+    """^PW не перевищує максимальну ширину друку"""
+    profile = get_printer_profile('zebra_300')
+    zpl = ZPLGenerator(profile=profile).generate([], {'width': 110, 'height': 30})
+    assert f"^PW{profile.max_print_width_dots}" in zpl
+    print("[OK] ^PW clamped to printer max width")
+
+
+def test_window_profile_switch():
+    """Перемикання профілю в MainWindow: генератор і Labelary - нова роздільність, полотно - ні"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    from gui.main_window import MainWindow
+    from utils.settings_manager import settings_manager
+
+    saved = settings_manager.load_printer_profile()
+    window = MainWindow()
+    try:
+        canvas_dpi = window.canvas.dpi
+        window._set_printer_profile('zebra_600')
+        assert window.zpl_generator.dpi == 600
+        assert window.labelary_client.dpi == 600
+        assert window.canvas.dpi == canvas_dpi
+        assert window.actions['printer_zebra_600'].isChecked()
+        assert settings_manager.load_printer_profile() == 'zebra_600'
+        print("[OK] Profile switch updates export resolution only")
+    finally:
+        settings_manager.save_printer_profile(saved)
+        window.close()
+
+
+if __name__ == '__main__':
+    test_profile_conversions()
+    test_generate_for_profiles_matches_single_runs()
+    test_print_width_clamped()
+    test_window_profile_switch()
+    print("\n[SUCCESS] All printer profile tests passed!")
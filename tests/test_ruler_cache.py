@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Тест кешування лінійки: pixmap з поділками + дешеве оновлення курсора"""
+
+import sys
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtWidgets import QApplication
+
+from gui.rulers import HorizontalRuler, VerticalRuler
+from utils.unit_converter import MeasurementUnit
+
+
+def _make_ruler(cls=HorizontalRuler):
+    app = QApplication.instance() or QApplication(sys.argv)
+    ruler = cls(length_mm=100, dpi=203, scale=2.5)
+    ruler.resize(ruler.minimumSizeHint().expandedTo(ruler.minimumSize()))
+    ruler.show()
+    app.processEvents()
+    return app, ruler
+
+
+def test_tick_pixmap_cached():
+    """Pixmap поділок рендериться один раз і перебудовується тільки при зміні ключа"""
+    print("=" * 60)
+    print("[TEST] Ruler tick pixmap cache")
+    print("=" * 60)
+
+    app, ruler = _make_ruler()
+
+    first = ruler._get_tick_pixmap()
+    assert ruler._get_tick_pixmap() is first, "Pixmap must be reused"
+    print("[OK] Same key -> cached pixmap")
+
+    ruler.update_cursor_position(10.0)
+    ruler.highlight_bounds(5.0, 20.0)
+    app.processEvents()
+    assert ruler._get_tick_pixmap() is first, "Cursor/bounds must not re-render ticks"
+    print("[OK] Cursor/bounds do not invalidate cache")
+
+    ruler.set_unit(MeasurementUnit.CM)
+    assert ruler._get_tick_pixmap() is not first, "Unit change must re-render"
+    second = ruler._get_tick_pixmap()
+
+    ruler.update_scale(3.0)
+    assert ruler._get_tick_pixmap() is not second, "Scale change must re-render"
+    print("[OK] Unit/scale change -> re-render")
+
+
+def test_tick_positions():
+    """Позиції поділок: основні кожні 5mm, додаткові кожні 2mm"""
+    app, ruler = _make_ruler()
+
+    ticks = ruler._tick_positions()
+    majors = [pos for pos, is_major in ticks if is_major]
+    minors = [pos for pos, is_major in ticks if not is_major]
+
+    assert majors == [5.0 * k for k in range(21)], majors
+    assert 2.0 in minors and 10.0 not in minors
+    assert [pos for pos, _ in ticks] == sorted(pos for pos, _ in ticks)
+
+    ruler.set_unit(MeasurementUnit.INCH)
+    inch_majors = [pos for pos, is_major in ruler._tick_positions() if is_major]
+    assert len(inch_majors) == 4, inch_majors  # 0, 1, 2, 3 inch
+    print("[OK] Tick positions")
+
+
+def test_cursor_updates_dirty_rect_only():
+    """Оновлення курсора перемальовує тільки малі прямокутники навколо маркерів"""
+    for cls in (HorizontalRuler, VerticalRuler):
+        app, ruler = _make_ruler(cls)
+
+        requested = []
+        ruler.update = lambda *args: requested.append(args)
+
+        ruler.update_cursor_position(10.0)
+        ruler.update_cursor_position(12.0)
+
+        assert requested, "No repaint requested"
+        for args in requested:
+            assert args, "Full repaint requested"
+            rect = args[0]
+            extent = rect.width() if cls is HorizontalRuler else rect.height()
+            assert extent <= 2 * ruler.CURSOR_DIRTY_MARGIN + 1, rect
+        print(f"[OK] {cls.__name__}: {len(requested)} small dirty rects")
+
+        requested.clear()
+        ruler.hide_cursor()
+        assert len(requested) == 1 and requested[0], requested
+
+
+if __name__ == '__main__':
+    test_tick_pixmap_cached()
+    test_tick_positions()
+    test_cursor_updates_dirty_rect_only()
+    print("\n[SUCCESS] All ruler cache tests passed!")
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""Тест серійних полів: ^SN/^SF з ^PQ - один формат, принтер збільшує номер"""
+
+import sys
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.elements.base import ElementConfig
+from core.elements.text_element import TextElement
+from core.elements.barcode_element import Code128BarcodeElement, QRCodeElement
+from core.elements.serial import SerialField
+from zpl.generator import ZPLGenerator
+from zpl.importer import import_zpl
+from zpl.optimizer import optimize_zpl
+
+
+def _serial_label():
+    text = TextElement(ElementConfig(x=2, y=2), text="Box", font_size=25)
+    text.serial = SerialField(start=1, increment=1, padding=6)
+    barcode = Code128BarcodeElement(ElementConfig(x=2, y=10), data="X")
+    barcode.serial = SerialField(start=1, increment=1, padding=6, prefix="BOX")
+    return [text, barcode]
+
+
+def test_serial_zpl():
+    """Один формат етикетки з ^SN/^SF та ^PQ"""
+    print("=" * 60)
+    print("[TEST] Serial fields")
+    print("=" * 60)
+
+    zpl = ZPLGenerator(dpi=203).generate(_serial_label(), {'width': 50, 'height': 30}, quantity=20000)
+
+    assert zpl.count("^XA") == 1
+    assert "^SN000001,1,Y^FS" in zpl
+    assert "^FDBOX000001^SFdddddd,1^FS" in zpl
+    assert zpl.index("^PQ20000") < zpl.index("^XZ")
+    print(f"[OK] 20000 labels in one format: {len(zpl)} bytes")
+
+    serial = SerialField(start=998, increment=2, padding=0)
+    assert [serial.value_at(i) for i in range(3)] == ["998", "1000", "1002"]
+    assert SerialField(start=5, padding=0).field_zpl() == "^SN5,1,N"
+    print("[OK] Values and unpadded ^SN")
+
+    # ^SF: маска фіксованої ширини, принтер після 999 друкує 000
+    serial = SerialField(start=998, increment=2, padding=3, prefix="A-")
+    assert serial.field_zpl() == "^FDA-998^SFddd,2"
+    assert [serial.value_at(i) for i in range(3)] == ["A-998", "A-000", "A-002"]
+    assert SerialField(start=1, increment=-1, padding=2, prefix="A").value_at(2) == "A99"
+    try:
+        SerialField(start=998, increment=2, padding=0, prefix="A-")
+        assert False, "Префікс без доповнення нулями має бути помилкою"
+    except ValueError:
+        pass
+    print("[OK] ^SF mask wraps like the printer")
+
+    try:
+        ZPLGenerator(dpi=203).generate(_serial_label(), {'width': 50, 'height': 30}, quantity=0)
+        assert False, "quantity=0 має бути помилкою"
+    except ValueError:
+        pass
+    print("[OK] Invalid quantity rejected")
+
+
+def test_serial_round_trip():
+    """to_dict/from_dict та імпорт ZPL зберігають серійне поле"""
+    for element in _serial_label():
+        restored = type(element).from_dict(element.to_dict())
+        assert restored.serial == element.serial
+        assert restored.to_zpl(203) == element.to_zpl(203)
+    assert TextElement.from_dict(TextElement(ElementConfig(x=0, y=0), "a").to_dict()).serial is None
+    print("[OK] to_dict/from_dict")
+
+    zpl = ZPLGenerator(dpi=203).generate(_serial_label(), {'width': 50, 'height': 30}, quantity=5)
+    imported = import_zpl(zpl).elements
+    assert [element.serial for element in imported] == [element.serial for element in _serial_label()]
+    assert imported[0].text == "000001"
+    assert not import_zpl(zpl).skipped
+    print("[OK] Import restores ^SN/^SF")
+
+    qr = QRCodeElement(ElementConfig(x=30, y=2), data="X")
+    qr.serial = SerialField(start=42, padding=4)
+    assert "^SN0042,1,Y^FS" in qr.to_zpl(203)
+    print("[OK] QR serial")
+
+
+def test_optimizer_keeps_serial():
+    """Оптимізатор не змінює ^SN/^SF/^PQ"""
+    zpl = ZPLGenerator(dpi=203).generate(_serial_label(), {'width': 50, 'height': 30}, quantity=300)
+    optimized = optimize_zpl(zpl).zpl
+    assert "^SN000001,1,Y" in optimized and "^SFdddddd,1" in optimized and "^PQ300" in optimized
+    assert [element.serial for element in import_zpl(optimized).elements] == \
+           [element.serial for element in import_zpl(zpl).elements]
+    print("[OK] Optimizer keeps serial commands")
+
+
+if __name__ == '__main__':
+    test_serial_zpl()
+    test_serial_round_trip()
+    test_optimizer_keeps_serial()
+    print("\n[SUCCESS] All serial field tests passed!")
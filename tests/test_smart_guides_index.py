@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""Тест індексу країв SmartGuides: bisect-пошук, інкрементне оновлення, пул ліній"""
+
+import sys
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtWidgets import QApplication, QGraphicsScene, QGraphicsLineItem
+
+from core.elements.shape_element import ShapeConfig, RectangleElement, GraphicsRectangleItem
+from gui.smart_guides import SmartGuides, EdgeIndex
+
+
+def _make_rect(scene, x, y, width=10, height=5):
+    element = RectangleElement(ShapeConfig(x=x, y=y, width=width, height=height))
+    item = GraphicsRectangleItem(element, dpi=203)
+    scene.addItem(item)
+    return item
+
+
+def test_edge_index_nearest():
+    """Пошук найближчого краю з виключенням власного ключа"""
+    print("=" * 60)
+    print("[TEST] EdgeIndex nearest")
+    print("=" * 60)
+
+    index = EdgeIndex()
+    index.set_item('a', (10.0, 15.0, 20.0))
+    index.set_item('b', (30.0, 35.0, 40.0))
+    index.set_item('self', (11.0, 16.0, 21.0))
+
+    assert index.nearest('start', 11.0, 2.0, exclude_key='self') == 10.0
+    assert index.nearest('start', 29.5, 2.0) == 30.0
+    assert index.nearest('start', 25.0, 2.0) is None
+    assert index.nearest('end', 39.0, 2.0) == 40.0
+
+    # Інкрементне оновлення: старі значення видаляються
+    index.set_item('b', (50.0, 55.0, 60.0))
+    assert index.nearest('start', 30.0, 2.0) is None
+    assert index.nearest('start', 49.0, 2.0) == 50.0
+    assert len(index.edges['start']) == 3
+
+    index.remove_item('a')
+    assert index.nearest('start', 10.0, 2.0, exclude_key='self') is None
+    print("[OK] Nearest/update/remove")
+
+
+def test_check_alignment_uses_index():
+    """Вирівнювання по лівому краю/центру та інкрементне оновлення перетягуваного елемента"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    scene = QGraphicsScene()
+    guides = SmartGuides(scene)
+
+    items = [_make_rect(scene, 10 + 30 * i, 50 + 30 * i) for i in range(50)]
+    dragged = _make_rect(scene, 11.0, 215.0)
+    items.append(dragged)
+
+    guides.rebuild_index(items, dpi=203)
+    result = guides.check_alignment(dragged, items, dpi=203)
+    assert result is not None and abs(result[0] - 10.0) < 0.01, result
+    print(f"[OK] Snapped to left edge: {result}")
+
+    # Перетягуваний елемент не потрапляє в індекс
+    dragged.element.config.x = 500.0
+    dragged.element.config.y = 515.0
+    assert guides.check_alignment(dragged, items, dpi=203) is None
+    assert id(dragged) not in guides.x_index.item_values
+    print("[OK] Dragged item excluded from index")
+
+    guides.clear()
+    assert not guides._index_valid
+
+
+def test_multi_selection_drag_excluded():
+    """Групове перетягування: жоден з виділених елементів не є ціллю вирівнювання"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    scene = QGraphicsScene()
+    guides = SmartGuides(scene)
+
+    anchor = _make_rect(scene, 100, 100)
+    first = _make_rect(scene, 10, 10)
+    second = _make_rect(scene, 10, 40)
+    items = [anchor, first, second]
+
+    guides.rebuild_index(items, dpi=203, moving_items=[first, second])
+
+    # Група зсунута вниз; старий край другого елемента (x=10) не має притягувати перший
+    first.element.config.x, first.element.config.y = 11.0, 150.0
+    second.element.config.x, second.element.config.y = 11.0, 180.0
+    assert guides.check_alignment(first, items, dpi=203) is None
+    assert id(first) not in guides.x_index.item_values
+    assert id(second) not in guides.x_index.item_values
+
+    first.element.config.x = 99.0
+    result = guides.check_alignment(first, items, dpi=203)
+    assert result is not None and abs(result[0] - 100.0) < 0.01
+    print("[OK] Multi-selection drag ignores moving items")
+
+
+def test_guide_pool_reused():
+    """Лінії-підказки не створюються заново при кожному виклику"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    scene = QGraphicsScene()
+    guides = SmartGuides(scene)
+
+    items = [_make_rect(scene, 10, 10), _make_rect(scene, 10.5, 40.5)]
+
+    for step in range(20):
+        items[1].element.config.x = 10.0 + step * 0.05
+        guides.check_alignment(items[1], items, dpi=203)
+
+    lines = [item for item in scene.items() if isinstance(item, QGraphicsLineItem)]
+    assert len(lines) == 1, len(lines)
+    assert lines[0].isVisible()
+
+    guides.clear_guides()
+    assert not lines[0].isVisible()
+
+    # Після scene.clear() пул відновлюється
+    scene.clear()
+    items = [_make_rect(scene, 10, 10), _make_rect(scene, 10.5, 40.5)]
+    guides.clear()
+    guides.check_alignment(items[1], items, dpi=203)
+    lines = [item for item in scene.items() if isinstance(item, QGraphicsLineItem)]
+    assert len(lines) == 1 and lines[0].isVisible()
+    print("[OK] Guide pool reused")
+
+
+if __name__ == '__main__':
+    test_edge_index_nearest()
+    test_check_alignment_uses_index()
+    test_multi_selection_drag_excluded()
+    test_guide_pool_reused()
+    print("\n[SUCCESS] All smart guides index tests passed!")
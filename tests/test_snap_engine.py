@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""Тест спільного snap-рушія: сітка, об'єкти (SnapMode.OBJECTS), NONE"""
+
+import sys
+import importlib
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PySide6.QtWidgets import QApplication
+
+from config import GridConfig, SnapMode
+from core.snap_engine import get_snap_engine
+from core.elements.shape_element import (
+    ShapeConfig, LineConfig, RectangleElement, LineElement,
+    GraphicsRectangleItem, GraphicsLineItem
+)
+from core.elements.text_element import TextElement, GraphicsTextItem
+from core.elements.base import ElementConfig
+from gui.canvas_view import CanvasView
+
+
+def _make_canvas(snap_mode):
+    app = QApplication.instance() or QApplication(sys.argv)
+    canvas = CanvasView(width_mm=100, height_mm=100, dpi=203)
+    canvas.grid_config = GridConfig(size_x_mm=1.0, size_y_mm=1.0, snap_mode=snap_mode)
+    return canvas
+
+
+def _add_rect(canvas, x, y, width=10, height=10):
+    element = RectangleElement(ShapeConfig(x=x, y=y, width=width, height=height))
+    item = GraphicsRectangleItem(element, dpi=canvas.dpi, canvas=canvas)
+    canvas.scene.addItem(item)
+    return item
+
+
+def _pos_mm(item):
+    return item.pos().x() * 25.4 / item.dpi, item.pos().y() * 25.4 / item.dpi
+
+
+def test_grid_mode():
+    """GRID: позиція округлюється до сітки з урахуванням зміщення"""
+    print("=" * 60)
+    print("[TEST] SnapEngine grid mode")
+    print("=" * 60)
+
+    canvas = _make_canvas(SnapMode.GRID)
+    canvas.grid_config.offset_x_mm = 0.5
+    engine = canvas.snap_engine
+
+    assert get_snap_engine(canvas) is engine
+    assert engine.snap_value(8.3, 'x') == 8.5
+    assert engine.snap_value(8.3, 'y') == 8.0
+
+    item = _add_rect(canvas, 0, 0)
+    item.setPos(canvas._mm_to_px(12.2), canvas._mm_to_px(7.8))
+    x_mm, y_mm = _pos_mm(item)
+    assert abs(x_mm - 12.5) < 0.01 and abs(y_mm - 8.0) < 0.01, (x_mm, y_mm)
+    print(f"[OK] Grid snap: ({x_mm:.2f}, {y_mm:.2f})")
+
+    # Без canvas - типова сітка 1mm
+    assert get_snap_engine(None).snap_value(3.4) == 3.0
+
+
+def test_objects_mode():
+    """OBJECTS: край/центр притягується до країв/центрів інших елементів"""
+    canvas = _make_canvas(SnapMode.OBJECTS)
+
+    anchor = _add_rect(canvas, 20, 20, 10, 10)
+    moving = _add_rect(canvas, 60, 60, 10, 10)
+
+    # Лівий край 21.2 -> 20.0 (лівий край anchor), y далеко від усіх кандидатів
+    moving.setPos(canvas._mm_to_px(21.2), canvas._mm_to_px(36.0))
+    x_mm, y_mm = _pos_mm(moving)
+    assert abs(x_mm - 20.0) < 0.01, x_mm
+    assert abs(y_mm - 36.0) < 0.01, y_mm
+    print(f"[OK] Left edge snapped: x={x_mm:.2f}")
+
+    # Правий край 31.5 -> 30.0 (правий край anchor)
+    moving.setPos(canvas._mm_to_px(31.5 - 10), canvas._mm_to_px(70.0))
+    x_mm, _ = _pos_mm(moving)
+    right_mm = x_mm + moving.boundingRect().right() * 25.4 / 203
+    assert abs(right_mm - anchor.sceneBoundingRect().right() * 25.4 / 203) < 0.01, right_mm
+    print("[OK] Right edge snapped")
+
+    # Після руху anchor кандидати перебудовуються
+    anchor.setPos(canvas._mm_to_px(70), canvas._mm_to_px(20))
+    moving.setPos(canvas._mm_to_px(71.2), canvas._mm_to_px(36.0))
+    x_mm, _ = _pos_mm(moving)
+    assert abs(x_mm - 70.0) < 0.01, x_mm
+    print("[OK] Candidates rebuilt after another item moves")
+
+    # Межі етикетки теж кандидати: лівий край (з половиною товщини пера) -> 0
+    moving.setPos(canvas._mm_to_px(1.0), canvas._mm_to_px(70.0))
+    x_mm, _ = _pos_mm(moving)
+    assert abs(x_mm - moving.boundingRect().left() * -25.4 / 203) < 0.01, x_mm
+    print("[OK] Label border is a candidate")
+
+    # Жодного об'єкта в межах порогу -> найближча лінія сітки по кожній осі
+    moving.setPos(canvas._mm_to_px(12.3), canvas._mm_to_px(35.4))
+    x_mm, y_mm = _pos_mm(moving)
+    assert abs(x_mm - 12.0) < 0.01 and abs(y_mm - 35.0) < 0.01, (x_mm, y_mm)
+    moving.setPos(canvas._mm_to_px(71.2), canvas._mm_to_px(35.4))
+    x_mm, y_mm = _pos_mm(moving)
+    assert abs(x_mm - 70.0) < 0.01 and abs(y_mm - 35.0) < 0.01, (x_mm, y_mm)
+    print("[OK] Grid lines used when no object is in range")
+
+
+def test_none_mode_and_all_items_delegate():
+    """NONE: без прив'язки; всі класи делегують рушію"""
+    canvas = _make_canvas(SnapMode.NONE)
+
+    text = GraphicsTextItem(TextElement(ElementConfig(x=0, y=0), 'A'), dpi=203, canvas=canvas)
+    canvas.scene.addItem(text)
+    text.setPos(canvas._mm_to_px(8.3), canvas._mm_to_px(4.7))
+    x_mm, y_mm = _pos_mm(text)
+    assert abs(x_mm - 8.3) < 0.01 and abs(y_mm - 4.7) < 0.01
+
+    canvas.grid_config.snap_mode = SnapMode.GRID
+    text.setPos(canvas._mm_to_px(8.4), canvas._mm_to_px(4.6))
+    assert text.element.config.x == 8.0 and text.element.config.y == 5.0
+
+    line = GraphicsLineItem(LineElement(LineConfig(x=0, y=0, x2=10.6, y2=0)), dpi=203, canvas=canvas)
+    canvas.scene.addItem(line)
+    line.setPos(canvas._mm_to_px(2.2), canvas._mm_to_px(3.1))
+    assert abs(line.element.config.x - 2.0) < 0.01
+    assert abs(line.element.config.x2 - 13.0) < 0.01, line.element.config.x2
+    print("[OK] Text/line delegate to engine")
+
+    for module_name, cls_name in (
+            ('core.elements.text_element', 'GraphicsTextItem'),
+            ('core.elements.barcode_element', 'GraphicsBarcodeItem'),
+            ('core.elements.image_element', 'GraphicsImageItem'),
+            ('core.elements.shape_element', 'GraphicsRectangleItem'),
+            ('core.elements.shape_element', 'GraphicsCircleItem'),
+            ('core.elements.shape_element', 'GraphicsLineItem')):
+        cls = getattr(importlib.import_module(module_name), cls_name)
+        assert not hasattr(cls, '_snap_to_grid'), cls_name
+    print("[OK] No per-class _snap_to_grid copies")
+
+
+if __name__ == '__main__':
+    test_grid_mode()
+    test_objects_mode()
+    test_none_mode_and_all_items_delegate()
+    print("\n[SUCCESS] All snap engine tests passed!")
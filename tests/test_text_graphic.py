@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Тест графічного режиму тексту: TrueType → ^GFA з кешем гліфів"""
+
+import sys
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.elements.base import ElementConfig
+from core.elements.text_element import TextElement, TextRenderMode
+from core.elements.image_element import ImageElement
+from core.elements.serial import SerialField
+from core.text_raster import GlyphCache, glyph_cache
+from zpl.generator import ZPLGenerator
+from zpl.importer import import_zpl
+from zpl.graphic_field import decode_graphic_field
+
+
+def _graphic_text(text="Сорт 1", x=2, y=2):
+    element = TextElement(ElementConfig(x=x, y=y), text=text, font_size=30)
+    element.render_mode = TextRenderMode.GRAPHIC
+    return element
+
+
+def test_glyph_cache():
+    """Кожен символ растеризується один раз; рядок кешується"""
+    print("=" * 60)
+    print("[TEST] Text graphic rendering")
+    print("=" * 60)
+
+    cache = GlyphCache()
+    first = cache.render("AAAB", None, 30, 203)
+    assert cache.rasterized == 2
+    assert cache.render("AAAB", None, 30, 203) is first
+    cache.render("BAA", None, 30, 203)
+    assert cache.rasterized == 2
+    cache.render("BAA", None, 30, 300)  # інша роздільність - нові гліфи
+    assert cache.rasterized == 4
+    print(f"[OK] {cache.rasterized} glyphs rasterized for 3 strings")
+
+    assert first.width > 0 and first.height > 0
+    assert decode_graphic_field(first.field_data, first.total_bytes, first.bytes_per_row) == first.packed
+    assert cache.render("", None, 30, 203) is None
+    print(f"[OK] {first.width}x{first.height} dots, compressed ^GFA decodes to the bitmap")
+
+    small = GlyphCache(max_glyphs=3, max_strings=1)
+    small.render("abcdef", None, 20, 203)
+    assert len(small._glyphs) == 3 and len(small._strings) == 1
+    print("[OK] Cache size bounded")
+
+
+def test_text_element_graphic_zpl():
+    """TextElement у графічному режимі: ^GFA замість ^A/^FD"""
+    element = _graphic_text()
+    zpl = element.to_zpl(203)
+    assert "^GFA," in zpl and "^A0" not in zpl and "^FD" not in zpl
+    assert zpl.startswith("^FO15,15")
+
+    imported = import_zpl(f"^XA\n{zpl}\n^XZ").elements
+    assert len(imported) == 1 and isinstance(imported[0], ImageElement)
+    print("[OK] Graphic text parses as an image")
+
+    restored = TextElement.from_dict(element.to_dict())
+    assert restored.render_mode == TextRenderMode.GRAPHIC and restored.to_zpl(203) == zpl
+    assert TextElement.from_dict({'x': 0, 'y': 0, 'text': 'a', 'font_size': 20}).render_mode \
+        == TextRenderMode.PRINTER_FONT
+    print("[OK] to_dict/from_dict")
+
+    element.serial = SerialField(start=1)
+    assert "^SN000001" in element.to_zpl(203) and "^GFA" not in element.to_zpl(203)
+    print("[OK] Serial fields stay printer-side")
+
+    element = _graphic_text("Дуже довга назва товару")
+    element.fit_width = 20.0
+    assert element.fitted_font_size(203) < element.font_size
+    assert element.text_width_dots(203) <= int(20.0 * 203 / 25.4)
+    print("[OK] Auto-fit uses glyph advances")
+
+
+def test_batch_graphic_text():
+    """Пакет: заповнювач рендериться для кожного запису, гліфи з кешу"""
+    element = _graphic_text()
+    element.data_field = "{{NAME}}"
+    records = [{'NAME': 'Milk 1L'}] * 3 + [{'NAME': 'Kefir'}, {'NAME': 'Milk 1L'}]
+
+    generator = ZPLGenerator(dpi=203)
+    zpl = generator.generate_batch([element], {'width': 50, 'height': 20}, records)
+    labels = [label.strip() for label in zpl.split("^XZ") if label.strip()]
+    assert len(labels) == 3 and "^PQ3" in labels[0]
+    assert all("^GFA" in label and "{{NAME}}" not in label for label in labels)
+    assert labels[0].split("^FS")[0] == labels[2].split("^FS")[0]
+    assert labels[0].split("^FS")[0] != labels[1].split("^FS")[0]
+
+    before = glyph_cache.rasterized
+    generator.generate_batch([element], {'width': 50, 'height': 20}, records * 100)
+    assert glyph_cache.rasterized == before
+    print("[OK] Batch reuses cached glyphs and strings")
+
+
+if __name__ == '__main__':
+    test_glyph_cache()
+    test_text_element_graphic_zpl()
+    test_batch_graphic_text()
+    print("\n[SUCCESS] All text graphic tests passed!")
@@ -172,9 +172,7 @@ def test_units_smart():
     element = TextElement(config, text="Test", font_size=20)
     
     graphics_item = GraphicsTextItem(element, dpi=203)
-    window.canvas.scene.addItem(graphics_item)
-    window.elements.append(element)
-    window.graphics_items.append(graphics_item)
+    window.document.add(element, graphics_item)
     
     # Вибрати element
     window.canvas.scene.clearSelection()
@@ -125,9 +125,7 @@ def test_units_template_smart():
     element = TextElement(config, text="Test Template", font_size=20)
     
     graphics_item = GraphicsTextItem(element, dpi=203)
-    window.canvas.scene.addItem(graphics_item)
-    window.elements.append(element)
-    window.graphics_items.append(graphics_item)
+    window.document.add(element, graphics_item)
     
     print(f"[OK] Element created at ({element.config.x:.2f}, {element.config.y:.2f})mm")
     
@@ -198,9 +196,8 @@ def test_units_template_smart():
     print(f"\n[7] Loading template...")
     
     # Очистити canvas
+    window.document.clear()
     window.canvas.clear_and_redraw_grid()
-    window.elements.clear()
-    window.graphics_items.clear()
     
     # Завантажити через TemplateManager
     template_data_loaded = window.template_manager.load_template(template_path)
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""Тест потокового токенізатора ZPL та імпорту ZPL -> елементи"""
+
+import sys
+import io
+import json
+import zlib
+import base64
+import tempfile
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PIL import Image
+
+from core.elements.base import ElementConfig
+from core.elements.text_element import TextElement, TextRenderMode, ZplFont
+from core.elements.barcode_element import EAN13BarcodeElement, Code128BarcodeElement, QRCodeElement
+from core.elements.shape_element import (RectangleElement, CircleElement, LineElement,
+                                         ShapeConfig, LineConfig)
+from core.elements.image_element import ImageConfig, ImageElement
+from core.dithering import DitherMode
+from core.template_manager import TemplateManager
+from zpl.generator import ZPLGenerator
+from zpl.tokenizer import ZplTokenizer, tokenize
+from zpl.importer import import_zpl, import_zpl_file
+from zpl.graphic_field import decode_graphic_field
+
+
+def _logo_base64():
+    buffer = io.BytesIO()
+    Image.radial_gradient('L').resize((60, 40)).save(buffer, format='PNG')
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def _all_elements():
+    bold = TextElement(ElementConfig(x=3, y=14.2), text="Жирний", font_size=30)
+    bold.bold = True
+    placeholder = TextElement(ElementConfig(x=2, y=2), text="{{NAME}}", font_size=25,
+                              font_family=ZplFont.FONT_D)
+    placeholder.data_field = "{{NAME}}"
+    code128 = Code128BarcodeElement(ElementConfig(x=4.1, y=20.7), data='ABC-123', height=8)
+    code128.module_width = 3
+    return [
+        placeholder,
+        bold,
+        code128,
+        EAN13BarcodeElement(ElementConfig(x=5, y=35), data='482000000000'),
+        QRCodeElement(ElementConfig(x=40, y=5), data='https://example.com'),
+        RectangleElement(ShapeConfig(x=1, y=1, width=60.3, height=50.1, border_thickness=0.5)),
+        RectangleElement(ShapeConfig(x=50, y=30, width=8, height=8, fill=True)),
+        CircleElement(ShapeConfig(x=45, y=20, width=10, height=10, border_thickness=0.4)),
+        CircleElement(ShapeConfig(x=30, y=40, width=12, height=6, fill=True)),
+        LineElement(LineConfig(x=2, y=48, x2=58, y2=48, thickness=0.3)),
+        LineElement(LineConfig(x=59, y=2, x2=59, y2=45, thickness=0.25)),
+        LineElement(LineConfig(x=10, y=10, x2=30, y2=18, thickness=0.5)),
+        ImageElement(ImageConfig(x=20, y=25, width=13.3, height=9.9, image_data=_logo_base64())),
+    ]
+
+
+def test_tokenizer_streaming():
+    """Розбиття на будь-які шматки дає ті самі команди"""
+    print("=" * 60)
+    print("[TEST] ZPL importer")
+    print("=" * 60)
+
+    zpl = "^XA\r\n^FO10,20^A0N,25,25^FDa~b ^FS\n~SD15^XZ"
+    expected = tokenize(zpl)
+    assert [str(t) for t in expected] == ["^XA", "^FO10,20", "^A0N,25,25", "^FDa~b ", "^FS", "~SD15", "^XZ"]
+
+    for size in range(1, 8):
+        tokenizer = ZplTokenizer()
+        tokens = []
+        for i in range(0, len(zpl), size):
+            tokens.extend(tokenizer.feed(zpl[i:i + size]))
+        tokens.extend(tokenizer.close())
+        assert tokens == expected, size
+    print("[OK] Chunked input produces identical tokens")
+
+    assert [t.command for t in tokenize("^XA^CC#\n#FO1,2#FS#XZ")] == ['XA', 'CC', 'FO', 'FS', 'XZ']
+    print("[OK] ^CC changes the format prefix")
+
+
+def test_round_trip_generated_zpl():
+    """ZPL, створений генератором -> елементи -> ідентичний ZPL"""
+    generator = ZPLGenerator(dpi=203)
+    label_config = {'width': 62, 'height': 52}
+    original = generator.generate(_all_elements(), label_config)
+
+    label = import_zpl(original)
+    assert label.skipped == {}
+    assert len(label.elements) == len(_all_elements())
+    assert (label.width_mm, label.height_mm) != (None, None)
+
+    regenerated = generator.generate(label.elements, {'width': label.width_mm, 'height': label.height_mm})
+    assert regenerated == original
+    print(f"[OK] {len(label.elements)} elements, {len(original)} bytes round-trip exactly")
+
+    names = [type(e).__name__ for e in label.elements]
+    assert names == [type(e).__name__ for e in _all_elements()]
+    assert label.elements[0].data_field == "{{NAME}}"
+    assert label.elements[0].font_family == ZplFont.FONT_D
+    assert label.elements[1].bold
+    assert label.elements[2].module_width == 3
+    assert label.elements[6].config.fill and not label.elements[5].config.fill
+    assert label.elements[-1].dither_mode == DitherMode.THRESHOLD
+    print("[OK] Element types and attributes restored")
+
+
+def test_graphic_field_encodings():
+    """^GFA: hex, стиснення Zebra ASCII, :Z64: і :B64: декодуються однаково"""
+    rows = [bytes([0xFF, 0x00, 0x0F]), bytes([0xFF, 0x00, 0x0F]), bytes([0x00, 0x00, 0x00]),
+            bytes([0xF0, 0xFF, 0xFF])]
+    packed = b"".join(rows)
+
+    assert decode_graphic_field(packed.hex().upper(), 12, 3) == packed
+    assert decode_graphic_field("HFI0F:,F0!", 12, 3) == packed
+    z64 = base64.b64encode(zlib.compress(packed)).decode('ascii')
+    assert decode_graphic_field(f":Z64:{z64}:1A2B", 12, 3) == packed
+    assert decode_graphic_field(f":B64:{base64.b64encode(packed).decode('ascii')}:0000", 12, 3) == packed
+
+    label = import_zpl(f"^XA^FO8,16^GFA,12,12,3,:Z64:{z64}:1A2B^FS^XZ")
+    image = label.elements[0]
+    assert image.to_zpl(203).splitlines()[1] == f"^GFA,12,12,3,{packed.hex().upper()}"
+    print("[OK] Hex, ASCII-compressed, Z64 and B64 graphic fields")
+
+
+def test_1c_json_template():
+    """JSON з 1С: поле "zpl" + "variables" завантажується як редагований шаблон"""
+    template = {
+        "name": "TEST TEMPLATE FROM 1C",
+        "zpl": "^XA\n^CI28\n^PW720\n^LL223\n^FO7,31^A0N,28,28^FD{{Модель}}^FS\n"
+               "^FO7,62^BY2^BCN,50,N,N,N^FD{{Штрихкод}}^FS\n^XZ",
+        "variables": {
+            "{{Модель}}": "[Номенклатура.А_Модель]",
+            "{{Штрихкод}}": "[Номенклатура.ШтрихКод]"
+        }
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / '1c.json'
+        path.write_text(json.dumps(template, ensure_ascii=False), encoding='utf-8')
+        loaded = TemplateManager(templates_dir=tmp).load_template(str(path))
+
+    text, barcode = loaded['elements']
+    assert text.data_field == "{{Модель}}" and text.font_size == 28
+    assert barcode.data_field == "{{Штрихкод}}" and not barcode.show_text
+    assert int(loaded['label_config']['width_mm'] * 203 / 25.4) == 720
+    assert loaded['variables'] == template['variables']
+    print("[OK] 1C JSON converted to text + Code128 with placeholders")
+
+
+def test_field_typeset_and_fonts():
+    """^FT (базова лінія / нижній край) -> верхній лівий кут; ^A без розміру; ^A@"""
+    label = import_zpl("^XA^FT10,100^A0N,30,30^FDHi^FS"
+                       "^FT10,200^BY2^BCN,50,Y,N,N^FD123^FS"
+                       "^FT10,300^GB40,20,2^FS"
+                       "^FT5,400^BQN,2,4^FDMA,HELLO^FS^XZ")
+    text, barcode, box, qr = label.elements
+    assert text.to_zpl(203).startswith("^FO10,70\n")
+    assert barcode.to_zpl(203).startswith("^FO10,150\n")
+    assert box.to_zpl(203).startswith("^FO10,280\n")
+    assert qr.to_zpl(203).startswith("^FO5,316\n")  # 21 модуль x 4
+    print("[OK] ^FT converted to top-left origin")
+
+    label = import_zpl("^XA^FO1,1^AAN^FDa^FS^FO1,2^ADN^FDd^FS"
+                       "^FO1,3^A@N,40,40,E:ARIAL.TTF^FDx^FS^FO1,4^A@N,40,40^FDy^FS^XZ")
+    font_a, font_d, downloaded, unnamed = label.elements
+    assert (font_a.font_family, font_a.font_size) == (ZplFont.FONT_A, 9)
+    assert font_d.font_size == 18
+    assert downloaded.render_mode == TextRenderMode.DOWNLOADED and downloaded.ttf_font == "ARIAL.TTF"
+    assert "^A@N,40,40,E:ARIAL.TTF\n" in downloaded.to_zpl(203)
+    assert unnamed.render_mode == TextRenderMode.PRINTER_FONT
+    assert label.skipped == {'^A@': 1}
+    print("[OK] Bitmap font default height and ^A@ reference")
+
+
+def test_stream_library_file():
+    """Файл з багатьма етикетками читається невеликими шматками"""
+    one_label = ZPLGenerator(dpi=203).generate(_all_elements()[:6], {'width': 62, 'height': 52})
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'library.zpl'
+        path.write_text("\n".join([one_label] * 50), encoding='utf-8')
+        labels = list(import_zpl_file(str(path), chunk_size=97))
+    assert len(labels) == 50
+    assert all(len(label.elements) == 6 for label in labels)
+    print("[OK] 50 labels streamed in 97-byte chunks")
+
+
+if __name__ == '__main__':
+    test_tokenizer_streaming()
+    test_round_trip_generated_zpl()
+    test_graphic_field_encodings()
+    test_1c_json_template()
+    test_field_typeset_and_fonts()
+    test_stream_library_file()
+    print("\n[SUCCESS] All ZPL importer tests passed!")
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Тест оптимізатора ZPL: менше байтів, той самий результат після розбору"""
+
+import sys
+import io
+import base64
+from pathlib import Path
+
+# Додати project root до sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PIL import Image
+
+from core.elements.base import ElementConfig
+from core.elements.text_element import TextElement
+from core.elements.barcode_element import Code128BarcodeElement, QRCodeElement
+from core.elements.shape_element import RectangleElement, LineElement, ShapeConfig, LineConfig
+from core.elements.image_element import ImageConfig, ImageElement
+from zpl.generator import ZPLGenerator
+from zpl.importer import import_zpl, iter_labels
+from zpl.optimizer import optimize_zpl
+from zpl.graphic_field import encode_graphic_field, decode_graphic_field
+
+
+def _logo_base64():
+    buffer = io.BytesIO()
+    Image.radial_gradient('L').resize((120, 80)).save(buffer, format='PNG')
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def _text_label_elements():
+    texts = [TextElement(ElementConfig(x=2, y=2 + i * 4), text=f"Рядок {i}", font_size=25) for i in range(6)]
+    return texts + [
+        RectangleElement(ShapeConfig(x=1, y=1, width=50, height=30, border_thickness=0.5)),
+        LineElement(LineConfig(x=2, y=27, x2=48, y2=27, thickness=0.3)),
+        ImageElement(ImageConfig(x=30, y=3, width=15, height=10, image_data=_logo_base64())),
+    ]
+
+
+def _semantics(zpl):
+    """Результат розбору: елементи кожної етикетки як dict"""
+    return [([element.to_dict() for element in label.elements], label.width_mm, label.height_mm)
+            for label in iter_labels([zpl])]
+
+
+def test_text_label_round_trip():
+    """Текст, фігури, зображення: менше байтів, ті самі елементи"""
+    print("=" * 60)
+    print("[TEST] ZPL optimizer")
+    print("=" * 60)
+
+    original = ZPLGenerator(dpi=203).generate(_text_label_elements(), {'width': 52, 'height': 32})
+    result = optimize_zpl(original)
+
+    assert "\n" not in result.zpl
+    assert result.zpl.count("^A0N,25,25") == 0 and result.zpl.count("^CF0,25,25") == 1
+    assert len(result.labels) == 1 and result.labels[0].saved_bytes == result.saved_bytes > 0
+    assert _semantics(result.zpl) == _semantics(original)
+    print(f"[OK] {result.original_bytes} -> {result.optimized_bytes} bytes "
+          f"({result.labels[0].saved_percent:.0f}% saved), parse identical")
+
+    # Оптимізатор у генераторі
+    generator = ZPLGenerator(dpi=203, optimize=True)
+    assert generator.generate(_text_label_elements(), {'width': 52, 'height': 32}) == result.zpl
+    assert generator.last_optimization.saved_bytes == result.saved_bytes
+    print("[OK] Generator optimize=True returns the optimized code")
+
+
+def test_redundant_state_commands():
+    """Повторні ^BY/^CF/^FW видаляються, змінені - залишаються"""
+    zpl = ("^XA\n^FWN^CF0,30\n^FO10,10^BY2^BCN,50,Y,N,N^FD123^FS\n"
+           "^FO10,100^BY2^BCN,50,Y,N,N^FD456^FS\n^FO10,200^BY3^BCN,50,Y,N,N^FD789^FS\n"
+           "^FWN^CF0,30^FO10,300^FDText^FS\n^FX comment\n^XZ")
+    result = optimize_zpl(zpl)
+    assert result.zpl.count("^BY2") == 1 and result.zpl.count("^BY3") == 1
+    assert result.zpl.count("^CF0,30") == 1 and result.zpl.count("^FWN") == 1
+    assert "^FX" not in result.zpl
+    assert _semantics(result.zpl) == _semantics(zpl)
+    print("[OK] Duplicate state dropped, changes kept")
+
+    # Поле без ^A використовує шрифт принтера - ^CF не додається
+    unsafe = "^XA^FO1,1^A0N,25,25^FDa^FS^FO1,40^A0N,25,25^FDb^FS^FO1,80^FDc^FS^XZ"
+    assert "^CF" not in optimize_zpl(unsafe).zpl
+    print("[OK] Default font not introduced when a field relies on the printer default")
+
+
+def test_multiple_labels_reported_separately():
+    """Кожна етикетка має власну статистику; стан скидається на ^XA"""
+    label = ZPLGenerator(dpi=203).generate(
+        [Code128BarcodeElement(ElementConfig(x=2, y=2), data='A1'),
+         Code128BarcodeElement(ElementConfig(x=2, y=15), data='B2'),
+         QRCodeElement(ElementConfig(x=30, y=2), data='QA,data')],
+        {'width': 50, 'height': 30})
+    zpl = "\n".join([label, label, label])
+    result = optimize_zpl(zpl)
+
+    assert len(result.labels) == 3
+    assert all(report.saved_bytes > 0 for report in result.labels)
+    assert result.zpl.count("^BY2") == 3  # по одному на етикетку
+    assert _semantics(result.zpl) == _semantics(zpl)
+    print(f"[OK] 3 labels, {result.labels[0].saved_bytes} bytes saved each")
+
+
+def test_graphic_field_compression():
+    """Стиснення ^GFA: декодування відновлює ті самі байти"""
+    element = ImageElement(ImageConfig(width=40, height=20, image_data=_logo_base64()))
+    zpl = element.to_zpl(203)
+    hex_data = zpl.splitlines()[1].split(',', 4)[4]
+    compressed = optimize_zpl(zpl).zpl.split('^GFA,')[1].split(',', 3)[3].split('^')[0]
+
+    assert len(compressed) < len(hex_data)
+    packed = bytes.fromhex(hex_data)
+    bytes_per_row = (int(40 * 203 / 25.4) + 7) // 8
+    assert decode_graphic_field(compressed, len(packed), bytes_per_row) == packed
+    assert encode_graphic_field(bytes(30), 3) == "," + ":" * 9
+    print(f"[OK] ^GFA {len(hex_data)} -> {len(compressed)} chars")
+
+    assert import_zpl(optimize_zpl(zpl).zpl).elements[0].to_zpl(203) == import_zpl(zpl).elements[0].to_zpl(203)
+    print("[OK] Compressed image parses to the same bitmap")
+
+
+if __name__ == '__main__':
+    test_text_label_round_trip()
+    test_redundant_state_commands()
+    test_multiple_labels_reported_separately()
+    test_graphic_field_compression()
+    print("\n[SUCCESS] All ZPL optimizer tests passed!")
@@ -4,7 +4,7 @@
 from PySide6.QtCore import QSettings
 
 from utils.logger import logger
-from config import SnapMode
+from config import CONFIG, SnapMode
 
 
 class SettingsManager:
@@ -79,6 +79,18 @@ class SettingsManager:
         logger.debug(f"[SETTINGS] 工具栏设置已加载: {settings}")
         return settings
 
+    def save_printer_profile(self, profile_key):
+        """保存当前打印机配置标识。"""
+        self.settings.setValue("printer/profile", profile_key)
+        self.settings.sync()
+        logger.debug(f"[SETTINGS] 打印机配置已保存: {profile_key}")
+
+    def load_printer_profile(self):
+        """加载打印机配置标识。"""
+        profile_key = self.settings.value("printer/profile", defaultValue=CONFIG['PRINTER_PROFILE'], type=str)
+        logger.debug(f"[SETTINGS] 打印机配置已加载: {profile_key}")
+        return profile_key
+
     def clear_all_settings(self):
         """清除所有设置（用于测试）。"""
         self.settings.clear()
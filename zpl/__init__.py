@@ -1,2 +1,2 @@
 # -*- coding: utf-8 -*-
-"""ZPL 代码生成"""
+"""ZPL 代码生成与解析"""
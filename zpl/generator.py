@@ -1,28 +1,88 @@
 # -*- coding: utf-8 -*-
 """ZPL 代码生成器"""
 
-from typing import List, Dict
+import re
+from typing import Iterable, List, Dict, Optional
 from core.elements.base import BaseElement
+from core.printer_profiles import PrinterProfile
+from core.printer_fonts import FontInventory, FontUpload, font_downloads
 from utils.logger import logger
+from .optimizer import ZplOptimizer
+
+# 占位符 {{字段名}}
+_PLACEHOLDER = re.compile(r'\{\{([^{}]+)\}\}')
 
 
 class ZPLGenerator:
     """从元素生成 ZPL 代码"""
 
-    def __init__(self, dpi=203):
+    def __init__(self, dpi=203, profile: Optional[PrinterProfile] = None, optimize=False):
+        """
+        Args:
+            dpi: 打印机分辨率（没有配置时使用）
+            profile: 打印机配置（分辨率、最大打印宽度、打印浓度）
+            optimize: 生成后运行 ZplOptimizer（输出更短，语义不变）
+        """
+        self.profile = None
         self.dpi = dpi
-        logger.info(f"ZPL生成器已初始化，DPI: {dpi}")
+        self.optimize = optimize
+        self.last_optimization = None  # 最近一次优化的统计 (OptimizedZpl)
+        self.font_inventory = None  # 打印机已安装的下载字体（None = 每次都上传）
+        self.printer_id = None
+        self.pending_font_uploads: List[FontUpload] = []  # 最近一次生成中待确认的字体上传
+        if profile is not None:
+            self.set_profile(profile)
+        logger.info(f"ZPL生成器已初始化，DPI: {self.dpi}")
+
+    def set_profile(self, profile: PrinterProfile):
+        """切换打印机配置"""
+        self.profile = profile
+        self.dpi = profile.dpi
+        logger.info(f"ZPL生成器: 打印机配置 {profile.name}")
+
+    def set_font_inventory(self, inventory: Optional[FontInventory], printer_id: Optional[str] = None):
+        """
+        设置目标打印机的下载字体记录
+
+        设置后只上传该打印机缺少的字体 (~DY)；None 时每次生成都包括所有下载字体
+        （导出的文件可以在任何打印机上打印）。上传的字体在作业发送成功后
+        调用 confirm_font_uploads() 才记录为已安装。
+
+        Args:
+            inventory: 字体记录
+            printer_id: 打印机标识（默认使用打印机配置的标识）
+        """
+        self.font_inventory = inventory
+        self.printer_id = printer_id
+        self.pending_font_uploads = []
+
+    def confirm_font_uploads(self, uploads: Optional[List[FontUpload]] = None):
+        """
+        打印机已收到作业: 把作业中上传的字体记录为已安装
+
+        预览、导出或发送失败时不要调用（下一个作业会再次上传字体）。
+
+        Args:
+            uploads: 已发送作业的上传（默认 pending_font_uploads，即最近一次生成）
+        """
+        if uploads is None:
+            uploads = self.pending_font_uploads
+            self.pending_font_uploads = []
+        if self.font_inventory is not None:
+            self.font_inventory.confirm(uploads)
 
     def generate(self, elements: List[BaseElement],
                  label_config: Dict,
-                 data: Dict = None) -> str:
+                 data: Dict = None,
+                 quantity: Optional[int] = None) -> str:
         """
         生成 ZPL 代码
 
         Args:
-            elements: 标签元素列表
+            elements: 标签元素列表或 LabelDocument（按 z 顺序从下到上）
             label_config: 标签配置 (width, height, dpi)
             data: 用于替换占位符的数据
+            quantity: 打印数量 (^PQ)；序列号字段由打印机逐张递增
 
         Returns:
             ZPL 代码 (str)
@@ -35,25 +95,8 @@ class ZPLGenerator:
         if data:
             logger.info(f"替换数据: {data}")
 
-        zpl_lines = []
-
-        # 标签开始
-        zpl_lines.append("^XA")
-        logger.debug("已添加: ^XA (标签开始)")
-
-        # 西里尔字符编码
-        zpl_lines.append("^CI28")
-        logger.debug("已添加: ^CI28 (UTF-8 编码)")
-
-        # 标签宽度
-        width_dots = self._mm_to_dots(label_config['width'])
-        zpl_lines.append(f"^PW{width_dots}")
-        logger.info(f"标签宽度: {label_config['width']}mm = {width_dots} 点 (^PW{width_dots})")
-
-        # 标签高度
-        height_dots = self._mm_to_dots(label_config['height'])
-        zpl_lines.append(f"^LL{height_dots}")
-        logger.info(f"标签高度: {label_config['height']}mm = {height_dots} 点 (^LL{height_dots})")
+        zpl_lines = self._font_download_lines(elements)
+        zpl_lines.extend(self._header_lines(label_config, self.dpi, self.profile))
 
         # 生成元素
         logger.info("正在生成元素...")
@@ -69,35 +112,239 @@ class ZPLGenerator:
                 logger.debug(f"  数据字段: {element.data_field}")
             logger.debug(f"  位置: ({element.config.x:.2f}mm, {element.config.y:.2f}mm)")
 
-            # 生成元素的 ZPL 代码
-            element_zpl = element.to_zpl(self.dpi)
-            logger.debug(f"  生成的 ZPL: {element_zpl}")
-
-            # 数据替换
-            if data:
-                original_zpl = element_zpl
-                element_zpl = self._substitute_placeholders(element_zpl, data)
-                if original_zpl != element_zpl:
-                    logger.info(f"  已应用占位符替换")
-                    logger.debug(f"  替换前: {original_zpl}")
-                    logger.debug(f"  替换后: {element_zpl}")
+            zpl_lines.append(self._element_zpl(element, self.dpi, data))
 
-            zpl_lines.append(element_zpl)
+        # 打印数量
+        zpl_lines.extend(self._quantity_lines(quantity))
 
         # 标签结束
         zpl_lines.append("^XZ")
         logger.debug("已添加: ^XZ (标签结束)")
 
-        zpl_code = "\n".join(zpl_lines)
+        zpl_code = self._finish("\n".join(zpl_lines))
         logger.info(f"ZPL 生成完成: {len(zpl_code)} 字节, {len(zpl_lines)} 行")
         logger.info("=" * 60)
 
         return zpl_code
 
-    def _mm_to_dots(self, mm: float) -> int:
+    def generate_for_profiles(self, elements: List[BaseElement],
+                              label_config: Dict,
+                              profiles: List[PrinterProfile],
+                              data: Dict = None,
+                              quantity: Optional[int] = None) -> Dict[str, str]:
+        """
+        一次遍历为多个打印机配置生成 ZPL
+
+        模板只遍历一次；每个元素按每个配置转换一次（相同分辨率的配置共享结果），
+        标签头（^PW/^LL/~SD）按配置计算一次。
+
+        Args:
+            elements: 标签元素列表或 LabelDocument
+            label_config: 标签配置 (width, height)
+            profiles: 打印机配置列表
+            data: 用于替换占位符的数据
+            quantity: 打印数量 (^PQ)
+
+        Returns:
+            {配置标识: ZPL 代码}
+        """
+        dpis = sorted({profile.dpi for profile in profiles})
+        logger.info(f"[多配置] {len(profiles)} 个配置, 分辨率: {dpis}")
+
+        # 元素 ZPL 按分辨率生成（每个元素每个分辨率一次）
+        bodies = {dpi: [] for dpi in dpis}
+        for element in elements:
+            for dpi in dpis:
+                bodies[dpi].append(self._element_zpl(element, dpi, data))
+
+        results = {}
+        # 按型号生成的代码不针对某台打印机: 包括所有下载字体
+        downloads = self._font_download_lines(elements, use_inventory=False)
+        for profile in profiles:
+            lines = downloads + self._header_lines(label_config, profile.dpi, profile)
+            lines.extend(bodies[profile.dpi])
+            lines.extend(self._quantity_lines(quantity))
+            lines.append("^XZ")
+            results[profile.key] = self._finish("\n".join(lines))
+            logger.debug(f"[多配置] {profile.key}: {len(results[profile.key])} 字节")
+        return results
+
+    def generate_batch(self, elements: List[BaseElement],
+                       label_config: Dict,
+                       records: Iterable[Dict],
+                       quantity_field: Optional[str] = None) -> str:
+        """
+        批量生成: 每条记录一个标签，连续相同的记录合并为一个标签 + ^PQn
+
+        元素 ZPL 只生成一次，每个标签只替换占位符（自动缩小或图形模式的
+        占位符文本按每条记录重新生成，字形和字符串位图有缓存）。两条记录的模板占位符值
+        全部相同时视为相同（模板中没有用到的字段不影响比较）。模板中有
+        序列号字段时不合并（合并会改变打印机端的编号）。
+
+        Args:
+            elements: 标签元素列表或 LabelDocument
+            label_config: 标签配置 (width, height)
+            records: 记录（占位符数据）
+            quantity_field: 记录中表示打印数量的字段（没有时每条记录 1 张）
+
+        Returns:
+            所有标签的 ZPL 代码
+        """
+        header = self._header_lines(label_config, self.dpi, self.profile)
+        template = [(element, self._element_zpl(element, self.dpi)) for element in elements]
+        # 逐条记录生成的元素（图形模式）的 ZPL 中没有占位符: 从 data_field 获取
+        template_text = "\n".join(element.data_field if self._renders_per_record(element) else zpl
+                                  for element, zpl in template)
+        fields = sorted(set(_PLACEHOLDER.findall(template_text)))
+        collapse = not any(getattr(element, 'serial', None) for element in elements)
+        logger.info(f"[批量] 模板占位符: {fields}, 合并相同记录: {collapse}")
+
+        downloads = self._font_download_lines(elements)
+        labels = []
+        run_record, run_key, run_quantity = None, None, 0
+        record_count = 0
+
+        def emit_run():
+            body = [self._element_zpl(element, self.dpi, run_record) if self._renders_per_record(element)
+                    else self._substitute_placeholders(element_zpl, run_record)
+                    for element, element_zpl in template]
+            # 1 张时不输出 ^PQ（打印机默认值）
+            quantity = self._quantity_lines(run_quantity if run_quantity > 1 else None)
+            labels.append("\n".join(header + body + quantity + ["^XZ"]))
+
+        for record in records:
+            record_count += 1
+            quantity = self._record_quantity(record, quantity_field, record_count)
+            if quantity is None:
+                continue
+            key = tuple(str(record[name]) if name in record else None for name in fields)
+            if collapse and run_record is not None and key == run_key:
+                run_quantity += quantity
+                continue
+            if run_record is not None:
+                emit_run()
+            run_record, run_key, run_quantity = record, key, quantity
+
+        if run_record is not None:
+            emit_run()
+
+        logger.info(f"[批量] {record_count} 条记录 → {len(labels)} 个标签")
+        return self._finish("\n".join(downloads + labels))
+
+    @staticmethod
+    def _record_quantity(record: Dict, quantity_field: Optional[str], number: int) -> Optional[int]:
+        """
+        记录的打印数量
+
+        没有数量字段或值为空（CSV/1C 导出中常见）时为 1；
+        无法解析或小于 1 时记录警告并返回 None（跳过该记录）。
+        """
+        value = record.get(quantity_field) if quantity_field else None
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return 1
+        try:
+            quantity = int(value.strip()) if isinstance(value, str) else int(value)
+        except (TypeError, ValueError):
+            logger.warning(f"[批量] 记录 {number}: 无效的数量 {value!r}，已跳过")
+            return None
+        if quantity < 1:
+            logger.warning(f"[批量] 记录 {number}: 数量 {quantity}，已跳过")
+            return None
+        return quantity
+
+    def _font_download_lines(self, elements: List[BaseElement], use_inventory=True) -> List[str]:
+        """下载字体模式的文本元素需要的 ~DY 上传命令（标签格式之前）"""
+        fonts = [(element.graphic_font, element.downloaded_font) for element in elements
+                 if getattr(element, 'downloaded_font', None)]
+        uploads = []
+        if fonts:
+            inventory = self.font_inventory if use_inventory else None
+            printer_id = self.printer_id or (self.profile.key if self.profile else None)
+            uploads = font_downloads(fonts, inventory, printer_id)
+        if use_inventory:
+            self.pending_font_uploads = uploads
+        return [upload.command for upload in uploads]
+
+    def _finish(self, zpl_code: str) -> str:
+        """启用优化时运行优化器"""
+        if not self.optimize:
+            return zpl_code
+        self.last_optimization = ZplOptimizer().optimize(zpl_code)
+        return self.last_optimization.zpl
+
+    def _header_lines(self, label_config: Dict, dpi: int, profile: Optional[PrinterProfile] = None) -> List[str]:
+        """标签头: ^XA、编码、打印浓度、宽度、高度"""
+        zpl_lines = []
+
+        # 标签开始
+        zpl_lines.append("^XA")
+        logger.debug("已添加: ^XA (标签开始)")
+
+        # 西里尔字符编码
+        zpl_lines.append("^CI28")
+        logger.debug("已添加: ^CI28 (UTF-8 编码)")
+
+        # 打印浓度（只在配置中明确设置时发送）
+        if profile is not None and profile.darkness is not None:
+            zpl_lines.append(f"~SD{profile.darkness:02d}")
+
+        # 标签宽度（不超过打印机的最大打印宽度）
+        width_dots = self._mm_to_dots(label_config['width'], dpi)
+        if profile is not None and width_dots > profile.max_print_width_dots:
+            logger.warning(f"标签宽度 {width_dots} 点超过 {profile.name} 的最大打印宽度 "
+                           f"{profile.max_print_width_dots} 点")
+            width_dots = profile.max_print_width_dots
+        zpl_lines.append(f"^PW{width_dots}")
+        logger.info(f"标签宽度: {label_config['width']}mm = {width_dots} 点 (^PW{width_dots})")
+
+        # 标签高度
+        height_dots = self._mm_to_dots(label_config['height'], dpi)
+        zpl_lines.append(f"^LL{height_dots}")
+        logger.info(f"标签高度: {label_config['height']}mm = {height_dots} 点 (^LL{height_dots})")
+
+        return zpl_lines
+
+    def _quantity_lines(self, quantity: Optional[int]) -> List[str]:
+        """^PQ 打印数量（没有指定时不输出，打印机默认打印 1 张）"""
+        if quantity is None:
+            return []
+        quantity = int(quantity)
+        if quantity < 1:
+            raise ValueError(f"打印数量必须 >= 1: {quantity}")
+        logger.debug(f"已添加: ^PQ{quantity} (打印数量)")
+        return [f"^PQ{quantity}"]
+
+    @staticmethod
+    def _renders_per_record(element: BaseElement) -> bool:
+        """自动缩小或图形模式的占位符文本: ZPL 取决于替换后的值"""
+        if not getattr(element, 'data_field', None) or getattr(element, 'serial', None):
+            return False
+        return bool(getattr(element, 'fit_width', None) or getattr(element, 'renders_graphic', False))
+
+    def _element_zpl(self, element: BaseElement, dpi: int, data: Dict = None) -> str:
+        """生成元素的 ZPL 代码并替换占位符"""
+        if data and self._renders_per_record(element):
+            element_zpl = element.to_zpl(dpi, record_text=self._substitute_placeholders(element.data_field, data))
+        else:
+            element_zpl = element.to_zpl(dpi)
+        logger.debug(f"  生成的 ZPL: {element_zpl}")
+
+        # 数据替换
+        if data:
+            original_zpl = element_zpl
+            element_zpl = self._substitute_placeholders(element_zpl, data)
+            if original_zpl != element_zpl:
+                logger.info(f"  已应用占位符替换")
+                logger.debug(f"  替换前: {original_zpl}")
+                logger.debug(f"  替换后: {element_zpl}")
+
+        return element_zpl
+
+    def _mm_to_dots(self, mm: float, dpi: int = None) -> int:
         """毫米 -> 点 转换"""
-        dots = int(mm * self.dpi / 25.4)
-        logger.debug(f"单位转换: {mm:.2f}mm = {dots} 点 (DPI={self.dpi})")
+        dpi = dpi or self.dpi
+        dots = int(mm * dpi / 25.4)
+        logger.debug(f"单位转换: {mm:.2f}mm = {dots} 点 (DPI={dpi})")
         return dots
 
     def _substitute_placeholders(self, zpl: str, data: Dict) -> str:
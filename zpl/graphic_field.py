@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""^GF 图形字段数据 - 十六进制、Zebra ASCII 压缩、:Z64:/:B64: 解码，ASCII 压缩编码"""
+
+import base64
+import binascii
+import zlib
+
+
+class GraphicFieldError(ValueError):
+    """^GF 数据无法解码"""
+
+
+# Zebra ASCII 压缩的重复计数: G..Y = 1..19, g..z = 20..400
+_REPEAT_COUNTS = {chr(ord('G') + i): i + 1 for i in range(19)}
+_REPEAT_COUNTS.update({chr(ord('g') + i): (i + 1) * 20 for i in range(20)})
+
+_HEX_DIGITS = frozenset('0123456789ABCDEFabcdef')
+
+
+def decode_graphic_field(data, total_bytes, bytes_per_row):
+    """
+    ^GFA 数据 → 打包的 1 位位图
+
+    Args:
+        data: ^GFA 的数据参数（十六进制 / ASCII 压缩 / :Z64: / :B64:）
+        total_bytes: 位图总字节数
+        bytes_per_row: 每行字节数
+
+    Returns:
+        bytes，长度为 total_bytes（不足部分补 0）
+    """
+    data = data.strip()
+    if data.startswith(':Z64:') or data.startswith(':B64:'):
+        packed = _decode_base64_field(data)
+    else:
+        packed = _decode_ascii_field(data, bytes_per_row)
+
+    if len(packed) < total_bytes:
+        packed += bytes(total_bytes - len(packed))
+    return packed[:total_bytes]
+
+
+def _decode_base64_field(data):
+    """:Z64:<base64 zlib 数据>:<crc> 或 :B64:<base64 数据>:<crc>"""
+    encoding, payload = data[1:4], data[5:]
+    payload = payload.split(':', 1)[0]  # CRC 不校验
+    try:
+        raw = base64.b64decode(payload)
+        return zlib.decompress(raw) if encoding == 'Z64' else raw
+    except (binascii.Error, zlib.error) as e:
+        raise GraphicFieldError(f"无效的 {encoding} 数据: {e}") from e
+
+
+def _decode_ascii_field(data, bytes_per_row):
+    """十六进制数据（可带 Zebra ASCII 压缩）逐行解码"""
+    row_chars = bytes_per_row * 2
+    rows = []
+    row = []
+    previous_row = '0' * row_chars
+    repeat = 0
+
+    def finish_row(fill=None):
+        nonlocal row, previous_row
+        if fill is not None:
+            row.extend(fill * (row_chars - len(row)))
+        text = ''.join(row)
+        rows.append(text)
+        previous_row = text
+        row = []
+
+    for char in data:
+        if char in _REPEAT_COUNTS:
+            repeat += _REPEAT_COUNTS[char]
+            continue
+        if char in _HEX_DIGITS:
+            row.extend(char * (repeat or 1))
+            repeat = 0
+        elif char == ',':
+            finish_row('0')  # 本行剩余为 0
+        elif char == '!':
+            finish_row('F')  # 本行剩余为 1
+        elif char == ':':
+            row = []
+            rows.append(previous_row)  # 重复上一行
+        elif char.isspace():
+            continue
+        else:
+            raise GraphicFieldError(f"无效的 ^GF 字符: {char!r}")
+
+        while len(row) >= row_chars:
+            rest = row[row_chars:]
+            row = row[:row_chars]
+            finish_row()
+            row = rest
+
+    if row:
+        finish_row('0')
+
+    try:
+        return bytes.fromhex(''.join(rows))
+    except ValueError as e:
+        raise GraphicFieldError(f"无效的十六进制数据: {e}") from e
+
+
+def _repeat_prefix(count):
+    """重复次数 → 计数字符（z = 400, g..y = 20..380, G..Y = 1..19）"""
+    prefix = 'z' * (count // 400)
+    count %= 400
+    if count >= 20:
+        prefix += chr(ord('g') + count // 20 - 1)
+        count %= 20
+    if count:
+        prefix += chr(ord('G') + count - 1)
+    return prefix
+
+
+def _compress_run(char, count):
+    """一段相同的十六进制字符（只在更短时使用计数）"""
+    prefix = _repeat_prefix(count)
+    if len(prefix) + 1 < count:
+        return prefix + char
+    return char * count
+
+
+def encode_graphic_field(packed, bytes_per_row):
+    """
+    打包的 1 位位图 → Zebra ASCII 压缩的 ^GFA 数据
+
+    每行: 与上一行相同 → ':'；行末连续的 0 → ','，连续的 F → '!'；
+    其余的相同字符序列写成 计数字符 + 十六进制字符。
+
+    Args:
+        packed: 打包的位图（每行 bytes_per_row 字节）
+        bytes_per_row: 每行字节数
+
+    Returns:
+        str，可直接作为 ^GFA 的数据参数
+    """
+    hex_data = bytes(packed).hex().upper()
+    row_chars = bytes_per_row * 2
+    parts = []
+    previous_row = None
+
+    for start in range(0, len(hex_data), row_chars):
+        row = hex_data[start:start + row_chars]
+        if row == previous_row:
+            parts.append(':')
+            continue
+        previous_row = row
+
+        # 行末填充
+        body = row.rstrip('0')
+        tail = ','
+        if len(row) - len(body) < 2:
+            body = row.rstrip('F')
+            tail = '!' if len(row) - len(body) >= 2 else ''
+            if not tail:
+                body = row
+
+        encoded = []
+        index = 0
+        while index < len(body):
+            char = body[index]
+            end = index + 1
+            while end < len(body) and body[end] == char:
+                end += 1
+            encoded.append(_compress_run(char, end - index))
+            index = end
+        parts.append(''.join(encoded) + tail)
+
+    return ''.join(parts)
@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+"""ZPL → 标签元素（把现有 ZPL 转换为可编辑的模板）"""
+
+import re
+import io
+import base64
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from core.elements.base import BaseElement, ElementConfig
+from core.elements.text_element import TextElement, TextRenderMode, ZplFont
+from core.elements.barcode_element import EAN13BarcodeElement, Code128BarcodeElement, QRCodeElement
+from core.elements.shape_element import (RectangleElement, CircleElement, LineElement,
+                                         ShapeConfig, LineConfig)
+from core.elements.image_element import ImageConfig, ImageElement
+from core.elements.serial import SerialField
+from core.barcode_encoder import encode
+from core.dithering import DitherMode
+from utils.logger import logger
+from .tokenizer import ZplToken, iter_tokens, iter_file_chunks
+from .graphic_field import decode_graphic_field, GraphicFieldError
+
+
+# 不影响元素的命令（导入时忽略，不计入未支持命令）
+_IGNORED_COMMANDS = frozenset({
+    'CI', 'PQ', 'PR', 'MD', 'SD', 'LS', 'LR', 'PO', 'PM', 'MN', 'MT', 'MM',
+    'JU', 'JM', 'FW', 'CC', 'CT', 'FX', 'FN', 'FR', 'DY',
+})
+
+_PLACEHOLDER = re.compile(r'\{\{[^{}]+\}\}')
+_QR_DATA_PREFIX = re.compile(r'^[HQML][AM],')
+_SERIAL_NUMBER = re.compile(r'^(.*?)(\d+)$')
+
+# ZPL 默认字体 (^CFA,9,5)
+_DEFAULT_FONT = ('A', 9, 5)
+
+
+@dataclass
+class ImportedLabel:
+    """一个 ^XA...^XZ 标签的导入结果"""
+    width_mm: Optional[float] = None  # ^PW
+    height_mm: Optional[float] = None  # ^LL
+    elements: List[BaseElement] = field(default_factory=list)
+    skipped: Dict[str, int] = field(default_factory=dict)  # 未支持的命令 → 次数
+
+
+class ZplImporter:
+    """
+    逐条接收 ZPL 命令并重建元素
+
+    支持本项目生成的命令: ^FO、^A/^A@、^CF、^FD/^FH、^SN/^SF、^BY、^BC/^BE/^BQ、
+    ^GB/^GC/^GE/^GD、^GFA（十六进制、ASCII 压缩、:Z64:/:B64:）、^PW/^LL/^LH。
+    ^FT 的原点是基线（条码、图形为底边），按字段高度换算为左上角。
+    点 → 毫米的换算保证再次导出时得到相同的点坐标。
+    """
+
+    def __init__(self, dpi=203):
+        self.dpi = dpi
+        self._label = None
+        self._reset_label()
+
+    def feed(self, token: ZplToken) -> Optional[ImportedLabel]:
+        """处理一条命令；遇到 ^XZ 时返回完成的标签"""
+        command = token.command
+        args = token.args
+
+        if command == 'XA':
+            self._reset_label()
+        elif command == 'XZ':
+            return self._finish_label()
+        elif command in ('FO', 'FT'):
+            self._x = self._label_home[0] + _int(args, 0)
+            self._y = self._label_home[1] + _int(args, 1)
+            self._baseline = command == 'FT'
+        elif command == 'LH':
+            self._label_home = (_int(args, 0), _int(args, 1))
+        elif command == 'PW':
+            self._label.width_mm = self._mm(_int(args, 0))
+        elif command == 'LL':
+            self._label.height_mm = self._mm(_int(args, 0))
+        elif command == 'CF':
+            font, height, width = self._default_font
+            height = _int(args, 1, height)
+            self._default_font = ((args[0] or font) if args else font, height, _int(args, 2, height))
+        elif command == 'A@':
+            self._parse_downloaded_font(token)
+        elif command[0] == 'A':
+            self._parse_font(command[1], args)
+        elif command == 'BY':
+            self._module_width = _int(args, 0, self._module_width)
+            self._bar_height = _int(args, 2, self._bar_height)
+        elif command in ('BC', 'BE', 'BQ', 'GB', 'GC', 'GE', 'GD', 'GF'):
+            self._field_command = token
+        elif command == 'FH':
+            self._hex_indicator = token.params[:1] or '_'
+        elif command == 'FD':
+            self._field_data = token.params
+        elif command in ('SN', 'SF'):
+            self._serial_command = token
+        elif command == 'FS':
+            self._finish_field()
+        elif command not in _IGNORED_COMMANDS:
+            key = str(token)[:3]
+            self._label.skipped[key] = self._label.skipped.get(key, 0) + 1
+        return None
+
+    def finish(self) -> Optional[ImportedLabel]:
+        """输入结束: 没有 ^XZ 的片段也作为标签返回"""
+        if self._label.elements:
+            return self._finish_label()
+        return None
+
+    # === 状态 ===
+
+    def _reset_label(self):
+        self._label = ImportedLabel()
+        self._label_home = (0, 0)
+        self._x = self._y = 0
+        self._baseline = False  # ^FT: y 是基线/底边
+        self._default_font = _DEFAULT_FONT
+        self._module_width = 2
+        self._bar_height = 10
+        self._reset_field()
+
+    def _reset_field(self):
+        self._field_font = None
+        self._field_font_name = None  # ^A@ 引用的打印机字体
+        self._field_command = None
+        self._field_data = None
+        self._hex_indicator = None
+        self._serial_command = None
+
+    def _finish_label(self):
+        label = self._label
+        logger.debug(f"[ZPL-导入] 标签: {len(label.elements)} 个元素, 未支持: {label.skipped}")
+        self._reset_label()
+        return label
+
+    def _mm(self, dots):
+        """点 → 毫米（保留 3 位小数，且 int(mm * dpi / 25.4) == dots）"""
+        mm = round(dots * 25.4 / self.dpi, 3)
+        while int(mm * self.dpi / 25.4) < dots:
+            mm = round(mm + 0.001, 3)
+        return mm
+
+    def _parse_font(self, font_code, args):
+        """^A{字体}{方向},{高度},{宽度}"""
+        font = ZplFont.from_zpl_code(font_code.upper())
+        size_args = args[1:]  # 第一个参数是方向
+        height = _int(size_args, 0, font.base_height if not font.scalable else self._default_font[1])
+        width = _int(size_args, 1, height)
+        self._field_font = (font_code.upper(), height, width)
+        self._field_font_name = None
+
+    def _parse_downloaded_font(self, token):
+        """^A@{方向},{高度},{宽度},{设备}:{文件名} → 下载字体模式（没有字体名时计入未支持命令）"""
+        name = _arg(token.args, 3)
+        if ':' in name:
+            name = name.split(':', 1)[1]
+        if not name:
+            self._label.skipped['^A@'] = self._label.skipped.get('^A@', 0) + 1
+            return
+        height = _int(token.args, 1, self._default_font[1])
+        self._field_font = ('0', height, _int(token.args, 2, height))
+        self._field_font_name = name
+
+    # === 字段 → 元素 ===
+
+    def _finish_field(self):
+        try:
+            element = self._build_element()
+        except (ValueError, GraphicFieldError) as e:
+            logger.warning(f"[ZPL-导入] 字段无法转换: {self._field_command or '^FD'}: {e}")
+            element = None
+        if element is not None:
+            self._label.elements.append(element)
+        self._reset_field()
+
+    def _build_element(self):
+        token = self._field_command
+        data = self._decoded_field_data()
+        serial = self._serial_field(data)
+        if serial is not None:
+            data = serial.start_text
+        self._top = self._y - self._baseline_offset(token, data) if self._baseline else self._y  # 字段左上角 y
+
+        if token is None:
+            if data is None:
+                return None
+            element = self._text_element(data)
+            element.serial = serial
+            return element
+
+        command, args = token.command, token.args
+        if command in ('BC', 'BE', 'BQ'):
+            element = self._barcode_element(command, args, data)
+            element.serial = serial
+            return element
+        if command == 'GB':
+            return self._box_element(args)
+        if command in ('GC', 'GE'):
+            return self._ellipse_element(command, args)
+        if command == 'GD':
+            return self._diagonal_element(args)
+        return self._image_element(args)
+
+    def _decoded_field_data(self):
+        """^FD 数据（^FH 时解码 _XX 十六进制转义）"""
+        data = self._field_data
+        if data is None or self._hex_indicator is None:
+            return data
+        pattern = re.compile(re.escape(self._hex_indicator) + r'([0-9A-Fa-f]{2})')
+        raw = bytearray()
+        pos = 0
+        for match in pattern.finditer(data):
+            raw += data[pos:match.start()].encode('utf-8')
+            raw.append(int(match.group(1), 16))
+            pos = match.end()
+        raw += data[pos:].encode('utf-8')
+        return raw.decode('utf-8', errors='replace')
+
+    def _serial_field(self, data):
+        """
+        ^SN{起始值},{增量},{补零 Y/N} 或 ^FD{数据}^SF{掩码},{增量} → SerialField
+
+        只递增末尾的数字部分，前面的字符作为前缀。
+        """
+        token = self._serial_command
+        if token is None:
+            return None
+        args = token.args
+        if token.command == 'SN':
+            match = _SERIAL_NUMBER.match(_arg(args, 0, '1'))
+            if not match:
+                raise ValueError(f"无效的 ^SN 起始值: {token.params}")
+            prefix, number = match.groups()
+            padding = len(number) if _arg(args, 2, 'N').upper() == 'Y' else 0
+        else:
+            mask = _arg(args, 0)
+            if not data or not mask or len(mask) > len(data) or not data[-len(mask):].isdigit():
+                raise ValueError(f"^SF 掩码与数据不匹配: {token.params}")
+            prefix, number = data[:-len(mask)], data[-len(mask):]
+            padding = len(mask)
+        return SerialField(start=int(number), increment=_int(args, 1, 1), padding=padding, prefix=prefix)
+
+    def _baseline_offset(self, token, data):
+        """^FT 原点到字段顶部的距离（点）: 文本为字体高度，条码为条高，图形为高度"""
+        if token is None:
+            return (self._field_font or self._default_font)[1]
+        command, args = token.command, token.args
+        if command in ('BC', 'BE'):
+            return _int(args, 1, self._bar_height)
+        if command == 'BQ':
+            magnification = _int(args, 2, QRCodeElement.DEFAULT_MAGNIFICATION)
+            return encode('QRCODE', _QR_DATA_PREFIX.sub('', data or '', count=1)).size * magnification
+        if command == 'GB':
+            return _int(args, 1, 1)
+        if command == 'GC':
+            return _int(args, 0, 3)
+        if command in ('GE', 'GD'):
+            return _int(args, 1, 3)
+        bytes_per_row = _int(args, 3)
+        return _int(args, 2) // bytes_per_row if bytes_per_row > 0 else 0
+
+    def _position(self):
+        return ElementConfig(x=self._mm(self._x), y=self._mm(self._top))
+
+    def _text_element(self, data):
+        font_code, height, width = self._field_font or self._default_font
+        font = ZplFont.from_zpl_code(font_code)
+        element = TextElement(self._position(), data, height, font)
+        element.bold = font == ZplFont.SCALABLE_0 and width == int(height * 1.5) and width != height
+        if self._field_font_name:
+            element.render_mode = TextRenderMode.DOWNLOADED
+            element.ttf_font = self._field_font_name
+            element.bold = False
+        if _PLACEHOLDER.fullmatch(data):
+            element.data_field = data
+        return element
+
+    def _barcode_element(self, command, args, data):
+        data = data or ''
+        if command == 'BQ':
+            element = QRCodeElement(self._position(), _QR_DATA_PREFIX.sub('', data, count=1))
+            element.magnification = _int(args, 2, element.magnification)
+        else:
+            height = self._mm(_int(args, 1, self._bar_height))
+            barcode_class = Code128BarcodeElement if command == 'BC' else EAN13BarcodeElement
+            element = barcode_class(self._position(), data, height=height)
+            element.module_width = self._module_width
+            element.show_text = _arg(args, 2, 'Y').upper() != 'N'
+        if _PLACEHOLDER.fullmatch(element.data):
+            element.data_field = element.data
+        return element
+
+    def _box_element(self, args):
+        """^GB: 细长且厚度等于短边 → 线条，否则矩形"""
+        width = _int(args, 0, 1)
+        thickness = _int(args, 2, 1)
+        height = _int(args, 1, 1)
+        color = _color(args, 3)
+        short_side, long_side = sorted((width, height))
+
+        if thickness == short_side and long_side >= 3 * short_side:
+            x2 = self._x + (width if width > height else 0)
+            y2 = self._top + (height if height > width else 0)
+            return LineElement(LineConfig(
+                x=self._mm(self._x), y=self._mm(self._top), x2=self._mm(x2), y2=self._mm(y2),
+                thickness=self._mm(thickness), color=color))
+
+        fill = thickness >= short_side
+        return RectangleElement(ShapeConfig(
+            x=self._mm(self._x), y=self._mm(self._top), width=self._mm(width), height=self._mm(height),
+            fill=fill, border_thickness=self._mm(thickness) if not fill else 2, color=color))
+
+    def _ellipse_element(self, command, args):
+        """^GC 圆形 / ^GE 椭圆"""
+        if command == 'GC':
+            width = height = _int(args, 0, 3)
+            thickness, color = _int(args, 1, 1), _color(args, 2)
+        else:
+            width, height = _int(args, 0, 3), _int(args, 1, 3)
+            thickness, color = _int(args, 2, 1), _color(args, 3)
+        fill = thickness * 2 >= min(width, height)
+        return CircleElement(ShapeConfig(
+            x=self._mm(self._x), y=self._mm(self._top), width=self._mm(width), height=self._mm(height),
+            fill=fill, border_thickness=self._mm(thickness) if not fill else 2, color=color))
+
+    def _diagonal_element(self, args):
+        """^GD: L = 左上到右下, R = 左下到右上"""
+        width, height = _int(args, 0, 3), _int(args, 1, 3)
+        if _arg(args, 4, 'R').upper() == 'L':
+            start, end = (self._top, self._top + height)
+        else:
+            start, end = (self._top + height, self._top)
+        return LineElement(LineConfig(
+            x=self._mm(self._x), y=self._mm(start), x2=self._mm(self._x + width), y2=self._mm(end),
+            thickness=self._mm(_int(args, 2, 1)), color=_color(args, 3)))
+
+    def _image_element(self, args):
+        """^GFA,总字节数,总字节数,每行字节数,数据 → 单色 PNG 图片元素"""
+        if _arg(args, 0, 'A').upper() != 'A':
+            raise ValueError("只支持 ^GFA (ASCII) 格式")
+        total_bytes, bytes_per_row = _int(args, 2), _int(args, 3)
+        if bytes_per_row <= 0 or total_bytes <= 0:
+            raise ValueError("无效的 ^GF 尺寸")
+        # 数据中可能有逗号（ASCII 压缩的行结束符），从第 5 个参数开始全部是数据
+        packed = decode_graphic_field(','.join(args[4:]), total_bytes, bytes_per_row)
+
+        rows = total_bytes // bytes_per_row
+        black = np.unpackbits(np.frombuffer(packed, dtype=np.uint8).reshape(rows, bytes_per_row), axis=1)
+        image = Image.fromarray(np.where(black, 0, 255).astype(np.uint8)).convert('1')
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG', optimize=True)
+
+        config = ImageConfig(
+            x=self._mm(self._x), y=self._mm(self._top),
+            width=self._mm(bytes_per_row * 8), height=self._mm(rows),
+            image_data=base64.b64encode(buffer.getvalue()).decode('ascii'))
+        # 已经是单色位图: 阈值模式逐点保留
+        return ImageElement(config, dither_mode=DitherMode.THRESHOLD)
+
+
+def _arg(args, index, default=''):
+    if index < len(args) and args[index].strip():
+        return args[index].strip()
+    return default
+
+
+def _int(args, index, default=0):
+    value = _arg(args, index)
+    try:
+        return int(float(value)) if value else default
+    except ValueError:
+        return default
+
+
+def _color(args, index):
+    return 'white' if _arg(args, index, 'B').upper() == 'W' else 'black'
+
+
+def iter_labels(chunks: Iterable[str], dpi=203) -> Iterator[ImportedLabel]:
+    """按块读取 ZPL，逐个输出标签（多标签的大文件内存占用恒定）"""
+    importer = ZplImporter(dpi)
+    for token in iter_tokens(chunks):
+        label = importer.feed(token)
+        if label is not None:
+            yield label
+    label = importer.finish()
+    if label is not None:
+        yield label
+
+
+def import_zpl(zpl: str, dpi=203) -> ImportedLabel:
+    """一段 ZPL → 第一个标签（没有标签时返回空结果）"""
+    return next(iter_labels([zpl], dpi), ImportedLabel())
+
+
+def import_zpl_file(path, dpi=203, chunk_size=64 * 1024) -> Iterator[ImportedLabel]:
+    """ZPL 文件 → 标签（按块读取）"""
+    logger.info(f"[ZPL-导入] 文件: {path}")
+    return iter_labels(iter_file_chunks(path, chunk_size), dpi)
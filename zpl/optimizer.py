@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""ZPL 优化 - 在语义不变的前提下减少输出字节数"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from utils.logger import logger
+from .tokenizer import ZplToken, tokenize
+from .graphic_field import encode_graphic_field, decode_graphic_field, GraphicFieldError
+
+
+# 可省略的末尾默认参数: 命令 → {参数位置: 默认值}
+_TRAILING_DEFAULTS = {
+    'GB': {3: 'B', 4: '0'},
+    'GC': {2: 'B'},
+    'GE': {3: 'B'},
+}
+
+# 在标签内保持有效的状态命令（与当前值相同时删除）
+_STATE_COMMANDS = frozenset({'BY', 'CF', 'FW'})
+
+# 使用默认字体显示文字的条码（没有 ^A 时使用 ^CF）
+_INTERPRETATION_BARCODES = frozenset({'BC', 'BE', 'B3', 'B8', 'BU', 'B2'})
+
+# 字段类型命令（有这些命令的字段不是文本字段）
+_FIELD_COMMANDS = _INTERPRETATION_BARCODES | frozenset({'BQ', 'GB', 'GC', 'GE', 'GD', 'GF'})
+
+_HEX_DATA = re.compile(r'^[0-9A-Fa-f]*$')
+
+# 按 ^XZ 分割标签（保留 ^XZ 在前一段）
+_LABEL_END = re.compile(r'(?<=\^XZ)', re.IGNORECASE)
+
+
+@dataclass
+class LabelOptimization:
+    """一个标签的优化结果"""
+    original_bytes: int
+    optimized_bytes: int
+
+    @property
+    def saved_bytes(self):
+        return self.original_bytes - self.optimized_bytes
+
+    @property
+    def saved_percent(self):
+        return 100.0 * self.saved_bytes / self.original_bytes if self.original_bytes else 0.0
+
+
+@dataclass
+class OptimizedZpl:
+    """优化后的 ZPL 和每个标签节省的字节数"""
+    zpl: str
+    labels: List[LabelOptimization] = field(default_factory=list)
+
+    @property
+    def original_bytes(self):
+        return sum(label.original_bytes for label in self.labels)
+
+    @property
+    def optimized_bytes(self):
+        return sum(label.optimized_bytes for label in self.labels)
+
+    @property
+    def saved_bytes(self):
+        return self.original_bytes - self.optimized_bytes
+
+
+class ZplOptimizer:
+    """
+    ZPL 优化器（生成后的可选步骤）
+
+    各步骤:
+    1. 去掉命令之间的换行和空白，删除 ^FX 注释
+    2. 删除与当前值相同的 ^BY、^CF、^FW（状态在每个 ^XA 处重置，不依赖打印机中已有的状态）
+    3. 多个文本字段使用相同的 ^A 字体时，改为一条 ^CF 并删除这些 ^A
+    4. 省略 ^GB/^GC/^GE 末尾的默认参数
+    5. 十六进制 ^GFA 数据改为 Zebra ASCII 压缩（更短时）
+    """
+
+    def optimize(self, zpl: str) -> OptimizedZpl:
+        """优化 ZPL（可包含多个标签），返回结果和每个标签的统计"""
+        parts = []
+        labels = []
+        for segment in _LABEL_END.split(zpl):
+            if not segment.strip():
+                continue
+            optimized = self.optimize_label(segment)
+            parts.append(optimized)
+            labels.append(LabelOptimization(len(segment.encode('utf-8')), len(optimized.encode('utf-8'))))
+
+        result = OptimizedZpl(''.join(parts), labels)
+        logger.info(f"[ZPL-优化] {len(labels)} 个标签: {result.original_bytes} → {result.optimized_bytes} 字节 "
+                    f"(节省 {result.saved_bytes})")
+        return result
+
+    def optimize_label(self, zpl: str) -> str:
+        """优化一个标签的 ZPL"""
+        tokens = [token for token in tokenize(zpl) if token.command != 'FX']
+        tokens = self._drop_redundant_state(tokens)
+        tokens = self._combine_default_font(tokens)
+        tokens = [self._compact(token) for token in tokens]
+        return ''.join(str(token) for token in tokens)
+
+    def _drop_redundant_state(self, tokens: List[ZplToken]) -> List[ZplToken]:
+        """删除与标签内当前值相同的状态命令"""
+        result = []
+        state = {}
+        for token in tokens:
+            if token.command == 'XA':
+                state = {}
+            elif token.command in _STATE_COMMANDS:
+                if state.get(token.command) == token.params:
+                    continue
+                state[token.command] = token.params
+            result.append(token)
+        return result
+
+    def _combine_default_font(self, tokens: List[ZplToken]) -> List[ZplToken]:
+        """
+        最常用的 ^A 字体 → 标签开头的一条 ^CF，删除文本字段中相同的 ^A
+
+        只在结果确定不变时进行: 标签中没有 ^CF/^FW，且所有使用默认字体的字段
+        （文本、带说明文字的条码）都有自己的 ^A。条码字段中的 ^A 不删除。
+        """
+        if any(token.command in ('CF', 'FW') for token in tokens):
+            return tokens
+
+        text_fonts = []  # (位置, 字体键)
+        font_index = None
+        field_kind = None
+        has_data = False
+        for index, token in enumerate(tokens):
+            command = token.command
+            if _is_font_command(token):
+                font_index = index
+            elif command in _FIELD_COMMANDS:
+                field_kind = command
+            elif command in ('FD', 'SN'):
+                has_data = True
+            elif command == 'FS':
+                uses_font = field_kind in _INTERPRETATION_BARCODES or (field_kind is None and has_data)
+                if uses_font and font_index is None:
+                    return tokens  # 字段依赖打印机的默认字体
+                if field_kind is None and has_data:
+                    text_fonts.append((font_index, _font_key(tokens[font_index])))
+                font_index = field_kind = None
+                has_data = False
+
+        counts = {}
+        for index, key in text_fonts:
+            if key is not None:
+                counts[key] = counts.get(key, 0) + 1
+        if not counts:
+            return tokens
+
+        key = max(counts, key=counts.get)
+        default_font = ZplToken('^', 'CF', ','.join(key))
+        removed = {index for index, font in text_fonts if font == key}
+        saved = sum(len(str(tokens[index])) for index in removed) - len(str(default_font))
+        if saved <= 0:
+            return tokens
+
+        result = [token for index, token in enumerate(tokens) if index not in removed]
+        insert_at = next((i + 1 for i, token in enumerate(result) if token.command == 'XA'), 0)
+        result.insert(insert_at, default_font)
+        logger.debug(f"[ZPL-优化] 默认字体 {default_font}: {len(removed)} 个 ^A 已合并")
+        return result
+
+    def _compact(self, token: ZplToken) -> ZplToken:
+        """省略末尾默认参数；十六进制 ^GFA 数据压缩"""
+        defaults = _TRAILING_DEFAULTS.get(token.command)
+        if defaults:
+            args = token.args
+            while args and defaults.get(len(args) - 1) == args[-1].upper():
+                args.pop()
+            return token._replace(params=','.join(args))
+        if token.command == 'GF':
+            return self._compress_graphic(token)
+        return token
+
+    def _compress_graphic(self, token: ZplToken) -> ZplToken:
+        args = token.args
+        if len(args) != 5 or args[0].upper() != 'A' or not _HEX_DATA.match(args[4]):
+            return token
+        try:
+            total_bytes, bytes_per_row = int(args[2]), int(args[3])
+            packed = decode_graphic_field(args[4], total_bytes, bytes_per_row)
+        except (ValueError, GraphicFieldError):
+            return token
+        compressed = encode_graphic_field(packed, bytes_per_row)
+        if len(compressed) >= len(args[4]):
+            return token
+        return token._replace(params=','.join(args[:4] + [compressed]))
+
+
+def _is_font_command(token: ZplToken) -> bool:
+    """^A{字体}（不包括 ^A@ 下载字体）"""
+    return token.command[0] == 'A' and token.command[1].isalnum()
+
+
+def _font_key(token: ZplToken) -> Optional[tuple]:
+    """^A{字体}N,{高度},{宽度} → (字体, 高度, 宽度)；其他方向或缺少尺寸时返回 None"""
+    args = token.args
+    if len(args) != 3 or args[0].upper() not in ('', 'N') or not args[1] or not args[2]:
+        return None
+    return (token.command[1], args[1], args[2])
+
+
+def optimize_zpl(zpl: str) -> OptimizedZpl:
+    """优化 ZPL"""
+    return ZplOptimizer().optimize(zpl)
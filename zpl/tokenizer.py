@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""流式 ZPL 词法分析器 - 按块输入，逐条输出命令（内存只保存当前命令）"""
+
+from typing import Iterable, Iterator, List, NamedTuple
+
+from utils.logger import logger
+
+
+class ZplToken(NamedTuple):
+    """一条 ZPL 命令"""
+    prefix: str  # '^' 或 '~'
+    command: str  # 两个字符的命令代码（大写），如 'FO'、'A0'、'GF'
+    params: str  # 命令参数（原始字符串）
+
+    @property
+    def args(self) -> List[str]:
+        """逗号分隔的参数列表"""
+        return self.params.split(',') if self.params else []
+
+    def __str__(self):
+        return f"{self.prefix}{self.command}{self.params}"
+
+
+# 参数是原始数据的命令: 只有格式前缀（^）结束数据，数据中的 ~ 保留
+_DATA_COMMANDS = frozenset({'FD', 'FV'})
+
+# 更改前缀字符的命令
+_PREFIX_COMMANDS = frozenset({'CC', 'CT'})
+
+
+class ZplTokenizer:
+    """
+    增量 ZPL 词法分析器
+
+    feed() 接收任意大小的文本块并返回已完整的命令，跨块的命令保存在内部
+    直到遇到下一个前缀；close() 输出最后一条命令。换行符 (CR/LF) 与打印机
+    一样被忽略。支持 ^CC/~CC、^CT/~CT 更改前缀字符。
+    """
+
+    def __init__(self):
+        self.caret = '^'
+        self.tilde = '~'
+        self._tail = ''  # 尚未读到完整命令代码的前缀
+        self._prefix = None  # 当前命令
+        self._command = None
+        self._params = []
+
+    def feed(self, chunk: str) -> List[ZplToken]:
+        """输入一个文本块，返回其中已完整的命令"""
+        text = self._tail + chunk.replace('\r', '').replace('\n', '')
+        self._tail = ''
+        tokens = []
+        pos = 0
+
+        while pos < len(text):
+            if self._command is None:
+                start = self._find_prefix(text, pos, data=False)
+                if start < 0:
+                    break  # 命令之外的文本忽略
+                if start + 3 > len(text):
+                    self._tail = text[start:]
+                    break
+                command = text[start + 1:start + 3].upper()
+                if command in _PREFIX_COMMANDS:
+                    # ^CC/^CT 的参数正好是一个字符
+                    if start + 4 > len(text):
+                        self._tail = text[start:]
+                        break
+                    self._prefix, self._command, self._params = text[start], command, [text[start + 3]]
+                    tokens.append(self._finish_command())
+                    pos = start + 4
+                    continue
+                self._prefix = text[start]
+                self._command = command
+                self._params = []
+                pos = start + 3
+                continue
+
+            end = self._find_prefix(text, pos, data=self._command in _DATA_COMMANDS)
+            if end < 0:
+                self._params.append(text[pos:])
+                break
+            self._params.append(text[pos:end])
+            tokens.append(self._finish_command())
+            pos = end
+
+        return tokens
+
+    def close(self) -> List[ZplToken]:
+        """输入结束，返回最后一条命令"""
+        tokens = []
+        if self._command is not None:
+            tokens.append(self._finish_command())
+        if self._tail:
+            logger.warning(f"[ZPL-词法] 输入末尾的不完整命令已忽略: {self._tail!r}")
+            self._tail = ''
+        return tokens
+
+    def _find_prefix(self, text, pos, data):
+        """下一个命令前缀的位置（数据命令中只查找格式前缀）"""
+        caret = text.find(self.caret, pos)
+        if data:
+            return caret
+        tilde = text.find(self.tilde, pos)
+        if caret < 0:
+            return tilde
+        if tilde < 0:
+            return caret
+        return min(caret, tilde)
+
+    def _finish_command(self):
+        params = ''.join(self._params)
+        if self._command not in _DATA_COMMANDS:
+            params = params.strip()
+        token = ZplToken(self._prefix, self._command, params)
+        self._prefix = self._command = None
+        self._params = []
+
+        # 前缀字符更改对后续命令生效
+        if token.command == 'CC' and params:
+            self.caret = params[0]
+        elif token.command == 'CT' and params:
+            self.tilde = params[0]
+        return token
+
+
+def iter_tokens(chunks: Iterable[str]) -> Iterator[ZplToken]:
+    """逐块读取并逐条输出命令"""
+    tokenizer = ZplTokenizer()
+    for chunk in chunks:
+        yield from tokenizer.feed(chunk)
+    yield from tokenizer.close()
+
+
+def tokenize(zpl: str) -> List[ZplToken]:
+    """整段 ZPL → 命令列表"""
+    return list(iter_tokens([zpl]))
+
+
+def iter_file_chunks(path, chunk_size=64 * 1024, encoding='utf-8'):
+    """按固定大小读取 ZPL 文件"""
+    with open(path, 'r', encoding=encoding, errors='replace') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk